@@ -5,9 +5,19 @@ github.com/peopledoc/workalendar/blob/master/workalendar/america/brazil.py
 
 from datetime import date, timedelta
 
-from workalendar.core import MON, SAT, SUN, ChristianMixin, WesternCalendar
+import numpy as np
+from workalendar.core import (
+    MON,
+    SAT,
+    SUN,
+    ChristianMixin,
+    WesternCalendar,
+    cleaned_date,
+)
 from workalendar.registry_tools import iso_register
 
+from stpstone.cals.holidays_cache import HolidaysCache
+
 
 @iso_register('BR')
 class Brazil(WesternCalendar, ChristianMixin):
@@ -657,6 +667,10 @@ class BrazilBankCalendar(BrazilSaoPauloCity):
     include_easter_sunday = False
     include_xmas_evng = False
     include_last_wd = False
+    # working days index, built on first use for each calendar class
+    INT_YEAR_INF_INDEX = 1990
+    INT_YEAR_SUP_INDEX = 2100
+    _dict_bzdays_index = dict()
 
     def get_last_day_of_year_for_only_internal_bank_trans(self, year):
         """
@@ -701,15 +715,185 @@ class BrazilBankCalendar(BrazilSaoPauloCity):
 
         return days + carnaval_days + non_working_days
 
+    def bzdays_index(self):
+        """
+        Ordinal index of working days, built once per calendar class for
+        the years between INT_YEAR_INF_INDEX and INT_YEAR_SUP_INDEX:
+            - int_ord_inf / int_ord_sup: first and last ordinals covered
+            - array_holidays: sorted ordinals of the holidays
+            - array_bl_working: working day flag per calendar day
+            - array_cum_working: working days up to each calendar day
+                (inclusive)
+            - array_ord_working: sorted ordinals of the working days
+        """
+        if type(self) not in self._dict_bzdays_index:
+            int_ord_inf = date(self.INT_YEAR_INF_INDEX, 1, 1).toordinal()
+            int_ord_sup = date(self.INT_YEAR_SUP_INDEX, 12, 31).toordinal()
+            array_ord = np.arange(int_ord_inf, int_ord_sup + 1)
+            # holidays within the index years - persistent on-disk cache
+            array_holidays = (
+                HolidaysCache()
+                .holidays_ordinals(
+                    self, self.INT_YEAR_INF_INDEX, self.INT_YEAR_SUP_INDEX
+                )
+                .astype(np.int64)
+            )
+            # weekends - ordinal 1 (0001-01-01) is a monday
+            array_bl_working = ~np.isin(
+                (array_ord - 1) % 7, self.get_weekend_days()
+            )
+            array_bl_working[array_holidays - int_ord_inf] = False
+            self._dict_bzdays_index[type(self)] = {
+                'int_ord_inf': int_ord_inf,
+                'int_ord_sup': int_ord_sup,
+                'array_holidays': array_holidays,
+                'array_bl_working': array_bl_working,
+                'array_cum_working': np.cumsum(array_bl_working),
+                'array_ord_working': array_ord[array_bl_working],
+            }
+        return self._dict_bzdays_index[type(self)]
+
+    def bl_within_index(self, *days):
+        """
+        Whether all the given dates lie within the working days index
+        """
+        dict_index = self.bzdays_index()
+        return all(
+            dict_index['int_ord_inf']
+            <= d.toordinal()
+            <= dict_index['int_ord_sup']
+            for d in days
+        )
+
+    def is_working_day(
+        self, day, extra_working_days=None, extra_holidays=None
+    ):
+        """
+        Return True if it's a working day, looked up in the working days
+        index; extra working days / holidays and dates out of the index
+        fall back to workalendar's rules
+        """
+        day = cleaned_date(day)
+        if (
+            extra_working_days
+            or extra_holidays
+            or self.bl_within_index(day) == False
+        ):
+            return super().is_working_day(
+                day,
+                extra_working_days=extra_working_days,
+                extra_holidays=extra_holidays,
+            )
+        dict_index = self.bzdays_index()
+        return bool(
+            dict_index['array_bl_working'][
+                day.toordinal() - dict_index['int_ord_inf']
+            ]
+        )
+
+    def add_working_days(
+        self,
+        day,
+        delta,
+        extra_working_days=None,
+        extra_holidays=None,
+        keep_datetime=False,
+    ):
+        """
+        Add `delta` working days to the date, positive or negative, as an
+        index lookup in the sorted working days ordinals
+        """
+        if extra_working_days or extra_holidays or keep_datetime == True:
+            return super().add_working_days(
+                day,
+                delta,
+                extra_working_days=extra_working_days,
+                extra_holidays=extra_holidays,
+                keep_datetime=keep_datetime,
+            )
+        day = cleaned_date(day)
+        if delta == 0 or self.bl_within_index(day) == False:
+            return super().add_working_days(day, delta)
+        dict_index = self.bzdays_index()
+        int_i = day.toordinal() - dict_index['int_ord_inf']
+        # position of the target date within the working days ordinals
+        if delta > 0:
+            int_pos = dict_index['array_cum_working'][int_i] + delta - 1
+        else:
+            int_pos = (
+                dict_index['array_cum_working'][int_i]
+                - dict_index['array_bl_working'][int_i]
+                + delta
+            )
+        if not 0 <= int_pos < len(dict_index['array_ord_working']):
+            return super().add_working_days(day, delta)
+        return date.fromordinal(int(dict_index['array_ord_working'][int_pos]))
+
+    def get_working_days_delta(
+        self,
+        start,
+        end,
+        include_start=False,
+        extra_working_days=None,
+        extra_holidays=None,
+    ):
+        """
+        Return the number of working days between two given dates, as the
+        difference of the cumulative working days counts
+        """
+        start = cleaned_date(start)
+        end = cleaned_date(end)
+        if (
+            extra_working_days
+            or extra_holidays
+            or self.bl_within_index(start, end) == False
+        ):
+            return super().get_working_days_delta(
+                start,
+                end,
+                include_start=include_start,
+                extra_working_days=extra_working_days,
+                extra_holidays=extra_holidays,
+            )
+        if start == end:
+            return 0
+        if start > end:
+            start, end = end, start
+        dict_index = self.bzdays_index()
+        int_i_start = start.toordinal() - dict_index['int_ord_inf']
+        int_i_end = end.toordinal() - dict_index['int_ord_inf']
+        int_count = int(
+            dict_index['array_cum_working'][int_i_end]
+            - dict_index['array_cum_working'][int_i_start]
+        )
+        if (
+            include_start == True
+            and dict_index['array_bl_working'][int_i_start] == True
+        ):
+            int_count += 1
+        return int_count
+
     def find_following_working_day(self, day):
         """
         Find the next working day by ignoring weekends,
         fixed and non fixed holidays and the last working
         day for only internal bank transactions in Brazil
         """
-        while not self.is_working_day(day):
-            day = day + timedelta(days=1)
-        return day
+        if self.bl_within_index(day) == False:
+            while not self.is_working_day(day):
+                day = day + timedelta(days=1)
+            return day
+        dict_index = self.bzdays_index()
+        int_pos = np.searchsorted(
+            dict_index['array_ord_working'], day.toordinal(), side='left'
+        )
+        if int_pos == len(dict_index['array_ord_working']):
+            return self.add_working_days(day, 1)
+        # shifting the given day keeps its type (date or datetime)
+        return day + timedelta(
+            days=int(dict_index['array_ord_working'][int_pos])
+            - day.toordinal()
+        )
 
     def find_last_working_day(self, day):
         """
@@ -717,10 +901,50 @@ class BrazilBankCalendar(BrazilSaoPauloCity):
         fixed and non fixed holidays and the last working
         day for only internal bank transactions in Brazil
         """
-        day = day + timedelta(days=-1)
-        while not self.is_working_day(day):
+        if self.bl_within_index(day) == False:
             day = day + timedelta(days=-1)
-        return day
+            while not self.is_working_day(day):
+                day = day + timedelta(days=-1)
+            return day
+        dict_index = self.bzdays_index()
+        int_pos = np.searchsorted(
+            dict_index['array_ord_working'], day.toordinal(), side='left'
+        )
+        if int_pos == 0:
+            return self.sub_working_days(day, 1)
+        return day + timedelta(
+            days=int(dict_index['array_ord_working'][int_pos - 1])
+            - day.toordinal()
+        )
+
+    def working_days_between(self, start, end):
+        """
+        Working days from the following working day of start to the
+        following working day of end, both inclusive, sliced from the
+        working days index
+        """
+        if start > end:
+            return list()
+        if self.bl_within_index(start, end) == False:
+            list_du = list()
+            day = self.find_following_working_day(start)
+            end = self.find_following_working_day(end)
+            while day <= end:
+                list_du.append(day)
+                day = self.add_working_days(day, 1)
+            return list_du
+        dict_index = self.bzdays_index()
+        int_pos_inf, int_pos_sup = np.searchsorted(
+            dict_index['array_ord_working'],
+            [start.toordinal(), end.toordinal()],
+            side='left',
+        )
+        return [
+            date.fromordinal(int(d))
+            for d in dict_index['array_ord_working'][
+                int_pos_inf : int_pos_sup + 1
+            ]
+        ]
 
 
 IBGE_TUPLE = (
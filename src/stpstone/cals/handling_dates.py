@@ -6,6 +6,7 @@ from datetime import date, datetime, time, timedelta, timezone
 from pprint import pprint
 
 import businesstimedelta
+import numpy as np
 import pandas as pd
 import pytz
 from dateutil.relativedelta import relativedelta
@@ -183,6 +184,250 @@ class DatesBR(BrazilBankCalendar):
         # retornando range de du anteriores
         return range(du_sup, du_inf + 1)
 
+    def bl_array_dates(self, dates):
+        """
+        DOCSTRING: WHETHER THE INPUT IS AN ARRAY-LIKE OF DATES (LIST, TUPLE, NUMPY ARRAY,
+            PANDAS SERIES OR INDEX) INSTEAD OF A SINGLE DATE
+        INPUTS: DATE OR ARRAY-LIKE OF DATES
+        OUTPUTS: BOOLEAN
+        """
+        return isinstance(
+            dates, (list, tuple, np.ndarray, pd.Series, pd.Index)
+        )
+
+    def dates_to_ordinals(self, dates):
+        """
+        DOCSTRING: PROLEPTIC GREGORIAN ORDINALS (DATE.TOORDINAL) OF AN ARRAY-LIKE OF DATES
+        INPUTS: DATE OR ARRAY-LIKE OF DATES (DATETIME.DATE, DATETIME64, TIMESTAMPS OR ISO STRINGS)
+        OUTPUTS: NUMPY ARRAY OF INTEGERS, WITH THE SHAPE OF THE INPUT
+        """
+        array_dates = np.asarray(dates)
+        array_dt64 = (
+            pd.to_datetime(array_dates.ravel())
+            .values.astype('datetime64[D]')
+            .reshape(array_dates.shape)
+        )
+        if np.isnat(array_dt64).any():
+            raise Exception(
+                'Missing dates (NaT) are not supported, please revisit the input'
+            )
+        # ordinal of the unix epoch (1970-01-01)
+        return array_dt64.astype(np.int64) + date(1970, 1, 1).toordinal()
+
+    def ordinals_to_dates(self, array_ord):
+        """
+        DOCSTRING: NUMPY DATETIME64[D] ARRAY FROM PROLEPTIC GREGORIAN ORDINALS
+        INPUTS: ARRAY OF ORDINALS
+        OUTPUTS: NUMPY ARRAY OF DATETIME64[D]
+        """
+        return (np.asarray(array_ord) - date(1970, 1, 1).toordinal()).astype(
+            'datetime64[D]'
+        )
+
+    def is_working_day(
+        self, day, extra_working_days=None, extra_holidays=None
+    ):
+        """
+        DOCSTRING: WHETHER THE DATE IS A WORKING DAY FOR BRAZILLIAN BANKS; ARRAY-LIKES OF DATES
+            ARE LOOKED UP AT ONCE IN THE WORKING DAYS INDEX, WITH THE SHAPE OF THE INPUT
+        INPUTS: DATE OR ARRAY-LIKE OF DATES, EXTRA WORKING DAYS AND EXTRA HOLIDAYS (SCALAR
+            DATES ONLY)
+        OUTPUTS: BOOLEAN, OR NUMPY ARRAY OF BOOLEANS (PANDAS SERIES FOR A SERIES INPUT)
+        """
+        if self.bl_array_dates(day) == False:
+            return super().is_working_day(
+                day,
+                extra_working_days=extra_working_days,
+                extra_holidays=extra_holidays,
+            )
+        dict_index = self.bzdays_index()
+        array_ord = self.dates_to_ordinals(day)
+        array_i = array_ord - dict_index['int_ord_inf']
+        mask_in = (array_i >= 0) & (
+            array_i < len(dict_index['array_bl_working'])
+        )
+        array_bl = np.zeros(array_ord.shape, dtype=bool)
+        array_bl[mask_in] = dict_index['array_bl_working'][array_i[mask_in]]
+        # dates out of the index years - workalendar's rules
+        for tup_i in map(tuple, np.argwhere(~mask_in)):
+            array_bl[tup_i] = super().is_working_day(
+                date.fromordinal(int(array_ord[tup_i]))
+            )
+        if isinstance(day, pd.Series):
+            return pd.Series(array_bl, index=day.index)
+        return array_bl
+
+    def add_working_days(
+        self,
+        day,
+        delta,
+        extra_working_days=None,
+        extra_holidays=None,
+        keep_datetime=False,
+    ):
+        """
+        DOCSTRING: ADD (OR SUBTRACT, FOR NEGATIVE DELTAS) WORKING DAYS TO A DATE; ARRAY-LIKES
+            OF DATES AND/OR DELTAS ARE BROADCAST AGAINST EACH OTHER AND SHIFTED AT ONCE
+        INPUTS: DATE OR ARRAY-LIKE OF DATES, NUMBER OR ARRAY-LIKE OF WORKING DAYS TO ADD,
+            EXTRA WORKING DAYS, EXTRA HOLIDAYS AND KEEP DATETIME (SCALAR DATES ONLY)
+        OUTPUTS: DATE, OR NUMPY ARRAY OF DATETIME64[D] (PANDAS SERIES FOR A SERIES INPUT)
+        """
+        if (
+            self.bl_array_dates(day) == False
+            and self.bl_array_dates(delta) == False
+        ):
+            return super().add_working_days(
+                day,
+                delta,
+                extra_working_days=extra_working_days,
+                extra_holidays=extra_holidays,
+                keep_datetime=keep_datetime,
+            )
+        dict_index = self.bzdays_index()
+        array_ord, array_delta = np.broadcast_arrays(
+            self.dates_to_ordinals(day), np.asarray(delta, dtype=np.int64)
+        )
+        array_i = array_ord - dict_index['int_ord_inf']
+        mask_in = (array_i >= 0) & (
+            array_i < len(dict_index['array_bl_working'])
+        )
+        array_i = np.where(mask_in, array_i, 0)
+        # position of the target dates within the working days ordinals
+        array_pos = np.where(
+            array_delta > 0,
+            dict_index['array_cum_working'][array_i] + array_delta - 1,
+            dict_index['array_cum_working'][array_i]
+            - dict_index['array_bl_working'][array_i]
+            + array_delta,
+        )
+        mask_in &= (array_pos >= 0) & (
+            array_pos < len(dict_index['array_ord_working'])
+        )
+        array_ord_out = np.where(
+            array_delta == 0,
+            array_ord,
+            dict_index['array_ord_working'][
+                np.clip(array_pos, 0, len(dict_index['array_ord_working']) - 1)
+            ],
+        )
+        # shifts reaching out of the index years - workalendar's rules
+        for tup_i in map(tuple, np.argwhere(~mask_in & (array_delta != 0))):
+            array_ord_out[tup_i] = (
+                super()
+                .add_working_days(
+                    date.fromordinal(int(array_ord[tup_i])),
+                    int(array_delta[tup_i]),
+                )
+                .toordinal()
+            )
+        array_dates = self.ordinals_to_dates(array_ord_out)
+        if isinstance(day, pd.Series):
+            return pd.Series(array_dates, index=day.index)
+        return array_dates
+
+    def working_days_delta(
+        self,
+        start,
+        end,
+        include_start=False,
+        bl_anbima=False,
+        list_holidays_not_considered=['25/01'],
+        list_dates_not_considered=['05/03/2025', '18/02/2026'],
+    ):
+        """
+        DOCSTRING: WORKING DAYS BETWEEN PAIRS OF DATES, AS NUMPY.BUSDAY_COUNT WITH THE BRAZILLIAN
+            BANK HOLIDAYS - FOLLOWING GET_WORKING_DAYS_DELTA, THE COUNT DOES NOT DEPEND ON THE
+            ORDER OF THE DATES AND SPANS (START, END]; THE ANBIMA ADJUSTMENT ADDS, AS
+            ADD_HOLIDAYS_NOT_CONSIDERED_ANBIMA, THE CALENDAR DAYS WITHIN [START, END) MATCHING THE
+            HOLIDAYS (DD/MM, ON WEEKDAYS) AND DATES (DD/MM/YYYY) NOT CONSIDERED, AS WELL AS THE
+            LAST WEEKDAYS OF THE YEARS
+        INPUTS: START AND END DATES (DATES OR ARRAY-LIKES OF DATES, BROADCAST AGAINST EACH
+            OTHER), INCLUDE START, BOOLEAN ANBIMA ADJUSTMENT, LIST OF HOLIDAYS NOT CONSIDERED
+            (DD/MM) AND LIST OF DATES NOT CONSIDERED (DD/MM/YYYY)
+        OUTPUTS: NUMPY ARRAY OF INTEGERS (PANDAS SERIES FOR A SERIES INPUT)
+        """
+        dict_index = self.bzdays_index()
+        array_ord_start, array_ord_end = np.broadcast_arrays(
+            self.dates_to_ordinals(start), self.dates_to_ordinals(end)
+        )
+        array_ord_inf = np.minimum(array_ord_start, array_ord_end)
+        array_ord_sup = np.maximum(array_ord_start, array_ord_end)
+        array_i_inf = array_ord_inf - dict_index['int_ord_inf']
+        array_i_sup = array_ord_sup - dict_index['int_ord_inf']
+        mask_in = (array_i_inf >= 0) & (
+            array_i_sup < len(dict_index['array_bl_working'])
+        )
+        array_i_inf = np.where(mask_in, array_i_inf, 0)
+        array_i_sup = np.where(mask_in, array_i_sup, 0)
+        array_du = np.array(
+            dict_index['array_cum_working'][array_i_sup]
+            - dict_index['array_cum_working'][array_i_inf],
+            dtype=np.int64,
+        )
+        if include_start == True:
+            # the start is counted as long as both dates differ
+            array_du += (
+                dict_index['array_bl_working'][array_i_inf]
+                & (array_ord_start != array_ord_end)
+            ).astype(np.int64)
+        # pairs out of the index years - workalendar's rules
+        for tup_i in map(tuple, np.argwhere(~mask_in)):
+            array_du[tup_i] = self.get_working_days_delta(
+                date.fromordinal(int(array_ord_start[tup_i])),
+                date.fromordinal(int(array_ord_end[tup_i])),
+                include_start=include_start,
+            )
+        # anbima adjustment - cumulative count of the days not considered within the range
+        if bl_anbima == True and array_du.size > 0:
+            int_ord_min = int(array_ord_inf.min())
+            array_ord = np.arange(int_ord_min, int(array_ord_sup.max()) + 1)
+            array_dt64 = self.ordinals_to_dates(array_ord)
+            array_month = (
+                array_dt64.astype('datetime64[M]').astype(int) % 12 + 1
+            )
+            array_day = (
+                array_dt64 - array_dt64.astype('datetime64[M]')
+            ).astype(int) + 1
+            # ordinal 1 (0001-01-01) is a monday
+            array_bl_weekday = (array_ord - 1) % 7 < SAT
+            array_bl_not_considered = np.zeros(array_ord.shape, dtype=bool)
+            for str_dt in list_holidays_not_considered:
+                array_bl_not_considered |= (
+                    array_bl_weekday
+                    & (array_day == int(str_dt[:2]))
+                    & (array_month == int(str_dt[3:5]))
+                )
+            array_bl_not_considered |= np.isin(
+                array_ord,
+                [
+                    self.str_date_to_datetime(str_dt, 'DD/MM/YYYY').toordinal()
+                    for str_dt in list_dates_not_considered
+                ],
+            )
+            # last weekday of the year - 31/12, or the friday before it
+            array_bl_not_considered |= (
+                array_bl_weekday
+                & (array_month == 12)
+                & (
+                    (array_day == 31)
+                    | ((array_day >= 29) & ((array_ord - 1) % 7 == 4))
+                )
+            )
+            array_cum = np.concatenate(
+                [[0], np.cumsum(array_bl_not_considered)]
+            )
+            array_du += (
+                array_cum[array_ord_sup - int_ord_min]
+                - array_cum[array_ord_inf - int_ord_min]
+            )
+        if array_du.ndim == 0:
+            return int(array_du)
+        if isinstance(start, pd.Series):
+            return pd.Series(array_du, index=start.index)
+        if isinstance(end, pd.Series):
+            return pd.Series(array_du, index=end.index)
+        return array_du
+
     def list_working_days(
         self,
         data_inic,
@@ -205,23 +450,15 @@ class DatesBR(BrazilBankCalendar):
             data_fim = DatesBR().str_date_to_datetime(
                 data_fim, format_datas_input
             )
-        # lista de passagem
-        list_du = list()
-        # * super() just works in its own scope, however list comprehensions create its own scope
-        # * so we have to append an empty list
-        for x in range(int((data_fim - data_inic).days) + 1):
-            list_du.append(
-                super().find_following_working_day(
-                    day=data_inic + timedelta(days=x)
-                )
-            )
+        # dias úteis seguintes a cada dia corrido entre as datas, fatiados do índice de dias úteis
+        list_du = self.working_days_between(data_inic, data_fim)
         if format_datas_saida != None:
             return [
                 DatesBR().datetime_to_string(d, format_datas_saida)
-                for d in list(unique_everseen(list_du))
+                for d in list_du
             ]
         else:
-            return list(unique_everseen(list_du))
+            return list_du
 
     def list_calendar_days(
         self, data_inic, data_fim, format_data='DD/MM/YYYY'
@@ -0,0 +1,191 @@
+### PERSISTENT HOLIDAYS CACHE FOR WORKALENDAR-DERIVED CALENDARS ###
+
+import hashlib
+import os
+import re
+import sys
+import tempfile
+from glob import escape, glob
+
+import numpy as np
+import workalendar
+
+
+class HolidaysCache:
+    """
+    DOCSTRING: SORTED HOLIDAYS ORDINALS (DATE.TOORDINAL) PER CALENDAR CLASS AND YEARS RANGE,
+        SERIALIZED TO .NPY FILES AND MEMORY-MAPPED ON LOAD; THE FILE NAME CARRIES A FINGERPRINT
+        OF THE CALENDAR RULES (CLASS ATTRIBUTES AND SOURCE FILES OF THE CLASS HIERARCHY,
+        WORKALENDAR VERSION AND CACHE VERSION), SO CHANGING A RULE INVALIDATES THE CACHE
+    INPUTS: DIRECTORY OF THE CACHE FILES (STPSTONE_CACHE_DIR ENVIRONMENT VARIABLE, OR
+        ~/.cache/stpstone, AS DEFAULT)
+    OUTPUTS: -
+    """
+
+    INT_CACHE_VERSION = 1
+    # memoized within the process - loaded arrays and source files hashes
+    _dict_holidays = dict()
+    _dict_files_hashes = dict()
+
+    def __init__(self, path_dir=None):
+        if path_dir == None:
+            path_dir = os.environ.get(
+                'STPSTONE_CACHE_DIR',
+                os.path.join(os.path.expanduser('~'), '.cache', 'stpstone'),
+            )
+        self.path_dir = path_dir
+
+    def file_hash(self, path_file):
+        """
+        DOCSTRING: SHA1 OF A FILE CONTENT, MEMOIZED WITHIN THE PROCESS
+        INPUTS: PATH OF THE FILE
+        OUTPUTS: STRING
+        """
+        if path_file not in self._dict_files_hashes:
+            try:
+                with open(path_file, 'rb') as f:
+                    self._dict_files_hashes[path_file] = hashlib.sha1(
+                        f.read()
+                    ).hexdigest()
+            except (OSError, TypeError):
+                self._dict_files_hashes[path_file] = ''
+        return self._dict_files_hashes[path_file]
+
+    def fingerprint(self, calendar, int_year_inf, int_year_sup):
+        """
+        DOCSTRING: HASH OF THE RULES OF A CALENDAR CLASS - PLAIN CLASS ATTRIBUTES (FIXED
+            HOLIDAYS, INCLUDE_* FLAGS, LABELS) AND SOURCE FILES OF EACH CLASS IN THE MRO
+        INPUTS: CALENDAR (WORKALENDAR INSTANCE), INFERIOR AND SUPERIOR YEARS
+        OUTPUTS: STRING
+        """
+        list_rules = [
+            self.INT_CACHE_VERSION,
+            workalendar.__version__,
+            int_year_inf,
+            int_year_sup,
+        ]
+        for cls_ in type(calendar).__mro__[:-1]:
+            list_rules.append(cls_.__qualname__)
+            list_rules.append(
+                self.file_hash(
+                    getattr(sys.modules.get(cls_.__module__), '__file__', None)
+                )
+            )
+            list_rules.append(
+                sorted(
+                    (k, repr(v))
+                    for k, v in vars(cls_).items()
+                    if k.startswith('__') == False
+                    and isinstance(
+                        v, (bool, int, float, str, tuple, list, type(None))
+                    )
+                )
+            )
+        return hashlib.sha1(repr(list_rules).encode('utf-8')).hexdigest()[:16]
+
+    def path_cache(self, calendar, int_year_inf, int_year_sup):
+        """
+        DOCSTRING: PATH OF THE CACHE FILE OF A CALENDAR CLASS AND YEARS RANGE
+        INPUTS: CALENDAR (WORKALENDAR INSTANCE), INFERIOR AND SUPERIOR YEARS
+        OUTPUTS: STRING
+        """
+        return os.path.join(
+            self.path_dir,
+            '{}_{}_{}_{}.npy'.format(
+                self.prefix_cache(calendar),
+                int_year_inf,
+                int_year_sup,
+                self.fingerprint(calendar, int_year_inf, int_year_sup),
+            ),
+        )
+
+    def prefix_cache(self, calendar):
+        """
+        DOCSTRING: PREFIX OF THE CACHE FILES OF A CALENDAR CLASS
+        INPUTS: CALENDAR (WORKALENDAR INSTANCE)
+        OUTPUTS: STRING
+        """
+        # classes defined within functions have <locals> in their qualified names
+        return re.sub(
+            r'[^\w.]',
+            '_',
+            'holidays_v{}_{}.{}'.format(
+                self.INT_CACHE_VERSION,
+                type(calendar).__module__,
+                type(calendar).__qualname__,
+            ),
+        )
+
+    def build_holidays(self, calendar, int_year_inf, int_year_sup):
+        """
+        DOCSTRING: SORTED HOLIDAYS ORDINALS, COMPUTED THROUGH WORKALENDAR'S RULES
+        INPUTS: CALENDAR (WORKALENDAR INSTANCE), INFERIOR AND SUPERIOR YEARS
+        OUTPUTS: NUMPY ARRAY OF INTEGERS
+        """
+        return np.array(
+            sorted(
+                d.toordinal()
+                for int_year in range(int_year_inf, int_year_sup + 1)
+                for d in calendar.holidays_set(int_year)
+            ),
+            dtype=np.int32,
+        )
+
+    def dump(self, path_file, array_holidays):
+        """
+        DOCSTRING: ATOMIC WRITE OF THE CACHE FILE, DROPPING STALE FILES OF THE SAME CALENDAR
+            CLASS; AN UNWRITABLE DIRECTORY LEAVES THE CACHE IN MEMORY ONLY
+        INPUTS: PATH OF THE CACHE FILE, ARRAY OF HOLIDAYS ORDINALS
+        OUTPUTS: BOOLEAN
+        """
+        try:
+            os.makedirs(self.path_dir, exist_ok=True)
+            # stale files - former rules of the calendar class
+            for path_stale in glob(
+                escape(path_file.rsplit('_', 1)[0]) + '_*.npy'
+            ):
+                try:
+                    os.remove(path_stale)
+                except OSError:
+                    pass
+            with tempfile.NamedTemporaryFile(
+                dir=self.path_dir, suffix='.npy', delete=False
+            ) as f:
+                np.save(f, array_holidays)
+            os.replace(f.name, path_file)
+            return True
+        except OSError:
+            return False
+
+    def holidays_ordinals(self, calendar, int_year_inf, int_year_sup):
+        """
+        DOCSTRING: SORTED HOLIDAYS ORDINALS OF A CALENDAR WITHIN THE YEARS RANGE - MEMORY-MAPPED
+            FROM THE CACHE FILE WHEN IT EXISTS, OTHERWISE BUILT AND PERSISTED
+        INPUTS: CALENDAR (WORKALENDAR INSTANCE), INFERIOR AND SUPERIOR YEARS
+        OUTPUTS: NUMPY ARRAY OF INTEGERS
+        """
+        path_file = self.path_cache(calendar, int_year_inf, int_year_sup)
+        if path_file not in self._dict_holidays:
+            try:
+                array_holidays = np.load(path_file, mmap_mode='r')
+            except (OSError, ValueError):
+                array_holidays = self.build_holidays(
+                    calendar, int_year_inf, int_year_sup
+                )
+                self.dump(path_file, array_holidays)
+            self._dict_holidays[path_file] = array_holidays
+        return self._dict_holidays[path_file]
+
+    def clear(self):
+        """
+        DOCSTRING: REMOVE ALL THE HOLIDAYS CACHE FILES FROM THE DIRECTORY
+        INPUTS: -
+        OUTPUTS: INTEGER - NUMBER OF FILES REMOVED
+        """
+        self._dict_holidays.clear()
+        list_files = glob(
+            os.path.join(escape(self.path_dir), 'holidays_v*.npy')
+        )
+        for path_file in list_files:
+            os.remove(path_file)
+        return len(list_files)
@@ -1,11 +1,23 @@
 ### USA WORKING DAYS ###
 
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Union
 
+import numpy as np
+import pandas as pd
 from workalendar.usa import UnitedStates
 
+from stpstone.cals.holidays_cache import HolidaysCache
+
 
 class WorkCalendar:
+    # years covered by the holidays cache and the working days index
+    INT_YEAR_INF_INDEX = 1990
+    INT_YEAR_SUP_INDEX = 2100
+    # working days index, built once per process
+    _dict_bzdays_index = dict()
+
     def __init__(self) -> None:
         """
         DOCSTRING: INITIALIZES THE WORK CALENDAR
@@ -14,17 +26,65 @@ class WorkCalendar:
         """
         self.calendar = UnitedStates()
 
+    def working_days_index(self) -> Dict[str, Any]:
+        """
+        DOCSTRING: ORDINAL INDEX OF THE USA WORKING DAYS WITHIN THE CACHED YEARS - FIRST AND LAST
+            ORDINALS, WORKING DAY FLAG PER CALENDAR DAY, CUMULATIVE WORKING DAYS (INCLUSIVE) AND
+            SORTED ORDINALS OF THE WORKING DAYS
+        INPUTS: NONE
+        OUTPUTS: DICTIONARY
+        """
+        if 'array_bl_working' not in self._dict_bzdays_index:
+            int_ord_inf = date(self.INT_YEAR_INF_INDEX, 1, 1).toordinal()
+            int_ord_sup = date(self.INT_YEAR_SUP_INDEX, 12, 31).toordinal()
+            array_ord = np.arange(int_ord_inf, int_ord_sup + 1)
+            # weekends - ordinal 1 (0001-01-01) is a monday
+            array_bl_working = (array_ord - 1) % 7 < 5
+            array_bl_working[
+                self.holidays_ordinals().astype(np.int64) - int_ord_inf
+            ] = False
+            self._dict_bzdays_index.update(
+                {
+                    'int_ord_inf': int_ord_inf,
+                    'int_ord_sup': int_ord_sup,
+                    'array_bl_working': array_bl_working,
+                    'array_cum_working': np.cumsum(array_bl_working),
+                    'array_ord_working': array_ord[array_bl_working],
+                }
+            )
+        return self._dict_bzdays_index
+
     def add_working_days(self, dt_bgn: datetime, num_days: int) -> datetime:
         """
         DOCSTRING: ADDS A SPECIFIED NUMBER OF WORKING DAYS TO A GIVEN START DATE
         INPUTS: DT_START (START DATE), NUM_DAYS (NUMBER OF WORKING DAYS TO ADD)
         OUTPUTS: DT_END (END DATE)
         """
+        if num_days <= 0:
+            return dt_bgn
+        dict_index = self.working_days_index()
+        int_ord = dt_bgn.toordinal()
+        if dict_index['int_ord_inf'] <= int_ord <= dict_index['int_ord_sup']:
+            # position of the target date within the working days ordinals
+            int_pos = (
+                dict_index['array_cum_working'][
+                    int_ord - dict_index['int_ord_inf']
+                ]
+                + num_days
+                - 1
+            )
+            if int_pos < len(dict_index['array_ord_working']):
+                # shifting the start date keeps its type (date or datetime)
+                return dt_bgn + timedelta(
+                    days=int(dict_index['array_ord_working'][int_pos])
+                    - int_ord
+                )
+        # out of the index years - stepping day by day
         current_date = dt_bgn
         working_days_added = 0
         while working_days_added < num_days:
             current_date += timedelta(days=1)
-            if current_date.weekday() < 5 and not self.calendar.is_holiday(
+            if current_date.weekday() < 5 and not self.is_holiday(
                 current_date
             ):
                 working_days_added += 1
@@ -36,7 +96,27 @@ class WorkCalendar:
         INPUTS: DATE (AS DATETIME)
         OUTPUTS: BOOLEAN
         """
-        return self.calendar.is_holiday(date)
+        if not (
+            self.INT_YEAR_INF_INDEX <= date.year <= self.INT_YEAR_SUP_INDEX
+        ):
+            return self.calendar.is_holiday(date)
+        array_holidays = self.holidays_ordinals()
+        int_pos = np.searchsorted(array_holidays, date.toordinal())
+        return bool(
+            int_pos < len(array_holidays)
+            and array_holidays[int_pos] == date.toordinal()
+        )
+
+    def holidays_ordinals(self) -> np.ndarray:
+        """
+        DOCSTRING: SORTED ORDINALS OF THE USA HOLIDAYS WITHIN THE CACHED YEARS, LOADED FROM THE
+            PERSISTENT HOLIDAYS CACHE
+        INPUTS: NONE
+        OUTPUTS: NUMPY ARRAY OF INTEGERS
+        """
+        return HolidaysCache().holidays_ordinals(
+            self.calendar, self.INT_YEAR_INF_INDEX, self.INT_YEAR_SUP_INDEX
+        )
 
     def is_weekend(self, date: datetime) -> bool:
         """
@@ -52,16 +132,135 @@ class WorkCalendar:
         INPUTS: START DATE (AS DATETIME), END DATE (AS DATETIME)
         OUTPUTS: INTEGER
         """
+        if dt_end.toordinal() < dt_bgn.toordinal():
+            return 0
+        dict_index = self.working_days_index()
+        if (
+            dict_index['int_ord_inf']
+            <= dt_bgn.toordinal()
+            <= dt_end.toordinal()
+            <= dict_index['int_ord_sup']
+        ):
+            # working days within [start, end] - difference of cumulative counts
+            int_i_bgn = dt_bgn.toordinal() - dict_index['int_ord_inf']
+            int_i_end = dt_end.toordinal() - dict_index['int_ord_inf']
+            return int(
+                dict_index['array_cum_working'][int_i_end]
+                - dict_index['array_cum_working'][int_i_bgn]
+                + dict_index['array_bl_working'][int_i_bgn]
+            )
+        # out of the index years - stepping day by day
         current_date = dt_bgn
         working_days = 0
         while current_date <= dt_end:
-            if current_date.weekday() < 5 and not self.calendar.is_holiday(
+            if current_date.weekday() < 5 and not self.is_holiday(
                 current_date
             ):
                 working_days += 1
             current_date += timedelta(days=1)
         return working_days
 
+    def dates_to_ordinals(self, array_dates: Any) -> np.ndarray:
+        """
+        DOCSTRING: PROLEPTIC GREGORIAN ORDINALS (DATE.TOORDINAL) OF AN ARRAY-LIKE OF DATES
+        INPUTS: ARRAY-LIKE OF DATES (DATETIME, DATETIME64, TIMESTAMPS OR ISO STRINGS)
+        OUTPUTS: NUMPY ARRAY OF INTEGERS, WITH THE SHAPE OF THE INPUT
+        """
+        array_dates = np.asarray(array_dates)
+        array_dt64 = (
+            pd.to_datetime(array_dates.ravel())
+            .values.astype('datetime64[D]')
+            .reshape(array_dates.shape)
+        )
+        if np.isnat(array_dt64).any():
+            raise Exception(
+                'Missing dates (NaT) are not supported, please revisit the input'
+            )
+        # ordinal of the unix epoch (1970-01-01)
+        return array_dt64.astype(np.int64) + date(1970, 1, 1).toordinal()
+
+    def add_working_days_batch(
+        self, array_dt_bgn: Any, array_num_days: Union[int, Any]
+    ) -> np.ndarray:
+        """
+        DOCSTRING: ADDS WORKING DAYS TO ARRAYS OF START DATES, BROADCAST AGAINST THE NUMBERS OF
+            WORKING DAYS - NON-POSITIVE NUMBERS KEEP THE START DATE, AS ADD_WORKING_DAYS
+        INPUTS: ARRAY-LIKE OF START DATES, NUMBER OR ARRAY-LIKE OF WORKING DAYS TO ADD
+        OUTPUTS: NUMPY ARRAY OF DATETIME64[D]
+        """
+        dict_index = self.working_days_index()
+        array_ord, array_num_days = np.broadcast_arrays(
+            self.dates_to_ordinals(array_dt_bgn),
+            np.asarray(array_num_days, dtype=np.int64),
+        )
+        array_i = array_ord - dict_index['int_ord_inf']
+        mask_in = (array_i >= 0) & (
+            array_i < len(dict_index['array_bl_working'])
+        )
+        array_pos = (
+            dict_index['array_cum_working'][np.where(mask_in, array_i, 0)]
+            + array_num_days
+            - 1
+        )
+        mask_in &= array_pos < len(dict_index['array_ord_working'])
+        array_ord_out = np.where(
+            array_num_days <= 0,
+            array_ord,
+            dict_index['array_ord_working'][
+                np.clip(array_pos, 0, len(dict_index['array_ord_working']) - 1)
+            ],
+        )
+        # out of the index years - stepping day by day
+        for tup_i in map(tuple, np.argwhere(~mask_in & (array_num_days > 0))):
+            array_ord_out[tup_i] = self.add_working_days(
+                date.fromordinal(int(array_ord[tup_i])),
+                int(array_num_days[tup_i]),
+            ).toordinal()
+        return (array_ord_out - date(1970, 1, 1).toordinal()).astype(
+            'datetime64[D]'
+        )
+
+    def diff_working_days_batch(
+        self, array_dt_bgn: Any, array_dt_end: Any
+    ) -> np.ndarray:
+        """
+        DOCSTRING: NUMBER OF WORKING DAYS WITHIN [START, END] FOR ARRAYS OF DATES, BROADCAST
+            AGAINST EACH OTHER - ZERO WHEN THE END PRECEDES THE START, AS DIFF_WORKING_DAYS
+        INPUTS: ARRAY-LIKES OF START AND END DATES
+        OUTPUTS: NUMPY ARRAY OF INTEGERS
+        """
+        dict_index = self.working_days_index()
+        array_ord_bgn, array_ord_end = np.broadcast_arrays(
+            self.dates_to_ordinals(array_dt_bgn),
+            self.dates_to_ordinals(array_dt_end),
+        )
+        array_i_bgn = array_ord_bgn - dict_index['int_ord_inf']
+        array_i_end = array_ord_end - dict_index['int_ord_inf']
+        mask_in = (
+            (array_i_bgn >= 0)
+            & (array_i_end < len(dict_index['array_bl_working']))
+            & (array_i_bgn <= array_i_end)
+        )
+        array_i_bgn = np.where(mask_in, array_i_bgn, 0)
+        array_i_end = np.where(mask_in, array_i_end, 0)
+        array_diff = np.where(
+            mask_in,
+            dict_index['array_cum_working'][array_i_end]
+            - dict_index['array_cum_working'][array_i_bgn]
+            + dict_index['array_bl_working'][array_i_bgn],
+            0,
+        )
+        # out of the index years - stepping day by day
+        for tup_i in map(
+            tuple,
+            np.argwhere(~mask_in & (array_ord_bgn <= array_ord_end)),
+        ):
+            array_diff[tup_i] = self.diff_working_days(
+                date.fromordinal(int(array_ord_bgn[tup_i])),
+                date.fromordinal(int(array_ord_end[tup_i])),
+            )
+        return array_diff
+
 
 if __name__ == '__main__':
 
@@ -77,3 +276,43 @@ if __name__ == '__main__':
     # Check if a specific date is a weekend
     weekdt_end = datetime(2025, 1, 11)
     print(f'Is {weekdt_end} a weekend? {cls_usabzdays.is_weekend(weekdt_end)}')
+    # benchmark - day-by-day stepping with workalendar's holidays against the index lookups,
+    #   for 10-year differences of a portfolio of usd legs
+    int_legs = 2_000
+    rng = np.random.default_rng(0)
+    list_dt_bgn = [
+        datetime(2015, 1, 1) + timedelta(days=int(x))
+        for x in rng.integers(0, 3_650, int_legs)
+    ]
+    list_dt_end = [dt_ + timedelta(days=3_650) for dt_ in list_dt_bgn]
+    cls_federal = UnitedStates()
+    float_t0 = time.perf_counter()
+    list_diff_loop = list()
+    for dt_bgn_, dt_end_ in zip(list_dt_bgn, list_dt_end):
+        current_date = dt_bgn_
+        working_days = 0
+        while current_date <= dt_end_:
+            if current_date.weekday() < 5 and not cls_federal.is_holiday(
+                current_date
+            ):
+                working_days += 1
+            current_date += timedelta(days=1)
+        list_diff_loop.append(working_days)
+    float_t_loop = time.perf_counter() - float_t0
+    float_t0 = time.perf_counter()
+    list_diff_scalar = [
+        cls_usabzdays.diff_working_days(dt_bgn_, dt_end_)
+        for dt_bgn_, dt_end_ in zip(list_dt_bgn, list_dt_end)
+    ]
+    float_t_scalar = time.perf_counter() - float_t0
+    float_t0 = time.perf_counter()
+    array_diff_batch = cls_usabzdays.diff_working_days_batch(
+        list_dt_bgn, list_dt_end
+    )
+    float_t_batch = time.perf_counter() - float_t0
+    print(
+        f'{int_legs} ten-year diffs - day by day: {float_t_loop:.3f}s, index: '
+        f'{float_t_scalar:.4f}s ({float_t_loop / float_t_scalar:.0f}x), batch: '
+        f'{float_t_batch:.4f}s ({float_t_loop / float_t_batch:.0f}x), matching: '
+        f'{list_diff_loop == list_diff_scalar == array_diff_batch.tolist()}'
+    )
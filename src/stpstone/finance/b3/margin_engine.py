@@ -0,0 +1,467 @@
+### LOCAL MARGIN ENGINE OVER B3 RISK SCENARIOS ###
+
+from logging import Logger
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from stpstone.loggs.create_logs import CreateLog
+
+
+class MarginEngineB3:
+    """
+    REFERENCES: B3 - CORE - Closeout Risk Evaluation, manual de metodologia (2020); B3 - arquivos
+        de pregão, fatores primitivos de risco e cenários de risco tipo curva e tipo spot
+    DOCSTRING: LOCAL MARGIN ENGINE, CORE-STYLE - THE RISK SCENARIOS OF THE PRIMITIVE RISK FACTORS
+        (FPRS), AS MERGED BY TRADINGFILESB3.FPRS_CENARIOS_CURVA_SPOT_MERGE, ARE LOADED INTO A
+        DENSE FPRS X VERTICES X SCENARIOS CUBE OF SHOCKS, LINEARLY INTERPOLATED ALONG EACH FPR'S
+        OWN VERTICES (FLAT BEYOND THEM; SPOT FPRS HOLD A SINGLE VERTEX); POSITIONS ARE MAPPED TO
+        THEIR FPRS AND FULLY REVALUED UNDER ALL SCENARIOS AT ONCE, AND THE MARGIN IS THE
+        WORST-CASE LOSS OF EACH PORTFOLIO - HOLDING PERIODS, CLOSE-OUT STRATEGIES AND
+        COLLATERAL ARE NOT MODELLED
+    INPUTS: DATAFRAME OF FPRS SCENARIOS, UNIT OF THE PERCENTUAL AND OF THE BASIS POINTS SHOCKS
+        (1.0 AND 10,000 AS DEFAULT, SHOCKS OF 0.05 AND 50 ARE 5% AND 0.5%), HOLDING PERIOD AND
+        SCENARIO TYPE OF INTEREST (NONE AS DEFAULT, ALL), COLUMNS NAMES AND LOGGER (NONE AS
+        DEFAULT) - A SCENARIO OF A FPR AT A VERTEX OUGHT BE UNIQUE ONCE SELECTED, OTHERWISE AN
+        EXCEPTION IS RAISED; FPRS WITHOUT ANY SHOCK (PHI MISSING AT EVERY VERTEX) ARE LEFT
+        UNSHOCKED, LISTED IN ARRAY_FPRS_NO_SHOCKS AND LOGGED AS A WARNING
+    OUTPUTS: -
+    """
+
+    # formats of variation and capitalization criteria of the fprs, as in b3's files
+    INT_FORMAT_BPS = 2
+    INT_CAPITALIZATION_LINEAR = 1
+
+    def __init__(
+        self,
+        df_scenarios: pd.DataFrame,
+        float_pct_unit: float = 1.0,
+        float_bps_unit: float = 1e4,
+        int_holding_period: Optional[int] = None,
+        int_scenario_type: Optional[int] = None,
+        col_id_fpr: str = 'ID_FPR',
+        col_id_scenario: str = 'ID_CENARIO',
+        col_vertex: str = 'DIAS_CORRIDOS_VERTICE',
+        col_phi: str = 'VALOR_PHI_1',
+        col_format: str = 'FORMATO_VARIACAO',
+        col_capitalization: str = 'CRITERIO_CAPITALIZACAO',
+        col_holding_period: str = 'DIAS_HOLDING_PERIOD',
+        col_scenario_type: str = 'INT_TIPO_CENARIO',
+        logger: Optional[Logger] = None,
+    ) -> None:
+        self.float_pct_unit = float_pct_unit
+        self.float_bps_unit = float_bps_unit
+        self.logger = logger
+        # holding period and scenario type of interest
+        for int_selected, col_ in [
+            (int_holding_period, col_holding_period),
+            (int_scenario_type, col_scenario_type),
+        ]:
+            if int_selected is None:
+                continue
+            if col_ not in df_scenarios.columns:
+                raise Exception(
+                    'Column {} not found within the risk scenarios, please revisit'.format(
+                        col_
+                    )
+                )
+            df_scenarios = df_scenarios[
+                pd.to_numeric(df_scenarios[col_]) == int_selected
+            ]
+        # keys of the shocks - spot fprs have no vertex, thus the vertex zero
+        df_ = pd.DataFrame(
+            {
+                'fpr': pd.to_numeric(df_scenarios[col_id_fpr]).to_numpy(),
+                'scenario': pd.to_numeric(
+                    df_scenarios[col_id_scenario]
+                ).to_numpy(),
+                'vertex': pd.to_numeric(df_scenarios[col_vertex])
+                .fillna(0)
+                .to_numpy(dtype=float),
+                'phi': pd.to_numeric(df_scenarios[col_phi]).to_numpy(
+                    dtype=float
+                ),
+                'format': pd.to_numeric(df_scenarios[col_format]).to_numpy(),
+                'capitalization': pd.to_numeric(
+                    df_scenarios[col_capitalization]
+                ).to_numpy(),
+            }
+        )
+        # a single shock per key - distinct holding periods or scenario types ought be selected
+        array_dupl = df_.duplicated(subset=['fpr', 'scenario', 'vertex'])
+        if array_dupl.any() == True:
+            raise Exception(
+                'Duplicated shocks of FPRs {} within the same scenario and vertex, please '
+                'select the holding period and/or the scenario type'.format(
+                    np.unique(df_.loc[array_dupl, 'fpr']).tolist()
+                )
+            )
+        # axes of the cube
+        self.array_scenarios, array_idx_s = np.unique(
+            df_['scenario'].to_numpy(), return_inverse=True
+        )
+        self.array_fprs, array_idx_f = np.unique(
+            df_['fpr'].to_numpy(), return_inverse=True
+        )
+        self.array_vertices, array_idx_v = np.unique(
+            df_['vertex'].to_numpy(), return_inverse=True
+        )
+        # dense cube of shocks, fprs x vertices x scenarios (contiguous scenarios, gathered by
+        #   position), filled along each fpr's own vertices
+        self.array_cube = np.full(
+            (
+                len(self.array_fprs),
+                len(self.array_vertices),
+                len(self.array_scenarios),
+            ),
+            np.nan,
+        )
+        self.array_cube[array_idx_f, array_idx_v, array_idx_s] = df_[
+            'phi'
+        ].to_numpy()
+        list_fprs_no_shocks = list()
+        for int_f in range(len(self.array_fprs)):
+            array_known = np.flatnonzero(
+                ~np.isnan(self.array_cube[int_f]).all(axis=1)
+            )
+            #   no vertex to interpolate from - a malformed fpr is left unshocked, not failing the
+            #       whole engine
+            if array_known.size == 0:
+                list_fprs_no_shocks.append(self.array_fprs[int_f])
+                continue
+            array_lo, array_hi, array_w = self.interp_weights(
+                self.array_vertices[array_known], self.array_vertices
+            )
+            self.array_cube[int_f] = (
+                1.0 - array_w[:, None]
+            ) * self.array_cube[int_f, array_known[array_lo]] + array_w[
+                :, None
+            ] * self.array_cube[
+                int_f, array_known[array_hi]
+            ]
+        #   scenarios absent for a fpr leave it unshocked
+        np.nan_to_num(self.array_cube, copy=False, nan=0.0)
+        self.array_fprs_no_shocks = np.array(
+            list_fprs_no_shocks, dtype=self.array_fprs.dtype
+        )
+        if len(list_fprs_no_shocks) > 0 and self.logger is not None:
+            CreateLog().warnings(
+                self.logger,
+                'FPRs {} without any shock within the risk scenarios, left unshocked'.format(
+                    self.array_fprs_no_shocks.tolist()
+                ),
+            )
+        # format of variation and capitalization criterion by fpr
+        df_fpr = df_.drop_duplicates(subset=['fpr'], keep='last').set_index(
+            'fpr'
+        )
+        self.array_bl_bps = (
+            df_fpr['format'].reindex(self.array_fprs).to_numpy()
+            == self.INT_FORMAT_BPS
+        )
+        self.array_bl_linear = (
+            df_fpr['capitalization'].reindex(self.array_fprs).to_numpy()
+            == self.INT_CAPITALIZATION_LINEAR
+        )
+
+    def interp_weights(
+        self, array_x_known: np.ndarray, array_x: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        DOCSTRING: LINEAR INTERPOLATION WEIGHTS OVER SORTED KNOWN POINTS, FLAT BEYOND THEM
+        INPUTS: SORTED KNOWN POINTS AND POINTS OF INTEREST
+        OUTPUTS: TUPLE OF ARRAYS (LOWER AND UPPER INDEXES WITHIN THE KNOWN POINTS AND WEIGHTS OF
+            THE UPPER ONES)
+        """
+        array_x = np.asarray(array_x, dtype=float)
+        # a single known point is constant
+        if len(array_x_known) < 2:
+            array_zeros = np.zeros(array_x.shape, dtype=int)
+            return array_zeros, array_zeros, np.zeros(array_x.shape)
+        array_lo = np.clip(
+            np.searchsorted(array_x_known, array_x, side='right') - 1,
+            0,
+            len(array_x_known) - 2,
+        )
+        array_w = np.clip(
+            (array_x - array_x_known[array_lo])
+            / (array_x_known[array_lo + 1] - array_x_known[array_lo]),
+            0.0,
+            1.0,
+        )
+        return array_lo, array_lo + 1, array_w
+
+    def exposures(
+        self,
+        df_positions: pd.DataFrame,
+        col_portfolio: str = 'ID_PORTFOLIO',
+        col_fpr_spot: str = 'ID_FPR_SPOT',
+        col_fpr_curve: str = 'ID_FPR_CURVA',
+        col_days: str = 'DIAS_CORRIDOS',
+        col_years: str = 'PRAZO_ANOS',
+        col_value: str = 'VALOR',
+        col_rate: str = 'TAXA',
+    ) -> Dict[str, np.ndarray]:
+        """
+        DOCSTRING: MAPPING OF POSITIONS TO FPR EXPOSURES - EACH POSITION (ONE ROW) IS A MARK-TO-
+            MARKET VALUE EXPOSED TO A SPOT FPR (PRICE, CURRENCY, INDEX), TO A CASH FLOW
+            DISCOUNTED BY A CURVE FPR AT ITS RATE AND TERM, OR TO BOTH (E.G. A DOLLAR-LINKED
+            FLOW DISCOUNTED BY THE COUPON CURVE); POSITIONS ARE SORTED BY PORTFOLIO
+        INPUTS: DATAFRAME OF POSITIONS - PORTFOLIO, SPOT AND CURVE FPRS (NAN FOR NONE), CALENDAR
+            DAYS TO THE CASH FLOW (CURVE VERTEX), TERM IN YEARS FOR THE CAPITALIZATION (CALENDAR
+            DAYS OVER 365 WHEN ABSENT), CURRENT VALUE AND CURVE RATE - AND COLUMNS NAMES
+        OUTPUTS: DICTIONARY OF ARRAYS
+        """
+        # sorting positions by portfolio
+        array_portfolios, array_idx_p = np.unique(
+            df_positions[col_portfolio].to_numpy(), return_inverse=True
+        )
+        array_order = np.argsort(array_idx_p, kind='stable')
+        dict_exp = {
+            'portfolios': array_portfolios,
+            'idx_portfolio': array_idx_p[array_order],
+            'value': df_positions[col_value].to_numpy(dtype=float)[
+                array_order
+            ],
+        }
+        # fprs' positions within the cube, flagging the missing ones
+        for key_, col_ in [('spot', col_fpr_spot), ('curve', col_fpr_curve)]:
+            array_fpr = (
+                pd.to_numeric(df_positions[col_]).to_numpy(dtype=float)[
+                    array_order
+                ]
+                if col_ in df_positions.columns
+                else np.full(len(array_order), np.nan)
+            )
+            array_bl = ~np.isnan(array_fpr)
+            array_idx = np.clip(
+                np.searchsorted(self.array_fprs, array_fpr), 0, None
+            )
+            array_idx = np.minimum(array_idx, len(self.array_fprs) - 1)
+            array_unknown = array_bl & (
+                self.array_fprs[array_idx] != array_fpr
+            )
+            if array_unknown.any() == True:
+                raise Exception(
+                    'FPRs {} not found within the risk scenarios, please revisit'.format(
+                        np.unique(array_fpr[array_unknown]).tolist()
+                    )
+                )
+            dict_exp['bl_' + key_] = array_bl
+            dict_exp['idx_' + key_] = array_idx
+        # curve vertices, rates and terms
+        if dict_exp['bl_curve'].any() == True:
+            array_days = df_positions[col_days].to_numpy(dtype=float)[
+                array_order
+            ]
+            dict_exp['rate'] = df_positions[col_rate].to_numpy(dtype=float)[
+                array_order
+            ]
+            dict_exp['years'] = (
+                df_positions[col_years].to_numpy(dtype=float)[array_order]
+                if col_years in df_positions.columns
+                else array_days / 365.0
+            )
+            (
+                dict_exp['vertex_lo'],
+                dict_exp['vertex_hi'],
+                dict_exp['vertex_w'],
+            ) = self.interp_weights(self.array_vertices, array_days)
+        return dict_exp
+
+    def revalue(
+        self, dict_exp: Dict[str, np.ndarray], int_lo: int, int_hi: int
+    ) -> np.ndarray:
+        """
+        DOCSTRING: FULL REVALUATION OF A SLICE OF POSITIONS UNDER ALL SCENARIOS - SPOT FACTORS
+            ARE SHOCKED BY (1 + PHI), CURVE RATES BY + PHI (BASIS POINTS) OR BY X (1 + PHI)
+            (PERCENTUAL), DISCOUNTED EXPONENTIALLY OR LINEARLY AS THEIR FPRS' CRITERIA
+        INPUTS: EXPOSURES, FIRST AND PAST-THE-END POSITIONS OF THE SLICE
+        OUTPUTS: NUMPY ARRAY OF P&L (POSITIONS X SCENARIOS)
+        """
+        array_value = dict_exp['value'][int_lo:int_hi]
+        array_factor = np.ones((int_hi - int_lo, len(self.array_scenarios)))
+        # spot factors - shocks are constant along the vertices of spot fprs
+        array_bl = dict_exp['bl_spot'][int_lo:int_hi]
+        if array_bl.any() == True:
+            array_f = dict_exp['idx_spot'][int_lo:int_hi][array_bl]
+            array_unit = np.where(
+                self.array_bl_bps[array_f],
+                self.float_bps_unit,
+                self.float_pct_unit,
+            )
+            array_factor[array_bl] *= (
+                1.0 + self.array_cube[array_f, 0] / array_unit[:, None]
+            )
+        # discount factors of the shocked rates over the current ones
+        array_bl = dict_exp['bl_curve'][int_lo:int_hi]
+        if array_bl.any() == True:
+            array_f = dict_exp['idx_curve'][int_lo:int_hi][array_bl]
+            array_w = dict_exp['vertex_w'][int_lo:int_hi][array_bl][:, None]
+            array_phi = (1.0 - array_w) * self.array_cube[
+                array_f, dict_exp['vertex_lo'][int_lo:int_hi][array_bl]
+            ] + array_w * self.array_cube[
+                array_f, dict_exp['vertex_hi'][int_lo:int_hi][array_bl]
+            ]
+            array_rate = dict_exp['rate'][int_lo:int_hi][array_bl][:, None]
+            array_years = dict_exp['years'][int_lo:int_hi][array_bl][:, None]
+            array_rate_shock = np.where(
+                self.array_bl_bps[array_f][:, None],
+                array_rate + array_phi / self.float_bps_unit,
+                array_rate * (1.0 + array_phi / self.float_pct_unit),
+            )
+            array_bl_linear = self.array_bl_linear[array_f]
+            array_disc = np.empty(array_phi.shape)
+            #   linear and exponential capitalization, each computed only where it applies
+            array_disc[array_bl_linear] = (
+                1.0
+                + array_rate[array_bl_linear] * array_years[array_bl_linear]
+            ) / (
+                1.0
+                + array_rate_shock[array_bl_linear]
+                * array_years[array_bl_linear]
+            )
+            array_disc[~array_bl_linear] = (
+                (1.0 + array_rate[~array_bl_linear])
+                / (1.0 + array_rate_shock[~array_bl_linear])
+            ) ** array_years[~array_bl_linear]
+            array_factor[array_bl] *= array_disc
+        return array_value[:, None] * (array_factor - 1.0)
+
+    def pnl_scenarios(
+        self,
+        df_positions: pd.DataFrame,
+        int_chunk_positions: int = 20000,
+        dict_exp: Optional[Dict[str, np.ndarray]] = None,
+        **kwargs: Any
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        DOCSTRING: P&L OF EACH PORTFOLIO UNDER ALL SCENARIOS - POSITIONS ARE REVALUED IN CHUNKS,
+            SO ONLY A CHUNK OF SCENARIOS X POSITIONS SITS IN MEMORY, AND SUMMED BY PORTFOLIO
+        INPUTS: DATAFRAME OF POSITIONS, CHUNK SIZE IN POSITIONS (20,000 AS DEFAULT), EXPOSURES
+            ALREADY MAPPED (NONE AS DEFAULT) AND COLUMNS NAMES, AS IN EXPOSURES
+        OUTPUTS: TUPLE OF ARRAYS (PORTFOLIOS AND P&L - PORTFOLIOS X SCENARIOS)
+        """
+        if dict_exp is None:
+            dict_exp = self.exposures(df_positions, **kwargs)
+        array_pnl = np.zeros(
+            (len(dict_exp['portfolios']), len(self.array_scenarios))
+        )
+        int_n = len(dict_exp['value'])
+        for int_lo in range(0, int_n, int_chunk_positions):
+            int_hi = min(int_lo + int_chunk_positions, int_n)
+            #   summing the positions of each portfolio within the chunk - sorted by portfolio
+            array_idx_p = dict_exp['idx_portfolio'][int_lo:int_hi]
+            array_starts = np.flatnonzero(
+                np.r_[True, array_idx_p[1:] != array_idx_p[:-1]]
+            )
+            array_pnl[array_idx_p[array_starts]] += np.add.reduceat(
+                self.revalue(dict_exp, int_lo, int_hi), array_starts, axis=0
+            )
+        return dict_exp['portfolios'], array_pnl
+
+    def worst_case_losses(
+        self,
+        df_positions: pd.DataFrame,
+        int_chunk_positions: int = 20000,
+        col_portfolio: str = 'ID_PORTFOLIO',
+        col_worst_loss: str = 'PIOR_PERDA',
+        col_worst_scenario: str = 'ID_CENARIO_PIOR',
+        col_margin: str = 'MARGEM',
+        **kwargs: Any
+    ) -> pd.DataFrame:
+        """
+        DOCSTRING: WORST-CASE LOSS OF EACH PORTFOLIO ACROSS THE SCENARIOS, ITS SCENARIO AND THE
+            MARGIN REQUIREMENT (THE LOSS, FLOORED AT ZERO)
+        INPUTS: DATAFRAME OF POSITIONS, CHUNK SIZE IN POSITIONS (20,000 AS DEFAULT) AND COLUMNS
+            NAMES, AS IN EXPOSURES
+        OUTPUTS: DATAFRAME
+        """
+        array_portfolios, array_pnl = self.pnl_scenarios(
+            df_positions,
+            int_chunk_positions=int_chunk_positions,
+            col_portfolio=col_portfolio,
+            **kwargs
+        )
+        array_worst = np.argmin(array_pnl, axis=1)
+        array_loss = -array_pnl[np.arange(len(array_portfolios)), array_worst]
+        return pd.DataFrame(
+            {
+                col_portfolio: array_portfolios,
+                col_worst_loss: array_loss,
+                col_worst_scenario: self.array_scenarios[array_worst],
+                col_margin: np.maximum(array_loss, 0.0),
+            }
+        )
+
+
+if __name__ == '__main__':
+    from time import time
+
+    # synthetic b3-like scenarios - 10 curve fprs x 30 vertices and 10 spot fprs, 1,056
+    #   scenarios
+    rng = np.random.default_rng(1)
+    list_ser = list()
+    array_vertices = np.unique(np.round(np.geomspace(1, 3650, 30)).astype(int))
+    for int_scenario in range(1, 1057):
+        for int_fpr in range(10):
+            for int_vertex in array_vertices:
+                list_ser.append(
+                    (2900 + int_fpr, int_scenario, int_vertex, 2, 0)
+                )
+        for int_fpr in range(10, 20):
+            list_ser.append((2900 + int_fpr, int_scenario, np.nan, 1, 2))
+    df_scenarios = pd.DataFrame(
+        list_ser,
+        columns=[
+            'ID_FPR',
+            'ID_CENARIO',
+            'DIAS_CORRIDOS_VERTICE',
+            'FORMATO_VARIACAO',
+            'CRITERIO_CAPITALIZACAO',
+        ],
+    )
+    df_scenarios['VALOR_PHI_1'] = np.where(
+        df_scenarios['FORMATO_VARIACAO'] == 2,
+        rng.normal(0.0, 80.0, len(df_scenarios)),
+        rng.normal(0.0, 0.06, len(df_scenarios)),
+    )
+    float_t0 = time()
+    cls_engine = MarginEngineB3(df_scenarios)
+    print(
+        'CUBE {}: {:.2f} s'.format(
+            cls_engine.array_cube.shape, time() - float_t0
+        )
+    )
+    # 5,000 portfolios of 20 positions each
+    int_portfolios, int_legs = 5000, 20
+    int_n = int_portfolios * int_legs
+    array_curve = rng.integers(0, 10, int_n)
+    df_positions = pd.DataFrame(
+        {
+            'ID_PORTFOLIO': np.repeat(np.arange(int_portfolios), int_legs),
+            'ID_FPR_SPOT': np.where(
+                rng.random(int_n) < 0.5,
+                2910 + rng.integers(0, 10, int_n),
+                np.nan,
+            ),
+            'ID_FPR_CURVA': np.where(
+                rng.random(int_n) < 0.7, 2900 + array_curve, np.nan
+            ),
+            'DIAS_CORRIDOS': rng.integers(1, 3650, int_n),
+            'VALOR': rng.normal(0.0, 1e6, int_n),
+            'TAXA': rng.uniform(0.05, 0.15, int_n),
+        }
+    )
+    float_t0 = time()
+    df_margins = cls_engine.worst_case_losses(df_positions)
+    print(
+        'WORST-CASE LOSSES OF {} PORTFOLIOS ({} POSITIONS) X {} SCENARIOS: {:.2f} s'.format(
+            int_portfolios,
+            int_n,
+            len(cls_engine.array_scenarios),
+            time() - float_t0,
+        )
+    )
+    print(df_margins.head())
@@ -0,0 +1,234 @@
+### MEMORY-MAPPED COLUMNAR CACHE OF B3 RISK SCENARIOS ###
+
+import json
+import os
+import shutil
+import tempfile
+from glob import escape, glob
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class ScenariosCacheB3:
+    """
+    DOCSTRING: B3'S RISK SCENARIOS FILES (TIPO CURVA AND TIPO SPOT) PARSED INTO TYPED COLUMNS
+        (INT32 IDS, FLOAT64 VALUES) AND CACHED AS ONE .NPY FILE PER COLUMN, IN A DIRECTORY PER
+        KIND OF SCENARIO AND TRADE DATE, MEMORY-MAPPED ON LOAD; ROWS ARE SORTED BY SCENARIO ID,
+        SO A RANGE OF SCENARIOS IS A BINARY SEARCH AND A SLICE RATHER THAN A FULL SCAN
+    INPUTS: DIRECTORY OF THE CACHE FILES (STPSTONE_CACHE_DIR ENVIRONMENT VARIABLE, OR
+        ~/.cache/stpstone, AS DEFAULT)
+    OUTPUTS: -
+    """
+
+    INT_CACHE_VERSION = 1
+    COL_FILE = 'ID_ARQUIVO'
+    STR_MANIFEST = 'manifest.json'
+
+    def __init__(self, path_dir: Optional[str] = None) -> None:
+        if path_dir == None:
+            path_dir = os.environ.get(
+                'STPSTONE_CACHE_DIR',
+                os.path.join(os.path.expanduser('~'), '.cache', 'stpstone'),
+            )
+        self.path_dir = path_dir
+
+    def path_cache(self, str_kind: str, str_date: str) -> str:
+        """
+        DOCSTRING: DIRECTORY OF THE CACHED COLUMNS OF A KIND OF SCENARIO AND TRADE DATE
+        INPUTS: KIND OF SCENARIO (E.G. 'TIPO_CURVA') AND TRADE DATE (E.G. '241220')
+        OUTPUTS: STRING
+        """
+        return os.path.join(
+            self.path_dir,
+            'b3_scenarios_v{}_{}_{}'.format(
+                self.INT_CACHE_VERSION, str_kind, str_date
+            ),
+        )
+
+    def parse(
+        self,
+        list_files: List[Any],
+        list_cols: List[str],
+        list_cols_float: List[str],
+        str_sep: str = ';',
+        int_fill_na: int = -1,
+        col_id_scenario: str = 'ID_CENARIO',
+    ) -> Dict[str, Any]:
+        """
+        DOCSTRING: SCENARIOS FILES PARSED STRAIGHT INTO TYPED COLUMNS - INT32 IDS, WITH MISSING
+            VALUES FILLED, AND FLOAT64 VALUES - CONCATENATED ACROSS FILES, WITH THE FILE OF EACH
+            ROW, AND SORTED BY SCENARIO ID
+        INPUTS: LIST OF OPENED FILES (HEADER IN THE FIRST LINE), COLUMNS NAMES, FLOAT COLUMNS,
+            SEPARATOR (';' AS DEFAULT), FILL OF MISSING IDS (-1 AS DEFAULT) AND SCENARIO ID
+            COLUMN NAME
+        OUTPUTS: DICTIONARY WITH COLUMNS (NUMPY ARRAYS) AND FILES NAMES
+        """
+        # setting variables
+        dict_chunks = {col_: list() for col_ in list_cols + [self.COL_FILE]}
+        list_names = list()
+        # typed columns of each file
+        for int_file, file_ in enumerate(list_files):
+            df_ = pd.read_csv(
+                file_,
+                sep=str_sep,
+                skiprows=1,
+                header=None,
+                names=list_cols,
+                decimal=',',
+                dtype={col_: np.float64 for col_ in list_cols_float},
+            )
+            for col_ in list_cols:
+                if col_ in list_cols_float:
+                    dict_chunks[col_].append(df_[col_].to_numpy(np.float64))
+                else:
+                    dict_chunks[col_].append(
+                        df_[col_]
+                        .fillna(int_fill_na)
+                        .to_numpy()
+                        .astype(np.int32)
+                    )
+            dict_chunks[self.COL_FILE].append(
+                np.full(len(df_), int_file, dtype=np.int32)
+            )
+            list_names.append(
+                os.path.basename(str(getattr(file_, 'name', int_file)))
+            )
+        # sorting rows by scenario id, keeping the files' order within each scenario
+        dict_cols = {
+            col_: np.concatenate(list_chunks)
+            if len(list_chunks) > 0
+            else np.empty(
+                0,
+                dtype=np.float64 if col_ in list_cols_float else np.int32,
+            )
+            for col_, list_chunks in dict_chunks.items()
+        }
+        array_order = np.argsort(dict_cols[col_id_scenario], kind='stable')
+        return {
+            'columns': {
+                col_: array_[array_order] for col_, array_ in dict_cols.items()
+            },
+            'files': list_names,
+        }
+
+    def dump(self, path_cache: str, dict_parsed: Dict[str, Any]) -> bool:
+        """
+        DOCSTRING: ATOMIC WRITE OF THE CACHED COLUMNS AND MANIFEST (FILES NAMES AND COLUMNS
+            ORDER); AN UNWRITABLE DIRECTORY LEAVES THE SCENARIOS IN MEMORY ONLY
+        INPUTS: DIRECTORY OF THE CACHE AND PARSED SCENARIOS
+        OUTPUTS: BOOLEAN
+        """
+        path_tmp = None
+        try:
+            os.makedirs(self.path_dir, exist_ok=True)
+            path_tmp = tempfile.mkdtemp(dir=self.path_dir)
+            for col_, array_ in dict_parsed['columns'].items():
+                np.save(os.path.join(path_tmp, col_ + '.npy'), array_)
+            with open(os.path.join(path_tmp, self.STR_MANIFEST), 'w') as f:
+                json.dump(
+                    {
+                        'columns': list(dict_parsed['columns'].keys()),
+                        'files': dict_parsed['files'],
+                    },
+                    f,
+                )
+            # replacing a former cache of the same date
+            if os.path.isdir(path_cache) == True:
+                shutil.rmtree(path_cache, ignore_errors=True)
+            os.replace(path_tmp, path_cache)
+            return True
+        except OSError:
+            if path_tmp is not None:
+                shutil.rmtree(path_tmp, ignore_errors=True)
+            return False
+
+    def load(self, path_cache: str) -> Optional[Dict[str, Any]]:
+        """
+        DOCSTRING: CACHED COLUMNS MEMORY-MAPPED, WITH THE FILES NAMES
+        INPUTS: DIRECTORY OF THE CACHE
+        OUTPUTS: DICTIONARY WITH COLUMNS (MEMORY-MAPPED NUMPY ARRAYS) AND FILES NAMES, OR NONE
+            WHEN THERE IS NO VALID CACHE
+        """
+        try:
+            with open(os.path.join(path_cache, self.STR_MANIFEST), 'r') as f:
+                dict_manifest = json.load(f)
+            return {
+                'columns': {
+                    col_: np.load(
+                        os.path.join(path_cache, col_ + '.npy'), mmap_mode='r'
+                    )
+                    for col_ in dict_manifest['columns']
+                },
+                'files': dict_manifest['files'],
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def frame(
+        self,
+        dict_parsed: Dict[str, Any],
+        list_files_substr: Optional[List[str]] = None,
+        int_scenario_inf: Optional[int] = None,
+        int_scenario_sup: Optional[int] = None,
+        col_id_scenario: str = 'ID_CENARIO',
+    ) -> pd.DataFrame:
+        """
+        DOCSTRING: DATAFRAME OF THE SCENARIOS WITHIN [INFERIOR, SUPERIOR) IDS, SLICED BY BINARY
+            SEARCH OVER THE SORTED SCENARIO IDS, AND OF THE FILES WHOSE NAMES HOLD ANY OF THE
+            SUBSTRINGS
+        INPUTS: PARSED (OR LOADED) SCENARIOS, FILES NAMES' SUBSTRINGS (NONE AS DEFAULT, ALL
+            FILES), INFERIOR AND SUPERIOR SCENARIO IDS (NONE AS DEFAULT, UNBOUNDED) AND SCENARIO
+            ID COLUMN NAME
+        OUTPUTS: DATAFRAME
+        """
+        dict_cols = dict_parsed['columns']
+        array_ids = dict_cols[col_id_scenario]
+        int_lo = (
+            0
+            if int_scenario_inf is None
+            else int(np.searchsorted(array_ids, int_scenario_inf, side='left'))
+        )
+        int_hi = (
+            len(array_ids)
+            if int_scenario_sup is None
+            else int(np.searchsorted(array_ids, int_scenario_sup, side='left'))
+        )
+        int_hi = max(int_hi, int_lo)
+        dict_slices = {
+            col_: array_[int_lo:int_hi]
+            for col_, array_ in dict_cols.items()
+            if col_ != self.COL_FILE
+        }
+        # files of interest
+        if list_files_substr is not None:
+            array_files = np.flatnonzero(
+                [
+                    any(
+                        str(substr) in str_name for substr in list_files_substr
+                    )
+                    for str_name in dict_parsed['files']
+                ]
+            )
+            array_mask = np.isin(
+                dict_cols[self.COL_FILE][int_lo:int_hi], array_files
+            )
+            dict_slices = {
+                col_: array_[array_mask]
+                for col_, array_ in dict_slices.items()
+            }
+        return pd.DataFrame(dict_slices)
+
+    def clear(self) -> int:
+        """
+        DOCSTRING: REMOVE ALL THE SCENARIOS CACHE DIRECTORIES
+        INPUTS: -
+        OUTPUTS: INTEGER - NUMBER OF DIRECTORIES REMOVED
+        """
+        list_dirs = glob(
+            os.path.join(escape(self.path_dir), 'b3_scenarios_v*')
+        )
+        for path_cache in list_dirs:
+            shutil.rmtree(path_cache, ignore_errors=True)
+        return len(list_dirs)
@@ -1,16 +1,28 @@
 #### SEARCH BY TRADING - B3
 
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Optional
 from zipfile import ZipFile
 
 import numpy as np
 import pandas as pd
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from stpstone.cals.handling_dates import DatesBR
 from stpstone.finance.b3.market_data import MDB3
+from stpstone.finance.b3.scenarios_cache import ScenariosCacheB3
 from stpstone.finance.b3.up2data_web import UP2DATAB3
 from stpstone.finance.derivatives.options.european import EuropeanOptions
 from stpstone.handling_data.folders import DirFilesManagement
 from stpstone.handling_data.html import HtmlHndler
+from stpstone.handling_data.http_cache import HttpCache
 from stpstone.handling_data.json import JsonFiles
 from stpstone.handling_data.lists import HandlingLists
 from stpstone.handling_data.str import StrHandler
@@ -22,6 +34,24 @@ from stpstone.settings._global_slots import YAML_B3
 
 
 class TradingFilesB3:
+    # yaml keys of the dated zips downloaded by each method - the url lies within the last key
+    DICT_BACKFILL_KEYS = {
+        'price_report': [['price_report']],
+        'tradable_securities': [['securities_tradable']],
+        'daily_liquidity_limits': [['daily_liquidity_limits']],
+        'options_b3': [['margens_teoricas_maximas_b3'], ['options_traded_b3']],
+        'carga_mtm_b3': [['margens_teoricas_maximas_b3']],
+        'mtm_compra_venda': [['margens_teoricas_maximas_b3']],
+        'fatores_primitivos_risco_b3': [['fatores_primitivos_risco_b3']],
+        'cenarios_tipo_curva': [['cenarios_risco_tipo_curva', 'tipo_curva']],
+        'cenarios_risco_tipo_spot': [
+            ['cenarios_risco_tipo_spot', 'tipo_curva']
+        ],
+    }
+
+    # former trade dates each method falls back to, in order, when a dated zip is missing
+    DICT_BACKFILL_WD_FALLBACK = {'cenarios_risco_tipo_spot': 1}
+
     def __init__(
         self,
         int_wd_bef: int = 1,
@@ -29,12 +59,230 @@ class TradingFilesB3:
         str_fillna_dt: str = '2100-12-31',
         str_fillna_ts: str = '2100-12-31 00:00:00',
         str_fmt_dt: str = 'YYYY-MM-DD',
+        http_cache: Optional[HttpCache] = None,
     ) -> None:
         self.int_wd_bef = int_wd_bef
         self.str_fillna = str_fillna
         self.str_fillna_dt = str_fillna_dt
         self.str_fillna_ts = str_fillna_ts
         self.str_fmt_dt = str_fmt_dt
+        # dated zips downloaded through this disk cache, when provided
+        self.http_cache = http_cache
+
+    def backfill_wd_bef(self, date_inf, date_sup):
+        """
+        DOCSTRING: TRADE DATES WITHIN A RANGE, UP TO THE FORMER WORKING DAY, AND THEIR WORKING
+            DAYS BEFORE THE CURRENT DATE - AS IN SUB_WORKING_DAYS(CURR_DATE, INT_WD_BEF)
+        INPUTS: INFERIOR AND SUPERIOR DATES (DATETIME.DATE)
+        OUTPUTS: LIST OF TUPLES (DATE, INTEGER)
+        """
+        date_curr = DatesBR().curr_date
+        list_dates = [
+            date_
+            for date_ in DatesBR().list_working_days(date_inf, date_sup)
+            if date_ < date_curr
+        ]
+        if len(list_dates) == 0:
+            return list()
+        # a non-working current date is itself subtracted as a working day
+        array_wd_bef = DatesBR().working_days_delta(list_dates, date_curr) + (
+            0 if DatesBR().is_working_day(date_curr) == True else 1
+        )
+        return [
+            (date_, int(int_wd_bef))
+            for date_, int_wd_bef in zip(list_dates, array_wd_bef)
+        ]
+
+    def backfill_urls(self, str_method, int_wd_bef):
+        """
+        DOCSTRING: DATED ZIPS DOWNLOADED BY A METHOD FOR A TRADE DATE, FOLLOWED BY THE ONES OF
+            THE FORMER TRADE DATES IT FALLS BACK TO (DICT_BACKFILL_WD_FALLBACK)
+        INPUTS: METHOD NAME (KEY OF DICT_BACKFILL_KEYS) AND WORKING DAYS BEFORE
+        OUTPUTS: LIST OF TUPLES (URL, VERIFY SSL CERTIFICATE)
+        """
+        if str_method not in self.DICT_BACKFILL_KEYS:
+            raise Exception(
+                'Method {} not available for backfill, please choose among: {}'.format(
+                    str_method, list(self.DICT_BACKFILL_KEYS.keys())
+                )
+            )
+        list_urls = list()
+        for int_wd_bef_try in range(
+            int_wd_bef,
+            int_wd_bef + 1 + self.DICT_BACKFILL_WD_FALLBACK.get(str_method, 0),
+        ):
+            str_date = (
+                DatesBR()
+                .sub_working_days(DatesBR().curr_date, int_wd_bef_try)
+                .strftime('%y%m%d')
+            )
+            for list_keys in self.DICT_BACKFILL_KEYS[str_method]:
+                dict_url = YAML_B3
+                for key_ in list_keys:
+                    dict_url = dict_url[key_]
+                list_urls.append(
+                    (
+                        dict_url['url'].format(str_date),
+                        YAML_B3[list_keys[0]]['bl_verify'],
+                    )
+                )
+        return list_urls
+
+    @classmethod
+    def backfill_parse(cls, str_method, int_wd_bef, dict_init, dict_kwargs):
+        """
+        DOCSTRING: OUTPUT OF A METHOD FOR A TRADE DATE, RAN WITHIN A WORKER PROCESS - THE
+            PREFETCHED ZIPS ARE SERVED BY THE DISK CACHE
+        INPUTS: METHOD NAME, WORKING DAYS BEFORE, INSTANCE'S KEYWORD ARGUMENTS (WITH THE HTTP
+            CACHE) AND METHOD'S KEYWORD ARGUMENTS (IGNORED BY PROPERTIES)
+        OUTPUTS: METHOD'S OUTPUT
+        """
+        obj_ = getattr(cls(int_wd_bef=int_wd_bef, **dict_init), str_method)
+        if callable(obj_) == True:
+            return obj_(**dict_kwargs)
+        return obj_
+
+    def backfill(
+        self,
+        str_method,
+        date_inf,
+        date_sup,
+        dict_kwargs=None,
+        int_workers_fetch=8,
+        int_workers_parse=None,
+        int_dates_ahead=16,
+        int_retries=3,
+        float_backoff_factor=0.5,
+        timeout=(5, 60),
+        bl_debug=False,
+    ):
+        """
+        DOCSTRING: OUTPUTS OF A METHOD OVER A RANGE OF TRADE DATES - ZIPS FETCHED CONCURRENTLY
+            (THREAD POOL SHARING A SESSION WITH A BOUNDED CONNECTION POOL AND RETRIES WITH
+            EXPONENTIAL BACKOFF) INTO THE DISK CACHE, EACH DATE PARSED IN A PROCESS POOL AS
+            SOON AS ITS ZIPS ARE AVAILABLE (INCLUDING THE FALLBACK DATES' ONES, SO A MISSING
+            FILE IS NOT DOWNLOADED SERIALLY BY THE PARSING), AND YIELDED AS IT FINISHES;
+            DOWNLOADS RUN AT MOST INT_DATES_AHEAD DATES AHEAD OF THE YIELDED ONES, SO PREFETCHED
+            ZIPS ARE NOT EVICTED BY THE CACHE BEFORE BEING PARSED, AND CLOSING THE GENERATOR
+            CANCELS PENDING WORK
+        INPUTS: METHOD NAME (KEY OF DICT_BACKFILL_KEYS), INFERIOR AND SUPERIOR DATES
+            (DATETIME.DATE), METHOD'S KEYWORD ARGUMENTS (NONE AS DEFAULT), CONCURRENT DOWNLOADS
+            (8 AS DEFAULT), PARSING PROCESSES (NONE AS DEFAULT, NUMBER OF CPUS), DATES IN
+            FLIGHT (16 AS DEFAULT), RETRIES (3 AS DEFAULT), BACKOFF FACTOR (0.5 AS DEFAULT),
+            TIMEOUT AND DEBUG FLAG
+        OUTPUTS: GENERATOR OF TUPLES (DATE, METHOD'S OUTPUT, EXCEPTION) - OUTPUT NONE AND THE
+            EXCEPTION RAISED FOR A FAILED DATE, EXCEPTION NONE OTHERWISE
+        """
+        # setting variables
+        if dict_kwargs == None:
+            dict_kwargs = dict()
+        if int_dates_ahead < 1:
+            raise Exception(
+                'int_dates_ahead must be a positive integer, please revisit'
+            )
+        http_cache = (
+            self.http_cache if self.http_cache is not None else HttpCache()
+        )
+        dict_init = {
+            'str_fillna': self.str_fillna,
+            'str_fillna_dt': self.str_fillna_dt,
+            'str_fillna_ts': self.str_fillna_ts,
+            'str_fmt_dt': self.str_fmt_dt,
+            'http_cache': http_cache,
+        }
+        iter_dates_wd_bef = iter(self.backfill_wd_bef(date_inf, date_sup))
+        # shared session - connections capped by the number of concurrent downloads, transient
+        #   statuses retried with exponential backoff
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=int_workers_fetch,
+            pool_block=True,
+            max_retries=Retry(
+                total=int_retries,
+                backoff_factor=float_backoff_factor,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        executor_fetch = ThreadPoolExecutor(max_workers=int_workers_fetch)
+        executor_parse = ProcessPoolExecutor(max_workers=int_workers_parse)
+        # dates downloading (pending zips by date) and parsing, both in flight
+        dict_fetch = dict()
+        dict_pending = dict()
+        dict_parse = dict()
+        set_futures = set()
+        try:
+            while True:
+                # downloads of the next dates, within the window ahead of the yielded ones
+                while len(dict_pending) + len(dict_parse) < int_dates_ahead:
+                    tup_date_wd_bef = next(iter_dates_wd_bef, None)
+                    if tup_date_wd_bef == None:
+                        break
+                    date_, int_wd_bef = tup_date_wd_bef
+                    list_urls = self.backfill_urls(str_method, int_wd_bef)
+                    dict_pending[date_] = len(list_urls)
+                    for url, bl_verify in list_urls:
+                        future_fetch = executor_fetch.submit(
+                            http_cache.get,
+                            url,
+                            bl_verify=bl_verify,
+                            timeout=timeout,
+                            session=session,
+                        )
+                        dict_fetch[future_fetch] = (date_, int_wd_bef)
+                        set_futures.add(future_fetch)
+                if len(set_futures) == 0:
+                    break
+                # parsing each date once its downloads are done, yielding each parsed date
+                set_done, set_futures = wait(
+                    set_futures, return_when=FIRST_COMPLETED
+                )
+                for future_ in set_done:
+                    if future_ in dict_fetch:
+                        date_, int_wd_bef = dict_fetch.pop(future_)
+                        #   failed downloads are retried, or reported, by the method itself
+                        if (
+                            future_.exception() is not None
+                            and bl_debug == True
+                        ):
+                            print(
+                                'FETCH FAILED {}: {}'.format(
+                                    date_, future_.exception()
+                                )
+                            )
+                        dict_pending[date_] -= 1
+                        if dict_pending[date_] == 0:
+                            del dict_pending[date_]
+                            future_parse = executor_parse.submit(
+                                type(self).backfill_parse,
+                                str_method,
+                                int_wd_bef,
+                                dict_init,
+                                dict_kwargs,
+                            )
+                            dict_parse[future_parse] = date_
+                            set_futures.add(future_parse)
+                    else:
+                        date_ = dict_parse.pop(future_)
+                        if future_.exception() is not None:
+                            if bl_debug == True:
+                                print(
+                                    'PARSING FAILED {}: {}'.format(
+                                        date_, future_.exception()
+                                    )
+                                )
+                            yield date_, None, future_.exception()
+                        else:
+                            if bl_debug == True:
+                                print('DATE {} DONE'.format(date_))
+                            yield date_, future_.result(), None
+        # early close, or an exception, cancels queued work without waiting on running tasks
+        finally:
+            executor_fetch.shutdown(wait=False, cancel_futures=True)
+            executor_parse.shutdown(wait=False, cancel_futures=True)
+            session.close()
 
     def price_report(self, bl_debug=False):
         """
@@ -42,8 +290,6 @@ class TradingFilesB3:
         INPUTS:
         OUTPUTS:
         """
-        # setting variables
-        list_ser = list()
         # price report file .zip
         url = YAML_B3['price_report']['url'].format(
             DatesBR()
@@ -55,49 +301,17 @@ class TradingFilesB3:
             url,
             bl_io_interpreting=YAML_B3['price_report']['bl_io_interpreting'],
             bl_verify=YAML_B3['price_report']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # dealing with nested zip file
         zipfile = ZipFile(zipfile)
-        # iterate through the files in the zip
-        for file_info in zipfile.infolist():
-            #   opennig just xml files
-            if file_info.filename.endswith('.xml'):
-                xml_file = zipfile.open(file_info)
-                xml_file = xml_file.read()
-            else:
-                continue
-            #   soup parser to xml trading options
-            soup_xml = XMLFiles().xml_memory_parser(xml_file)
-            #   looping through tags of BOV & BMF markets
-            for key, value in YAML_B3['price_report']['tags'].items():
-                #   finding key of interest within soup
-                for soup_content in soup_xml.find_all(key):
-                    #   reseting variables
-                    dict_ = dict()
-                    #   adding all tags availabe to the dictionary
-                    for tag in value:
-                        try:
-                            #   get tag in order to find attributes of interest
-                            tag_ = soup_content.find(tag)
-                            if bl_debug == True:
-                                print(tag_)
-                            dict_[tag] = tag_.get_text()
-                            #   getting currency of notionals
-                            if (
-                                YAML_B3['price_report']['attrb_currency']
-                                in tag_.attrs
-                            ):
-                                dict_[
-                                    YAML_B3['price_report']['col_currency']
-                                ] = tag_.attrs[
-                                    YAML_B3['price_report']['attrb_currency']
-                                ]
-                        except AttributeError:
-                            continue
-                    #   appendig dictionary to list
-                    list_ser.append(dict_)
-        # uploading list of dictionaries to pandas
-        df_pr = pd.DataFrame(list_ser)
+        # records streamed from the xmls, gathered as columns
+        df_pr = pd.DataFrame(
+            XMLFiles().records_to_columns(
+                self.price_report_records(zipfile, bl_debug=bl_debug)
+            )
+        )
         # removing duplicates
         df_pr.drop_duplicates(inplace=True)
         # adding logging
@@ -135,6 +349,8 @@ class TradingFilesB3:
                 'bl_io_interpreting'
             ],
             bl_verify=YAML_B3['securities_tradable']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # extracting content
         zipfile = ZipFile(zipfile)
@@ -261,6 +477,8 @@ class TradingFilesB3:
                 'bl_io_interpreting'
             ],
             bl_verify=YAML_B3['daily_liquidity_limits']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # extracting content
         zipfile = ZipFile(zipfile)
@@ -317,10 +535,9 @@ class TradingFilesB3:
         INPUTS:
         OUTPUTS:
         """
-        # setting variables
-        list_ser = list()
-        # raw maximum theoretical margins
-        list_rows_mtm = self.carga_mtm_b3
+        # instruments' closing prices by ticker, from the raw maximum theoretical margins
+        self.dict_mtm_close = self.index_mtm_b3(self.carga_mtm_b3)
+        dict_mtm_close = self.dict_mtm_close
         # b3 financial indicators
         df_fin_ind = MDB3().financial_indicators_b3
         # risk-free rate
@@ -343,377 +560,256 @@ class TradingFilesB3:
                 'bl_io_interpreting'
             ],
             bl_verify=YAML_B3['options_traded_b3']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # retorno é um novo zip com dois xmls
         zipfile = ZipFile(zipfile)
+        # options streamed from the xmls, gathered as columns
+        df_opt_in = pd.DataFrame(
+            XMLFiles().records_to_columns(
+                self.options_b3_records(
+                    zipfile,
+                    dict_mtm_close,
+                    r,
+                    float_days_year=float_days_year,
+                    bl_debug=bl_debug,
+                )
+            )
+        )
+        # removing duplicates
+        df_opt_in.drop_duplicates(inplace=True)
+        # implied volatility and delta for the whole chain at once - contracts whose prices
+        #   violate no-arbitrage bounds or do not converge are flagged with the error value
+        array_s, array_k, array_t, array_cp0 = [
+            pd.to_numeric(
+                df_opt_in[YAML_B3['options_traded_b3']['keys'][key_]],
+                errors='coerce',
+            ).to_numpy(dtype=float)
+            for key_ in ['close_spot', 'k', 'days_maturity_ratio', 'close_opt']
+        ]
+        array_opt_type = (
+            df_opt_in[YAML_B3['options_traded_b3']['keys']['opt_type']]
+            .str.lower()
+            .str.replace('putt', 'put')
+            .to_numpy()
+        )
+        (
+            array_imp_vol,
+            array_status,
+        ) = EuropeanOptions().implied_volatility_batch(
+            array_s,
+            array_k,
+            float(r),
+            array_t,
+            0.0,
+            float(r),
+            array_cp0,
+            array_opt_type,
+        )
+        mask_conv = array_status == EuropeanOptions().INT_IV_CONVERGED
+        df_opt_in[YAML_B3['options_traded_b3']['keys']['imp_vol']] = np.where(
+            mask_conv, array_imp_vol, float_value_error
+        )
+        df_opt_in[YAML_B3['options_traded_b3']['keys']['delta']] = np.where(
+            mask_conv,
+            EuropeanOptions()
+            .greeks_table(
+                {
+                    's': array_s,
+                    'k': array_k,
+                    'r': float(r),
+                    't': array_t,
+                    'sigma': np.where(mask_conv, array_imp_vol, 1.0),
+                    'q': 0.0,
+                    'b': float(r),
+                    'opt_type': array_opt_type,
+                },
+                which=['delta'],
+            )['delta']
+            .to_numpy(),
+            float_value_error,
+        )
+        if bl_debug == True:
+            print(
+                'IV STATUS COUNTS: {}'.format(
+                    pd.Series(array_status).value_counts().to_dict()
+                )
+            )
+        # adding logging
+        df_opt_in = DBLogs().audit_log(
+            df_opt_in,
+            url,
+            DatesBR().utc_from_dt(
+                DatesBR().sub_working_days(
+                    DatesBR().curr_date, self.int_wd_bef
+                )
+            ),
+        )
+        # returning dataframe
+        return df_opt_in
+
+    def xml_records_zip(self, zipfile, dict_record_tags):
+        """
+        DOCSTRING: RECORDS OF INTEREST STREAMED FROM THE XML FILES WITHIN A ZIP, ONE AT A TIME
+        INPUTS: ZIP FILE AND DICTIONARY OF RECORD TAGS TO LISTS OF FIELD TAGS
+        OUTPUTS: GENERATOR OF TUPLES (RECORD TAG, DICTIONARY OF TEXTS, DICTIONARY OF ATTRIBUTES)
+        """
         # iterate through the files in the zip
         for file_info in zipfile.infolist():
             #   opennig just xml files
-            if file_info.filename.endswith('.xml'):
-                xml_file = zipfile.open(file_info)
-                xml_file = xml_file.read()
-            else:
+            if file_info.filename.endswith('.xml') == False:
                 continue
-            #   soup parser to xml trading options
-            soup_xml = XMLFiles().xml_memory_parser(xml_file)
-            #   looping through tags of BOV & BMF markets
-            for key, value in YAML_B3['options_traded_b3']['tags'].items():
-                #   finding key of interest within soup
-                for soup_content in soup_xml.find_all(key):
-                    #   reseting variables
-                    dict_ = dict()
-                    bl_break_opt_price = False
-                    bl_break_spt_price = False
-                    #   adding all tags availabe to the dictionary
-                    for tag in value:
-                        dict_[tag] = soup_content.find(tag).get_text()
-                        if bl_debug == True:
-                            print(soup_content.find(tag).get_text())
-                    if bl_debug == True:
-                        print(
-                            'ISIN: {}'.format(
-                                soup_content.find(
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'isin'
-                                    ]
-                                ).get_text()
-                            )
-                        )
-                        print(
-                            'TICKER: {}'.format(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'ticker'
-                                    ]
-                                ]
-                            )
-                        )
-                    #   spot ticker
-                    str_isin = soup_content.find(
-                        YAML_B3['options_traded_b3']['keys']['isin']
-                    ).get_text()
-                    dict_[
-                        YAML_B3['options_traded_b3']['keys']['spot']
-                    ] = str_isin[2:6] + str_isin[6].replace('9', '11')
-                    if bl_debug == True:
-                        print(
-                            'SPOT TICKER: {}'.format(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'spot'
-                                    ]
-                                ]
-                            )
-                        )
-                    #   calendar days to expiration
-                    dict_[
-                        YAML_B3['options_traded_b3']['keys']['cd_exp']
-                    ] = DatesBR().delta_calendar_days(
-                        DatesBR().sub_working_days(
-                            DatesBR().curr_date, abs(-self.int_wd_bef - 1)
-                        ),
-                        DatesBR().str_date_to_datetime(
-                            str(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'xpr_dt'
-                                    ]
-                                ]
-                            ),
-                            YAML_B3['options_traded_b3']['dt_input_format'],
-                        ),
-                    )
-                    if bl_debug == True:
-                        print(
-                            'CALENDAR DAYS TO EXPIRATION: {}'.format(
-                                DatesBR().delta_calendar_days(
-                                    DatesBR().sub_working_days(
-                                        DatesBR().curr_date,
-                                        abs(-self.int_wd_bef - 1),
-                                    ),
-                                    DatesBR().str_date_to_datetime(
-                                        str(
-                                            dict_[
-                                                YAML_B3['options_traded_b3'][
-                                                    'keys'
-                                                ]['xpr_dt']
-                                            ]
-                                        ),
-                                        YAML_B3['options_traded_b3'][
-                                            'dt_input_format'
-                                        ],
-                                    ),
-                                )
-                            )
-                        )
-                    #   closing price of spot and option
-                    while (bl_break_spt_price == False) and (
-                        bl_break_opt_price == False
-                    ):
-                        for i, _ in enumerate(list_rows_mtm):
-                            if i < len(list_rows_mtm) - 3:
-                                #   option close
-                                if (
-                                    list_rows_mtm[i][0]
-                                    == YAML_B3['margens_teoricas_maximas_b3'][
-                                        'key_instrumentos'
-                                    ]
-                                    and list_rows_mtm[i][4] != '0'
-                                    and list_rows_mtm[i][5]
-                                    == dict_[
-                                        YAML_B3['options_traded_b3']['keys'][
-                                            'ticker'
-                                        ]
-                                    ]
-                                ):
-                                    dict_[
-                                        YAML_B3['options_traded_b3']['keys'][
-                                            'close_opt'
-                                        ]
-                                    ] = float(
-                                        list_rows_mtm[i][4].replace(',', '.')
-                                    )
-                                    bl_break_opt_price = True
-                                    if bl_debug == True:
-                                        print(
-                                            'OPT CLOSE: {}'.format(
-                                                float(
-                                                    list_rows_mtm[i][
-                                                        4
-                                                    ].replace(',', '.')
-                                                )
-                                            )
-                                        )
-                                #   spot close
-                                if (
-                                    list_rows_mtm[i][0]
-                                    == YAML_B3['margens_teoricas_maximas_b3'][
-                                        'key_instrumentos'
-                                    ]
-                                    and list_rows_mtm[i][4] != '0'
-                                    and list_rows_mtm[i][5]
-                                    == dict_[
-                                        YAML_B3['options_traded_b3']['keys'][
-                                            'spot'
-                                        ]
-                                    ]
-                                ):
-                                    dict_[
-                                        YAML_B3['options_traded_b3']['keys'][
-                                            'close_spot'
-                                        ]
-                                    ] = float(
-                                        list_rows_mtm[i][4].replace(',', '.')
-                                    )
-                                    bl_break_spt_price = True
-                                    if bl_debug == True:
-                                        print(
-                                            'SPOT CLOSE: {}'.format(
-                                                float(
-                                                    list_rows_mtm[i][
-                                                        4
-                                                    ].replace(',', '.')
-                                                )
-                                            )
-                                        )
-                    #   risk-free rate
-                    dict_[
-                        YAML_B3['options_traded_b3']['keys']['risk_free']
-                    ] = r
-                    #   days to maturity ratio
+            #   streaming parser over the records of interest
+            with zipfile.open(file_info) as xml_file:
+                yield from XMLFiles().xml_iterparse_records(
+                    xml_file, dict_record_tags
+                )
+
+    def price_report_records(self, zipfile, bl_debug=False):
+        """
+        DOCSTRING: PRICE REPORT RECORDS STREAMED FROM THE XMLS WITHIN THE ZIP FILE, WITH THE
+            CURRENCY OF NOTIONALS
+        INPUTS: ZIP FILE AND DEBUG FLAG (FALSE AS DEFAULT)
+        OUTPUTS: GENERATOR OF DICTIONARIES
+        """
+        for _, dict_texts, dict_attrs in self.xml_records_zip(
+            zipfile, YAML_B3['price_report']['tags']
+        ):
+            #   reseting variables
+            dict_ = dict()
+            #   adding all tags availabe to the dictionary
+            for tag, str_text in dict_texts.items():
+                if bl_debug == True:
+                    print(tag, str_text, dict_attrs[tag])
+                dict_[tag] = str_text
+                #   getting currency of notionals
+                if (
+                    YAML_B3['price_report']['attrb_currency']
+                    in dict_attrs[tag]
+                ):
                     dict_[
-                        YAML_B3['options_traded_b3']['keys'][
-                            'days_maturity_ratio'
+                        YAML_B3['price_report']['col_currency']
+                    ] = dict_attrs[tag][
+                        YAML_B3['price_report']['attrb_currency']
+                    ]
+            yield dict_
+
+    def options_b3_records(
+        self, zipfile, dict_mtm_close, r, float_days_year=365.0, bl_debug=False
+    ):
+        """
+        DOCSTRING: OPTIONS TRADED IN B3 STREAMED FROM THE XMLS WITHIN THE ZIP FILE, WITH THEIR SPOT
+            TICKERS, CALENDAR DAYS TO EXPIRATION AND CLOSING PRICES
+        INPUTS: ZIP FILE, CLOSING PRICES INDEXED BY TICKER, RISK-FREE RATE, DAYS PER YEAR (365 AS
+            DEFAULT) AND DEBUG FLAG (FALSE AS DEFAULT)
+        OUTPUTS: GENERATOR OF DICTIONARIES
+        """
+        # looping through records of BOV & BMF markets
+        for str_record, dict_texts, _ in self.xml_records_zip(
+            zipfile, YAML_B3['options_traded_b3']['tags']
+        ):
+            #   reseting variables
+            dict_ = dict()
+            #   adding all tags availabe to the dictionary
+            for tag in YAML_B3['options_traded_b3']['tags'][str_record]:
+                dict_[tag] = dict_texts[tag]
+                if bl_debug == True:
+                    print(dict_texts[tag])
+            if bl_debug == True:
+                print(
+                    'ISIN: {}'.format(
+                        dict_texts[
+                            YAML_B3['options_traded_b3']['keys']['isin']
                         ]
-                    ] = (
-                        float(
-                            dict_[
-                                YAML_B3['options_traded_b3']['keys']['cd_exp']
-                            ]
-                        )
-                        / float_days_year
                     )
-                    #   implied volatility
-                    if bl_debug == True:
-                        print('*** INPUTS VOL IMP ***')
-                        print(
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'close_spot'
-                                    ]
-                                ]
-                            ),
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys']['k']
-                                ]
-                            ),
-                            float(r),
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'days_maturity_ratio'
-                                    ]
-                                ]
-                            ),
-                            float(0.5),
-                            float(0),
-                            float(r),
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'close_opt'
-                                    ]
-                                ]
-                            ),
-                            str(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'opt_type'
-                                    ]
-                                ]
-                                .lower()
-                                .replace('putt', 'put')
-                            ),
-                        )
-                    try:
-                        dict_[
-                            YAML_B3['options_traded_b3']['keys']['imp_vol']
-                        ] = EuropeanOptions().implied_volatility(
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'close_spot'
-                                    ]
-                                ]
-                            ),
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys']['k']
-                                ]
+                )
+                print(
+                    'TICKER: {}'.format(
+                        dict_[YAML_B3['options_traded_b3']['keys']['ticker']]
+                    )
+                )
+            #   spot ticker
+            str_isin = dict_texts[YAML_B3['options_traded_b3']['keys']['isin']]
+            dict_[YAML_B3['options_traded_b3']['keys']['spot']] = str_isin[
+                2:6
+            ] + str_isin[6].replace('9', '11')
+            if bl_debug == True:
+                print(
+                    'SPOT TICKER: {}'.format(
+                        dict_[YAML_B3['options_traded_b3']['keys']['spot']]
+                    )
+                )
+            #   calendar days to expiration
+            dict_[
+                YAML_B3['options_traded_b3']['keys']['cd_exp']
+            ] = DatesBR().delta_calendar_days(
+                DatesBR().sub_working_days(
+                    DatesBR().curr_date, abs(-self.int_wd_bef - 1)
+                ),
+                DatesBR().str_date_to_datetime(
+                    str(dict_[YAML_B3['options_traded_b3']['keys']['xpr_dt']]),
+                    YAML_B3['options_traded_b3']['dt_input_format'],
+                ),
+            )
+            if bl_debug == True:
+                print(
+                    'CALENDAR DAYS TO EXPIRATION: {}'.format(
+                        DatesBR().delta_calendar_days(
+                            DatesBR().sub_working_days(
+                                DatesBR().curr_date,
+                                abs(-self.int_wd_bef - 1),
                             ),
-                            float(r),
-                            float(
-                                float(
+                            DatesBR().str_date_to_datetime(
+                                str(
                                     dict_[
                                         YAML_B3['options_traded_b3']['keys'][
-                                            'cd_exp'
+                                            'xpr_dt'
                                         ]
                                     ]
-                                )
-                                / 365.0
-                            ),
-                            float(0.5),
-                            float(0),
-                            float(r),
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'close_opt'
-                                    ]
-                                ]
-                            ),
-                            str(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'opt_type'
-                                    ]
-                                ]
-                                .lower()
-                                .replace('putt', 'put')
+                                ),
+                                YAML_B3['options_traded_b3'][
+                                    'dt_input_format'
+                                ],
                             ),
                         )
-                    except KeyError:
-                        dict_[
-                            YAML_B3['options_traded_b3']['keys']['imp_vol']
-                        ] = float_value_error
-                    #   delta
-                    try:
-                        dict_[
-                            YAML_B3['options_traded_b3']['keys']['delta']
-                        ] = EuropeanOptions().delta(
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'close_spot'
-                                    ]
-                                ]
-                            ),
-                            float(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys']['k']
-                                ]
-                            ),
-                            float(r),
-                            float(
-                                float(
-                                    dict_[
-                                        YAML_B3['options_traded_b3']['keys'][
-                                            'cd_exp'
-                                        ]
-                                    ]
-                                )
-                                / 365.0
-                            ),
-                            dict_[
-                                YAML_B3['options_traded_b3']['keys']['imp_vol']
-                            ],
-                            float(0),
-                            float(r),
-                            str(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'opt_type'
-                                    ]
-                                ]
-                                .lower()
-                                .replace('putt', 'put')
+                    )
+                )
+            #   closing price of spot and option - o(1) lookups in the mtm index, missing
+            #       tickers are flagged as nan, which the implied volatility flags with
+            #       the error value
+            for key_ticker, key_close in [
+                ('ticker', 'close_opt'),
+                ('spot', 'close_spot'),
+            ]:
+                str_ticker = dict_[
+                    YAML_B3['options_traded_b3']['keys'][key_ticker]
+                ]
+                dict_[
+                    YAML_B3['options_traded_b3']['keys'][key_close]
+                ] = dict_mtm_close.get(str_ticker, np.nan)
+                if bl_debug == True:
+                    print(
+                        '{} {}: {}'.format(
+                            key_close.upper(),
+                            str_ticker,
+                            dict_mtm_close.get(
+                                str_ticker, 'MISSING IN MTM B3'
                             ),
                         )
-                    except KeyError:
-                        dict_[
-                            YAML_B3['options_traded_b3']['keys']['delta']
-                        ] = float_value_error
-                    if bl_debug == True:
-                        print(
-                            'DELTA: {}'.format(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'delta'
-                                    ]
-                                ]
-                            )
-                        )
-                        print(
-                            'IV: {}'.format(
-                                dict_[
-                                    YAML_B3['options_traded_b3']['keys'][
-                                        'imp_vol'
-                                    ]
-                                ]
-                            )
-                        )
-                    #   appendig dictionary to list
-                    list_ser.append(dict_)
-                    if bl_debug == True:
-                        print(dict_)
-        # uploading list of dictionaries to pandas
-        df_opt_in = pd.DataFrame(list_ser)
-        # removing duplicates
-        df_opt_in.drop_duplicates(inplace=True)
-        # adding logging
-        df_opt_in = DBLogs().audit_log(
-            df_opt_in,
-            url,
-            DatesBR().utc_from_dt(
-                DatesBR().sub_working_days(
-                    DatesBR().curr_date, self.int_wd_bef
-                )
-            ),
-        )
-        # returning dataframe
-        return df_opt_in
+                    )
+            #   risk-free rate
+            dict_[YAML_B3['options_traded_b3']['keys']['risk_free']] = r
+            #   days to maturity ratio
+            dict_[
+                YAML_B3['options_traded_b3']['keys']['days_maturity_ratio']
+            ] = (
+                float(dict_[YAML_B3['options_traded_b3']['keys']['cd_exp']])
+                / float_days_year
+            )
+            if bl_debug == True:
+                print(dict_)
+            yield dict_
 
     @property
     def carga_mtm_b3(self):
@@ -735,6 +831,8 @@ class TradingFilesB3:
                 'bl_io_interpreting'
             ],
             bl_verify=YAML_B3['margens_teoricas_maximas_b3']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # retorno é um novo zip com um xlsx
         zipfile = ZipFile(zipfile)
@@ -764,6 +862,22 @@ class TradingFilesB3:
         # retornando lista de linhas do csv corrente
         return list_rows_mtm
 
+    def index_mtm_b3(self, list_rows_mtm):
+        """
+        DOCSTRING: HASH INDEX OF THE INSTRUMENTS' CLOSING PRICES WITHIN THE MAXIMUM THEORETICAL
+            MARGINS, KEYED BY TICKER - INSTRUMENT RECORDS WITH A NON-NULL CLOSE, EXCEPT THE
+            LAST THREE ROWS; THE LATEST RECORD OF A REPEATED TICKER PREVAILS
+        INPUTS: LIST OF ROWS OF THE MAXIMUM THEORETICAL MARGINS
+        OUTPUTS: DICTIONARY
+        """
+        return {
+            list_row[5]: float(list_row[4].replace(',', '.'))
+            for list_row in list_rows_mtm[: max(len(list_rows_mtm) - 3, 0)]
+            if list_row[0]
+            == YAML_B3['margens_teoricas_maximas_b3']['key_instrumentos']
+            and list_row[4] != '0'
+        }
+
     @property
     def mtm_compra_venda(
         self,
@@ -1053,6 +1167,8 @@ class TradingFilesB3:
                 'bl_io_interpreting'
             ],
             bl_verify=YAML_B3['fatores_primitivos_risco_b3']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # retorno é um novo zip com um txt quanto aos fatores de risco primitivos da b3, com isso
         #   desziparesse arquivo
@@ -1287,126 +1403,120 @@ class TradingFilesB3:
         # returning dataframe
         return df_coll_acc_spot_bov
 
-    def cenarios_tipo_curva(self, list_cenarios_tipo_curva=None):
+    def cenarios_risco_b3(
+        self,
+        str_key,
+        list_cols_float,
+        list_cenarios=None,
+        int_cenario_inf=None,
+        int_cenario_sup=None,
+        bl_cache=True,
+        list_int_wd_bef=None,
+    ):
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: RISK SCENARIOS OF B3 (TIPO CURVA OR TIPO SPOT) OF THE TRADE DATE, PARSED INTO
+            TYPED COLUMNS AND CACHED PER DATE, THUS MEMORY-MAPPED ON LATER LOADS
+        INPUTS: YAML KEY ('cenarios_risco_tipo_curva' OR 'cenarios_risco_tipo_spot'), FLOAT
+            COLUMNS, SUBSTRINGS OF THE FILES OF INTEREST (NONE AS DEFAULT, ALL), INFERIOR AND
+            SUPERIOR SCENARIO IDS - [INF, SUP) - (NONE AS DEFAULT, UNBOUNDED), CACHE FLAG (TRUE
+            AS DEFAULT) AND WORKING DAYS BEFORE TO TRY, IN ORDER (NONE AS DEFAULT, THE
+            INSTANCE'S)
+        OUTPUTS: TUPLE (DATAFRAME, URL)
         """
         # setting variables
-        list_ser_exportacao_curvas = list()
+        cls_cache = ScenariosCacheB3()
+        if list_int_wd_bef == None:
+            list_int_wd_bef = [self.int_wd_bef]
         # validando tipo de variáveis de interesse
-        if list_cenarios_tipo_curva != None:
+        if list_cenarios != None:
             #   convertendo para lista, caso não seja
-            if type(list_cenarios_tipo_curva) != list:
-                list_cenarios_tipo_curva = [list_cenarios_tipo_curva]
+            if type(list_cenarios) != list:
+                list_cenarios = [list_cenarios]
             #   alterando tipo de instâncias
-            list_cenarios_tipo_curva = [
-                str(x) for x in list_cenarios_tipo_curva
-            ]
-        # definindo url com cenários de risco - tipo de curva
-        url_cenarios_tipo_curva = YAML_B3['cenarios_risco_tipo_curva'][
-            'tipo_curva'
-        ]['url'].format(
-            DatesBR()
-            .sub_working_days(
-                DatesBR().curr_date,
-                YAML_B3['cenarios_risco_tipo_curva']['tipo_curva'][
-                    'self.int_wd_bef'
-                ],
-            )
-            .strftime('%y%m%d')
-        )
-        # baixando em memória zip com cenário de tipo curva da b3
-        list_txts_tipos_curva_cenarios = (
-            DirFilesManagement().get_zip_from_web_in_memory(
-                url_cenarios_tipo_curva,
-                bl_verify=YAML_B3['cenarios_risco_tipo_curva']['bl_verify'],
-                bl_io_interpreting=YAML_B3['cenarios_risco_tipo_curva'][
-                    'bl_io_interpreting'
-                ],
-                timeout=YAML_B3['cenarios_risco_tipo_curva']['tipo_curva'][
-                    'timeout'
-                ],
+            list_cenarios = [str(x) for x in list_cenarios]
+        # trying each trade date, from the cache or from b3
+        for int_wd_bef in list_int_wd_bef:
+            str_date = (
+                DatesBR()
+                .sub_working_days(DatesBR().curr_date, int_wd_bef)
+                .strftime('%y%m%d')
             )
-        )
-        # loopando em torno dos arquivos em txt, abrindo em memória no dataframe pandas
-        for (
-            extracted_file_tipo_curva_cenario
-        ) in list_txts_tipos_curva_cenarios:
-            #   caso a variável list_cenarios_tipo_curva seja diferente de none, o usuário tem
-            #       interesse que apenas uma parte dos cenários seja considerado, com isso, caso
-            #       o cenário corrente não esteja nessa amostra passar para o próximo
-            if (list_cenarios_tipo_curva != None) and (
-                all(
-                    [
-                        StrHandler().find_substr_str(
-                            extracted_file_tipo_curva_cenario.name, substr
-                        )
-                        == False
-                        for substr in list_cenarios_tipo_curva
-                    ]
+            url = YAML_B3[str_key]['tipo_curva']['url'].format(str_date)
+            path_cache = cls_cache.path_cache(str_key, str_date)
+            #   cached columns of the date, memory-mapped
+            if bl_cache == True:
+                dict_parsed = cls_cache.load(path_cache)
+                if dict_parsed is not None:
+                    break
+            #   baixando em memória zip com cenários da b3 - falling back to the next date
+            try:
+                list_txts_cenarios = (
+                    DirFilesManagement().get_zip_from_web_in_memory(
+                        url,
+                        bl_verify=YAML_B3[str_key]['bl_verify'],
+                        bl_io_interpreting=YAML_B3[str_key][
+                            'bl_io_interpreting'
+                        ],
+                        timeout=YAML_B3[str_key]['tipo_curva']['timeout'],
+                        bl_cache=self.http_cache is not None,
+                        http_cache=self.http_cache,
+                    )
                 )
-            ):
+            except Exception:
+                if int_wd_bef == list_int_wd_bef[-1]:
+                    raise
                 continue
-            #   abrindo em memória arquivo corrente - pandas dataframe
-            reader = pd.read_csv(
-                extracted_file_tipo_curva_cenario,
-                sep=YAML_B3['cenarios_risco_tipo_curva']['sep_instancias'],
-                skiprows=1,
-                header=None,
-                names=YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ],
-                decimal=',',
-            )
-            df_cenarios_passagem = pd.DataFrame(reader)
-            #   preenchendo com valor padrão campos com valor indisponível
-            df_cenarios_passagem.fillna(
-                YAML_B3['cenarios_risco_tipo_curva']['fill_na_padrao'],
-                inplace=True,
+            if type(list_txts_cenarios) != list:
+                list_txts_cenarios = [list_txts_cenarios]
+            #   typed columns, persisted for later loads
+            dict_parsed = cls_cache.parse(
+                list_txts_cenarios,
+                YAML_B3[str_key]['cols_cenarios_tipo_curvas'],
+                list_cols_float,
+                str_sep=YAML_B3[str_key]['sep_instancias'],
+                int_fill_na=YAML_B3[str_key]['fill_na_padrao'],
             )
-            #   alterando para dicionário dataframe corrente, visando consolidar em uma lista e
-            #       importar para uma dataframe para exportação
-            list_passagem = df_cenarios_passagem.to_dict(
-                orient=YAML_B3['cenarios_risco_tipo_curva']['orient_df']
-            )
-            list_ser_exportacao_curvas.extend(list_passagem)
-        # adicionando lista a um dataframe a ser exportado
-        df_cenarios_tipo_curva = pd.DataFrame.from_dict(
-            list_ser_exportacao_curvas
+            if bl_cache == True:
+                cls_cache.dump(path_cache, dict_parsed)
+            break
+        # scenarios and files of interest
+        return (
+            cls_cache.frame(
+                dict_parsed,
+                list_files_substr=list_cenarios,
+                int_scenario_inf=int_cenario_inf,
+                int_scenario_sup=int_cenario_sup,
+            ),
+            url,
         )
-        # alterando tipo de variáveis de colunas de interesse
-        df_cenarios_tipo_curva = df_cenarios_tipo_curva.astype(
-            {
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][0]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][1]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][2]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][3]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][4]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][5]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][6]: int,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][7]: float,
-                YAML_B3['cenarios_risco_tipo_curva'][
-                    'cols_cenarios_tipo_curvas'
-                ][8]: float,
-            }
+
+    def cenarios_tipo_curva(
+        self,
+        list_cenarios_tipo_curva=None,
+        int_cenario_inf=None,
+        int_cenario_sup=None,
+        bl_cache=True,
+    ):
+        """
+        DOCSTRING: RISK SCENARIOS OF B3 - TIPO CURVA
+        INPUTS: SUBSTRINGS OF THE FILES OF INTEREST (NONE AS DEFAULT, ALL), INFERIOR AND
+            SUPERIOR SCENARIO IDS - [INF, SUP) - (NONE AS DEFAULT, UNBOUNDED) AND CACHE FLAG (TRUE
+            AS DEFAULT)
+        OUTPUTS: DATAFRAME
+        """
+        # cenários tipo curva, ids como int32 e valores phi como float64
+        (
+            df_cenarios_tipo_curva,
+            url_cenarios_tipo_curva,
+        ) = self.cenarios_risco_b3(
+            'cenarios_risco_tipo_curva',
+            YAML_B3['cenarios_risco_tipo_curva']['cols_cenarios_tipo_curvas'][
+                7:
+            ],
+            list_cenarios=list_cenarios_tipo_curva,
+            int_cenario_inf=int_cenario_inf,
+            int_cenario_sup=int_cenario_sup,
+            bl_cache=bl_cache,
         )
         # adding logging
         df_cenarios_tipo_curva = DBLogs().audit_log(
@@ -1417,130 +1527,43 @@ class TradingFilesB3:
         # exportando dataframe de interesse
         return df_cenarios_tipo_curva
 
-    def cenarios_risco_tipo_spot(self, list_cenarios_tipo_spot=None):
+    def cenarios_risco_tipo_spot(
+        self,
+        list_cenarios_tipo_spot=None,
+        int_cenario_inf=None,
+        int_cenario_sup=None,
+        bl_cache=True,
+    ):
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: RISK SCENARIOS OF B3 - TIPO SPOT, FALLING BACK TO THE FORMER TRADE DATE WHEN
+            THE CURRENT ONE IS NOT AVAILABLE
+        INPUTS: SUBSTRINGS OF THE FILES OF INTEREST (NONE AS DEFAULT, ALL), INFERIOR AND
+            SUPERIOR SCENARIO IDS - [INF, SUP) - (NONE AS DEFAULT, UNBOUNDED) AND CACHE FLAG (TRUE
+            AS DEFAULT)
+        OUTPUTS: DATAFRAME
         """
-        # setting variables
-        list_ser_exportacao_curvas = list()
-        # validando tipo de variáveis de interesse
-        if list_cenarios_tipo_spot != None:
-            #   convertendo para lista, caso não seja
-            if type(list_cenarios_tipo_spot) != list:
-                list_cenarios_tipo_spot = [list_cenarios_tipo_spot]
-            #   alterando tipo de instâncias
-            list_cenarios_tipo_spot = [str(x) for x in list_cenarios_tipo_spot]
-        # definindo url com cenários de risco - tipo de curva
-        url_cenarios_tipo_spot = YAML_B3['cenarios_risco_tipo_spot'][
-            'tipo_curva'
-        ]['url'].format(
-            DatesBR()
-            .sub_working_days(
-                DatesBR().curr_date,
-                YAML_B3['cenarios_risco_tipo_spot']['tipo_curva'][
-                    'self.int_wd_bef'
-                ],
-            )
-            .strftime('%y%m%d')
-        )
-        # baixando em memória zip com cenário de tipo curva da b3
-        list_txts_tipos_spot_cenarios = (
-            DirFilesManagement().get_zip_from_web_in_memory(
-                url_cenarios_tipo_spot,
-                bl_verify=YAML_B3['cenarios_risco_tipo_spot']['bl_verify'],
-                bl_io_interpreting=YAML_B3['cenarios_risco_tipo_spot'][
-                    'bl_io_interpreting'
-                ],
-                timeout=YAML_B3['cenarios_risco_tipo_spot']['tipo_curva'][
-                    'timeout'
-                ],
-            )
-        )
-        # loopando em torno dos arquivos em txt, abrindo em memória no dataframe pandas
-        for extracted_file_tipo_curva_cenario in list_txts_tipos_spot_cenarios:
-            #   caso a variável list_cenarios_tipo_spot seja diferente de none, o usuário tem
-            #       interesse que apenas uma parte dos cenários seja considerado, com isso, caso o
-            #       cenário corrente não esteja nessa amostra passar para o próximo
-            if (list_cenarios_tipo_spot != None) and (
-                all(
-                    [
-                        StrHandler().find_substr_str(
-                            extracted_file_tipo_curva_cenario.name, substr
-                        )
-                        == False
-                        for substr in list_cenarios_tipo_spot
-                    ]
-                )
-            ):
-                continue
-            #   abrindo em memória arquivo corrente - pandas dataframe
-            reader = pd.read_csv(
-                extracted_file_tipo_curva_cenario,
-                sep=YAML_B3['cenarios_risco_tipo_spot']['sep_instancias'],
-                skiprows=1,
-                header=None,
-                names=YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ],
-                decimal=',',
-            )
-            df_cenarios_passagem = pd.DataFrame(reader)
-            #   preenchendo com valor padrão campos com valor indisponível
-            df_cenarios_passagem.fillna(
-                YAML_B3['cenarios_risco_tipo_spot']['fill_na_padrao'],
-                inplace=True,
-            )
-            #   alterando para dicionário dataframe corrente, visando consolidar em uma lista e
-            #       importar para uma dataframe para exportação
-            list_passagem = df_cenarios_passagem.to_dict(
-                orient=YAML_B3['cenarios_risco_tipo_spot']['orient_df']
-            )
-            list_ser_exportacao_curvas.extend(list_passagem)
-        # adicionando lista a um dataframe a ser exportado
-        df_cenarios_tipo_spot = pd.DataFrame.from_dict(
-            list_ser_exportacao_curvas
-        )
-        # alterando tipo de variáveis de colunas de interesse
-        df_cenarios_tipo_spot = df_cenarios_tipo_spot.astype(
-            {
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][0]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][1]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][2]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][3]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][4]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][5]: float,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][6]: float,
-            }
+        # cenários tipo spot, ids como int32 e valores phi como float64
+        df_cenarios_tipo_spot, url_cenarios_tipo_spot = self.cenarios_risco_b3(
+            'cenarios_risco_tipo_spot',
+            YAML_B3['cenarios_risco_tipo_spot']['cols_cenarios_tipo_curvas'][
+                5:
+            ],
+            list_cenarios=list_cenarios_tipo_spot,
+            int_cenario_inf=int_cenario_inf,
+            int_cenario_sup=int_cenario_sup,
+            bl_cache=bl_cache,
+            list_int_wd_bef=[self.int_wd_bef, self.int_wd_bef + 1],
         )
         # adicionando colunas de interesse - nome tipo do cenário
         df_cenarios_tipo_spot[
             YAML_B3['cenarios_risco_tipo_spot']['col_criar_nome_tipo_cenario']
-        ] = [
+        ] = df_cenarios_tipo_spot[
+            YAML_B3['cenarios_risco_tipo_spot']['cols_cenarios_tipo_curvas'][3]
+        ].map(
             YAML_B3['cenarios_risco_tipo_spot'][
                 'variaveis_tipo_cenarios_curvas'
-            ][x]
-            for x in df_cenarios_tipo_spot[
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][3]
-            ].tolist()
-        ]
+            ]
+        )
         # adding logging
         df_cenarios_tipo_spot = DBLogs().audit_log(
             df_cenarios_tipo_spot,
@@ -1604,8 +1627,18 @@ class TradingFilesB3:
             print('*** TIPO FRPS ***')
             print(df_tipos_fprs)
         # * arquivos de pregão b3 - cenários tipo curva
+        #   within the range of interest, without prospective scenarios - sliced from the
+        #       scenarios sorted by id
         df_cenarios_tipo_curva = self.cenarios_tipo_curva(
-            list_cenarios_tipo_curva
+            list_cenarios_tipo_curva,
+            int_cenario_inf=max(
+                YAML_B3['cenarios_risco_tipo_curva']['int_inf_range_cenarios'],
+                1,
+            ),
+            int_cenario_sup=min(
+                YAML_B3['cenarios_risco_tipo_curva']['int_sup_range_cenarios'],
+                int_cenario_sup_avaliacao,
+            ),
         )
         # removendo colunas de interesse
         df_cenarios_tipo_curva.drop(
@@ -1616,34 +1649,23 @@ class TradingFilesB3:
             axis=1,
             inplace=True,
         )
-        # limitando cenários de tipos de curvas dentro do range de interesse
-        df_cenarios_tipo_curva = df_cenarios_tipo_curva[
-            df_cenarios_tipo_curva[
-                YAML_B3['cenarios_risco_tipo_curva']['col_id_cenario']
-            ].isin(
-                range(
-                    YAML_B3['cenarios_risco_tipo_curva'][
-                        'int_inf_range_cenarios'
-                    ],
-                    YAML_B3['cenarios_risco_tipo_curva'][
-                        'int_sup_range_cenarios'
-                    ],
-                )
-            )
-        ].reset_index(drop=True)
-        # eliminando cenários prospectivos
-        df_cenarios_tipo_curva = df_cenarios_tipo_curva[
-            df_cenarios_tipo_curva['ID_CENARIO'].isin(
-                range(1, int_cenario_sup_avaliacao)
-            )
-        ].reset_index(drop=True)
         if bl_debug == True:
             print('*** TIPO CURVA ***')
             print(df_cenarios_tipo_curva.info())
             print(df_cenarios_tipo_curva)
         # * arquivos de pregão b3 - cenários risco tipo spot
+        #   within the range of interest, without prospective scenarios - sliced from the
+        #       scenarios sorted by id
         df_cenarios_tipo_spot = self.cenarios_risco_tipo_spot(
-            list_cenarios_tipo_spot
+            list_cenarios_tipo_spot,
+            int_cenario_inf=max(
+                YAML_B3['cenarios_risco_tipo_spot']['int_inf_range_cenarios'],
+                1,
+            ),
+            int_cenario_sup=min(
+                YAML_B3['cenarios_risco_tipo_spot']['int_sup_range_cenarios'],
+                int_cenario_sup_avaliacao,
+            ),
         )
         # removendo colunas de interesse
         df_cenarios_tipo_spot.drop(
@@ -1654,27 +1676,6 @@ class TradingFilesB3:
             axis=1,
             inplace=True,
         )
-        # limitando cenários de curvas spot
-        df_cenarios_tipo_spot = df_cenarios_tipo_spot[
-            df_cenarios_tipo_spot[
-                YAML_B3['cenarios_risco_tipo_spot']['col_id_cenario']
-            ].isin(
-                range(
-                    YAML_B3['cenarios_risco_tipo_spot'][
-                        'int_inf_range_cenarios'
-                    ],
-                    YAML_B3['cenarios_risco_tipo_spot'][
-                        'int_sup_range_cenarios'
-                    ],
-                )
-            )
-        ].reset_index(drop=True)
-        # eliminando cenários prospectivos
-        df_cenarios_tipo_spot = df_cenarios_tipo_spot[
-            df_cenarios_tipo_spot['ID_CENARIO'].isin(
-                range(1, int_cenario_sup_avaliacao)
-            )
-        ].reset_index(drop=True)
         if bl_debug == True:
             print('*** TIPO SPOT ***')
             print(df_cenarios_tipo_spot.info())
@@ -1784,168 +1785,6 @@ class TradingFilesB3:
         # retornando fpr completo
         return df_fpr_b3
 
-    def cenarios_risco_tipo_spot(self, list_cenarios_tipo_spot=None):
-        """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
-        """
-        # setting variables
-        list_ser_exportacao_curvas = list()
-        # validando tipo de variáveis de interesse
-        if list_cenarios_tipo_spot != None:
-            #   convertendo para lista, caso não seja
-            if type(list_cenarios_tipo_spot) != list:
-                list_cenarios_tipo_spot = [list_cenarios_tipo_spot]
-            #   alterando tipo de instâncias
-            list_cenarios_tipo_spot = [str(x) for x in list_cenarios_tipo_spot]
-        try:
-            # definindo url com cenários de risco - tipo de curva
-            url_cenarios_tipo_spot = YAML_B3['cenarios_risco_tipo_spot'][
-                'tipo_curva'
-            ]['url'].format(
-                DatesBR()
-                .sub_working_days(
-                    DatesBR().curr_date,
-                    YAML_B3['cenarios_risco_tipo_spot']['tipo_curva'][
-                        'self.int_wd_beferiores'
-                    ],
-                )
-                .strftime('%y%m%d')
-            )
-            # baixando em memória zip com cenário de tipo curva da b3
-            list_txts_tipos_spot_cenarios = (
-                DirFilesManagement().get_zip_from_web_in_memory(
-                    url_cenarios_tipo_spot,
-                    bl_verify=YAML_B3['cenarios_risco_tipo_spot']['bl_verify'],
-                    bl_io_interpreting=YAML_B3['cenarios_risco_tipo_spot'][
-                        'bl_io_interpreting'
-                    ],
-                    timeout=YAML_B3['cenarios_risco_tipo_spot']['tipo_curva'][
-                        'timeout'
-                    ],
-                )
-            )
-        except:
-            url_cenarios_tipo_spot = YAML_B3['cenarios_risco_tipo_spot'][
-                'tipo_curva'
-            ]['url'].format(
-                DatesBR()
-                .sub_working_days(
-                    DatesBR().curr_date,
-                    (
-                        YAML_B3['cenarios_risco_tipo_spot']['tipo_curva'][
-                            'self.int_wd_beferiores'
-                        ]
-                        + 1
-                    ),
-                )
-                .strftime('%y%m%d')
-            )
-            list_txts_tipos_spot_cenarios = (
-                DirFilesManagement().get_zip_from_web_in_memory(
-                    url_cenarios_tipo_spot,
-                    bl_verify=YAML_B3['cenarios_risco_tipo_spot']['bl_verify'],
-                    bl_io_interpreting=YAML_B3['cenarios_risco_tipo_spot'][
-                        'bl_io_interpreting'
-                    ],
-                    timeout=YAML_B3['cenarios_risco_tipo_spot']['tipo_curva'][
-                        'timeout'
-                    ],
-                )
-            )
-        # loopando em torno dos arquivos em txt, abrindo em memória no dataframe pandas
-        for extracted_file_tipo_curva_cenario in list_txts_tipos_spot_cenarios:
-            #   caso a variável list_cenarios_tipo_spot seja diferente de none, o usuário tem
-            #       interesse que apenas uma parte dos cenários seja considerado, com isso, caso
-            #       o cenário corrente não esteja nessa amostra passar para o próximo
-            if (list_cenarios_tipo_spot != None) and (
-                all(
-                    [
-                        StrHandler().find_substr_str(
-                            extracted_file_tipo_curva_cenario.name, substr
-                        )
-                        == False
-                        for substr in list_cenarios_tipo_spot
-                    ]
-                )
-            ):
-                continue
-            #   abrindo em memória arquivo corrente - pandas dataframe
-            reader = pd.read_csv(
-                extracted_file_tipo_curva_cenario,
-                sep=YAML_B3['cenarios_risco_tipo_spot']['sep_instancias'],
-                skiprows=1,
-                header=None,
-                names=YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ],
-                decimal=',',
-            )
-            df_cenarios_passagem = pd.DataFrame(reader)
-            #   preenchendo com valor padrão campos com valor indisponível
-            df_cenarios_passagem.fillna(
-                YAML_B3['cenarios_risco_tipo_spot']['fill_na_padrao'],
-                inplace=True,
-            )
-            #   alterando para dicionário dataframe corrente, visando consolidar em uma lista
-            #       e importar para uma dataframe para exportação
-            list_passagem = df_cenarios_passagem.to_dict(
-                orient=YAML_B3['cenarios_risco_tipo_spot']['orient_df']
-            )
-            list_ser_exportacao_curvas.extend(list_passagem)
-        # adicionando lista a um dataframe a ser exportado
-        df_cenarios_tipo_spot = pd.DataFrame.from_dict(
-            list_ser_exportacao_curvas
-        )
-        # alterando tipo de variáveis de colunas de interesse
-        df_cenarios_tipo_spot = df_cenarios_tipo_spot.astype(
-            {
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][0]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][1]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][2]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][3]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][4]: int,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][5]: float,
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][6]: float,
-            }
-        )
-        # adicionando colunas de interesse - nome tipo do cenário
-        df_cenarios_tipo_spot[
-            YAML_B3['cenarios_risco_tipo_spot']['col_criar_nome_tipo_cenario']
-        ] = [
-            YAML_B3['cenarios_risco_tipo_spot'][
-                'variaveis_tipo_cenarios_curvas'
-            ][x]
-            for x in df_cenarios_tipo_spot[
-                YAML_B3['cenarios_risco_tipo_spot'][
-                    'cols_cenarios_tipo_curvas'
-                ][3]
-            ].tolist()
-        ]
-        # adding logging
-        df_cenarios_tipo_spot = DBLogs().audit_log(
-            df_cenarios_tipo_spot,
-            url_cenarios_tipo_spot,
-            DatesBR().utc_from_dt(DatesBR().curr_date),
-        )
-        # exportando dataframe de interesse
-        return df_cenarios_tipo_spot
-
     @property
     def trading_report(
         self,
@@ -2027,6 +1866,8 @@ class TradingFilesB3:
             url,
             bl_io_interpreting=YAML_B3['trading_report']['bl_io_interpreting'],
             bl_verify=YAML_B3['trading_report']['bl_verify'],
+            bl_cache=self.http_cache is not None,
+            http_cache=self.http_cache,
         )
         # retorno é um novo zip com um txt quanto aos fatores de risco primitivos da b3,
         #   com isso deszipar esse arquivo
@@ -100,19 +100,23 @@ class NotionalFromRt:
     ):
         """
         DOCSTRING: DI1 CONTRACT PRICING - CONSIDERS DAYTRADE AND SWING TRADE PRICING
-        INPUTS: NOMINAL RATE, DATE OF SETTLEMENT, WORKING DAYS BEFORE, FUTURE VALUE, WORKING DAYS
+        INPUTS: NOMINAL RATE, DATE OF SETTLEMENT (OR ARRAY-LIKE OF DATES), WORKING DAYS BEFORE, FUTURE VALUE, WORKING DAYS
             WITHIN A YEAR, WORKING DAYS OF CAPITALIZATION (1 AS STANDARD), DATE FORMAT INPUT
-        OUTPUTS:
+        OUTPUTS: FLOAT, OR NUMPY ARRAY FOR AN ARRAY-LIKE OF SETTLEMENT DATES
         """
-        # checking wheter the settlement date is in datetime format
-        if DatesBR().check_date_datetime_format(dt_xpt) == False:
+        # checking wheter the settlement date is in datetime format - array-likes of dates
+        #   (datetime.date, datetime64 or iso strings) are handled at once
+        if (
+            DatesBR().bl_array_dates(dt_xpt) == False
+            and DatesBR().check_date_datetime_format(dt_xpt) == False
+        ):
             dt_xpt = DatesBR().str_date_to_datetime(
                 dt_xpt, str_format_dt_input
             )
         # reference date
         dt_ref = DatesBR().sub_working_days(DatesBR().curr_date, int_wd_bef)
         # number of days to settlement of contract
-        int_wddt = DatesBR().get_working_days_delta(dt_ref, dt_xpt)
+        int_wddt = DatesBR().working_days_delta(dt_ref, dt_xpt)
         # real rate
         float_real_rate = FinancialMath().compound_interest(
             float_nominal_rt, int_wddy, int_wd_cap
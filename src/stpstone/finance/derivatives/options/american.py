@@ -2,6 +2,12 @@
 
 import numpy as np
 
+from stpstone.finance.derivatives.options.european import (
+    BlackScholesMerton,
+    IterativeMethods,
+)
+from stpstone.quantitative_methods.prob_distributions import NormalDistribution
+
 
 class InitialSettings:
     def set_parameters(self, *params, opt_style='call'):
@@ -39,61 +45,374 @@ class PricingModels(InitialSettings):
         DOCSTRING: BINOMIAL ASSET PRICING MODEL - UPPER/LOWER BARRIERS FEATURES IMPLEMENTED
         INPUTS: S0 (INITIAL STOCK PRICING MODEL), K (STRIKE PRICE), T (TIME TO MATURITY IN YEARS),
             R (ANNUAL RISK-FREE RATE), N (NODES), U (UP-FACTOR IN BINOMIAL MODELS), D (DOWN-FACTOR
-            - TO ENSURE RECOMBINING TREE USE 1/U), OPTION STYLE (CALL/PUT)
+            - TO ENSURE RECOMBINING TREE USE 1/U), OPTION STYLE (CALL/PUT) - ARRAYS OF
+            CONTRACTS ARE PRICED IN A SINGLE (CONTRACTS X NODES) LATTICE
         OUTPUTS: FLOAT FROM ARRAY_CP[0] (CALL-PUT PRICING FOR EACH NODE)
         """
-        # initial parameters
-        s, k, r, t, n, u, d = self.set_parameters(
-            s, k, r, t, n, u, d, opt_style
-        )
-        # precompute values
-        dt = t / n
-        q = (np.exp(r * dt) - d) / (u - d)
-        disc = np.exp(-r * dt)
-        # initialise stock prices at maturity
-        array_s_nodes = (
-            s * d ** (np.arange(n, -1, -1)) * u ** (np.arange(0, n + 1, 1))
+        # returning the no-arbitrage price at node 0, with early exercise - the lattice engine
+        #   reuses one buffer through the backward induction and prices arrays of contracts
+        return IterativeMethods().binomial_pricing_model(
+            s,
+            k,
+            r,
+            t,
+            n,
+            u,
+            d,
+            opt_style,
+            h_upper=h_upper,
+            h_lower=h_lower,
+            bl_american=True,
         )
-        # initialise option values at maturity - if intrinsic value is negative, consider zero
-        if opt_style == 'call':
-            array_cp = np.maximum(array_s_nodes - k, np.zeros(int(n) + 1))
-        else:
-            array_cp = np.maximum(k - array_s_nodes, np.zeros(int(n) + 1))
-        # check s payoff, according to barriers, if values are different from none
-        if h_upper != None:
-            array_cp[array_s_nodes >= h_upper] = 0
-        if h_lower != None:
-            array_cp[array_s_nodes <= h_lower] = 0
-        # step backwards recursion through tree
-        for i in np.arange(int(n) - 1, -1, -1):
-            array_s_nodes = (
-                s * d ** (np.arange(i, -1, -1)) * u ** (np.arange(0, i + 1, 1))
-            )
-            array_cp[: i + 1] = disc * (
-                q * array_cp[1 : i + 2] + (1 - q) * array_cp[0 : i + 1]
-            )
-            array_cp = array_cp[:-1]
-            #   evaluating maximum value between fair and intrinsic value
-            if opt_style == 'call':
-                array_cp = np.maximum(array_cp, array_s_nodes - k)
-            else:
-                array_cp = np.maximum(array_cp, k - array_s_nodes)
-        # returning the no-arbitrage price at node 0
-        return array_cp[0]
 
     def barone_adesi_whaley(
-        self,
+        self, s, k, r, t, sigma, b, opt_style, tolerance=1e-6, max_iter=100
     ):
         """
-        REFERENCES: THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG - PG 119
+        REFERENCES: THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG - PG 97
         DOCSTRING: QUADRATIC APPROXIMATION METHOD BY BARONE-ADESI AND WHALEY (1987) TO PRICE
             CALL AND PUT OPTIONS ON AN UNDERLYING ASSET WITH THE COST-OF-CARRY RATE B - WHEN THE
             B >= R, THE AMERICAN CALL VALUE IS EQUAL TO THE EUROPEAN CALL VALUE AND CAN THEN BE FOUND
-            BY USING THE GENERALIZED BLACK-SHCOLES-MERTHON (BSM) FORMULA
-        INPUTS: PSI_R (VOLATILITY OF REFERENCE VOLATILITY), DICTIONARIES (KEYS -
-            NUMBER OF CONTRACTS WITH VEGA I, T (q_vega), VEGA I, T (vega_t), PSI T (VOLATILITY OF
-            VOLATILITY FOR THE GIVEN SET OF OPTIONS WITH SAME UNDERLYING AND MATURITY) (psi_t),
-            CORRELATION BETWEEN THE VOLATILITY WITH TIME TO MATURITY T AND THE REFERENCE VOLATILITY
-            (corr_t))
-        OUTPUTS: FLOAT (VEGA)
+            BY USING THE GENERALIZED BLACK-SHCOLES-MERTHON (BSM) FORMULA - THE CRITICAL PRICES ARE
+            FOUND THROUGH NEWTON ITERATIONS RUN OVER THE WHOLE CHAIN AT ONCE
+        INPUTS: S (SPOT PRICE), K (STRIKE), R (INTEREST RATE), T (TIME TO MATURITY),
+            SIGMA (VOLATILITY OF UNDERLYING ASSET), B (COST OF CARRY), OPTION STYLE (CALL/PUT) -
+            SCALARS OR ARRAYS BROADCASTING TOGETHER -, TOLERANCE (RELATIVE TO THE STRIKE) AND
+            MAXIMUM ITERATIONS OF THE CRITICAL PRICE SEARCH
+        OUTPUTS: FLOAT, OR ARRAY FOR ARRAY INPUTS
         """
+        # initial parameters - one entry per contract
+        cls_bsm = BlackScholesMerton()
+        bl_array = cls_bsm.bl_array_like(s, k, r, t, sigma, b, opt_style)
+        s, k, r, t, sigma, b, sign_ = [
+            np.ravel(x)
+            for x in np.broadcast_arrays(
+                *[np.asarray(x, dtype=float) for x in [s, k, r, t, sigma, b]],
+                cls_bsm.opt_type_sign(opt_style),
+            )
+        ]
+        array_opt_style = np.where(sign_ > 0.0, 'call', 'put')
+        array_prices = cls_bsm.general_opt_price(
+            s, k, r, t, sigma, 0.0, b, array_opt_style
+        )
+        # early exercise is never optimal for calls with b >= r, nor for puts with r <= 0
+        mask_early = np.where(sign_ > 0.0, b < r, r > 0.0)
+        if mask_early.any() == True:
+            s, k, r, t, sigma, b, sign_ = [
+                x[mask_early] for x in [s, k, r, t, sigma, b, sign_]
+            ]
+            array_opt_style = array_opt_style[mask_early]
+            sigma_sqrt_t = sigma * np.sqrt(t)
+            carry = np.exp((b - r) * t)
+            n_ = 2.0 * b / sigma**2
+            m_ = 2.0 * r / sigma**2
+            q = (
+                -(n_ - 1.0)
+                + sign_
+                * np.sqrt((n_ - 1.0) ** 2 + 4.0 * m_ / (1.0 - np.exp(-r * t)))
+            ) / 2.0
+            #   seed value of the critical price
+            q_inf = (
+                -(n_ - 1.0) + sign_ * np.sqrt((n_ - 1.0) ** 2 + 4.0 * m_)
+            ) / 2.0
+            s_inf = k / (1.0 - 1.0 / q_inf)
+            h = (
+                -(sign_ * b * t + 2.0 * sigma_sqrt_t)
+                * k
+                / (sign_ * (s_inf - k))
+            )
+            s_crit = k + (s_inf - k) * (1.0 - np.exp(h))
+            #   newton-raphson iterations for the critical price, masked by convergence
+            mask_active = np.ones(s.shape, dtype=bool)
+            for _ in range(max_iter):
+                idx = np.flatnonzero(mask_active)
+                if idx.size == 0:
+                    break
+                s_i, sign_i, q_i, carry_i = (
+                    s_crit[idx],
+                    sign_[idx],
+                    q[idx],
+                    carry[idx],
+                )
+                d1 = (
+                    np.log(s_i / k[idx])
+                    + (b[idx] + sigma[idx] ** 2 / 2.0) * t[idx]
+                ) / sigma_sqrt_t[idx]
+                cdf_d1 = NormalDistribution().cdf(sign_i * d1)
+                lhs = sign_i * (s_i - k[idx])
+                rhs = (
+                    cls_bsm.general_opt_price(
+                        s_i,
+                        k[idx],
+                        r[idx],
+                        t[idx],
+                        sigma[idx],
+                        0.0,
+                        b[idx],
+                        array_opt_style[idx],
+                    )
+                    + sign_i * (1.0 - carry_i * cdf_d1) * s_i / q_i
+                )
+                mask_conv = np.abs(lhs - rhs) / k[idx] < tolerance
+                mask_active[idx[mask_conv]] = False
+                bi = (
+                    sign_i * carry_i * cdf_d1 * (1.0 - 1.0 / q_i)
+                    + (
+                        sign_i
+                        - carry_i
+                        * NormalDistribution().pdf(d1)
+                        / sigma_sqrt_t[idx]
+                    )
+                    / q_i
+                )
+                s_crit[idx[~mask_conv]] = (
+                    (k[idx] + sign_i * rhs - sign_i * bi * s_i)
+                    / (1.0 - sign_i * bi)
+                )[~mask_conv]
+            #   early exercise premium, or intrinsic value beyond the critical price
+            d1 = (
+                np.log(s_crit / k) + (b + sigma**2 / 2.0) * t
+            ) / sigma_sqrt_t
+            a = (
+                sign_
+                * s_crit
+                / q
+                * (1.0 - carry * NormalDistribution().cdf(sign_ * d1))
+            )
+            array_prices[mask_early] = np.where(
+                sign_ * (s - s_crit) >= 0.0,
+                sign_ * (s - k),
+                array_prices[mask_early] + a * (s / s_crit) ** q,
+            )
+        # returning prices
+        if bl_array == True:
+            return array_prices
+        return float(array_prices[0])
+
+    def bjerksund_stensland(self, s, k, r, t, sigma, b, opt_style):
+        """
+        REFERENCES: THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG - PG 104,
+            BJERKSUND, P.; STENSLAND, G. - CLOSED FORM VALUATION OF AMERICAN OPTIONS (2002)
+        DOCSTRING: BJERKSUND-STENSLAND (2002) APPROXIMATION OF AMERICAN OPTIONS, SPLITTING TIME
+            TO MATURITY IN TWO FLAT EXERCISE BOUNDARIES - PUTS ARE PRICED THROUGH THE PUT-CALL
+            TRANSFORMATION P(S, K, T, R, B, SIGMA) = C(K, S, T, R - B, -B, SIGMA) - CLOSED FORM,
+            SO WHOLE CHAINS ARE PRICED WITHOUT ITERATIONS
+        INPUTS: S (SPOT PRICE), K (STRIKE), R (INTEREST RATE), T (TIME TO MATURITY),
+            SIGMA (VOLATILITY OF UNDERLYING ASSET), B (COST OF CARRY) AND OPTION STYLE
+            (CALL/PUT) - SCALARS OR ARRAYS BROADCASTING TOGETHER
+        OUTPUTS: FLOAT, OR ARRAY FOR ARRAY INPUTS
+        """
+        # initial parameters - one entry per contract
+        cls_bsm = BlackScholesMerton()
+        bl_array = cls_bsm.bl_array_like(s, k, r, t, sigma, b, opt_style)
+        s, k, r, t, sigma, b, sign_ = [
+            np.ravel(x)
+            for x in np.broadcast_arrays(
+                *[np.asarray(x, dtype=float) for x in [s, k, r, t, sigma, b]],
+                cls_bsm.opt_type_sign(opt_style),
+            )
+        ]
+        # put-call transformation - every contract is priced as a call
+        mask_put = sign_ < 0.0
+        s, k = np.where(mask_put, k, s), np.where(mask_put, s, k)
+        r, b = np.where(mask_put, r - b, r), np.where(mask_put, -b, b)
+        array_prices = cls_bsm.general_opt_price(
+            s, k, r, t, sigma, 0.0, b, np.full(s.shape, 'call')
+        )
+        # early exercise is never optimal for calls with b >= r
+        mask_early = b < r
+        if mask_early.any() == True:
+            s, k, r, t, sigma, b = [
+                x[mask_early] for x in [s, k, r, t, sigma, b]
+            ]
+            t1 = 0.5 * (np.sqrt(5.0) - 1.0) * t
+            beta = (0.5 - b / sigma**2) + np.sqrt(
+                (b / sigma**2 - 0.5) ** 2 + 2.0 * r / sigma**2
+            )
+            b_inf = beta / (beta - 1.0) * k
+            b_0 = np.maximum(k, r / (r - b) * k)
+            h_t1 = (
+                -(b * t1 + 2.0 * sigma * np.sqrt(t1))
+                * k**2
+                / ((b_inf - b_0) * b_0)
+            )
+            h_t2 = (
+                -(b * t + 2.0 * sigma * np.sqrt(t))
+                * k**2
+                / ((b_inf - b_0) * b_0)
+            )
+            i1 = b_0 + (b_inf - b_0) * (1.0 - np.exp(h_t1))
+            i2 = b_0 + (b_inf - b_0) * (1.0 - np.exp(h_t2))
+            alpha1 = (i1 - k) * i1 ** (-beta)
+            alpha2 = (i2 - k) * i2 ** (-beta)
+
+            def phi(gamma, h, i):
+                return self.bjerksund_stensland_phi(
+                    s, t1, gamma, h, i, r, b, sigma
+                )
+
+            def psi(gamma, h):
+                return self.bjerksund_stensland_psi(
+                    s, t, gamma, h, i2, i1, t1, r, b, sigma
+                )
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                array_approx = (
+                    alpha2 * s**beta
+                    - alpha2 * phi(beta, i2, i2)
+                    + phi(1.0, i2, i2)
+                    - phi(1.0, i1, i2)
+                    - k * phi(0.0, i2, i2)
+                    + k * phi(0.0, i1, i2)
+                    + alpha1 * phi(beta, i1, i2)
+                    - alpha1 * psi(beta, i1)
+                    + psi(1.0, i1)
+                    - psi(1.0, k)
+                    - k * psi(0.0, i1)
+                    + k * psi(0.0, k)
+                )
+            array_prices[mask_early] = np.where(s >= i2, s - k, array_approx)
+        # returning prices
+        if bl_array == True:
+            return array_prices
+        return float(array_prices[0])
+
+    def bjerksund_stensland_phi(self, s, t, gamma, h, i, r, b, sigma):
+        """
+        REFERENCES: THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG - PG 104
+        DOCSTRING: PHI AUXILIARY FUNCTION OF BJERKSUND-STENSLAND'S APPROXIMATION
+        INPUTS: S, T, GAMMA, H, I, R, B AND SIGMA
+        OUTPUTS: ARRAY
+        """
+        sigma_sqrt_t = sigma * np.sqrt(t)
+        lambda_ = (
+            -r + gamma * b + 0.5 * gamma * (gamma - 1.0) * sigma**2
+        ) * t
+        d = (
+            -(np.log(s / h) + (b + (gamma - 0.5) * sigma**2) * t)
+            / sigma_sqrt_t
+        )
+        kappa = 2.0 * b / sigma**2 + (2.0 * gamma - 1.0)
+        return (
+            np.exp(lambda_)
+            * s**gamma
+            * (
+                NormalDistribution().cdf(d)
+                - (i / s) ** kappa
+                * NormalDistribution().cdf(
+                    d - 2.0 * np.log(i / s) / sigma_sqrt_t
+                )
+            )
+        )
+
+    def bjerksund_stensland_psi(
+        self, s, t2, gamma, h, i2, i1, t1, r, b, sigma
+    ):
+        """
+        REFERENCES: THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG - PG 105
+        DOCSTRING: PSI AUXILIARY FUNCTION OF BJERKSUND-STENSLAND'S APPROXIMATION, OVER THE
+            BIVARIATE NORMAL CDF
+        INPUTS: S, T2, GAMMA, H, I2, I1, T1, R, B AND SIGMA
+        OUTPUTS: ARRAY
+        """
+        drift_t1 = (b + (gamma - 0.5) * sigma**2) * t1
+        drift_t2 = (b + (gamma - 0.5) * sigma**2) * t2
+        sigma_sqrt_t1 = sigma * np.sqrt(t1)
+        sigma_sqrt_t2 = sigma * np.sqrt(t2)
+        e1 = (np.log(s / i1) + drift_t1) / sigma_sqrt_t1
+        e2 = (np.log(i2**2 / (s * i1)) + drift_t1) / sigma_sqrt_t1
+        e3 = (np.log(s / i1) - drift_t1) / sigma_sqrt_t1
+        e4 = (np.log(i2**2 / (s * i1)) - drift_t1) / sigma_sqrt_t1
+        f1 = (np.log(s / h) + drift_t2) / sigma_sqrt_t2
+        f2 = (np.log(i2**2 / (s * h)) + drift_t2) / sigma_sqrt_t2
+        f3 = (np.log(i1**2 / (s * h)) + drift_t2) / sigma_sqrt_t2
+        f4 = (np.log(s * i1**2 / (h * i2**2)) + drift_t2) / sigma_sqrt_t2
+        rho = np.sqrt(t1 / t2)
+        lambda_ = -r + gamma * b + 0.5 * gamma * (gamma - 1.0) * sigma**2
+        kappa = 2.0 * b / sigma**2 + (2.0 * gamma - 1.0)
+        return (
+            np.exp(lambda_ * t2)
+            * s**gamma
+            * (
+                NormalDistribution().bivariate_cdf(-e1, -f1, rho)
+                - (i2 / s) ** kappa
+                * NormalDistribution().bivariate_cdf(-e2, -f2, rho)
+                - (i1 / s) ** kappa
+                * NormalDistribution().bivariate_cdf(-e3, -f3, -rho)
+                + (i1 / i2) ** kappa
+                * NormalDistribution().bivariate_cdf(-e4, -f4, -rho)
+            )
+        )
+
+
+if __name__ == '__main__':
+    import timeit
+
+    # accuracy and speed benchmark of the closed-form approximations against the binomial tree
+    #   at a high step count, over a random chain of stock options (b = r)
+    int_n_contracts = 500
+    int_steps = 2000
+    rng = np.random.default_rng(42)
+    array_s = rng.uniform(70.0, 130.0, int_n_contracts)
+    array_t = rng.uniform(0.05, 2.0, int_n_contracts)
+    array_sigma = rng.uniform(0.1, 0.6, int_n_contracts)
+    array_opt_style = rng.choice(['call', 'put'], int_n_contracts)
+    float_k, float_r = 100.0, 0.1
+    array_u = np.exp(array_sigma * np.sqrt(array_t / int_steps))
+    cls_pricing = PricingModels()
+    dict_prices, dict_times = dict(), dict()
+    for str_model, func_ in [
+        (
+            'binomial',
+            lambda: cls_pricing.binomial(
+                array_s,
+                float_k,
+                float_r,
+                array_t,
+                int_steps,
+                array_u,
+                1.0 / array_u,
+                array_opt_style,
+            ),
+        ),
+        (
+            'barone_adesi_whaley',
+            lambda: cls_pricing.barone_adesi_whaley(
+                array_s,
+                float_k,
+                float_r,
+                array_t,
+                array_sigma,
+                float_r,
+                array_opt_style,
+            ),
+        ),
+        (
+            'bjerksund_stensland',
+            lambda: cls_pricing.bjerksund_stensland(
+                array_s,
+                float_k,
+                float_r,
+                array_t,
+                array_sigma,
+                float_r,
+                array_opt_style,
+            ),
+        ),
+    ]:
+        dict_times[str_model] = timeit.timeit(
+            lambda: dict_prices.__setitem__(str_model, func_()), number=1
+        )
+    for str_model in ['barone_adesi_whaley', 'bjerksund_stensland']:
+        array_error = dict_prices[str_model] - dict_prices['binomial']
+        print(
+            '{}: {:.2f} ms ({:.0f}x faster than binomial with {} steps) | '
+            'max abs error: {:.4f} | rmse: {:.4f}'.format(
+                str_model,
+                dict_times[str_model] * 1000,
+                dict_times['binomial'] / dict_times[str_model],
+                int_steps,
+                np.max(np.abs(array_error)),
+                np.sqrt(np.mean(array_error**2)),
+            )
+        )
@@ -1,9 +1,9 @@
 # OPTION PRCING FORMULAS, FOR EUROPEAN TYPE
 
-from functools import lru_cache
 from math import pi
 
 import numpy as np
+import pandas as pd
 from scipy.optimize import fsolve, minimize
 
 from stpstone.quantitative_methods.prob_distributions import NormalDistribution
@@ -13,9 +13,10 @@ from stpstone.quantitative_methods.regression import NonLinearEquations
 class InitialSettings:
     def set_parameters(self, *params, opt_type='call'):
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: CAST PARAMETERS TO FLOAT, OR TO FLOAT ARRAYS WHEN NUMPY ARRAYS OR PANDAS SERIES
+            ARE PASSED (WHOLE OPTION CHAINS), DISCARDING STRINGS (OPTION STYLE)
+        INPUTS: *PARAMS
+        OUTPUTS: LIST
         """
         # check wheter is a call or put option, in case the type is neither of the former raise
         #   error
@@ -28,11 +29,59 @@ class InitialSettings:
         ]
         # return parameters
         return [
-            float(param)
+            np.asarray(param, dtype=float)
+            if self.bl_array_like(param) == True
+            else float(param)
             for param in list_params
             if isinstance(param, str) == False
+            and self.bl_str_array(param) == False
         ]
 
+    def bl_array_like(self, *params):
+        """
+        DOCSTRING: CHECK WHETER ANY OF THE PARAMETERS IS A NUMPY ARRAY OR A PANDAS SERIES
+        INPUTS: *PARAMS
+        OUTPUTS: BOOLEAN
+        """
+        return any(
+            isinstance(param, (np.ndarray, pd.Series))
+            and np.ndim(param) > 0
+            for param in params
+        )
+
+    def bl_str_array(self, param):
+        """
+        DOCSTRING: CHECK WHETER THE PARAMETER IS AN ARRAY OF STRINGS (OPTION STYLES) - OBJECT
+            ARRAYS ARE JUDGED BY THEIR ELEMENTS, SO NUMBERS HELD AS OBJECTS ARE NOT STRINGS
+        INPUTS: PARAM
+        OUTPUTS: BOOLEAN
+        """
+        if isinstance(param, (np.ndarray, pd.Series)) == False:
+            return False
+        array_param = np.asarray(param)
+        if array_param.dtype.kind in ['U', 'S']:
+            return True
+        if array_param.dtype.kind != 'O':
+            return False
+        # numeric elements, as long as every non-missing one converts to a number
+        array_num = pd.to_numeric(array_param.ravel(), errors='coerce')
+        return (
+            np.issubdtype(array_num.dtype, np.number) == False
+            or (pd.isna(array_num) != pd.isna(array_param.ravel())).any()
+        )
+
+    def opt_type_sign(self, opt_type):
+        """
+        DOCSTRING: SIGN OF THE OPTION STYLE - 1.0 FOR CALLS AND -1.0 FOR PUTS, ELEMENT-WISE FOR
+            ARRAYS OF OPTION STYLES
+        INPUTS: OPTION STYLE (CALL/PUT, OR ARRAY-LIKE OF CALL/PUT)
+        OUTPUTS: FLOAT OR ARRAY
+        """
+        array_opt_type = np.asarray(opt_type)
+        if np.isin(array_opt_type, ['call', 'put']).all() == False:
+            raise Exception('Option ought be a call or a put')
+        return np.where(array_opt_type == 'call', 1.0, -1.0)
+
 
 class BlackScholesMerton(InitialSettings):
     """
@@ -75,9 +124,23 @@ class BlackScholesMerton(InitialSettings):
             T (TIME TO MATURITY), SIGMA (VOLATILITY OF UNDERLYING ASSET), Q (DIVIDEND YIELD),
             B (COST OF CARRY - R FOR STOCK OPTION, R - Q FOR STOCK
             OPTION WITH CONTINUOUS DIVIDEND YIELD, 0 FOR FUTURES, 0 AND R 0 FOR MARGINED FUTURES
-            OPTIONS, AND R - RF FOR CURRENCY OPTION MODEL) AND OPTION STYLE (CALL/PUT)
-        OUTPUTS: CALL PRICE
-        """
+            OPTIONS, AND R - RF FOR CURRENCY OPTION MODEL) AND OPTION STYLE (CALL/PUT) - EVERY
+            INPUT MAY BE A NUMPY ARRAY OR PANDAS SERIES, AS LONG AS THEY BROADCAST TOGETHER
+        OUTPUTS: CALL PRICE (FLOAT, OR ARRAY FOR ARRAY INPUTS)
+        """
+        # vectorized pricing for whole option chains - d1 and d2 are computed once and the
+        #   option style is handled through its sign, so calls and puts can be mixed
+        if self.bl_array_like(s, k, r, t, sigma, q, b, opt_type) == True:
+            s, k, r, t, sigma, q, b = self.set_parameters(
+                s, k, r, t, sigma, q, b
+            )
+            phi = self.opt_type_sign(opt_type)
+            d1 = self.d1(s, k, b, t, sigma, q)
+            d2 = d1 - sigma * np.sqrt(t)
+            return phi * (
+                s * np.exp((b - r) * t) * NormalDistribution().cdf(phi * d1)
+                - k * np.exp(-r * t) * NormalDistribution().cdf(phi * d2)
+            )
         # initial parameters
         s, k, r, t, sigma, q, b = self.set_parameters(
             s, k, r, t, sigma, q, b, opt_type
@@ -1188,10 +1251,250 @@ class Greeks(BlackScholesMerton):
             for dict_ in dicts_opts
         ].sum()
 
+    def greeks_table(
+        self,
+        chain,
+        which=None,
+        list_cols=['s', 'k', 'r', 't', 'sigma', 'q', 'b', 'opt_type'],
+    ):
+        """
+        REFERENCES: THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG
+        DOCSTRING: BATCH GREEKS SURFACE FOR A WHOLE OPTION CHAIN - D1, D2, CARRY AND DISCOUNT
+            FACTORS, NORMAL PDF AND CDF ARE COMPUTED ONCE PER CONTRACT AND SHARED AMONG EVERY
+            REQUESTED GREEK
+        INPUTS: CHAIN (DATAFRAME OR DICT OF ARRAYS WITH S (SPOT PRICE), K (STRIKE),
+            R (INTEREST RATE), T (TIME TO MATURITY), SIGMA (VOLATILITY OF UNDERLYING ASSET),
+            Q (DIVIDEND YIELD), B (COST OF CARRY) AND OPTION STYLE (CALL/PUT)), WHICH (LIST OF
+            GREEKS NAMES, ALL AVAILABLE BY DEFAULT) AND LIST_COLS (NAMES OF THE CHAIN COLUMNS,
+            FOLLOWING THE ORDER OF THE PARAMETERS ABOVE)
+        OUTPUTS: DATAFRAME (ONE ROW PER CONTRACT, ONE COLUMN PER GREEK)
+        """
+        # initial parameters
+        df_chain = pd.DataFrame(chain)
+        s, k, r, t, sigma, q, b = [
+            df_chain[col_].to_numpy(dtype=float) for col_ in list_cols[:-1]
+        ]
+        sign_ = self.opt_type_sign(df_chain[list_cols[-1]].to_numpy())
+        # shared intermediates - transcendental work is done once per contract
+        sqrt_t = np.sqrt(t)
+        sigma_sqrt_t = sigma * sqrt_t
+        d1 = (np.log(s / k) + (b + sigma**2 / 2.0) * t) / sigma_sqrt_t
+        d2 = d1 - sigma_sqrt_t
+        d1_d2 = d1 * d2
+        carry = np.exp((b - r) * t)
+        disc = np.exp(-r * t)
+        pdf_d1 = NormalDistribution().phi(d1)
+        pdf_d2 = NormalDistribution().phi(d2)
+        cdf_d1 = NormalDistribution().cdf(sign_ * d1)
+        cdf_d2 = NormalDistribution().cdf(sign_ * d2)
+        price = sign_ * (s * carry * cdf_d1 - k * disc * cdf_d2)
+        delta = sign_ * carry * cdf_d1
+        gamma = pdf_d1 * carry / (s * sigma_sqrt_t)
+        gamma_p = gamma * s / 100.0
+        vega = s * carry * pdf_d1 * sqrt_t
+        vega_p = sigma / 10.0 * vega
+        vanna = -carry * d2 * pdf_d1 / sigma
+        vomma = vega * d1_d2 / sigma
+        # greeks, lazily evaluated from the shared intermediates
+        dict_greeks = {
+            'price': lambda: price,
+            'delta': lambda: delta,
+            'gamma': lambda: gamma,
+            'gamma_p': lambda: gamma_p,
+            'theta': lambda: -s * carry * pdf_d1 * sigma / (2.0 * sqrt_t)
+            - sign_ * (b - r) * s * carry * cdf_d1
+            - sign_ * r * k * disc * cdf_d2,
+            'vega': lambda: vega,
+            'vega_p': lambda: vega_p,
+            'vega_elasticity': lambda: vega * sigma / price,
+            'rho': lambda: sign_ * t * k * disc * cdf_d2,
+            'lambda_greek': lambda: delta * s / price,
+            'vanna': lambda: vanna,
+            'vanna_vol': lambda: vanna / sigma * (d1_d2 - d1 / d2 - 1.0),
+            'charm': lambda: -carry
+            * (
+                pdf_d1 * (b / sigma_sqrt_t - d2 / (2.0 * t))
+                + sign_ * (b - r) * cdf_d1
+            ),
+            'zomma': lambda: gamma * (d1_d2 - 1.0) / sigma,
+            'zomma_p': lambda: gamma * (d1_d2 - 1.0) / sigma * s / 100.0,
+            'speed': lambda: -gamma * (1.0 + d1 / sigma_sqrt_t) / s,
+            'speed_p': lambda: -gamma * (1.0 + d1 / sigma_sqrt_t) / 100.0,
+            'color': lambda: -gamma
+            * (r - b + b * d1 / sigma_sqrt_t + (1.0 - d1_d2) / (2.0 * t)),
+            'color_p': lambda: -gamma_p
+            * (r - b + b * d1 / sigma_sqrt_t + (1.0 - d1_d2) / (2.0 * t)),
+            'vomma': lambda: vomma,
+            'vomma_p': lambda: vega_p * d1_d2 / sigma,
+            'ultima': lambda: vomma
+            / sigma
+            * (d1_d2 - d1 / d2 - d2 / d1 - 1.0),
+            'd_vega_d_time': lambda: vega
+            * (r - b + b * d1 / sigma_sqrt_t - (1.0 + d1_d2) / (2.0 * t)),
+            'variance_vega': lambda: vega / (2.0 * sigma),
+            'variance_vanna': lambda: -s
+            * carry
+            * pdf_d1
+            * d2
+            / (2.0 * sigma),
+            'variance_vomma': lambda: s
+            * carry
+            * sqrt_t
+            / (4.0 * sigma**3)
+            * pdf_d1
+            * (d1_d2 - 1.0),
+            'variance_ultima': lambda: s
+            * carry
+            * sqrt_t
+            / (8.0 * sigma**5)
+            * pdf_d1
+            * ((d1_d2 - 1.0) * (d1_d2 - 3.0) - (d1**2 + d2**2)),
+            'driftless_theta': lambda: -s * pdf_d1 * sigma / (2.0 * sqrt_t),
+            'theta_vega_relationship': lambda: -gamma * sigma / (2.0 * t),
+            'phi': lambda: -sign_ * t * s * carry * cdf_d1,
+            'carry_rho': lambda: sign_ * t * s * carry * cdf_d1,
+            'risk_neutral_prob_itm': lambda: cdf_d2,
+            'd_zeta_d_vol': lambda: -sign_ * pdf_d2 * d1 / sigma,
+            'd_zeta_d_time': lambda: sign_
+            * pdf_d2
+            * (b / sigma_sqrt_t - d1 / (2.0 * t)),
+            'risk_neutral_probability_density': lambda: pdf_d2
+            * disc
+            / (k * sigma_sqrt_t),
+        }
+        # validating requested greeks
+        if which is None:
+            which = list(dict_greeks.keys())
+        list_unknown = [
+            greek_ for greek_ in which if greek_ not in dict_greeks
+        ]
+        if len(list_unknown) > 0:
+            raise Exception(
+                'Greeks {} are not available, please consider {}'.format(
+                    list_unknown, list(dict_greeks.keys())
+                )
+            )
+        # returning greeks surface
+        return pd.DataFrame(
+            {greek_: dict_greeks[greek_]() for greek_ in which},
+            index=df_chain.index,
+        )
+
 
 class IterativeMethods(Greeks):
+    def backward_induction(
+        self,
+        s,
+        k,
+        r,
+        t,
+        n,
+        log_u,
+        log_d,
+        pu,
+        opt_type,
+        bl_american=False,
+        h_upper=None,
+        h_lower=None,
+        int_block_contracts=32,
+    ):
+        """
+        REFERENCES:
+            https://www.youtube.com/watch?v=a3906k9C0fM,
+            https://quantpy.com.au/binomial-tree-model/binomial-asset-pricing-model-choosing-parameters/
+        DOCSTRING: RECOMBINING BINOMIAL LATTICE FOR A BATCH OF CONTRACTS - OPTION VALUES LIVE IN
+            ONE PREALLOCATED (NODES X CONTRACTS) BUFFER, UPDATED IN PLACE AT EACH BACKWARD STEP,
+            AND NODE PRICES ARE BUILT FROM POWERS OF THE UP/DOWN RATIO COMPUTED ONCE - CONTRACTS
+            ARE PROCESSED IN BLOCKS, SO THAT THE BUFFERS FIT IN CPU CACHE
+        INPUTS: S (SPOT), K (STRIKE), R (RISK-FREE RATE), T (TIME TO MATURITY IN YEARS),
+            N (NODES, SHARED BY THE BATCH), LOG_U AND LOG_D (LOG OF UP AND DOWN FACTORS),
+            PU (UP PROBABILITY), OPTION STYLE (CALL/PUT), BL_AMERICAN (EARLY EXERCISE), UPPER/LOWER
+            BARRIERS CHECKED AT MATURITY - SCALARS OR ARRAYS BROADCASTING TOGETHER - AND NUMBER
+            OF CONTRACTS PER BLOCK
+        OUTPUTS: FLOAT, OR ARRAY FOR ARRAY INPUTS
+        """
+        # initial parameters - one entry per contract
+        bl_array = self.bl_array_like(s, k, r, t, log_u, log_d, pu, opt_type)
+        s, k, r, t, log_u, log_d, pu, sign_ = [
+            np.ravel(x)
+            for x in np.broadcast_arrays(
+                *[
+                    np.asarray(x, dtype=float)
+                    for x in [s, k, r, t, log_u, log_d, pu]
+                ],
+                self.opt_type_sign(opt_type),
+            )
+        ]
+        n = int(n)
+        # precompute constants per contract
+        disc = np.exp(-r * t / n)
+        disc_pu = disc * pu
+        disc_pd = disc * (1.0 - pu)
+        array_nodes = np.arange(n + 1, dtype=float)[:, None]
+        array_prices = np.empty(s.shape)
+        # buffers reused by every block of contracts
+        int_block = min(int_block_contracts, s.shape[0])
+        array_cp_buffer = np.empty((n + 1, int_block))
+        array_tmp_buffer = np.empty((n + 1, int_block))
+        array_pow_buffer = np.empty((n + 1, int_block))
+        for j in range(0, s.shape[0], int_block):
+            sl_ = slice(j, j + int_block)
+            int_width = s[sl_].shape[0]
+            array_cp = array_cp_buffer[:, :int_width]
+            array_tmp = array_tmp_buffer[:, :int_width]
+            array_pow = array_pow_buffer[:, :int_width]
+            #   powers of the up/down ratio, shared by every level of the tree
+            np.multiply(array_nodes, log_u[sl_] - log_d[sl_], out=array_pow)
+            np.exp(array_pow, out=array_pow)
+            #   option values at maturity - if intrinsic value is negative, consider zero
+            np.multiply(
+                s[sl_] * np.exp(n * log_d[sl_]), array_pow, out=array_tmp
+            )
+            np.subtract(array_tmp, k[sl_], out=array_cp)
+            array_cp *= sign_[sl_]
+            np.maximum(array_cp, 0.0, out=array_cp)
+            #   check s payoff, according to barriers, if values are different from none
+            if h_upper is not None:
+                array_cp[array_tmp >= h_upper] = 0.0
+            if h_lower is not None:
+                array_cp[array_tmp <= h_lower] = 0.0
+            #   step backwards through tree, in place - the lower nodes are overwritten only
+            #       after the upper ones have been copied to the scratch buffer
+            for i in range(n, 0, -1):
+                array_cp_i = array_cp[:i]
+                array_tmp_i = array_tmp[:i]
+                np.multiply(array_cp[1 : i + 1], disc_pu[sl_], out=array_tmp_i)
+                array_cp_i *= disc_pd[sl_]
+                array_cp_i += array_tmp_i
+                #   evaluating maximum value between fair and intrinsic value
+                if bl_american == True:
+                    np.multiply(
+                        s[sl_] * np.exp((i - 1) * log_d[sl_]),
+                        array_pow[:i],
+                        out=array_tmp_i,
+                    )
+                    array_tmp_i -= k[sl_]
+                    array_tmp_i *= sign_[sl_]
+                    np.maximum(array_cp_i, array_tmp_i, out=array_cp_i)
+            array_prices[sl_] = array_cp[0]
+        # returning the no-arbitrage price at node 0
+        if bl_array == True:
+            return array_prices
+        return float(array_prices[0])
+
     def binomial_pricing_model(
-        self, s, k, r, t, n, u, d, opt_type, h_upper=None, h_lower=None
+        self,
+        s,
+        k,
+        r,
+        t,
+        n,
+        u,
+        d,
+        opt_type,
+        h_upper=None,
+        h_lower=None,
+        bl_american=False,
     ):
         """
         REFERENCES:
@@ -1200,138 +1503,98 @@ class IterativeMethods(Greeks):
         DOCSTRING: BINOMIAL ASSET PRICING MODEL - UPPER/LOWER BARRIERS FEATURES IMPLEMENTED
         INPUTS: S0 (INITIAL STOCK PRICING MODEL), K (STRIKE PRICE), T (TIME TO MATURITY IN YEARS),
             R (ANNUAL RISK-FREE RATE), N (NODES), U (UP-FACTOR IN BINOMIAL MODELS), D (DOWN-FACTOR
-            - TO ENSURE RECOMBINING TREE USE 1/U), OPTION STYLE (CALL/PUT)
+            - TO ENSURE RECOMBINING TREE USE 1/U), OPTION STYLE (CALL/PUT) AND BL_AMERICAN
+            (EARLY EXERCISE) - ARRAYS OF CONTRACTS ARE PRICED IN A SINGLE LATTICE
         OUTPUTS: FLOAT FROM ARRAY_CP[0] (CALL-PUT PRICING FOR EACH NODE)
         """
         # initial parameters
-        s, k, r, t, n, u, d = self.set_parameters(
-            s, k, r, t, n, u, d, opt_type
-        )
+        s, k, r, t, n, u, d = self.set_parameters(s, k, r, t, n, u, d)
         # precomute constants
         dt = t / n
         q = (np.exp(r * dt) - d) / (u - d)
-        disc = np.exp(-r * dt)
-        # initialise asset prices at maturity - time step n
-        array_s_nodes = (
-            s * d ** (np.arange(n, -1, -1)) * u ** (np.arange(0, n + 1, 1))
-        )
-        # initialise option values at maturity - if intrinsic value is negative, consider zero
-        if opt_type == 'call':
-            array_cp = np.maximum(array_s_nodes - k, np.zeros(int(n) + 1))
-        else:
-            array_cp = np.maximum(k - array_s_nodes, np.zeros(int(n) + 1))
-        # check s payoff, according to barriers, if values are different from none
-        if h_upper != None:
-            array_cp[array_s_nodes >= h_upper] = 0
-        if h_lower != None:
-            array_cp[array_s_nodes <= h_lower] = 0
-        # step backwards recursion through tree
-        for i in np.arange(int(n), 0, -1):
-            array_cp = disc * (
-                q * array_cp[1 : i + 1] + (1.0 - q) * array_cp[0:i]
-            )
         # returning the no-arbitrage price at node 0
-        return array_cp[0]
+        return self.backward_induction(
+            s,
+            k,
+            r,
+            t,
+            n,
+            np.log(u),
+            np.log(d),
+            q,
+            opt_type,
+            bl_american=bl_american,
+            h_upper=h_upper,
+            h_lower=h_lower,
+        )
 
-    def crr_method(self, s, k, r, t, n, sigma, opt_type):
+    def crr_method(self, s, k, r, t, n, sigma, opt_type, bl_american=False):
         """
         REFERENCES:
             https://www.youtube.com/watch?v=nWslah9tHLk,
             https://quantpy.com.au/binomial-tree-model/binomial-asset-pricing-model-choosing-parameters/
         DOCSTRING: COX, ROSS AND RUBINSTEIN (CRR) METHOD
         INPUTS: SPOT (S), STRIKE (K), RISK-FREE RATE (R), T (TIME TO MATURITY IN YEARS), N (NODES),
-            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT)
+            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT) AND BL_AMERICAN
+            (EARLY EXERCISE)
         OUTPUTS: FLOAT
         """
         # initial parameters
-        s, k, r, t, n, sigma = self.set_parameters(
-            s, k, r, t, n, sigma, opt_type
-        )
+        s, k, r, t, n, sigma = self.set_parameters(s, k, r, t, n, sigma)
         # precomute constants
         dt = t / n
-        u = np.exp(sigma * np.sqrt(dt))
+        log_u = sigma * np.sqrt(dt)
+        u = np.exp(log_u)
         d = 1 / u
         q = (np.exp(r * dt) - d) / (u - d)
-        disc = np.exp(-r * dt)
-        # initialise asset prices at maturity - Time step N
-        array_s_nodes = np.zeros(int(n) + 1)
-        array_s_nodes[0] = s * d**n
-        for j in range(1, int(n) + 1):
-            array_s_nodes[j] = array_s_nodes[j - 1] * u / d
-        # initialise option values at maturity
-        array_cp = np.zeros(int(n) + 1)
-        for j in range(0, int(n) + 1):
-            #   evaluating maximum value between fair and intrinsic value
-            if opt_type == 'call':
-                array_cp = np.maximum(array_cp, array_s_nodes - k)
-            else:
-                array_cp = np.maximum(array_cp, k - array_s_nodes)
-        # step backwards through tree
-        for i in np.arange(int(n), 0, -1):
-            for j in range(0, i):
-                array_cp[j] = disc * (
-                    q * array_cp[j + 1] + (1 - q) * array_cp[j]
-                )
         # returning the no-arbitrage price at node 0
-        return array_cp[0]
+        return self.backward_induction(
+            s, k, r, t, n, log_u, -log_u, q, opt_type, bl_american=bl_american
+        )
 
-    def jr_method(self, s, k, r, t, n, sigma, opt_type):
+    def jr_method(self, s, k, r, t, n, sigma, opt_type, bl_american=False):
         """
         REFERENCES:
             https://www.youtube.com/watch?v=nWslah9tHLk,
             https://quantpy.com.au/binomial-tree-model/binomial-asset-pricing-model-choosing-parameters/
         DOCSTRING: JARROW AND RUDD (JR) METHOD
         INPUTS: SPOT (S), STRIKE (K), RISK-FREE RATE (R), T (TIME TO MATURITY IN YEARS), N (NODES),
-            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT)
+            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT) AND BL_AMERICAN
+            (EARLY EXERCISE)
         OUTPUTS: FLOAT
         """
         # initial parameters
-        s, k, r, t, n, sigma = self.set_parameters(
-            s, k, r, t, n, sigma, opt_type
-        )
+        s, k, r, t, n, sigma = self.set_parameters(s, k, r, t, n, sigma)
         # precomute constants
         dt = t / n
         nu = r - 0.5 * sigma**2
-        u = np.exp(nu * dt + sigma * np.sqrt(dt))
-        d = np.exp(nu * dt - sigma * np.sqrt(dt))
-        q = 0.5
-        disc = np.exp(-r * dt)
-        # initialise asset prices at maturity - Time step N
-        array_s_nodes = np.zeros(int(n) + 1)
-        array_s_nodes[0] = s * d**n
-        for j in range(1, int(n) + 1):
-            array_s_nodes[j] = array_s_nodes[j - 1] * u / d
-        # initialise option values at maturity
-        array_cp = np.zeros(int(n) + 1)
-        for j in range(0, int(n) + 1):
-            #   evaluating maximum value between fair and intrinsic value
-            if opt_type == 'call':
-                array_cp = np.maximum(array_cp, array_s_nodes - k)
-            else:
-                array_cp = np.maximum(array_cp, k - array_s_nodes)
-        # step backwards through tree
-        for i in np.arange(int(n), 0, -1):
-            for j in range(0, i):
-                array_cp[j] = disc * (
-                    q * array_cp[j + 1] + (1 - q) * array_cp[j]
-                )
         # returning the no-arbitrage price at node 0
-        return array_cp[0]
+        return self.backward_induction(
+            s,
+            k,
+            r,
+            t,
+            n,
+            nu * dt + sigma * np.sqrt(dt),
+            nu * dt - sigma * np.sqrt(dt),
+            0.5,
+            opt_type,
+            bl_american=bl_american,
+        )
 
-    def eqp_method(self, s, k, r, t, n, sigma, opt_type):
+    def eqp_method(self, s, k, r, t, n, sigma, opt_type, bl_american=False):
         """
         REFERENCES:
             https://www.youtube.com/watch?v=nWslah9tHLk,
             https://quantpy.com.au/binomial-tree-model/binomial-asset-pricing-model-choosing-parameters/
         DOCSTRING: EQUAL PROBABILITIES (EQP) METHOD
         INPUTS: SPOT (S), STRIKE (K), RISK-FREE RATE (R), T (TIME TO MATURITY IN YEARS), N (NODES),
-            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT)
+            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT) AND BL_AMERICAN
+            (EARLY EXERCISE)
         OUTPUTS: FLOAT
         """
         # initial parameters
-        s, k, r, t, n, sigma = self.set_parameters(
-            s, k, r, t, n, sigma, opt_type
-        )
+        s, k, r, t, n, sigma = self.set_parameters(s, k, r, t, n, sigma)
         # precomute constants
         dt = t / n
         nu = r - 0.5 * sigma**2
@@ -1341,74 +1604,42 @@ class IterativeMethods(Greeks):
         dxd = 1.5 * nu * dt - 0.5 * np.sqrt(
             4 * sigma**2 * dt - 3 * nu**2 * dt**2
         )
-        pu = 0.5
-        pd = 1 - pu
-        disc = np.exp(-r * dt)
-        # initialise asset prices at maturity - Time step N
-        array_s_nodes = np.zeros(int(n) + 1)
-        array_s_nodes[0] = s * np.exp(n * dxd)
-        for j in range(1, int(n) + 1):
-            array_s_nodes[j] = array_s_nodes[j - 1] * np.exp(dxu - dxd)
-        # initialise option values at maturity
-        array_cp = np.zeros(int(n) + 1)
-        for j in range(0, int(n) + 1):
-            #   evaluating maximum value between fair and intrinsic value
-            if opt_type == 'call':
-                array_cp = np.maximum(array_cp, array_s_nodes - k)
-            else:
-                array_cp = np.maximum(array_cp, k - array_s_nodes)
-        # step backwards through tree
-        for i in np.arange(int(n), 0, -1):
-            for j in range(0, i):
-                array_cp[j] = disc * (pu * array_cp[j + 1] + pd * array_cp[j])
         # returning the no-arbitrage price at node 0
-        return array_cp[0]
+        return self.backward_induction(
+            s, k, r, t, n, dxu, dxd, 0.5, opt_type, bl_american=bl_american
+        )
 
-    def trg_method(self, s, k, r, t, n, sigma, opt_type):
+    def trg_method(self, s, k, r, t, n, sigma, opt_type, bl_american=False):
         """
         REFERENCES:
             https://www.youtube.com/watch?v=nWslah9tHLk,
             https://quantpy.com.au/binomial-tree-model/binomial-asset-pricing-model-choosing-parameters/
         DOCSTRING: TRIGEORGIS (TRG) METHOD
         INPUTS: SPOT (S), STRIKE (K), RISK-FREE RATE (R), T (TIME TO MATURITY IN YEARS), N (NODES),
-            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT)
+            SIGMA (VOLATILITY OF UNDERLYING ASSET), OPTION STYLE (CALL/PUT) AND BL_AMERICAN
+            (EARLY EXERCISE)
         OUTPUTS: FLOAT
         """
         # initial parameters
-        s, k, r, t, n, sigma = self.set_parameters(
-            s, k, r, t, n, sigma, opt_type
-        )
+        s, k, r, t, n, sigma = self.set_parameters(s, k, r, t, n, sigma)
         # precomute constants
         dt = t / n
         nu = r - 0.5 * sigma**2
         dxu = np.sqrt(sigma**2 * dt + nu**2 * dt**2)
-        dxd = -dxu
         pu = 0.5 + 0.5 * nu * dt / dxu
-        pd = 1 - pu
-        disc = np.exp(-r * dt)
-        # initialise asset prices at maturity - Time step N
-        array_s_nodes = np.zeros(int(n) + 1)
-        array_s_nodes[0] = s * np.exp(n * dxd)
-        for j in range(1, int(n) + 1):
-            array_s_nodes[j] = array_s_nodes[j - 1] * np.exp(dxu - dxd)
-        # initialise option values at maturity
-        array_cp = np.zeros(int(n) + 1)
-        for j in range(0, int(n) + 1):
-            #   evaluating maximum value between fair and intrinsic value
-            if opt_type == 'call':
-                array_cp = np.maximum(array_cp, array_s_nodes - k)
-            else:
-                array_cp = np.maximum(array_cp, k - array_s_nodes)
-        # step backwards through tree
-        for i in np.arange(int(n), 0, -1):
-            for j in range(0, i):
-                array_cp[j] = disc * (pu * array_cp[j + 1] + pd * array_cp[j])
         # returning the no-arbitrage price at node 0
-        return array_cp[0]
+        return self.backward_induction(
+            s, k, r, t, n, dxu, -dxu, pu, opt_type, bl_american=bl_american
+        )
 
 
 class EuropeanOptions(IterativeMethods):
-    @lru_cache()
+    # status codes of the batch implied volatility solver
+    INT_IV_CONVERGED = 0
+    INT_IV_ARBITRAGE = 1
+    INT_IV_NOT_CONVERGED = 2
+    INT_IV_ZERO_VEGA = 3
+
     def implied_volatility(
         self,
         s,
@@ -1425,7 +1656,7 @@ class EuropeanOptions(IterativeMethods):
         epsilon=1,
         max_iter=1000,
         orig_vol=0.5,
-        list_bounds=[(0, 2)],
+        list_bounds=None,
     ):
         """
         REFERENCES: https://www.youtube.com/watch?v=Jpy3iCsijIU,
@@ -1438,6 +1669,8 @@ class EuropeanOptions(IterativeMethods):
         s, k, r, t, sigma, q, b, cp0 = self.set_parameters(
             s, k, r, t, sigma, q, b, cp0, opt_type
         )
+        if list_bounds is None:
+            list_bounds = [(0, 2)]
         count = 0
         if method == 'newton_raphson':
             # iterating until the error is meaningless
@@ -1539,6 +1772,139 @@ class EuropeanOptions(IterativeMethods):
                 + 'recognized, please revisit the parameter'
             )
 
+    def implied_volatility_batch(
+        self,
+        s,
+        k,
+        r,
+        t,
+        q,
+        b,
+        cp0,
+        opt_type,
+        tolerance=1e-10,
+        max_iter=100,
+        float_vol_lower=1e-6,
+        float_vol_upper=10.0,
+        float_vega_min=1e-12,
+    ):
+        """
+        REFERENCES: https://en.wikipedia.org/wiki/Newton%27s_method,
+            CORRADO, C. J.; MILLER, T. W. - A NOTE ON A SIMPLE, ACCURATE FORMULA TO COMPUTE
+            IMPLIED STANDARD DEVIATIONS (1996)
+        DOCSTRING: IMPLIED VOLATILITY FOR A WHOLE OPTION CHAIN AT ONCE - NEWTON-RAPHSON ITERATIONS
+            SAFEGUARDED BY A PER-CONTRACT VOLATILITY BRACKET (BISECTION WHENEVER THE NEWTON STEP
+            LEAVES IT OR VEGA VANISHES), STARTING FROM CORRADO-MILLER'S RATIONAL GUESS - ONLY
+            CONTRACTS NOT YET CONVERGED ARE REPRICED AT EACH ITERATION
+        INPUTS: S (SPOT PRICE), K (STRIKE), R (INTEREST RATE), T (TIME TO MATURITY),
+            Q (DIVIDEND YIELD), B (COST OF CARRY), CP0 (OPTION MARKET PRICE) AND OPTION STYLE
+            (CALL/PUT) - SCALARS OR ARRAYS BROADCASTING TOGETHER -, TOLERANCE (OVER THE
+            VOLATILITY), MAXIMUM ITERATIONS, VOLATILITY BRACKET AND MINIMUM VEGA FOR NEWTON STEPS
+        OUTPUTS: TUPLE WITH ARRAY OF IMPLIED VOLATILITIES (NAN FOR NO-ARBITRAGE VIOLATIONS AND
+            PRICES WITHOUT TIME VALUE) AND
+            ARRAY OF STATUS CODES (INT_IV_CONVERGED, INT_IV_ARBITRAGE, INT_IV_NOT_CONVERGED OR
+            INT_IV_ZERO_VEGA)
+        """
+        # initial parameters - contract terms broadcasted to the chain shape
+        s, k, r, t, q, b, cp0 = np.broadcast_arrays(
+            *[np.asarray(x, dtype=float) for x in [s, k, r, t, q, b, cp0]]
+        )
+        sign_ = np.broadcast_to(self.opt_type_sign(opt_type), s.shape)
+        tup_shape = s.shape
+        s, k, r, t, b, cp0, sign_ = [
+            np.ravel(x) for x in [s, k, r, t, b, cp0, sign_]
+        ]
+        # no-arbitrage bounds of the option price
+        s_carry = s * np.exp((b - r) * t)
+        k_disc = k * np.exp(-r * t)
+        array_lower = np.maximum(sign_ * (s_carry - k_disc), 0.0)
+        array_upper = np.where(sign_ > 0.0, s_carry, k_disc)
+        array_status = np.full(s.shape, self.INT_IV_NOT_CONVERGED)
+        mask_arbitrage = (
+            ~np.isfinite(cp0)
+            | (t <= 0.0)
+            | (cp0 < array_lower - tolerance)
+            | (cp0 >= array_upper)
+        )
+        array_status[mask_arbitrage] = self.INT_IV_ARBITRAGE
+        # prices without time value are only matched by a vanishing volatility (zero vega)
+        mask_no_time_value = ~mask_arbitrage & (cp0 <= array_lower)
+        array_status[mask_no_time_value] = self.INT_IV_ZERO_VEGA
+        # initial guess - corrado-miller, over the call price given by the put-call parity
+        c0 = cp0 + (sign_ < 0.0) * (s_carry - k_disc)
+        x = c0 - (s_carry - k_disc) / 2.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            array_sigma = (
+                np.sqrt(2.0 * pi)
+                / (s_carry + k_disc)
+                * (
+                    x
+                    + np.sqrt(
+                        np.maximum(x**2 - (s_carry - k_disc) ** 2 / pi, 0.0)
+                    )
+                )
+                / np.sqrt(t)
+            )
+        array_sigma = np.where(
+            np.isfinite(array_sigma)
+            & (array_sigma > float_vol_lower)
+            & (array_sigma < float_vol_upper),
+            array_sigma,
+            0.3,
+        )
+        array_lo = np.full(s.shape, float_vol_lower)
+        array_hi = np.full(s.shape, float_vol_upper)
+        array_vega = np.zeros(s.shape)
+        mask_active = ~mask_arbitrage & ~mask_no_time_value
+        # iterating only over the contracts not yet converged
+        for _ in range(max_iter):
+            idx = np.flatnonzero(mask_active)
+            if idx.size == 0:
+                break
+            sigma_, t_, sqrt_t = array_sigma[idx], t[idx], np.sqrt(t[idx])
+            d1 = (
+                np.log(s[idx] / k[idx]) + (b[idx] + sigma_**2 / 2.0) * t_
+            ) / (sigma_ * sqrt_t)
+            d2 = d1 - sigma_ * sqrt_t
+            diff = (
+                sign_[idx]
+                * (
+                    s_carry[idx] * NormalDistribution().cdf(sign_[idx] * d1)
+                    - k_disc[idx] * NormalDistribution().cdf(sign_[idx] * d2)
+                )
+                - cp0[idx]
+            )
+            vega = s_carry[idx] * NormalDistribution().phi(d1) * sqrt_t
+            array_vega[idx] = vega
+            #   shrinking the bracket - the price is increasing in volatility
+            lo = np.where(diff < 0.0, sigma_, array_lo[idx])
+            hi = np.where(diff > 0.0, sigma_, array_hi[idx])
+            array_lo[idx], array_hi[idx] = lo, hi
+            #   convergence, either by the newton step size or by a collapsed bracket
+            mask_conv = (np.abs(diff) < tolerance * vega) | (
+                hi - lo < tolerance
+            )
+            array_status[idx[mask_conv]] = self.INT_IV_CONVERGED
+            mask_active[idx[mask_conv]] = False
+            #   newton step, falling back to bisection outside the bracket or with vanishing vega
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sigma_newton = sigma_ - diff / vega
+            mask_bisection = (
+                (vega < float_vega_min)
+                | ~(sigma_newton > lo)
+                | ~(sigma_newton < hi)
+            )
+            array_sigma[idx[~mask_conv]] = np.where(
+                mask_bisection, (lo + hi) / 2.0, sigma_newton
+            )[~mask_conv]
+        # flagging contracts that did not converge, due to vanishing vega or iterations exhausted
+        array_status[
+            mask_active & (array_vega < float_vega_min)
+        ] = self.INT_IV_ZERO_VEGA
+        array_sigma[mask_arbitrage | mask_no_time_value] = np.nan
+        # returning implied volatilities and status codes
+        return array_sigma.reshape(tup_shape), array_status.reshape(tup_shape)
+
     def moneyness(self, s, k, r, t, sigma, q):
         """
         REFERENCES: MERCADO DE OPÇÕES, CONCEITOS E ESTRATÉGIAS / AUTOR: LUIZ MAURÍCIO DA SILVA /
@@ -2,19 +2,20 @@
 
 import math
 from datetime import datetime
-from itertools import combinations
 from typing import Any, Dict, List, Optional, Tuple
 
 import cvxopt as opt
 import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
+from scipy.signal import lfilter
 
 from stpstone.finance.b3.search_by_trading import TradingFilesB3
 from stpstone.finance.spot.stocks import ValuingStocks
 from stpstone.handling_data.json import JsonFiles
 from stpstone.handling_data.lists import HandlingLists
 from stpstone.handling_data.numbers import NumHandler
+from stpstone.multithreading.mp_helper import mp_run_parallel
 from stpstone.quantitative_methods.linear_algebra import LinearAlgebra
 from stpstone.quantitative_methods.prob_distributions import NormalDistribution
 
@@ -23,14 +24,36 @@ class MarketRiskManagement:
     def prices_base_normalizer(self, list_returns, base=100):
         """
         DOCSTRING: RETURNS AS PRICES, PRESERVING DISTANCES THAT WOULD PRESENT THE GIVEN RETURNS
-        INPUTS: RETURNS AND BASE
-        OUTPUTS: ARRAY
-        """
-        # Converts returns into prices
-        s = [base]
-        for i in range(len(list_returns)):
-            s.append(base * (1 + list_returns[i]))
-        return np.array(s)
+        INPUTS: RETURNS (1-D, OR 2-D AS DATES X ASSETS) AND BASE
+        OUTPUTS: ARRAY, WITH THE BASE AS THE FIRST ROW
+        """
+        # compounding the returns over the base, along the dates axis
+        array_returns = np.asarray(list_returns, dtype=float)
+        return base * np.concatenate(
+            [
+                np.ones((1,) + array_returns.shape[1:]),
+                np.cumprod(1.0 + array_returns, axis=0),
+            ]
+        )
+
+    def prices_from_inputs(
+        self, list_original_prices=None, list_returns=None, prices_base=100
+    ):
+        """
+        DOCSTRING: PRICES FROM EITHER ORIGINAL PRICES OR RETURNS - ONLY ONE OF THEM OUGHT BE
+            PROVIDED
+        INPUTS: ORIGINAL PRICES, RETURNS (1-D, OR 2-D AS DATES X ASSETS) AND PRICES BASE
+            (100 AS DEFAULT)
+        OUTPUTS: ARRAY OF FLOATS
+        """
+        if (list_original_prices is None) == (list_returns is None):
+            raise Exception(
+                'Please revisit original prices and returns arguments; only one '
+                'of them ought be different from none'
+            )
+        if list_original_prices is not None:
+            return np.asarray(list_original_prices, dtype=float)
+        return self.prices_base_normalizer(list_returns, prices_base)
 
     def beta(self, list_returns, list_market):
         """
@@ -278,66 +301,198 @@ class MarketRiskManagement:
         INPUTS: RETURNS, TAU (TIME PERIOD) AND PRICES BASE (100 AS DEFAULT)
         OUTPUTS: FLOAT
         """
-        # returns the drawdown given time period tau
-        if list_returns:
-            values = MarketRiskManagement().prices_base_normalizer(
-                list_returns, prices_base
-            )
-        if list_original_prices:
-            values = list_original_prices
-        if all([x != None for x in [list_original_prices, list_returns]]):
-            raise Exception(
-                'Please revisit original prices and returns arguments; only one '
-                'of them ought be different from none'
-            )
-        pos = len(values) - 1
-        pre = pos - tau
-        drawdown = float('+inf')
-        # find the maximum drawdown given tau
-        while pre >= 0:
-            dd_i = (values[pos] / values[pre]) - 1
-            if dd_i < drawdown:
-                drawdown = dd_i
-            pos, pre = pos - 1, pre - 1
-        # drawdown should be positive
-        return abs(drawdown)
+        values = self.prices_from_inputs(
+            list_original_prices, list_returns, prices_base
+        )
+        # no pair of prices tau periods apart
+        if tau >= len(values):
+            return float('inf')
+        if tau == 0:
+            return 0.0
+        # the lowest return among the prices tau periods apart - drawdown should be positive
+        return abs(float(np.min(values[tau:] / values[:-tau] - 1.0)))
+
+    def drawdown_series(
+        self, list_original_prices=None, list_returns=None, prices_base=100
+    ):
+        """
+        DOCSTRING: DRAWDOWN SERIES, OR DECREASE FROM THE RUNNING PEAK OF PRICES, IN A SINGLE PASS
+        INPUTS: ORIGINAL PRICES OR RETURNS (1-D, OR 2-D AS DATES X ASSETS) AND PRICES BASE
+            (100 AS DEFAULT)
+        OUTPUTS: ARRAY OF FLOATS (POSITIVE DRAWDOWNS), WITH THE SHAPE OF THE PRICES
+        """
+        array_prices = self.prices_from_inputs(
+            list_original_prices, list_returns, prices_base
+        )
+        return 1.0 - array_prices / np.maximum.accumulate(array_prices, axis=0)
 
     def max_drawdown(
         self, list_original_prices=None, list_returns=None, prices_base=100
     ):
         """
-        DOCSTRING: MAXIMUM DRAW DOWN FOR A GIVEN PORTFOLIO
-        INPUTS: RETURNS
-        OUTPUTS: FLOAT
+        DOCSTRING: MAXIMUM DRAW DOWN FOR A GIVEN PORTFOLIO, AS THE LARGEST DECREASE FROM THE
+            RUNNING PEAK OF PRICES (SINGLE PASS)
+        INPUTS: ORIGINAL PRICES OR RETURNS (1-D, OR 2-D AS DATES X ASSETS) AND PRICES BASE
+            (100 AS DEFAULT)
+        OUTPUTS: FLOAT, OR ARRAY OF FLOATS PER ASSET FOR 2-D INPUTS
         """
-        # returns the maximum drawdown for any tau in (0, T) where T is the length of
-        #   the return series
-        max_drawdown = float('-inf')
-        # number of occurrencies in the sample
-        if list_original_prices:
-            len_observations_data = len(list_original_prices)
-        elif list_returns:
-            len_observations_data = len(list_returns)
-        else:
+        if list_original_prices is None and list_returns is None:
             raise Exception(
                 'List of original prices or returns ought be provided'
             )
-        for i in range(len_observations_data):
-            drawdown_i = MarketRiskManagement().drawdown(
-                i, list_original_prices, list_returns, prices_base
+        array_mdd = np.max(
+            self.drawdown_series(
+                list_original_prices, list_returns, prices_base
+            ),
+            axis=0,
+        )
+        if np.ndim(array_mdd) == 0:
+            return float(array_mdd)
+        return array_mdd
+
+    def drawdown_duration_recovery(
+        self, list_original_prices=None, list_returns=None, prices_base=100
+    ):
+        """
+        DOCSTRING: MAXIMUM DRAWDOWN WITH ITS PEAK, TROUGH AND RECOVERY POSITIONS, DURATION (PEAK
+            TO TROUGH), RECOVERY TIME (TROUGH TO THE FIRST PRICE BACK AT THE PEAK, -1 WHEN THE
+            PRICES HAVE NOT RECOVERED) AND LONGEST UNDERWATER PERIOD (PERIODS BELOW A FORMER PEAK)
+        INPUTS: ORIGINAL PRICES OR RETURNS (1-D, OR 2-D AS DATES X ASSETS) AND PRICES BASE
+            (100 AS DEFAULT)
+        OUTPUTS: DICTIONARY - INTEGERS AND FLOATS, OR ARRAYS PER ASSET FOR 2-D INPUTS
+        """
+        array_prices = self.prices_from_inputs(
+            list_original_prices, list_returns, prices_base
+        )
+        bl_1d = array_prices.ndim == 1
+        array_prices = array_prices.reshape(len(array_prices), -1)
+        array_idx = np.arange(len(array_prices))[:, None]
+        array_cummax = np.maximum.accumulate(array_prices, axis=0)
+        array_dd = 1.0 - array_prices / array_cummax
+        # trough - deepest drawdown; peak - last running maximum before the trough
+        array_trough = np.argmax(array_dd, axis=0)
+        array_cols = np.arange(array_prices.shape[1])
+        array_peak = np.max(
+            np.where(
+                (array_prices == array_cummax)
+                & (array_idx <= array_trough[None, :]),
+                array_idx,
+                0,
+            ),
+            axis=0,
+        )
+        # recovery - first price after the trough back at the peak level
+        array_bl_recovered = (array_idx > array_trough[None, :]) & (
+            array_prices >= array_prices[array_peak, array_cols][None, :]
+        )
+        array_recovery = np.where(
+            array_bl_recovered.any(axis=0),
+            np.argmax(array_bl_recovered, axis=0),
+            -1,
+        )
+        # without drawdown, the prices never left the peak
+        array_recovery = np.where(
+            array_dd[array_trough, array_cols] == 0.0,
+            array_trough,
+            array_recovery,
+        )
+        # longest underwater period - longest run of dates below the running peak, from the
+        #   positions of the last date at the peak
+        array_last_peak = np.maximum.accumulate(
+            np.where(array_dd == 0.0, array_idx, 0), axis=0
+        )
+        array_underwater = np.max(array_idx - array_last_peak, axis=0)
+        dict_ = {
+            'max_drawdown': array_dd[array_trough, array_cols],
+            'peak': array_peak,
+            'trough': array_trough,
+            'recovery': array_recovery,
+            'duration': array_trough - array_peak,
+            'recovery_time': np.where(
+                array_recovery >= 0, array_recovery - array_trough, -1
+            ),
+            'max_underwater_period': array_underwater,
+        }
+        if bl_1d == True:
+            return {k: v[0].item() for k, v in dict_.items()}
+        return dict_
+
+    def rolling_drawdown(
+        self,
+        int_window,
+        list_original_prices=None,
+        list_returns=None,
+        prices_base=100,
+    ):
+        """
+        DOCSTRING: ROLLING DRAWDOWN SERIES, OR DECREASE FROM THE PEAK OF PRICES WITHIN THE
+            TRAILING WINDOW (SHORTER WINDOWS AT THE BEGINNING OF THE SAMPLE)
+        INPUTS: WINDOW SIZE (NUMBER OF PRICES), ORIGINAL PRICES OR RETURNS (1-D, OR 2-D AS
+            DATES X ASSETS) AND PRICES BASE (100 AS DEFAULT)
+        OUTPUTS: ARRAY OF FLOATS (POSITIVE DRAWDOWNS), WITH THE SHAPE OF THE PRICES
+        """
+        array_prices = self.prices_from_inputs(
+            list_original_prices, list_returns, prices_base
+        )
+        array_rolling_max = (
+            pd.DataFrame(array_prices.reshape(len(array_prices), -1))
+            .rolling(int_window, min_periods=1)
+            .max()
+            .values.reshape(array_prices.shape)
+        )
+        return 1.0 - array_prices / array_rolling_max
+
+    def rolling_max_drawdown(
+        self,
+        int_window,
+        list_original_prices=None,
+        list_returns=None,
+        prices_base=100,
+        int_block_assets=16,
+    ):
+        """
+        DOCSTRING: ROLLING MAXIMUM DRAWDOWN, OR MAXIMUM DRAWDOWN WITHIN EACH TRAILING WINDOW OF
+            PRICES (NAN WHILE THE WINDOW IS NOT COMPLETE)
+        INPUTS: WINDOW SIZE (NUMBER OF PRICES), ORIGINAL PRICES OR RETURNS (1-D, OR 2-D AS
+            DATES X ASSETS), PRICES BASE (100 AS DEFAULT) AND NUMBER OF ASSETS PER BLOCK
+            (16 AS DEFAULT, KEEPING THE BUFFERS IN CACHE)
+        OUTPUTS: ARRAY OF FLOATS, WITH THE SHAPE OF THE PRICES
+        """
+        array_prices = self.prices_from_inputs(
+            list_original_prices, list_returns, prices_base
+        )
+        array_prices_2d = array_prices.reshape(len(array_prices), -1)
+        array_rolling_mdd = np.full(array_prices_2d.shape, np.nan)
+        int_windows = len(array_prices_2d) - int_window + 1
+        if int_windows <= 0:
+            return array_rolling_mdd.reshape(array_prices.shape)
+        for int_col in range(0, array_prices_2d.shape[1], int_block_assets):
+            array_block = np.ascontiguousarray(
+                array_prices_2d[:, int_col : int_col + int_block_assets]
             )
-            if drawdown_i > max_drawdown:
-                max_drawdown = drawdown_i
-        # max drawdown should be positive
-        return abs(max_drawdown)
+            # walking every window at once, one position at a time: running peak and lowest
+            #   price-to-peak ratio of all windows, indexed by their first date, in place
+            array_peak = array_block[:int_windows].copy()
+            array_min_ratio = np.ones(array_peak.shape)
+            array_ratio = np.empty(array_peak.shape)
+            for j in range(1, int_window):
+                array_curr = array_block[j : j + int_windows]
+                np.maximum(array_peak, array_curr, out=array_peak)
+                np.divide(array_curr, array_peak, out=array_ratio)
+                np.minimum(array_min_ratio, array_ratio, out=array_min_ratio)
+            array_rolling_mdd[
+                int_window - 1 :, int_col : int_col + int_block_assets
+            ] = (1.0 - array_min_ratio)
+        return array_rolling_mdd.reshape(array_prices.shape)
 
     def ewma(self, list_daily_returns, int_wdy=252, accuracy=0.01):
         """
         REFERENCES: https://www.investopedia.com/articles/07/ewma.asp
         DOCSTRING: EXPONENTIALLY WEIGHTED MOVING AVERAGE
-        INPUTS: DAILY RETURNS, LAMBDA SMOOTHING PARAMETER (BY DEFAULT 94%, ACCORDING TO
-            RISKMETRICS)
-        OUTPUTS:
+        INPUTS: DAILY PRICES (1-D, OR 2-D AS DATES X ASSETS), WORKING DAYS IN A YEAR AND
+            ACCURACY, DEFINING THE LAMBDA SMOOTHING PARAMETER BY THE NUMBER OF OBSERVATIONS
+        OUTPUTS: JSON WITH DAILY AND YEARLY VARIANCE AND STANDARD DEVIATION (LISTS PER ASSET
+            FOR 2-D PRICES) - FOR COVARIANCES AND INCREMENTAL UPDATES, SEE EWMACOVARIANCE
         """
         # number of observations precision-wise
         list_accuracy_0_01 = [44, 49, 55, 63, 74, 90, 113, 151, 228, 458]
@@ -365,44 +520,26 @@ class MarketRiskManagement:
                 'Poor defined variable accuracy, please make sure its within '
                 + '[0.01, 0.001, 0.0001] possible values'
             )
-        # periodic returns
-        u_ln_returns = [
-            ValuingStocks().continuous_return(
-                list_daily_returns[p - 1], list_daily_returns[p]
-            )
-            for p in range(1, len(list_daily_returns))
-        ]
-        # array_weights
-        array_weights = [
-            (1 - lamba_smoothing_parameter)
-            * lamba_smoothing_parameter ** (d - 1)
-            for d in range(1, len(list_daily_returns))
-        ]
-        array_weights.reverse()
-        # ewma daily contributions
-        if len(u_ln_returns) == len(array_weights):
-            ewma_daily_contributions_list = [
-                array_weights[i] * u_ln_returns[i] ** 2
-                for i in range(len(u_ln_returns))
-            ]
-        else:
-            return (
-                'Please check wheter daily returns and array_weights list are the same size and '
-                'try again.'
-            )
+        # periodic continuous returns and weights, the latest return weighted by (1 - lambda)
+        #   - prices are 1-D, or 2-D as dates x assets
+        array_ln_returns = np.diff(
+            np.log(np.asarray(list_daily_returns, dtype=float)), axis=0
+        )
+        array_weights = (1.0 - lamba_smoothing_parameter) * (
+            lamba_smoothing_parameter
+            ** np.arange(len(array_ln_returns) - 1, -1, -1)
+        )
         # variance and standard deviation ewma-wise
+        array_var = array_weights @ array_ln_returns**2
         dict_message = {
-            'variance_ewma_daily': sum(ewma_daily_contributions_list),
-            'std_ewma_daily': math.sqrt(sum(ewma_daily_contributions_list)),
-            'variance_ewma_yearly': (
-                math.sqrt(sum(ewma_daily_contributions_list))
-                * math.sqrt(int_wdy)
-            )
-            ** 2,
-            'std_ewma_yearly': math.sqrt(sum(ewma_daily_contributions_list))
-            * math.sqrt(int_wdy),
+            'variance_ewma_daily': array_var,
+            'std_ewma_daily': np.sqrt(array_var),
+            'variance_ewma_yearly': array_var * int_wdy,
+            'std_ewma_yearly': np.sqrt(array_var * int_wdy),
         }
-        return JsonFiles().send_json(dict_message)
+        return JsonFiles().send_json(
+            {k: v.tolist() for k, v in dict_message.items()}
+        )
 
     def systematic_specific_risk(
         self,
@@ -429,6 +566,428 @@ class MarketRiskManagement:
         }
 
 
+class EWMACovariance:
+    """
+    REFERENCES: RiskMetrics - Technical Document (J.P. Morgan/Reuters, 1996), section 5.2
+    DOCSTRING: RISKMETRICS EWMA COVARIANCE MATRIX OF A DATES X ASSETS MATRIX OF RETURNS, WITH
+        INCREMENTAL UPDATES - SIGMA_T = LAMBDA * SIGMA_T-1 + (1 - LAMBDA) * R_T * R_T' - IN
+        O(ASSETS^2), WITHOUT RECOMPUTING THE HISTORY
+    INPUTS: LAMBDA SMOOTHING PARAMETER (0.94 AS DEFAULT, ACCORDING TO RISKMETRICS), WORKING
+        DAYS IN A YEAR (252 AS DEFAULT) AND SEED COVARIANCE MATRIX (NONE AS DEFAULT, OR ZEROS,
+        CONSISTENT WITH MARKETRISKMANAGEMENT.EWMA)
+    OUTPUTS: -
+    """
+
+    def __init__(
+        self,
+        float_lambda: float = 0.94,
+        int_wdy: int = 252,
+        array_cov_seed: Optional[np.ndarray] = None,
+    ) -> None:
+        if not 0.0 < float_lambda < 1.0:
+            raise Exception(
+                'Lambda smoothing parameter ought be within (0, 1), please revisit'
+            )
+        self.float_lambda = float_lambda
+        self.int_wdy = int_wdy
+        self.array_cov_seed = array_cov_seed
+        self.array_cov = None
+        self.list_assets = None
+        self.int_n_obs = 0
+
+    def log_returns(self, array_prices: Any) -> Any:
+        """
+        DOCSTRING: CONTINUOUS RETURNS OF A DATES X ASSETS MATRIX OF PRICES
+        INPUTS: PRICES (NUMPY ARRAY OR PANDAS DATAFRAME)
+        OUTPUTS: RETURNS, WITH ONE DATE LESS (SAME TYPE AS THE INPUT)
+        """
+        if isinstance(array_prices, pd.DataFrame):
+            return np.log(array_prices).diff().iloc[1:]
+        return np.diff(np.log(np.asarray(array_prices, dtype=float)), axis=0)
+
+    def fit(self, array_returns: Any) -> Any:
+        """
+        DOCSTRING: EWMA COVARIANCE MATRIX AT THE LAST DATE, AS A SINGLE WEIGHTED PRODUCT OF THE
+            RETURNS MATRIX - THE STATE IS REPLACED
+        INPUTS: RETURNS (DATES X ASSETS, NUMPY ARRAY OR PANDAS DATAFRAME WITH ASSETS AS
+            COLUMNS)
+        OUTPUTS: COVARIANCE MATRIX (ASSETS X ASSETS)
+        """
+        if isinstance(array_returns, pd.DataFrame):
+            self.list_assets = list(array_returns.columns)
+        array_returns = np.asarray(array_returns, dtype=float)
+        if array_returns.ndim == 1:
+            array_returns = array_returns[:, None]
+        int_n_obs, int_n_assets = array_returns.shape
+        # weights - the latest return weighted by (1 - lambda)
+        array_weights = (1.0 - self.float_lambda) * (
+            self.float_lambda ** np.arange(int_n_obs - 1, -1, -1)
+        )
+        self.array_cov = (array_returns * array_weights[:, None]).T @ (
+            array_returns
+        )
+        if self.array_cov_seed is not None:
+            self.array_cov += self.float_lambda**int_n_obs * np.asarray(
+                self.array_cov_seed, dtype=float
+            ).reshape(int_n_assets, int_n_assets)
+        self.int_n_obs = int_n_obs
+        return self.cov
+
+    def update(self, new_returns: Any, bl_commit: bool = True) -> Any:
+        """
+        DOCSTRING: ADVANCE THE EWMA COVARIANCE MATRIX WITH NEW RETURNS (ONE DATE, OR SEVERAL
+            DATES IN ORDER), IN O(ASSETS^2) PER DATE; WITHOUT COMMITTING, THE STATE IS KEPT,
+            FOR INSTANCE FOR INTRADAY REFRESHES WITH THE PARTIAL RETURNS OF THE DAY
+        INPUTS: NEW RETURNS (ASSETS, OR DATES X ASSETS) AND WHETHER TO COMMIT THE UPDATE
+        OUTPUTS: COVARIANCE MATRIX (ASSETS X ASSETS)
+        """
+        array_new = np.asarray(new_returns, dtype=float)
+        if self.array_cov is None:
+            int_n_assets = array_new.shape[-1] if array_new.ndim > 0 else 1
+            self.array_cov = (
+                np.zeros((int_n_assets, int_n_assets))
+                if self.array_cov_seed is None
+                else np.asarray(self.array_cov_seed, dtype=float).reshape(
+                    int_n_assets, int_n_assets
+                )
+            )
+        array_new = array_new.reshape(-1, self.array_cov.shape[0])
+        array_cov = self.array_cov.copy()
+        for array_r in array_new:
+            array_cov *= self.float_lambda
+            array_cov += (1.0 - self.float_lambda) * np.outer(array_r, array_r)
+        if bl_commit == True:
+            self.array_cov = array_cov
+            self.int_n_obs += len(array_new)
+        return self.to_output(array_cov)
+
+    def variance_series(self, array_returns: Any) -> np.ndarray:
+        """
+        DOCSTRING: PATH OF EWMA VARIANCES PER ASSET (DIAGONAL OF THE COVARIANCE MATRIX) - ROW T
+            IS THE FORECAST FOR THE RETURN OF DATE T, KNOWN AT THE CLOSE OF DATE T - 1, AND THE
+            LAST ROW IS THE FORECAST FOR THE NEXT DATE; THE RECURSION RUNS AS A LINEAR FILTER
+            OVER ALL THE ASSETS AT ONCE, WITHOUT CHANGING THE STATE
+        INPUTS: RETURNS (DATES X ASSETS, NUMPY ARRAY OR PANDAS DATAFRAME)
+        OUTPUTS: NUMPY ARRAY (DATES + 1 X ASSETS)
+        """
+        array_returns = np.asarray(array_returns, dtype=float)
+        if array_returns.ndim == 1:
+            array_returns = array_returns[:, None]
+        # seed - diagonal of the seed covariance matrix, or the sample mean of squared
+        #   returns, avoiding null variances for the first dates
+        if self.array_cov_seed is not None:
+            array_seed = np.diag(
+                np.asarray(self.array_cov_seed, dtype=float).reshape(
+                    array_returns.shape[1], array_returns.shape[1]
+                )
+            )
+        else:
+            array_seed = np.mean(array_returns**2, axis=0)
+        # sigma2_t = lambda * sigma2_t-1 + (1 - lambda) * r_t-1^2
+        array_var = lfilter(
+            [1.0 - self.float_lambda],
+            [1.0, -self.float_lambda],
+            array_returns**2,
+            axis=0,
+            zi=self.float_lambda * array_seed[None, :],
+        )[0]
+        return np.vstack([array_seed[None, :], array_var])
+
+    def to_output(self, array_cov: np.ndarray) -> Any:
+        """
+        DOCSTRING: COVARIANCE MATRIX AS A DATAFRAME WHEN THE ASSETS ARE NAMED
+        INPUTS: COVARIANCE MATRIX
+        OUTPUTS: NUMPY ARRAY OR PANDAS DATAFRAME
+        """
+        if self.list_assets is not None:
+            return pd.DataFrame(
+                array_cov, index=self.list_assets, columns=self.list_assets
+            )
+        return array_cov
+
+    @property
+    def cov(self) -> Any:
+        """
+        DOCSTRING: DAILY EWMA COVARIANCE MATRIX
+        INPUTS: -
+        OUTPUTS: NUMPY ARRAY OR PANDAS DATAFRAME
+        """
+        if self.array_cov is None:
+            raise Exception(
+                'EWMA covariance not fitted, please call fit first'
+            )
+        return self.to_output(self.array_cov)
+
+    @property
+    def cov_yearly(self) -> Any:
+        """
+        DOCSTRING: YEARLY EWMA COVARIANCE MATRIX (DAILY COVARIANCE TIMES WORKING DAYS PER YEAR)
+        INPUTS: -
+        OUTPUTS: NUMPY ARRAY OR PANDAS DATAFRAME
+        """
+        return self.cov * self.int_wdy
+
+    @property
+    def vol(self) -> Any:
+        """
+        DOCSTRING: DAILY EWMA VOLATILITIES PER ASSET
+        INPUTS: -
+        OUTPUTS: NUMPY ARRAY OR PANDAS SERIES
+        """
+        array_vol = np.sqrt(np.diag(np.asarray(self.cov)))
+        if self.list_assets is not None:
+            return pd.Series(array_vol, index=self.list_assets)
+        return array_vol
+
+    @property
+    def corr(self) -> Any:
+        """
+        DOCSTRING: EWMA CORRELATION MATRIX
+        INPUTS: -
+        OUTPUTS: NUMPY ARRAY OR PANDAS DATAFRAME
+        """
+        array_cov = np.asarray(self.cov)
+        array_vol = np.sqrt(np.diag(array_cov))
+        return self.to_output(array_cov / np.outer(array_vol, array_vol))
+
+
+class HistoricalVaR:
+    """
+    REFERENCES: Hull, J., White, A. - Incorporating volatility updating into the historical
+        simulation method for value-at-risk (1998); Barone-Adesi, G., Giannopoulos, K.,
+        Vosper, L. - VaR without correlations for portfolios of derivative securities (1999);
+        Tasche, D. - Conditional expectation as quantile derivative (2000)
+    DOCSTRING: HISTORICAL SIMULATION VALUE-AT-RISK AND EXPECTED SHORTFALL OF PORTFOLIOS - THE
+        P&L OF EVERY SCENARIO AND PORTFOLIO IS A SINGLE PRODUCT OF THE SCENARIOS RETURNS BY THE
+        POSITIONS, AND THE TAILS OF ALL CONFIDENCE LEVELS COME FROM A SINGLE PARTITION OF THE
+        LOSSES; IN THE FILTERED MODE (FHS), EACH ASSET'S RETURN IS DEVOLATILIZED BY ITS EWMA
+        VOLATILITY AT THE SCENARIO DATE AND RESCALED BY THE CURRENT ONE
+    INPUTS: POSITIONS (FINANCIAL EXPOSURES - ASSETS, OR ASSETS X PORTFOLIOS; PANDAS SERIES OR
+        DATAFRAME INDEXED BY ASSETS ARE ALIGNED TO THE SCENARIOS COLUMNS), SCENARIOS RETURNS
+        (DATES X ASSETS), CONFIDENCE LEVELS (0.95, 0.975 AND 0.99 AS DEFAULT), WHETHER TO
+        FILTER THE SCENARIOS BY VOLATILITY (FALSE AS DEFAULT), LAMBDA SMOOTHING PARAMETER OF
+        THE EWMA (0.94 AS DEFAULT) AND SEED COVARIANCE MATRIX OF THE EWMA (NONE AS DEFAULT)
+    OUTPUTS: -
+    """
+
+    def __init__(
+        self,
+        array_positions: Any,
+        array_scenarios: Any,
+        list_confidence_levels: List[float] = [0.95, 0.975, 0.99],
+        bl_filtered: bool = False,
+        float_lambda: float = 0.94,
+        array_cov_seed: Optional[np.ndarray] = None,
+    ) -> None:
+        # checking confidence levels
+        if any([not 0.0 < x < 1.0 for x in list_confidence_levels]):
+            raise Exception(
+                'Confidence levels ought be within (0, 1), please revisit'
+            )
+        self.list_confidence_levels = list(list_confidence_levels)
+        # scenarios - dates x assets
+        self.list_assets = None
+        self.list_dates = None
+        if isinstance(array_scenarios, pd.DataFrame):
+            self.list_assets = list(array_scenarios.columns)
+            self.list_dates = list(array_scenarios.index)
+        self.array_scenarios = np.asarray(array_scenarios, dtype=float)
+        if self.array_scenarios.ndim == 1:
+            self.array_scenarios = self.array_scenarios[:, None]
+        # positions - assets x portfolios, aligned to the scenarios assets when both are
+        #   named; assets without positions are flat
+        self.list_portfolios = None
+        if (
+            isinstance(array_positions, (pd.Series, pd.DataFrame))
+            and self.list_assets is not None
+        ):
+            list_missing = [
+                x for x in array_positions.index if x not in self.list_assets
+            ]
+            if len(list_missing) > 0:
+                raise Exception(
+                    'Positions without scenarios: {}, please revisit'.format(
+                        list_missing
+                    )
+                )
+            array_positions = array_positions.reindex(self.list_assets).fillna(
+                0.0
+            )
+        if isinstance(array_positions, pd.DataFrame):
+            self.list_portfolios = list(array_positions.columns)
+        self.bl_single_portfolio = np.ndim(array_positions) == 1
+        self.array_positions = np.asarray(array_positions, dtype=float)
+        if self.bl_single_portfolio == True:
+            self.array_positions = self.array_positions[:, None]
+        if self.array_positions.shape[0] != self.array_scenarios.shape[1]:
+            raise Exception(
+                'Positions and scenarios ought have the same number of assets, '
+                'please revisit'
+            )
+        # filtered historical simulation
+        self.bl_filtered = bl_filtered
+        self.cls_ewma = EWMACovariance(
+            float_lambda=float_lambda, array_cov_seed=array_cov_seed
+        )
+        if bl_filtered == True:
+            self.array_scenarios = self.filtered_scenarios(
+                self.array_scenarios
+            )
+        # p&l - scenarios x portfolios
+        self.array_pnl = self.array_scenarios @ self.array_positions
+
+    def filtered_scenarios(self, array_returns: np.ndarray) -> np.ndarray:
+        """
+        DOCSTRING: VOLATILITY-FILTERED SCENARIOS - R_T * SIGMA_T+1 / SIGMA_T, WITH EWMA
+            VOLATILITIES PER ASSET
+        INPUTS: RETURNS (DATES X ASSETS)
+        OUTPUTS: NUMPY ARRAY (DATES X ASSETS)
+        """
+        array_vol = np.sqrt(self.cls_ewma.variance_series(array_returns))
+        # assets without variance are kept unfiltered
+        with np.errstate(divide='ignore', invalid='ignore'):
+            array_scale = np.where(
+                array_vol[:-1] > 0.0, array_vol[-1:] / array_vol[:-1], 1.0
+            )
+        return array_returns * array_scale
+
+    def tail_sizes(self) -> np.ndarray:
+        """
+        DOCSTRING: NUMBER OF SCENARIOS IN THE TAIL OF EACH CONFIDENCE LEVEL - CEIL(N * (1 -
+            ALPHA)), ROUNDED BEFORE THE CEIL TO AVOID FLOATING-POINT SPILLS (1000 * 0.01)
+        INPUTS: -
+        OUTPUTS: NUMPY ARRAY OF INTEGERS
+        """
+        int_n_scenarios = self.array_scenarios.shape[0]
+        array_k = np.ceil(
+            np.round(
+                int_n_scenarios
+                * (1.0 - np.array(self.list_confidence_levels)),
+                8,
+            )
+        ).astype(int)
+        return np.clip(array_k, 1, int_n_scenarios)
+
+    @property
+    def pnl(self) -> Any:
+        """
+        DOCSTRING: P&L OF EACH SCENARIO AND PORTFOLIO
+        INPUTS: -
+        OUTPUTS: NUMPY ARRAY (SCENARIOS, OR SCENARIOS X PORTFOLIOS) OR PANDAS SERIES/DATAFRAME
+            WHEN THE SCENARIOS DATES ARE NAMED
+        """
+        if self.bl_single_portfolio == True:
+            if self.list_dates is not None:
+                return pd.Series(self.array_pnl[:, 0], index=self.list_dates)
+            return self.array_pnl[:, 0]
+        if self.list_dates is not None or self.list_portfolios is not None:
+            return pd.DataFrame(
+                self.array_pnl,
+                index=self.list_dates,
+                columns=self.list_portfolios,
+            )
+        return self.array_pnl
+
+    def var_es(self) -> Dict[str, Any]:
+        """
+        DOCSTRING: VALUE-AT-RISK AND EXPECTED SHORTFALL, AS POSITIVE LOSSES, FOR ALL THE
+            CONFIDENCE LEVELS - THE VAR IS THE K-TH WORST LOSS AND THE ES IS THE AVERAGE OF THE
+            K WORST LOSSES, WITH K = CEIL(N * (1 - ALPHA))
+        INPUTS: -
+        OUTPUTS: DICTIONARY WITH VAR AND ES KEYS (PANDAS SERIES INDEXED BY CONFIDENCE LEVELS,
+            OR DATAFRAMES CONFIDENCE LEVELS X PORTFOLIOS)
+        """
+        int_n_scenarios = self.array_pnl.shape[0]
+        array_k = self.tail_sizes()
+        # single partition pass - after it, the worst k losses of every level lie beyond
+        #   position n - k, with the k-th worst loss at n - k
+        array_losses = np.partition(
+            -self.array_pnl, np.unique(int_n_scenarios - array_k), axis=0
+        )
+        array_var = array_losses[int_n_scenarios - array_k]
+        array_cum_tail = np.cumsum(array_losses[::-1], axis=0)
+        array_es = array_cum_tail[array_k - 1] / array_k[:, None]
+        if self.bl_single_portfolio == True:
+            return {
+                'var': pd.Series(
+                    array_var[:, 0], index=self.list_confidence_levels
+                ),
+                'es': pd.Series(
+                    array_es[:, 0], index=self.list_confidence_levels
+                ),
+            }
+        return {
+            'var': pd.DataFrame(
+                array_var,
+                index=self.list_confidence_levels,
+                columns=self.list_portfolios,
+            ),
+            'es': pd.DataFrame(
+                array_es,
+                index=self.list_confidence_levels,
+                columns=self.list_portfolios,
+            ),
+        }
+
+    def components(
+        self,
+        float_confidence_level: float = 0.99,
+        int_portfolio: int = 0,
+        int_kernel: int = 0,
+    ) -> pd.DataFrame:
+        """
+        DOCSTRING: EULER ALLOCATION OF VAR AND ES AMONG THE ASSETS OF A PORTFOLIO - THE
+            MARGINAL VAR (DVAR/DPOSITION) IS THE LOSS PER UNIT OF POSITION AT THE VAR SCENARIO,
+            AVERAGED OVER THE 2 * KERNEL + 1 SCENARIOS RANKED AROUND IT, AND THE COMPONENT VAR
+            IS THE POSITION TIMES THE MARGINAL VAR; WITHOUT KERNEL, THE COMPONENTS ADD UP TO
+            THE VAR, WHEREAS THE COMPONENT ES ALWAYS ADD UP TO THE ES
+        INPUTS: CONFIDENCE LEVEL (0.99 AS DEFAULT), PORTFOLIO COLUMN (0 AS DEFAULT) AND KERNEL
+            HALF-WIDTH IN SCENARIOS (0 AS DEFAULT)
+        OUTPUTS: PANDAS DATAFRAME (ASSETS X MARGINAL_VAR, COMPONENT_VAR, MARGINAL_ES AND
+            COMPONENT_ES)
+        """
+        if not 0.0 < float_confidence_level < 1.0:
+            raise Exception(
+                'Confidence level ought be within (0, 1), please revisit'
+            )
+        int_n_scenarios = self.array_pnl.shape[0]
+        int_k = int(
+            np.clip(
+                np.ceil(
+                    np.round(
+                        int_n_scenarios * (1.0 - float_confidence_level), 8
+                    )
+                ),
+                1,
+                int_n_scenarios,
+            )
+        )
+        int_rank_var = int_n_scenarios - int_k
+        int_rank_inf = max(int_rank_var - int_kernel, 0)
+        int_rank_sup = min(int_rank_var + int_kernel, int_n_scenarios - 1)
+        # scenarios ranked by loss - kernel around the var and the tail beyond it
+        array_idx = np.argpartition(
+            -self.array_pnl[:, int_portfolio],
+            sorted({int_rank_inf, int_rank_var, int_rank_sup}),
+        )
+        array_idx_kernel = array_idx[int_rank_inf : int_rank_sup + 1]
+        array_idx_tail = array_idx[int_rank_var:]
+        array_marginal_var = -self.array_scenarios[array_idx_kernel].mean(
+            axis=0
+        )
+        array_marginal_es = -self.array_scenarios[array_idx_tail].mean(axis=0)
+        array_positions = self.array_positions[:, int_portfolio]
+        return pd.DataFrame(
+            {
+                'marginal_var': array_marginal_var,
+                'component_var': array_positions * array_marginal_var,
+                'marginal_es': array_marginal_es,
+                'component_es': array_positions * array_marginal_es,
+            },
+            index=self.list_assets,
+        )
+
+
 class MarkowitzEff:
     """
     REFERENCES: https://www.linkedin.com/pulse/python-aplicado-markowitz-e-teoria-nem-tão-moderna-de-paulo-rodrigues/?originalSubdomain=pt
@@ -628,144 +1187,179 @@ class MarkowitzEff:
         bl_opt_possb_comb: bool = False,
         array_min_w: np.array = None,
         nth_try: int = 100,
-        int_idx_val: int = 2,
-        bl_valid_weights: bool = False,
-        i_attempts: int = 0,
         float_atol_sum: float = 1e-4,
-        float_atol_w: float = 10000.0,
+        bl_allow_zero: bool = True,
     ) -> np.array:
         """
         DOCSTRING: RANDOM WEIGHTS - WITH OR WITHOUT CONSTRAINTS
         INPUTS:
             - INT_N_ASSETS: THE NUMBER OF ASSETS IN THE PORTFOLIO
             - BL_CONSTRAINTS: BOOLEAN FLAG TO APPLY CONSTRAINTS OR NOT
+            - BL_OPT_POSSB_COMB: WEIGHTS AS MULTIPLES OF THE MINIMUM (LOTS)
             - MIN_INVEST_PER_ASSET: A LIST OF MINIMUM WEIGHTS/INVESTMENTS FOR EACH ASSET
+            - NTH_TRY: NUMBER OF SAMPLING ROUNDS BEFORE FALLING BACK TO A SINGLE ASSET
+            - FLOAT_ATOL_SUM: TOLERANCE OF THE SUM OF LOT-MULTIPLE WEIGHTS
+            - BL_ALLOW_ZERO: WHETHER ASSETS MAY BE LEFT OUT (ZERO OR ABOVE THE MINIMUM)
         OUTPUTS:
             - A LIST OF WEIGHTS FOR THE ASSETS THAT SATISFY THE GIVEN CONSTRAINTS,
                 WHERE SUM OF WEIGHTS = 1
         """
-        # adjusting number of assets within the portfolio
-        int_idx_val = min(len(array_min_w), int_idx_val)
-        # check wheter the constraints are enabled
-        if bl_constraints == True:
-            #   sanity check for constraints
-            if array_min_w is None:
-                raise ValueError(
-                    'MIN_INVEST_PER_ASSET MUST BE PROVIDED AS A LIST WHEN '
-                    + 'CONSTRAINTS ARE ENABLED.'
-                )
-            if any(isinstance(x, str) for x in array_min_w):
-                raise ValueError(
-                    'MIN_INVEST_PER_ASSET MUST BE A LIST OF NUMBERS.'
-                )
-            if len(array_min_w) != int_n_assets:
-                raise ValueError(
-                    'THE LENGTH OF MIN_INVEST_PER_ASSET MUST MATCH THE '
-                    + 'NUMBER OF ASSETS.'
-                )
-            if any(x < 0 for x in array_min_w):
-                raise ValueError('MIN_INVEST_PER_ASSET MUST BE POSITIVE.')
-            if any(x > 1 for x in array_min_w):
-                raise ValueError('MIN_INVEST_PER_ASSET MUST BE BELOW 1.0')
-            if any(x == 0 for x in array_min_w):
-                raise ValueError(
-                    'EVERY MIN_INVEST_PER_ASSET MUST BE GREATER THAN 0.'
+        return self.random_weights_batch(
+            1,
+            int_n_assets,
+            bl_constraints,
+            bl_opt_possb_comb,
+            array_min_w,
+            nth_try,
+            float_atol_sum,
+            bl_allow_zero,
+        )[0]
+
+    def random_weights_batch(
+        self,
+        int_n_portfolios: int,
+        int_n_assets: int,
+        bl_constraints: bool = False,
+        bl_opt_possb_comb: bool = False,
+        array_min_w: Optional[np.ndarray] = None,
+        nth_try: int = 100,
+        float_atol_sum: float = 1e-4,
+        bl_allow_zero: bool = True,
+    ) -> np.ndarray:
+        """
+        DOCSTRING: RANDOM WEIGHTS OF MANY PORTFOLIOS AT ONCE - UNCONSTRAINED WEIGHTS ARE
+            UNIFORM OVER THE SIMPLEX (DIRICHLET WITH UNIT CONCENTRATIONS); CONSTRAINED
+            CANDIDATES ARE DRAWN FOR ALL THE PENDING PORTFOLIOS AT ONCE, ON RANDOM SUPPORTS OF
+            AT LEAST TWO ASSETS: EACH ASSET OF THE SUPPORT RECEIVES ITS MINIMUM, AND THE SLACK
+            IS SPREAD WITH DIRICHLET WEIGHTS - WITH LOTS, THE WEIGHTS ARE FLOORED TO MULTIPLES
+            OF THE MINIMUM AND THE REMAINDER IS FILLED GREEDILY, IN RANDOM ORDER; CANDIDATES
+            ARE ACCEPTED BY MASKS (MINIMUMS WITHIN THE PORTFOLIO, SUM OF THE LOTS WITHIN
+            TOLERANCE), AND PORTFOLIOS STILL PENDING AFTER NTH_TRY ROUNDS HOLD A SINGLE ASSET;
+            THE ACCEPTANCE STATISTICS ARE KEPT IN DICT_SAMPLER_STATS
+        INPUTS: NUMBER OF PORTFOLIOS AND ASSETS, WHETHER TO APPLY CONSTRAINTS (FALSE AS
+            DEFAULT), WHETHER THE WEIGHTS ARE MULTIPLES OF THE MINIMUM (FALSE AS DEFAULT),
+            MINIMUM WEIGHTS PER ASSET (NONE AS DEFAULT), NUMBER OF ROUNDS (100 AS DEFAULT),
+            TOLERANCE OF THE SUM OF LOTS (1E-4 AS DEFAULT) AND WHETHER ASSETS MAY BE LEFT OUT
+            (TRUE AS DEFAULT; OTHERWISE EVERY ASSET HOLDS AT LEAST ITS MINIMUM)
+        OUTPUTS: NUMPY ARRAY (PORTFOLIOS X ASSETS)
+        """
+        if bl_constraints == False:
+            self.dict_sampler_stats = {
+                'portfolios': int_n_portfolios,
+                'candidates': int_n_portfolios,
+                'accepted': int_n_portfolios,
+                'acceptance_rate': 1.0,
+                'rounds': 1,
+                'fallbacks': 0,
+                'max_support': int_n_assets,
+            }
+            return np.random.dirichlet(
+                np.ones(int_n_assets), size=int_n_portfolios
+            )
+        # sanity check for constraints
+        if array_min_w is None:
+            raise ValueError(
+                'MIN_INVEST_PER_ASSET MUST BE PROVIDED AS A LIST WHEN '
+                + 'CONSTRAINTS ARE ENABLED.'
+            )
+        if any(isinstance(x, str) for x in array_min_w):
+            raise ValueError('MIN_INVEST_PER_ASSET MUST BE A LIST OF NUMBERS.')
+        array_min_w = np.asarray(array_min_w, dtype=float).reshape(-1)
+        if len(array_min_w) != int_n_assets:
+            raise ValueError(
+                'THE LENGTH OF MIN_INVEST_PER_ASSET MUST MATCH THE '
+                + 'NUMBER OF ASSETS.'
+            )
+        if (array_min_w < 0.0).any():
+            raise ValueError('MIN_INVEST_PER_ASSET MUST BE POSITIVE.')
+        if (array_min_w > 1.0).any():
+            raise ValueError('MIN_INVEST_PER_ASSET MUST BE BELOW 1.0')
+        if (array_min_w == 0.0).any():
+            raise ValueError(
+                'EVERY MIN_INVEST_PER_ASSET MUST BE GREATER THAN 0.'
+            )
+        # largest support - the smallest minimums that fit within the portfolio
+        int_max_support = int(
+            (np.cumsum(np.sort(array_min_w)) <= 1.0 + float_atol_sum).sum()
+        )
+        if bl_allow_zero == False and int_max_support < int_n_assets:
+            raise ValueError(
+                'THE SUM OF MIN_INVEST_PER_ASSET MUST BE BELOW 1.0 WHEN '
+                + 'EVERY ASSET IS HELD.'
+            )
+        array_w = np.zeros((int_n_portfolios, int_n_assets))
+        array_pending = np.arange(int_n_portfolios)
+        int_candidates = 0
+        int_rounds = 0
+        while (
+            len(array_pending) > 0
+            and int_max_support >= 2
+            and int_rounds < nth_try
+        ):
+            int_rounds += 1
+            int_n_cand = len(array_pending)
+            int_candidates += int_n_cand
+            array_rows = np.arange(int_n_cand)
+            # random supports - sizes uniform within [2, max support], assets in the order of
+            #   random keys
+            array_keys = np.random.rand(int_n_cand, int_n_assets)
+            array_order = np.argsort(array_keys, axis=1)
+            if bl_allow_zero == True:
+                array_k = np.random.randint(2, int_max_support + 1, int_n_cand)
+                array_mask = (
+                    array_keys
+                    <= np.take_along_axis(array_keys, array_order, axis=1)[
+                        array_rows, array_k - 1
+                    ][:, None]
                 )
-            #   initializing variables
-            bl_valid_weights = False
-            list_combs = [
-                comb
-                for r in range(2, int_idx_val + 1)
-                for comb in combinations(array_min_w, r)
-            ]
-            #   recursive call to get valid weights
-            while not bl_valid_weights:
-                #   increment the try counter
-                i_attempts += 1
-                #   reseting variables
-                array_w = np.zeros(int_n_assets)
-                #   check if it's the nth try or all the combinations are greater than one
-                if (i_attempts >= nth_try) or (
-                    all([sum(comb) >= 1.0 for comb in list_combs])
-                ):
-                    #   return a weight array with one asset having weight 1.0 and others 0.0
-                    array_w = np.zeros(int_n_assets)
-                    int_idx = np.random.randint(0, int_n_assets)
-                    array_w[int_idx] = 1.0
-                    return array_w
-                #   if multiplier is enabled, build a list of possible indexes combinations in
-                #       order to sum 1.0 or less
-                if bl_opt_possb_comb == True:
-                    #   combinations where sum is less than 1.0 - flatten list
-                    list_i = HandlingLists().remove_duplicates(
-                        [
-                            idx
-                            for comb in list_combs
-                            for x in comb
-                            for idx in np.where(array_min_w == x)[0]
-                            if sum(comb) <= 1.0
-                        ]
-                    )
-                else:
-                    list_i = list(range(int_n_assets))
-                np.random.shuffle(list_i)
-                #   looping through the indexes
-                for i in list_i:
-                    #   randomly building a float weight
-                    float_upper_tol = max(
-                        float_atol_w * (1.0 - sum(array_w)), 1.0
-                    )
-                    #   building the float weight with any given value above the minimum or a
-                    #       multiple of the minimum
-                    if bl_opt_possb_comb == True:
-                        int_max_mult = max(
-                            int((1.0 - sum(array_w)) // array_min_w[i]), 1
-                        )
-                        int_rand_mult = np.random.randint(0, int_max_mult + 1)
-                        float_weight = float(int_rand_mult * array_min_w[i])
-                    else:
-                        float_upper_tol = max(
-                            float_atol_w * (1.0 - sum(array_w)), 1.0
-                        )
-                        random_integer = np.random.randint(0, float_upper_tol)
-                        float_weight = float(random_integer) / float_upper_tol
-                    #   check if the weight is greater than the minimum
-                    if float_weight < array_min_w[i]:
-                        array_w[i] = 0
-                    else:
-                        array_w[i] = float_weight
-                    #   check if the sum of weights is equal to 1.0 or greater
-                    if sum(array_w) >= 1.0:
-                        break
-                #   normalize only if the total weight is non-zero, if multiplier is unabled
-                if (bl_opt_possb_comb == False) or (
-                    np.count_nonzero(array_w) == 1
-                ):
-                    total_weight = np.sum(array_w)
-                    if total_weight > 0:
-                        array_w /= total_weight
-                #   sanity checks for weights:
-                #       1 - all weights must be non-negative
-                #       2 - sum must be equal to 1
-                #       3 - the minimum must be respected, or zero for a given asset
-                #       4 - some weight must be positive
-                bl_valid_weights = (
-                    np.all(array_w >= 0)
-                    and np.isclose(np.sum(array_w), 1, atol=float_atol_sum)
-                    and all(
-                        [
-                            (array_w[i] >= array_min_w[i]) or (array_w[i] == 0)
-                            for i in range(int_n_assets)
-                        ]
-                    )
-                    and np.any(array_w > 0)
-                    and np.all(array_w != 1)
+            else:
+                array_mask = np.ones((int_n_cand, int_n_assets), dtype=bool)
+            # minimums over the support plus the slack, spread with dirichlet weights
+            array_floor = array_min_w * array_mask
+            array_slack = 1.0 - array_floor.sum(axis=1)
+            array_gamma = (
+                np.random.standard_gamma(1.0, (int_n_cand, int_n_assets))
+                * array_mask
+            )
+            array_cand = array_floor + np.clip(array_slack, 0.0, None)[
+                :, None
+            ] * (array_gamma / array_gamma.sum(axis=1, keepdims=True))
+            array_accepted = array_slack >= -float_atol_sum
+            # lots - weights floored to multiples of the minimum, remainder filled greedily
+            if bl_opt_possb_comb == True:
+                array_lots = np.floor(array_cand / array_min_w + 1e-9) * (
+                    array_mask
                 )
-            return array_w
-        else:
-            # if no constraints are applied, return standard random weights
-            k = np.random.rand(int_n_assets)
-            return k / sum(k)
+                array_rem = 1.0 - array_lots @ array_min_w
+                for j in range(int_n_assets):
+                    array_idx = array_order[:, j]
+                    array_add = np.floor(
+                        np.clip(array_rem, 0.0, None) / array_min_w[array_idx]
+                        + 1e-9
+                    ) * (array_mask[array_rows, array_idx])
+                    array_lots[array_rows, array_idx] += array_add
+                    array_rem -= array_add * array_min_w[array_idx]
+                array_cand = array_lots * array_min_w
+                array_accepted &= np.abs(array_rem) <= float_atol_sum
+            array_w[array_pending[array_accepted]] = array_cand[array_accepted]
+            array_pending = array_pending[array_accepted == False]
+        # fallback - one asset with weight 1.0 and others 0.0
+        array_w[
+            array_pending,
+            np.random.randint(0, int_n_assets, len(array_pending)),
+        ] = 1.0
+        # acceptance statistics, for tuning the sampler
+        self.dict_sampler_stats = {
+            'portfolios': int_n_portfolios,
+            'candidates': int_candidates,
+            'accepted': int_n_portfolios - len(array_pending),
+            'acceptance_rate': (int_n_portfolios - len(array_pending))
+            / max(int_candidates, 1),
+            'rounds': int_rounds,
+            'fallbacks': len(array_pending),
+            'max_support': int_max_support,
+        }
+        return array_w
 
     def random_portfolio(
         self,
@@ -776,14 +1370,14 @@ class MarkowitzEff:
         array_min_w: Optional[np.ndarray] = None,
         nth_try: int = 100,
         int_wdy: int = 252,
-    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+    ) -> Tuple[float, float, float, np.ndarray]:
         """
         DOCSTRING: RETURNS THE MEAN AND STANDARD DEVIATION OF RETURNS FROM A RANDOM PORTFOLIO
         INPUTS: MATRIX ASSETS RETURNS, ARRAY EXPECTED RETURNS, FLOAT RISK FREE
         OUTPUTS: TUP OF FLOATS
         """
         # adjusting variables' types
-        array_r = np.asmatrix(array_returns)
+        array_r = np.asarray(array_returns, dtype=float)
         float_rf = float(float_rf)
         # random wieghts for the current portfolio
         array_weights = self.random_weights(
@@ -794,17 +1388,15 @@ class MarkowitzEff:
             nth_try,
         )
         # mean returns for assets
-        array_returns = np.asmatrix(np.mean(array_r, axis=1))
+        array_returns = np.mean(array_r, axis=1)
         # portfolio standard deviation
         array_sigmas = self.sigma_portfolio(array_weights, array_r) * np.sqrt(
             int_wdy
         )
         # portfolio expected return
-        array_mus = float(array_weights * array_returns) * int_wdy
+        array_mus = float(array_weights @ array_returns) * int_wdy
         # sharpes ratio
         array_sharpes = self.sharpe_ratio(array_mus, array_sigmas, float_rf)
-        # changing type of array weights to transform into one value
-        array_weights = ' '.join([str(x) for x in array_weights])
         # returning portfolio infos
         return array_mus, array_sigmas, array_sharpes, array_weights
 
@@ -823,13 +1415,19 @@ class MarkowitzEff:
         bl_opt_possb_comb: bool = False,
         nth_try: int = 100,
         int_wdy: int = 252,
+        int_block_portfolios: int = 100000,
     ) -> Tuple[
         np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]
     ]:
         """
-        DOCSTRING: RETURNS THE MEAN AND STANDARD DEVIATION OF RETURNS FROM A RANDOM PORTFOLIO
-        INPUTS: MATRIX ASSETS RETURNS, ARRAY EXPECTED RETURNS, FLOAT RISK FREE
-        OUTPUTS: TUP OF FLOATS
+        DOCSTRING: MEAN, STANDARD DEVIATION AND SHARPE OF RANDOM PORTFOLIOS, WITH THE
+            COVARIANCE MATRIX AND MEAN RETURNS COMPUTED ONCE AND THE WEIGHTS DRAWN AS A
+            PORTFOLIOS X ASSETS MATRIX
+        INPUTS: DATAFRAME OF ASSETS, NUMBER OF PORTFOLIOS, COLUMNS NAMES, PORTFOLIO NOTIONAL,
+            RISK FREE, CONSTRAINTS FLAGS, NUMBER OF TRIES OF CONSTRAINED WEIGHTS, WORKING DAYS
+            IN A YEAR AND PORTFOLIOS PER BLOCK OF THE STANDARD DEVIATIONS (100,000 AS DEFAULT)
+        OUTPUTS: TUPLE OF ARRAYS (MUS, SIGMAS, SHARPES, WEIGHTS - PORTFOLIOS X ASSETS - AND
+            RETURNS - ASSETS X DATES) AND LIST OF UUIDS
         """
         # arrays of retunrs and minimum weights per asset
         array_returns, array_min_w, list_uuids = self.returns_min_w_uids(
@@ -839,30 +1437,29 @@ class MarkowitzEff:
             col_returns,
             col_min_w,
         )
-        # generating random portfolios
-        (
-            array_mus,
-            array_sigmas,
-            array_sharpes,
-            array_weights,
-        ) = np.column_stack(
-            [
-                self.random_portfolio(
-                    array_returns,
-                    float_rf,
-                    bl_constraints,
-                    bl_opt_possb_comb,
-                    array_min_w,
-                    nth_try,
-                    int_wdy,
-                )
-                for _ in range(int_n_portfolios)
-            ]
+        # weights - portfolios x assets
+        array_weights = self.random_weights_batch(
+            int_n_portfolios,
+            array_returns.shape[0],
+            bl_constraints,
+            bl_opt_possb_comb,
+            array_min_w,
+            nth_try,
         )
-        # altering data types
-        array_mus = array_mus.astype(float)
-        array_sigmas = array_sigmas.astype(float)
-        array_sharpes = array_sharpes.astype(float)
+        # mean returns and covariance between assets, computed once
+        array_mean_returns = np.mean(array_returns, axis=1)
+        array_cov = np.atleast_2d(np.cov(array_returns))
+        # expected returns, standard deviations and sharpes of all the portfolios, in blocks
+        #   bounding the temporary products
+        array_mus = array_weights @ array_mean_returns * int_wdy
+        array_sigmas = np.empty(int_n_portfolios)
+        for i in range(0, int_n_portfolios, int_block_portfolios):
+            array_w_block = array_weights[i : i + int_block_portfolios]
+            array_sigmas[i : i + int_block_portfolios] = np.sqrt(
+                np.einsum('ij,ij->i', array_w_block @ array_cov, array_w_block)
+                * int_wdy
+            )
+        array_sharpes = (array_mus - float(float_rf)) / array_sigmas
         return (
             array_mus,
             array_sigmas,
@@ -872,59 +1469,361 @@ class MarkowitzEff:
             list_uuids,
         )
 
+    @staticmethod
+    def frontier_points(
+        array_cov: np.ndarray,
+        array_mean: np.ndarray,
+        list_mus: List[float],
+        list_initvals: Optional[List[Optional[dict]]] = None,
+        bl_warm_start: bool = True,
+        bl_progress_printing_opt: bool = False,
+        float_eps_warm: float = 1e-6,
+    ) -> List[dict]:
+        """
+        DOCSTRING: LONG-ONLY FULLY-INVESTED PORTFOLIOS MINIMIZING X' S X - PBAR' X / MU, ONE
+            PER RISK-AVERSION LEVEL, IN ORDER - EQUIVALENT TO MU * X' S X - PBAR' X, WITH THE
+            QUADRATIC TERM BUILT (AND SCALED) ONCE; WITH WARM STARTS, EACH SOLVE STARTS FROM ITS GIVEN
+            INITIAL VALUES OR FROM THE PREVIOUS SOLUTION, WITH THE SLACKS AND THE DUALS OF THE
+            INEQUALITIES NUDGED INTO THE INTERIOR OF THE CONE; A STATIC METHOD, SO THAT
+            SEGMENTS OF THE FRONTIER ARE PICKLED TO WORKER PROCESSES WITHOUT THE INSTANCE
+        INPUTS: COVARIANCE MATRIX, MEAN RETURNS, RISK-AVERSION LEVELS, INITIAL VALUES PER LEVEL
+            (NONE AS DEFAULT), WHETHER TO WARM-START (TRUE AS DEFAULT), WHETHER TO PRINT THE
+            SOLVER PROGRESS (FALSE AS DEFAULT) AND SHIFT OF THE WARM SLACKS (1E-6 AS DEFAULT)
+        OUTPUTS: LIST OF DICTIONARIES (X, S, Y AND Z NUMPY ARRAYS AND STATUS)
+        """
+        opt.solvers.options['show_progress'] = bl_progress_printing_opt
+        int_n = len(array_mean)
+        # scaling by the mean variance - objectives of order one, within the absolute
+        #   tolerances of the solver, with the same minimizers
+        array_cov = np.asarray(array_cov, dtype=float)
+        float_scale = float(np.mean(np.diag(array_cov)))
+        if float_scale <= 0.0:
+            float_scale = 1.0
+        S = opt.matrix(array_cov / float_scale)
+        pbar = opt.matrix(np.asarray(array_mean, dtype=float) / float_scale)
+        G = -opt.matrix(np.eye(int_n))
+        h = opt.matrix(0.0, (int_n, 1))
+        A = opt.matrix(1.0, (1, int_n))
+        b = opt.matrix(1.0)
+        list_sols = list()
+        dict_initvals = None
+        for k, float_mu in enumerate(list_mus):
+            if list_initvals is not None and list_initvals[k] is not None:
+                dict_initvals = list_initvals[k]
+            dict_sol = opt.solvers.qp(
+                S,
+                -pbar / float_mu,
+                G,
+                h,
+                A,
+                b,
+                initvals=(
+                    {
+                        'x': opt.matrix(dict_initvals['x']),
+                        's': opt.matrix(dict_initvals['s'] + float_eps_warm),
+                        'y': opt.matrix(dict_initvals['y']),
+                        'z': opt.matrix(dict_initvals['z'] + float_eps_warm),
+                    }
+                    if bl_warm_start == True and dict_initvals is not None
+                    else None
+                ),
+            )
+            list_sols.append(
+                {
+                    'x': np.array(dict_sol['x']).ravel(),
+                    's': np.array(dict_sol['s']).ravel(),
+                    'y': np.array(dict_sol['y']).ravel(),
+                    'z': np.array(dict_sol['z']).ravel(),
+                    'status': dict_sol['status'],
+                }
+            )
+            #   the next level starts from this solution, when it is optimal
+            dict_initvals = (
+                list_sols[-1] if dict_sol['status'] == 'optimal' else None
+            )
+        return list_sols
+
+    def solve_frontier(
+        self,
+        array_cov: np.ndarray,
+        array_mean: np.ndarray,
+        list_mus: List[float],
+        list_initvals: Optional[List[Optional[dict]]] = None,
+        bl_warm_start: bool = True,
+        bl_progress_printing_opt: bool = False,
+        int_workers: int = 1,
+    ) -> List[dict]:
+        """
+        DOCSTRING: FRONTIER PORTFOLIOS OF THE RISK-AVERSION LEVELS, SPLIT INTO CONTIGUOUS
+            SEGMENTS SPREAD OVER WORKER PROCESSES - EACH SEGMENT IS WARM-STARTED WITHIN ITSELF
+        INPUTS: COVARIANCE MATRIX, MEAN RETURNS, RISK-AVERSION LEVELS, INITIAL VALUES PER LEVEL
+            (NONE AS DEFAULT), WHETHER TO WARM-START (TRUE AS DEFAULT), WHETHER TO PRINT THE
+            SOLVER PROGRESS (FALSE AS DEFAULT) AND NUMBER OF WORKER PROCESSES (1 AS DEFAULT)
+        OUTPUTS: LIST OF DICTIONARIES, IN THE ORDER OF THE LEVELS
+        """
+        if list_initvals is None:
+            list_initvals = [None] * len(list_mus)
+        if int_workers <= 1 or len(list_mus) < 2 * int_workers:
+            return self.frontier_points(
+                array_cov,
+                array_mean,
+                list_mus,
+                list_initvals,
+                bl_warm_start,
+                bl_progress_printing_opt,
+            )
+        list_bounds = np.linspace(0, len(list_mus), int_workers + 1).astype(
+            int
+        )
+        list_segments = mp_run_parallel(
+            MarkowitzEff.frontier_points,
+            [
+                (
+                    (
+                        array_cov,
+                        array_mean,
+                        list_mus[i_inf:i_sup],
+                        list_initvals[i_inf:i_sup],
+                        bl_warm_start,
+                        bl_progress_printing_opt,
+                    ),
+                    dict(),
+                )
+                for i_inf, i_sup in zip(list_bounds[:-1], list_bounds[1:])
+            ],
+            int_ncpus=int_workers,
+        )
+        return [
+            dict_sol for list_sols in list_segments for dict_sol in list_sols
+        ]
+
+    def adaptive_frontier(
+        self,
+        array_cov: np.ndarray,
+        array_mean: np.ndarray,
+        n_attempts: int,
+        int_n_init: int = 16,
+        float_log_mu_inf: float = -1.0,
+        float_log_mu_sup: float = 4.0,
+        bl_progress_printing_opt: bool = False,
+        int_workers: int = 1,
+    ) -> Tuple[List[float], List[dict]]:
+        """
+        DOCSTRING: FRONTIER WITH POINTS PLACED WHERE IT BENDS - FROM A COARSE LOG GRID OF
+            RISK-AVERSION LEVELS, EACH ROUND BISECTS (IN LOG SCALE) THE INTERVALS WITH THE
+            HIGHEST SCORES - LENGTH OF THE SEGMENT IN THE NORMALIZED RISK X RETURN PLANE TIMES
+            THE TURNING ANGLES AT ITS ENDS -, WARM-STARTED FROM THE LEFT NEIGHBOUR; INTERVALS
+            WITH COINCIDENT PORTFOLIOS (FOR INSTANCE, ALL IN THE MAXIMUM RETURN ASSET) ARE NOT
+            REFINED, HENCE LESS THAN N_ATTEMPTS POINTS MAY BE RETURNED
+        INPUTS: COVARIANCE MATRIX, MEAN RETURNS, NUMBER OF POINTS, POINTS OF THE COARSE GRID
+            (16 AS DEFAULT), LOG10 BOUNDS OF THE RISK-AVERSION LEVELS (-1 AND 4 AS DEFAULT,
+            AS THE LOG GRID), WHETHER TO PRINT THE SOLVER PROGRESS AND NUMBER OF WORKERS
+        OUTPUTS: TUPLE (RISK-AVERSION LEVELS, ASCENDING, AND SOLUTIONS)
+        """
+        list_log_mus = list(
+            np.linspace(
+                float_log_mu_inf, float_log_mu_sup, min(int_n_init, n_attempts)
+            )
+        )
+        list_sols = self.solve_frontier(
+            array_cov,
+            array_mean,
+            [10.0**x for x in list_log_mus],
+            bl_progress_printing_opt=bl_progress_printing_opt,
+            int_workers=int_workers,
+        )
+        while len(list_log_mus) < n_attempts:
+            # risk x return points, normalized by their ranges
+            array_x = np.array([dict_sol['x'] for dict_sol in list_sols])
+            array_pts = np.column_stack(
+                [
+                    np.sqrt(
+                        np.einsum('ij,jk,ik->i', array_x, array_cov, array_x)
+                    ),
+                    array_x @ array_mean,
+                ]
+            )
+            array_pts /= np.where(
+                np.ptp(array_pts, axis=0) > 0.0, np.ptp(array_pts, axis=0), 1.0
+            )
+            array_seg = np.diff(array_pts, axis=0)
+            array_len = np.linalg.norm(array_seg, axis=1)
+            # turning angles at the inner points
+            with np.errstate(divide='ignore', invalid='ignore'):
+                array_cos = np.einsum(
+                    'ij,ij->i', array_seg[:-1], array_seg[1:]
+                ) / (array_len[:-1] * array_len[1:])
+            array_angle = np.concatenate(
+                [
+                    [0.0],
+                    np.arccos(
+                        np.clip(np.nan_to_num(array_cos, nan=1.0), -1.0, 1.0)
+                    ),
+                    [0.0],
+                ]
+            )
+            array_score = array_len * (array_angle[:-1] + array_angle[1:])
+            if (array_score > 0.0).any() == False:
+                array_score = array_len
+            int_n_new = min(
+                n_attempts - len(list_log_mus), int((array_score > 0.0).sum())
+            )
+            if int_n_new == 0:
+                break
+            array_idx = np.sort(np.argsort(-array_score)[:int_n_new])
+            list_log_mus_new = [
+                (list_log_mus[i] + list_log_mus[i + 1]) / 2.0
+                for i in array_idx
+            ]
+            list_sols_new = self.solve_frontier(
+                array_cov,
+                array_mean,
+                [10.0**x for x in list_log_mus_new],
+                [
+                    list_sols[i]
+                    if list_sols[i]['status'] == 'optimal'
+                    else None
+                    for i in array_idx
+                ],
+                bl_progress_printing_opt=bl_progress_printing_opt,
+                int_workers=int_workers,
+            )
+            # merging, in ascending order of risk aversion
+            list_order = np.argsort(
+                list_log_mus + list_log_mus_new, kind='stable'
+            )
+            list_log_mus = [
+                (list_log_mus + list_log_mus_new)[k] for k in list_order
+            ]
+            list_sols = [(list_sols + list_sols_new)[k] for k in list_order]
+        return [10.0**x for x in list_log_mus], list_sols
+
     def optimal_portfolios(
         self,
         array_returns: np.ndarray,
         n_attempts: int = 1000,
         bl_progress_printing_opt: bool = False,
         int_wdy: int = 252,
+        bl_warm_start: bool = True,
+        int_workers: int = 1,
+        bl_adaptive: bool = False,
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        DOCSTRING: WEIGHTS RETURNS AND SIGMA FOR EFFICIENT FRONTIER
-        INPUTS: MATRIX OF ASSETS' RETURNS
+        DOCSTRING: WEIGHTS RETURNS AND SIGMA FOR EFFICIENT FRONTIER - QUADRATIC PROGRAMS OVER A
+            LOG GRID OF RISK-AVERSION LEVELS, WARM-STARTED FROM THE NEIGHBOUR LEVEL AND
+            OPTIONALLY SPLIT INTO SEGMENTS OVER WORKER PROCESSES, OR PLACED ADAPTIVELY WHERE
+            THE FRONTIER BENDS
+        INPUTS: MATRIX OF ASSETS' RETURNS, NUMBER OF FRONTIER POINTS (1000 AS DEFAULT), WHETHER
+            TO PRINT THE SOLVER PROGRESS (FALSE AS DEFAULT), WORKING DAYS IN A YEAR (252 AS
+            DEFAULT), WHETHER TO WARM-START (TRUE AS DEFAULT), NUMBER OF WORKER PROCESSES (1
+            AS DEFAULT) AND WHETHER TO PLACE THE POINTS ADAPTIVELY (FALSE AS DEFAULT)
         OUTPUTS: TUP OF ARRAYS
         """
         # turn on/off progress printing
         opt.solvers.options['show_progress'] = bl_progress_printing_opt
         # configuring data types
-        array_returns = np.asmatrix(array_returns)
+        array_returns = np.asarray(array_returns, dtype=float)
         # definig the number of portfolios to be created
         n = array_returns.shape[0]
-        # calculating first attempt for float_mu in each portfolio
-        mus = [
-            10.0 ** (5.0 * float(t / n_attempts) - 1.0)
-            for t in range(n_attempts)
-        ]
-        # convert to cvxopt matrices
-        S = opt.matrix(np.cov(array_returns))
-        pbar = opt.matrix(np.mean(array_returns, axis=1))
-        # create constraint matrices
-        #   negative n x n identity matrix
-        G = -opt.matrix(np.eye(n))
-        h = opt.matrix(0.0, (n, 1))
-        A = opt.matrix(1.0, (1, n))
-        b = opt.matrix(1.0)
-        # calculate efficient frontier weights using quadratic programming
-        list_portfolios = [
-            opt.solvers.qp(float_mu * S, -pbar, G, h, A, b)['x']
-            for float_mu in mus
-        ]
+        # covariance matrix and mean returns, computed once
+        array_cov = np.atleast_2d(np.cov(array_returns))
+        array_mean = np.mean(array_returns, axis=1)
+        # efficient frontier weights using quadratic programming
+        if bl_adaptive == True:
+            mus, list_sols = self.adaptive_frontier(
+                array_cov,
+                array_mean,
+                n_attempts,
+                bl_progress_printing_opt=bl_progress_printing_opt,
+                int_workers=int_workers,
+            )
+        else:
+            #   first attempt for float_mu in each portfolio
+            mus = [
+                10.0 ** (5.0 * float(t / n_attempts) - 1.0)
+                for t in range(n_attempts)
+            ]
+            list_sols = self.solve_frontier(
+                array_cov,
+                array_mean,
+                mus,
+                bl_warm_start=bl_warm_start,
+                bl_progress_printing_opt=bl_progress_printing_opt,
+                int_workers=int_workers,
+            )
+        array_x = np.array([dict_sol['x'] for dict_sol in list_sols])
         # calculating risk and return for efficient frontier
-        array_returns = [
-            opt.blas.dot(pbar, x) * int_wdy for x in list_portfolios
-        ]
-        array_sigmas = [
-            np.sqrt(opt.blas.dot(x, S * x)) * np.sqrt(int_wdy)
-            for x in list_portfolios
-        ]
+        array_returns = list(array_x @ array_mean * int_wdy)
+        array_sigmas = list(
+            np.sqrt(np.einsum('ij,jk,ik->i', array_x, array_cov, array_x))
+            * np.sqrt(int_wdy)
+        )
         # calculate the second degree polynomial of the frontier curve
         m1 = np.polyfit(array_returns, array_sigmas, 2)
         x1 = np.sqrt(m1[2] / m1[0])
         # calculate the optimal portfolio
+        S = opt.matrix(array_cov)
+        pbar = opt.matrix(array_mean)
+        G = -opt.matrix(np.eye(n))
+        h = opt.matrix(0.0, (n, 1))
+        A = opt.matrix(1.0, (1, n))
+        b = opt.matrix(1.0)
         wt = opt.solvers.qp(opt.matrix(x1 * S), -pbar, G, h, A, b)['x']
         # returning weights, returns, and sigma from efficient frontier
         return np.asarray(wt), array_returns, array_sigmas
 
+    def sparse_table_argmax(self, array_values: np.ndarray) -> np.ndarray:
+        """
+        REFERENCES: Bender, M., Farach-Colton, M. - The LCA problem revisited (2000)
+        DOCSTRING: SPARSE TABLE FOR RANGE-ARGMAX QUERIES - ROW K HOLDS, FOR EACH POSITION I,
+            THE ARGMAX OF THE VALUES WITHIN [I, I + 2^K); BUILT IN O(N LOG N)
+        INPUTS: ARRAY OF VALUES
+        OUTPUTS: NUMPY ARRAY OF INTEGERS (LOG2(N) + 1 X N)
+        """
+        int_n = len(array_values)
+        int_levels = max(int(np.floor(np.log2(max(int_n, 1)))) + 1, 1)
+        array_table = np.empty(
+            (int_levels, int_n),
+            dtype=np.int32 if int_n < 2**31 else np.int64,
+        )
+        array_table[0] = np.arange(int_n)
+        for k in range(1, int_levels):
+            int_half = 1 << (k - 1)
+            int_len = int_n - (1 << k) + 1
+            array_left = array_table[k - 1, :int_len]
+            array_right = array_table[k - 1, int_half : int_half + int_len]
+            array_table[k, :int_len] = np.where(
+                array_values[array_right] > array_values[array_left],
+                array_right,
+                array_left,
+            )
+            # positions whose window overflows keep the previous level
+            array_table[k, int_len:] = array_table[k - 1, int_len:]
+        return array_table
+
+    def range_argmax(
+        self,
+        array_values: np.ndarray,
+        array_table: np.ndarray,
+        array_lo: np.ndarray,
+        array_hi: np.ndarray,
+    ) -> np.ndarray:
+        """
+        DOCSTRING: ARGMAX OF THE VALUES WITHIN [LO, HI) FOR MANY RANGES AT ONCE, IN O(1) EACH,
+            AS THE BEST OF TWO OVERLAPPING POWER-OF-TWO WINDOWS OF THE SPARSE TABLE
+        INPUTS: ARRAY OF VALUES, SPARSE TABLE, INFERIOR AND PAST-THE-END POSITIONS (NON-EMPTY
+            RANGES)
+        OUTPUTS: NUMPY ARRAY OF INTEGERS
+        """
+        array_k = np.floor(np.log2(array_hi - array_lo)).astype(int)
+        array_left = array_table[array_k, array_lo]
+        array_right = array_table[array_k, array_hi - (1 << array_k)]
+        return np.where(
+            array_values[array_right] > array_values[array_left],
+            array_right,
+            array_left,
+        )
+
     def eff_frontier(
         self,
         array_eff_risks: np.array,
@@ -939,39 +1838,72 @@ class MarkowitzEff:
         col_sharpe: str = 'sharpe',
         atol: float = 1e-2,
         int_pace_atol: int = 5,
+        rtol: float = 1e-5,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: RANDOM PORTFOLIOS CLOSEST TO THE EFFICIENT FRONTIER - FOR EACH FRONTIER
+            POINT, THE HIGHEST RETURN AMONG THE RANDOM PORTFOLIOS WHOSE SIGMA IS WITHIN THE
+            TOLERANCE BAND (AS NP.ISCLOSE), WIDENED BY THE PACE UNTIL IT HOLDS A PORTFOLIO; THE
+            PORTFOLIOS ARE SORTED BY SIGMA ONCE, THE BANDS ARE FOUND BY BINARY SEARCH AND THE
+            HIGHEST RETURNS BY A SPARSE TABLE, IN O(LOG N) PER FRONTIER POINT
+        INPUTS: FRONTIER RISKS AND RETURNS, RANDOM PORTFOLIOS WEIGHTS, RETURNS AND RISKS, RISK
+            FREE, COLUMNS NAMES, ABSOLUTE TOLERANCE (1E-2 AS DEFAULT), PACE OF THE TOLERANCE
+            (5 AS DEFAULT) AND RELATIVE TOLERANCE (1E-5 AS DEFAULT)
+        OUTPUTS: TUPLE OF DATAFRAMES (FRONTIER AND RANDOM PORTFOLIOS)
         """
-        # setting variables
-        array_eff_weights = list()
-        # convert string-based array_weights to a 2D array by splitting the values
-        array_weights_2d = np.array(
-            [list(map(float, row.split())) for row in array_weights]
+        # weights as a portfolios x assets matrix of floats
+        array_weights_2d = np.asarray(array_weights, dtype=float)
+        array_mus = np.asarray(array_mus, dtype=float).ravel()
+        array_sigmas = np.asarray(array_sigmas, dtype=float).ravel()
+        array_risks = np.asarray(array_eff_risks, dtype=float).ravel()
+        # random portfolios sorted by sigma and sparse table of their returns, built once
+        array_order = np.argsort(array_sigmas, kind='stable')
+        array_sigmas_sorted = array_sigmas[array_order]
+        array_mus_sorted = array_mus[array_order]
+        array_table = self.sparse_table_argmax(array_mus_sorted)
+        # distance to the closest sigma and tolerance band per frontier point - the absolute
+        #   tolerance grows by the pace until the band holds a portfolio
+        int_n = len(array_sigmas_sorted)
+        array_pos = np.searchsorted(array_sigmas_sorted, array_risks)
+        array_prev = np.clip(array_pos - 1, 0, int_n - 1)
+        array_next = np.clip(array_pos, 0, int_n - 1)
+        array_closest = np.where(
+            np.abs(array_sigmas_sorted[array_prev] - array_risks)
+            <= np.abs(array_sigmas_sorted[array_next] - array_risks),
+            array_prev,
+            array_next,
         )
-        # iterate over the efficient returns and risks
-        for _, eff_risk in zip(array_eff_returns, array_eff_risks):
-            while True:
-                try:
-                    #   find the indices in sigmas that correspond to the current risk using
-                    #       np.isclose
-                    list_idx_sigma = np.where(
-                        np.isclose(array_sigmas, eff_risk, atol=atol)
-                    )
-                    #   get the highest return for the given datasets
-                    idx_mu = np.argmax(array_mus[list_idx_sigma])
-                    # print(eff_risk, list_idx_sigma, array_mus[list_idx_sigma], idx_mu)
-                    # raise Exception('BREAK')
-                    #   get the index from mus and append weights
-                    array_eff_weights.append(array_weights_2d[idx_mu])
-                    #   in case of no error break the loop
-                    break
-                except ValueError:
-                    atol *= int_pace_atol
-        # convert to numpy array for final output if needed
-        array_eff_weights = np.array(array_eff_weights)
+        array_dist = np.abs(array_sigmas_sorted[array_closest] - array_risks)
+        array_excess = np.clip(
+            array_dist - rtol * np.abs(array_risks), 0.0, None
+        )
+        with np.errstate(divide='ignore'):
+            array_pow = np.ceil(
+                np.log(np.maximum(array_excess / atol, 1.0))
+                / np.log(int_pace_atol)
+            )
+        array_pow += array_excess > atol * float(int_pace_atol) ** array_pow
+        array_tol = atol * float(int_pace_atol) ** array_pow + rtol * np.abs(
+            array_risks
+        )
+        array_lo = np.searchsorted(
+            array_sigmas_sorted, array_risks - array_tol, side='left'
+        )
+        array_hi = np.searchsorted(
+            array_sigmas_sorted, array_risks + array_tol, side='right'
+        )
+        # bands left empty by rounding at their edges hold the closest portfolio
+        array_empty = array_hi <= array_lo
+        array_lo[array_empty] = array_closest[array_empty]
+        array_hi[array_empty] = array_closest[array_empty] + 1
+        # highest return within each band, mapped back to the random portfolios
+        array_eff_weights = array_weights_2d[
+            array_order[
+                self.range_argmax(
+                    array_mus_sorted, array_table, array_lo, array_hi
+                )
+            ]
+        ]
         # create a dataframe
         columns = [f'weight_{i}' for i in range(array_eff_weights.shape[1])]
         df_eff = pd.DataFrame(array_eff_weights, columns=columns)
@@ -982,7 +1914,11 @@ class MarkowitzEff:
         df_eff[col_sharpe] = (df_eff[col_mu] - float_rf) / df_eff[col_sigma]
         # create a pandas dataframe with returns, weights and mus from the original porfolios
         df_porf = pd.DataFrame(
-            {col_mu: array_mus, col_sigma: array_sigmas, col_w: array_weights}
+            {
+                col_mu: array_mus,
+                col_sigma: array_sigmas,
+                col_w: list(array_weights_2d),
+            }
         )
         # output the results
         return df_eff, df_porf
@@ -1035,7 +1971,10 @@ class MarkowitzEff:
         # prepare customdata for scatter plot
         customdata_portfolios = np.array(
             [
-                [weights, ', '.join(self.list_securities)]
+                [
+                    ' '.join([str(x) for x in weights]),
+                    ', '.join(self.list_securities),
+                ]
                 for weights in self.array_weights
             ],
             dtype=object,
@@ -1190,13 +2129,13 @@ class MarkowitzEff:
         else:
             int_argmax_sharpe = self.array_sharpes.argmax()
         # maximum sharpe ratio portfolio
-        array_eff_w = self.array_weights[self.array_sharpes.argmax()]
-        array_eff_mu = self.array_mus[self.array_sharpes.argmax()]
-        array_eff_sharpe = self.array_sharpes[self.array_sharpes.argmax()]
+        array_eff_w = self.array_weights[int_argmax_sharpe]
+        array_eff_mu = self.array_mus[int_argmax_sharpe]
+        array_eff_sharpe = self.array_sharpes[int_argmax_sharpe]
         # efficient quantities
         array_eff_quantities = [
             round(float(w) * self.float_prtf_notional / self.array_close[i])
-            for i, w in enumerate(array_eff_w.split())
+            for i, w in enumerate(array_eff_w)
         ]
         # calculating notional (ensure array_eff_quantities is properly calculated as float)
         self.array_close = np.round(self.array_close, self.int_round_close)
@@ -1250,7 +2189,7 @@ class MarkowitzEff:
         # efficient quantities
         array_eff_quantities = [
             round(float(w) * self.float_prtf_notional / self.array_close[i])
-            for i, w in enumerate(array_eff_w.split())
+            for i, w in enumerate(array_eff_w)
         ]
         # calculating notional (ensure array_eff_quantities is properly calculated as float)
         self.array_close = np.round(self.array_close, self.int_round_close)
@@ -0,0 +1,410 @@
+### MONTE CARLO VALUE-AT-RISK ###
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from stpstone.multithreading.mp_helper import mp_run_parallel
+from stpstone.quantitative_methods.linear_algebra import LinearAlgebra
+from stpstone.quantitative_methods.prob_distributions import HansenSkewStudent
+
+
+class MonteCarloVaR:
+    """
+    REFERENCES: Glasserman, P. - Monte Carlo Methods in Financial Engineering (2003), sections
+        4.2 (antithetic variates) and 5.2 (Sobol sequences); Hansen, B. - Autoregressive
+        conditional density estimation (1994)
+    DOCSTRING: MONTE CARLO VALUE-AT-RISK AND EXPECTED SHORTFALL OF PORTFOLIOS, WITH NORMAL OR
+        HANSEN'S SKEW-T SHOCKS CORRELATED THROUGH THE CHOLESKY FACTOR OF THE COVARIANCE MATRIX;
+        THE PATHS ARE SIMULATED IN FIXED-SIZE CHUNKS, SO ONLY A CHUNK OF SHOCKS (PATHS X
+        ASSETS) SITS IN MEMORY AT ONCE, ALONGSIDE THE P&L VECTOR - THE DRAWS OF EACH BLOCK
+        OF PATHS COME FROM ITS OWN SEED SEQUENCE (OR ITS SOBOL POINTS), HENCE THE
+        DRAWS OF A PATH DEPEND ON THE SEED ONLY, NOT ON THE CHUNK SIZE NOR ON THE WORKERS
+    INPUTS: POSITIONS (FINANCIAL EXPOSURES - ASSETS, OR ASSETS X PORTFOLIOS), COVARIANCE
+        MATRIX OF RETURNS (ASSETS X ASSETS, FOR ONE DAY), MEAN RETURNS (NONE AS DEFAULT, OR
+        ZEROS), DISTRIBUTION OF THE SHOCKS ('NORMAL' OR 'SKEW_T'), DEGREES OF FREEDOM AND
+        SKEWNESS OF THE SKEW-T (10 AND -0.1 AS DEFAULT), HORIZON IN DAYS (1 AS DEFAULT),
+        CONFIDENCE LEVELS (0.95, 0.975 AND 0.99 AS DEFAULT), SEED (NONE AS DEFAULT),
+        ANTITHETIC VARIATES (FALSE AS DEFAULT), SOBOL SEQUENCE (FALSE AS DEFAULT), CHUNK SIZE
+        IN PATHS (10,000 AS DEFAULT) AND P&L FUNCTION OF THE RETURNS OF A CHUNK (PATHS X
+        ASSETS), FOR NON-LINEAR PORTFOLIOS (NONE AS DEFAULT, OR LINEAR POSITIONS)
+    OUTPUTS: -
+    """
+
+    # paths per block of draws - a power of 2, keeping the balance of sobol points
+    INT_BLOCK_PATHS = 1024
+    FLOAT_U_TOL = 2.0**-53
+
+    def __init__(
+        self,
+        array_positions: Any,
+        array_cov: Any,
+        array_mu: Optional[Any] = None,
+        str_distribution: str = 'normal',
+        float_eta: float = 10.0,
+        float_lam: float = -0.1,
+        int_horizon: int = 1,
+        list_confidence_levels: List[float] = [0.95, 0.975, 0.99],
+        int_seed: Optional[int] = None,
+        bl_antithetic: bool = False,
+        bl_sobol: bool = False,
+        int_chunk_size: int = 10000,
+        func_pnl: Optional[Callable] = None,
+    ) -> None:
+        # checking parameters
+        if str_distribution not in ['normal', 'skew_t']:
+            raise Exception(
+                'Distribution ought be normal or skew_t, please revisit'
+            )
+        if any([not 0.0 < x < 1.0 for x in list_confidence_levels]):
+            raise Exception(
+                'Confidence levels ought be within (0, 1), please revisit'
+            )
+        if int_chunk_size < 1:
+            raise Exception('Chunk size ought be positive, please revisit')
+        # covariance matrix - cholesky factor, assets x assets
+        self.list_assets = (
+            list(array_cov.columns)
+            if isinstance(array_cov, pd.DataFrame)
+            else None
+        )
+        self.array_cov = np.atleast_2d(np.asarray(array_cov, dtype=float))
+        self.int_n_assets = self.array_cov.shape[0]
+        self.array_chol = LinearAlgebra().cholesky_decomposition(
+            self.array_cov
+        )
+        self.array_mu = (
+            np.zeros(self.int_n_assets)
+            if array_mu is None
+            else np.asarray(array_mu, dtype=float).reshape(self.int_n_assets)
+        )
+        # positions - assets x portfolios, aligned to the covariance assets when both are
+        #   named
+        if (
+            isinstance(array_positions, (pd.Series, pd.DataFrame))
+            and self.list_assets is not None
+        ):
+            array_positions = array_positions.reindex(self.list_assets).fillna(
+                0.0
+            )
+        self.list_portfolios = (
+            list(array_positions.columns)
+            if isinstance(array_positions, pd.DataFrame)
+            else None
+        )
+        self.bl_single_portfolio = np.ndim(array_positions) == 1
+        self.array_positions = np.asarray(array_positions, dtype=float)
+        if self.bl_single_portfolio == True:
+            self.array_positions = self.array_positions[:, None]
+        if self.array_positions.shape[0] != self.int_n_assets:
+            raise Exception(
+                'Positions and covariance matrix ought have the same number of '
+                'assets, please revisit'
+            )
+        self.str_distribution = str_distribution
+        self.cls_skew_t = HansenSkewStudent(eta=float_eta, lam=float_lam)
+        self.int_horizon = int_horizon
+        self.list_confidence_levels = list(list_confidence_levels)
+        # entropy of the seed sequence - drawn once when no seed is given, so that every
+        #   chunk and worker shares it
+        self.int_entropy = np.random.SeedSequence(int_seed).entropy
+        self.bl_antithetic = bl_antithetic
+        self.bl_sobol = bl_sobol
+        self.int_chunk_size = int_chunk_size
+        self.func_pnl = func_pnl
+        self.array_pnl = None
+        # sobol engine drawn in sequence across chunks, the next block it draws and the last
+        #   block drawn
+        self.cls_sobol = None
+        self.int_sobol_next = 0
+        self.array_sobol_last = None
+
+    def sobol_uniforms(
+        self, int_block_inf: int, int_block_sup: int
+    ) -> np.ndarray:
+        """
+        DOCSTRING: SCRAMBLED SOBOL POINTS OF THE BLOCKS WITHIN [INF, SUP], FROM A SINGLE ENGINE
+            KEPT ACROSS CALLS - IT IS FAST-FORWARDED ONLY WHEN THE BLOCKS ARE NOT THE ONES IT
+            DRAWS NEXT (FIRST CHUNK OF A WORKER), WHILE THE LAST BLOCK DRAWN IS KEPT FOR CHUNKS
+            SHARING IT (ANTITHETIC VARIATES)
+        INPUTS: INFERIOR AND SUPERIOR BLOCKS
+        OUTPUTS: NUMPY ARRAY (BLOCKS PATHS X ASSETS)
+        """
+        list_u = list()
+        int_block_inf, int_block_sup = int(int_block_inf), int(int_block_sup)
+        # last block drawn, shared with the former chunk
+        if (
+            self.cls_sobol is not None
+            and int_block_inf == self.int_sobol_next - 1
+        ):
+            list_u.append(self.array_sobol_last)
+            int_block_inf += 1
+        # engine positioned at the first block to draw
+        if self.cls_sobol is None or int_block_inf != self.int_sobol_next:
+            self.cls_sobol = qmc.Sobol(
+                d=self.int_n_assets,
+                scramble=True,
+                seed=np.random.default_rng(
+                    np.random.SeedSequence(self.int_entropy)
+                ),
+            )
+            if int_block_inf > 0:
+                self.cls_sobol.fast_forward(
+                    int_block_inf * self.INT_BLOCK_PATHS
+                )
+        # block by block, keeping the balance of each block's points
+        for _ in range(int_block_inf, int_block_sup + 1):
+            list_u.append(self.cls_sobol.random(self.INT_BLOCK_PATHS))
+            self.array_sobol_last = list_u[-1]
+        if int_block_sup >= int_block_inf:
+            self.int_sobol_next = int_block_sup + 1
+        return np.vstack(list_u)
+
+    def shocks_blocks(
+        self, int_block_inf: int, int_block_sup: int
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        DOCSTRING: INDEPENDENT STANDARD SHOCKS (MEAN ZERO, UNIT VARIANCE) OF THE BLOCKS OF BASE
+            PATHS WITHIN [INF, SUP], AND THEIR ANTITHETIC COUNTERPARTS - NORMAL PSEUDO-RANDOM
+            SHOCKS ARE DRAWN STRAIGHT FROM EACH BLOCK'S OWN SEED SEQUENCE (MIRRORED AS -Z),
+            WHEREAS SOBOL AND SKEW-T SHOCKS ARE QUANTILES OF UNIFORM DRAWS (MIRRORED AS 1 - U) -
+            SOBOL POINTS ARE SCRAMBLED AND DRAWN IN SEQUENCE
+        INPUTS: INFERIOR AND SUPERIOR BLOCKS
+        OUTPUTS: TUPLE OF NUMPY ARRAYS (BLOCKS PATHS X ASSETS) - ANTITHETIC SHOCKS ARE NONE
+            WITHOUT ANTITHETIC VARIATES
+        """
+        if self.bl_sobol == True:
+            array_u = self.sobol_uniforms(int_block_inf, int_block_sup)
+        else:
+            list_rngs = [
+                np.random.default_rng(
+                    np.random.SeedSequence(
+                        self.int_entropy, spawn_key=(int_block,)
+                    )
+                )
+                for int_block in range(int_block_inf, int_block_sup + 1)
+            ]
+            if self.str_distribution == 'normal':
+                array_z = np.vstack(
+                    [
+                        rng.standard_normal(
+                            (self.INT_BLOCK_PATHS, self.int_n_assets)
+                        )
+                        for rng in list_rngs
+                    ]
+                )
+                return array_z, (
+                    -array_z if self.bl_antithetic == True else None
+                )
+            array_u = np.vstack(
+                [
+                    rng.random((self.INT_BLOCK_PATHS, self.int_n_assets))
+                    for rng in list_rngs
+                ]
+            )
+        # quantiles of the uniform draws, within (0, 1)
+        array_u = np.clip(array_u, self.FLOAT_U_TOL, 1.0 - self.FLOAT_U_TOL)
+        if self.str_distribution == 'normal':
+            array_z = ndtri(array_u)
+            return array_z, (-array_z if self.bl_antithetic == True else None)
+        return self.skew_t_ppf(array_u), (
+            self.skew_t_ppf(1.0 - array_u)
+            if self.bl_antithetic == True
+            else None
+        )
+
+    def skew_t_ppf(self, array_u: np.ndarray) -> np.ndarray:
+        """
+        DOCSTRING: QUANTILES OF HANSEN'S SKEW-T, KEEPING THE SHAPE OF THE UNIFORM DRAWS
+        INPUTS: UNIFORM DRAWS
+        OUTPUTS: NUMPY ARRAY
+        """
+        return np.asarray(self.cls_skew_t.ppf(array_u)).reshape(array_u.shape)
+
+    def standard_shocks(self, int_start: int, int_end: int) -> np.ndarray:
+        """
+        DOCSTRING: INDEPENDENT STANDARD SHOCKS OF THE PATHS WITHIN [START, END) - WITH
+            ANTITHETIC VARIATES, THE ODD PATHS MIRROR THE EVEN ONES
+        INPUTS: FIRST AND PAST-THE-END PATHS
+        OUTPUTS: NUMPY ARRAY (PATHS X ASSETS)
+        """
+        array_paths = np.arange(int_start, int_end)
+        array_base = (
+            array_paths // 2 if self.bl_antithetic == True else array_paths
+        )
+        # blocks of base paths covering the chunk
+        int_block_inf = array_base[0] // self.INT_BLOCK_PATHS
+        int_block_sup = array_base[-1] // self.INT_BLOCK_PATHS
+        array_z_blocks, array_z_anti = self.shocks_blocks(
+            int_block_inf, int_block_sup
+        )
+        array_idx = array_base - int_block_inf * self.INT_BLOCK_PATHS
+        array_z = array_z_blocks[array_idx]
+        if self.bl_antithetic == True:
+            array_odd = array_paths % 2 == 1
+            array_z[array_odd] = array_z_anti[array_idx[array_odd]]
+        return array_z
+
+    def correlated_returns(self, int_start: int, int_end: int) -> np.ndarray:
+        """
+        DOCSTRING: SIMULATED RETURNS OVER THE HORIZON OF THE PATHS WITHIN [START, END) - MU *
+            H + SQRT(H) * L * Z
+        INPUTS: FIRST AND PAST-THE-END PATHS
+        OUTPUTS: NUMPY ARRAY (PATHS X ASSETS)
+        """
+        return self.array_mu * self.int_horizon + np.sqrt(self.int_horizon) * (
+            self.standard_shocks(int_start, int_end) @ self.array_chol.T
+        )
+
+    def pnl_chunk(self, int_start: int, int_end: int) -> np.ndarray:
+        """
+        DOCSTRING: P&L OF THE PATHS WITHIN [START, END) - FOR LINEAR POSITIONS, THE SHOCKS ARE
+            PROJECTED ONTO THE CHOLESKY LOADINGS OF THE POSITIONS (L' * W), WITHOUT BUILDING
+            THE CORRELATED RETURNS
+        INPUTS: FIRST AND PAST-THE-END PATHS
+        OUTPUTS: NUMPY ARRAY (PATHS X PORTFOLIOS)
+        """
+        if self.func_pnl is not None:
+            return np.asarray(
+                self.func_pnl(self.correlated_returns(int_start, int_end)),
+                dtype=float,
+            ).reshape(int_end - int_start, -1)
+        return (
+            self.array_mu @ self.array_positions * self.int_horizon
+            + np.sqrt(self.int_horizon)
+            * (
+                self.standard_shocks(int_start, int_end)
+                @ (self.array_chol.T @ self.array_positions)
+            )
+        )
+
+    def simulate(
+        self, int_n_paths: int = 100000, int_workers: int = 1
+    ) -> np.ndarray:
+        """
+        DOCSTRING: SIMULATE THE P&L OF ALL THE PATHS, CHUNK BY CHUNK, OPTIONALLY SPREAD OVER
+            WORKER PROCESSES - THE RESULT DOES NOT DEPEND ON THE CHUNK SIZE NOR ON THE NUMBER
+            OF WORKERS
+        INPUTS: NUMBER OF PATHS (100,000 AS DEFAULT) AND NUMBER OF WORKER PROCESSES (1 AS
+            DEFAULT, SERIAL)
+        OUTPUTS: NUMPY ARRAY (PATHS X PORTFOLIOS)
+        """
+        list_chunks = [
+            (int_start, min(int_start + self.int_chunk_size, int_n_paths))
+            for int_start in range(0, int_n_paths, self.int_chunk_size)
+        ]
+        if int_workers > 1 and len(list_chunks) > 1:
+            list_pnl = mp_run_parallel(
+                self.pnl_chunk,
+                [(tup_chunk, dict()) for tup_chunk in list_chunks],
+                int_ncpus=int_workers,
+            )
+        else:
+            list_pnl = [
+                self.pnl_chunk(int_start, int_end)
+                for int_start, int_end in list_chunks
+            ]
+        self.array_pnl = np.vstack(list_pnl)
+        return self.array_pnl
+
+    def var_es(self) -> Dict[str, Any]:
+        """
+        DOCSTRING: VALUE-AT-RISK AND EXPECTED SHORTFALL, AS POSITIVE LOSSES, FOR ALL THE
+            CONFIDENCE LEVELS, FROM A SINGLE PARTITION OF THE SIMULATED LOSSES - THE VAR IS THE
+            K-TH WORST LOSS AND THE ES IS THE AVERAGE OF THE K WORST LOSSES, WITH K = CEIL(N *
+            (1 - ALPHA))
+        INPUTS: -
+        OUTPUTS: DICTIONARY WITH VAR AND ES KEYS (PANDAS SERIES INDEXED BY CONFIDENCE LEVELS,
+            OR DATAFRAMES CONFIDENCE LEVELS X PORTFOLIOS)
+        """
+        if self.array_pnl is None:
+            raise Exception(
+                'Monte Carlo P&L not simulated, please call simulate first'
+            )
+        int_n_paths = self.array_pnl.shape[0]
+        array_k = np.clip(
+            np.ceil(
+                np.round(
+                    int_n_paths
+                    * (1.0 - np.array(self.list_confidence_levels)),
+                    8,
+                )
+            ).astype(int),
+            1,
+            int_n_paths,
+        )
+        # single partition pass - the worst k losses of every level lie beyond n - k
+        array_losses = np.partition(
+            -self.array_pnl, np.unique(int_n_paths - array_k), axis=0
+        )
+        array_var = array_losses[int_n_paths - array_k]
+        array_es = (
+            np.cumsum(array_losses[::-1], axis=0)[array_k - 1]
+            / array_k[:, None]
+        )
+        if self.bl_single_portfolio == True:
+            return {
+                'var': pd.Series(
+                    array_var[:, 0], index=self.list_confidence_levels
+                ),
+                'es': pd.Series(
+                    array_es[:, 0], index=self.list_confidence_levels
+                ),
+            }
+        return {
+            'var': pd.DataFrame(
+                array_var,
+                index=self.list_confidence_levels,
+                columns=self.list_portfolios,
+            ),
+            'es': pd.DataFrame(
+                array_es,
+                index=self.list_confidence_levels,
+                columns=self.list_portfolios,
+            ),
+        }
+
+
+if __name__ == '__main__':
+    import time
+
+    from stpstone.quantitative_methods.prob_distributions import (
+        NormalDistribution,
+    )
+
+    # benchmark - 1M paths x 500 assets, chunks of 10,000 paths (40 MB of shocks at once)
+    int_n_assets = 500
+    rng = np.random.default_rng(42)
+    array_a = rng.normal(0.0, 0.01, (int_n_assets, int_n_assets))
+    array_cov = array_a @ array_a.T / int_n_assets + np.diag(
+        np.full(int_n_assets, 1e-4)
+    )
+    array_positions = rng.normal(0.0, 1e6, int_n_assets)
+    cls_mc = MonteCarloVaR(
+        array_positions,
+        array_cov,
+        int_seed=42,
+        bl_antithetic=True,
+        int_chunk_size=10000,
+    )
+    float_t0 = time.perf_counter()
+    cls_mc.simulate(int_n_paths=1000000)
+    dict_var_es = cls_mc.var_es()
+    print(
+        'MONTE CARLO VAR - 1M PATHS X {} ASSETS: {:.2f} s'.format(
+            int_n_assets, time.perf_counter() - float_t0
+        )
+    )
+    float_sigma = np.sqrt(array_positions @ array_cov @ array_positions)
+    for float_level in cls_mc.list_confidence_levels:
+        print(
+            '{}: MC VAR {:.2f} | PARAMETRIC VAR {:.2f} | MC ES {:.2f}'.format(
+                float_level,
+                dict_var_es['var'].loc[float_level],
+                NormalDistribution().inv_cdf(float_level) * float_sigma,
+                dict_var_es['es'].loc[float_level],
+            )
+        )
@@ -332,29 +332,24 @@ class PrecificacaoTD:
         """
         pass
 
-    def dus_vencimento(
-        self, data_vencimento, data_referencia=DatesBR().curr_date()
-    ):
+    def dus_vencimento(self, data_vencimento, data_referencia=None):
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: DIAS ÚTEIS ATÉ O VENCIMENTO, COM O AJUSTE ANBIMA
+        INPUTS: DATA DE VENCIMENTO (OU ARRAY-LIKE DE DATAS) E DATA DE REFERÊNCIA (HOJE COMO PADRÃO)
+        OUTPUTS: INT, OU NUMPY ARRAY PARA ARRAY-LIKES DE VENCIMENTOS
         """
+        # data de referência
+        if data_referencia == None:
+            data_referencia = DatesBR().curr_date
         # convertendo datas para datetime
         if type(data_vencimento) == str:
             data_vencimento = DatesBR().str_date_to_datetime(
-                data_vencimento, 'DD/MM/AAAA'
+                data_vencimento, 'DD/MM/YYYY'
             )
-        # lista últimos dias do ano entre o intervalo
-        list_years = DatesBR().list_years_within_dates(
-            data_referencia, data_vencimento
-        )
-        list_last_week_year_day = DatesBR().list_last_days_of_years(list_years)
-        # retornando dias úteis para o vencimento
-        return DatesBR().get_working_days_delta(
-            data_referencia, data_vencimento
-        ) + DatesBR().add_holidays_not_considered_anbima(
-            data_referencia, data_vencimento, list_last_week_year_day
+        # retornando dias úteis para o vencimento - dias não considerados pela anbima, como
+        #   os últimos dias úteis dos anos no intervalo, são somados à contagem
+        return DatesBR().working_days_delta(
+            data_referencia, data_vencimento, bl_anbima=True
         )
 
     def dus_pagamento_cupons(self, prim_dia_util, papel, vencimento):
@@ -16,6 +16,7 @@ import requests
 import wget
 
 from stpstone.handling_data.dicts import HandlingDicts
+from stpstone.handling_data.http_cache import HttpCache
 from stpstone.handling_data.str import StrHandler
 
 
@@ -229,21 +230,40 @@ class DirFilesManagement:
         bl_io_interpreting: bool = False,
         timeout: Union[Tuple[int, int], int] = (5, 5),
         session=None,
+        bl_cache: bool = False,
+        http_cache: HttpCache = None,
     ) -> List[ZipFile]:
         """
         REFERENCES: https://stackoverflow.com/questions/5710867/downloading-and-unzipping-a-zip-file-without-writing-to-disk
         DOCSTRING: DOWNLOAD A ZIP AND UNZIP IT, HANDLING FILE IN MEMORY
-        INPUTS: FILE URL
+        INPUTS: FILE URL, VERIFY SSL CERTIFICATE, INTERPRET A SINGLE FILE AS TEXT, TIMEOUT,
+            REQUESTS SESSION, CACHE THE ARCHIVE ON DISK (FALSE AS DEFAULT) AND HTTP CACHE
+            (NONE AS DEFAULT, HTTPCACHE WITH DEFAULT DIRECTORY, TTL AND SIZE CAP)
         OUTPUTS: LIST OF OPENNED FILES UNZIPPED
         """
-        # requiring url zip content
-        if session is not None:
-            req_resp = session.get(file_url, verify=bl_verify, timeout=timeout)
-        else:
-            req_resp = requests.get(
-                file_url, verify=bl_verify, timeout=timeout
+        # requiring url zip content - when the cache is enabled, memory-mapped from disk and
+        #   revalidated through conditional requests once stale
+        if bl_cache == True:
+            if http_cache is None:
+                http_cache = HttpCache()
+            zipfile = ZipFile(
+                http_cache.get(
+                    file_url,
+                    bl_verify=bl_verify,
+                    timeout=timeout,
+                    session=session,
+                )
             )
-        zipfile = ZipFile(BytesIO(req_resp.content))
+        else:
+            if session is not None:
+                req_resp = session.get(
+                    file_url, verify=bl_verify, timeout=timeout
+                )
+            else:
+                req_resp = requests.get(
+                    file_url, verify=bl_verify, timeout=timeout
+                )
+            zipfile = ZipFile(BytesIO(req_resp.content))
         # defining names of files from extraction
         zip_names = zipfile.namelist()
         # check wheter the exported content is a file or a list of files
@@ -0,0 +1,274 @@
+### ON-DISK HTTP CACHE WITH CONDITIONAL REQUESTS ###
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import time
+from glob import escape, glob
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+
+
+class HttpCache:
+    """
+    DOCSTRING: RESPONSES BODIES CACHED ON DISK, ADDRESSED BY THE SHA1 OF THE URL, WITH A JSON
+        SIDECAR OF VALIDATORS (ETAG AND LAST-MODIFIED); WITHIN THE TIME TO LIVE A HIT SKIPS THE
+        NETWORK, AFTERWARDS THE ENTRY IS REVALIDATED THROUGH A CONDITIONAL GET (304 KEEPS THE
+        BODY); BODIES ARE SERVED MEMORY-MAPPED AND THE LEAST RECENTLY USED ENTRIES ARE EVICTED
+        ABOVE THE SIZE CAP
+    INPUTS: DIRECTORY OF THE CACHE FILES (STPSTONE_CACHE_DIR ENVIRONMENT VARIABLE, OR
+        ~/.cache/stpstone, AS DEFAULT), TIME TO LIVE IN SECONDS (1 HOUR AS DEFAULT) AND SIZE
+        CAP IN BYTES (2 GB AS DEFAULT)
+    OUTPUTS: -
+    """
+
+    INT_CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        path_dir: Optional[str] = None,
+        int_ttl_seconds: int = 3600,
+        int_max_bytes: int = 2 * 1024**3,
+    ) -> None:
+        if path_dir == None:
+            path_dir = os.environ.get(
+                'STPSTONE_CACHE_DIR',
+                os.path.join(os.path.expanduser('~'), '.cache', 'stpstone'),
+            )
+        self.path_dir = path_dir
+        self.int_ttl_seconds = int_ttl_seconds
+        self.int_max_bytes = int_max_bytes
+
+    def paths(self, file_url: str) -> Tuple[str, str]:
+        """
+        DOCSTRING: PATHS OF THE BODY AND OF THE VALIDATORS SIDECAR OF AN URL
+        INPUTS: URL
+        OUTPUTS: TUPLE OF STRINGS
+        """
+        str_name = 'http_v{}_{}'.format(
+            self.INT_CACHE_VERSION,
+            hashlib.sha1(file_url.encode('utf-8')).hexdigest(),
+        )
+        return (
+            os.path.join(self.path_dir, str_name + '.bin'),
+            os.path.join(self.path_dir, str_name + '.json'),
+        )
+
+    def load_meta(self, file_url: str) -> Optional[Dict[str, Any]]:
+        """
+        DOCSTRING: VALIDATORS OF A CACHED URL, PROVIDED ITS BODY IS STILL ON DISK
+        INPUTS: URL
+        OUTPUTS: DICTIONARY, OR NONE WHEN THE URL IS NOT CACHED
+        """
+        path_body, path_meta = self.paths(file_url)
+        try:
+            with open(path_meta, 'r') as f:
+                dict_meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            dict_meta.get('url') != file_url
+            or os.path.isfile(path_body) == False
+        ):
+            return None
+        return dict_meta
+
+    def dump_meta(self, file_url: str, dict_meta: Dict[str, Any]) -> bool:
+        """
+        DOCSTRING: ATOMIC WRITE OF THE VALIDATORS SIDECAR
+        INPUTS: URL AND VALIDATORS
+        OUTPUTS: BOOLEAN
+        """
+        _, path_meta = self.paths(file_url)
+        return self.atomic_write(
+            path_meta, json.dumps(dict_meta).encode('utf-8')
+        )
+
+    def atomic_write(self, path_file: str, bytes_content: bytes) -> bool:
+        """
+        DOCSTRING: WRITE TO A TEMPORARY FILE IN THE CACHE DIRECTORY AND RENAME IT, SO READERS
+            NEVER SEE A PARTIAL FILE; AN UNWRITABLE DIRECTORY (OR A BODY MAPPED BY ANOTHER
+            PROCESS, ON WINDOWS) LEAVES THE CACHE UNTOUCHED
+        INPUTS: PATH OF THE FILE AND CONTENT
+        OUTPUTS: BOOLEAN
+        """
+        path_tmp = None
+        try:
+            os.makedirs(self.path_dir, exist_ok=True)
+            int_fd, path_tmp = tempfile.mkstemp(dir=self.path_dir)
+            with os.fdopen(int_fd, 'wb') as f:
+                f.write(bytes_content)
+            os.replace(path_tmp, path_file)
+            return True
+        except OSError:
+            if path_tmp is not None and os.path.exists(path_tmp) == True:
+                os.remove(path_tmp)
+            return False
+
+    def open_body(self, file_url: str) -> Union[mmap.mmap, BytesIO]:
+        """
+        DOCSTRING: READ-ONLY MEMORY MAP OF A CACHED BODY, MARKED AS RECENTLY USED
+        INPUTS: URL
+        OUTPUTS: MMAP (BYTESIO FOR AN EMPTY BODY)
+        """
+        path_body, _ = self.paths(file_url)
+        os.utime(path_body, None)
+        with open(path_body, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return BytesIO(b'')
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def evict(self) -> int:
+        """
+        DOCSTRING: REMOVE THE LEAST RECENTLY USED BODIES (MODIFICATION TIME, REFRESHED ON EACH
+            HIT) AND THEIR SIDECARS UNTIL THE CACHE FITS THE SIZE CAP
+        INPUTS: -
+        OUTPUTS: INTEGER - NUMBER OF ENTRIES REMOVED
+        """
+        list_entries = list()
+        for path_body in glob(
+            os.path.join(
+                escape(self.path_dir),
+                'http_v{}_*.bin'.format(self.INT_CACHE_VERSION),
+            )
+        ):
+            try:
+                stat_ = os.stat(path_body)
+            except OSError:
+                continue
+            list_entries.append((stat_.st_mtime, stat_.st_size, path_body))
+        int_bytes = sum(int_size for _, int_size, _ in list_entries)
+        int_removed = 0
+        for _, int_size, path_body in sorted(list_entries):
+            if int_bytes <= self.int_max_bytes:
+                break
+            try:
+                os.remove(path_body)
+            except OSError:
+                continue
+            path_meta = path_body[: -len('.bin')] + '.json'
+            if os.path.exists(path_meta) == True:
+                os.remove(path_meta)
+            int_bytes -= int_size
+            int_removed += 1
+        return int_removed
+
+    def get(
+        self,
+        file_url: str,
+        bl_verify: bool = True,
+        timeout: Union[Tuple[int, int], int] = (5, 5),
+        session=None,
+    ) -> Union[mmap.mmap, BytesIO]:
+        """
+        DOCSTRING: BODY OF AN URL - FROM DISK WITHIN THE TIME TO LIVE, OTHERWISE THROUGH A
+            CONDITIONAL GET (IF-NONE-MATCH / IF-MODIFIED-SINCE), KEEPING THE CACHED BODY ON A 304
+            AND REPLACING IT ON A 200; ON OTHER STATUSES, OR AN UNREACHABLE SERVER, THE STALE
+            BODY IS SERVED WHEN CACHED, OTHERWISE AN EXCEPTION IS RAISED
+        INPUTS: URL, VERIFY SSL CERTIFICATE (TRUE AS DEFAULT), TIMEOUT AND REQUESTS SESSION
+            (NONE AS DEFAULT)
+        OUTPUTS: FILE-LIKE OBJECT (MMAP WHEN CACHED, BYTESIO OTHERWISE)
+        """
+        # fresh entry - no network at all
+        dict_meta = self.load_meta(file_url)
+        if (
+            dict_meta is not None
+            and time.time() - dict_meta['time_validated']
+            < self.int_ttl_seconds
+        ):
+            try:
+                return self.open_body(file_url)
+            #   entry evicted meanwhile by another process
+            except OSError:
+                dict_meta = None
+        # conditional request of a stale entry
+        dict_headers = dict()
+        if dict_meta is not None:
+            if dict_meta.get('etag') is not None:
+                dict_headers['If-None-Match'] = dict_meta['etag']
+            if dict_meta.get('last_modified') is not None:
+                dict_headers['If-Modified-Since'] = dict_meta['last_modified']
+        try:
+            req_resp = (session if session is not None else requests).get(
+                file_url,
+                verify=bl_verify,
+                timeout=timeout,
+                headers=dict_headers,
+            )
+        #   unreachable server - the stale body, when there is one
+        except requests.exceptions.RequestException:
+            if dict_meta is None:
+                raise
+            return self.open_body(file_url)
+        #   not modified - revalidated body
+        if req_resp.status_code == 304 and dict_meta is not None:
+            dict_meta['time_validated'] = time.time()
+            for str_key, str_header in [
+                ('etag', 'ETag'),
+                ('last_modified', 'Last-Modified'),
+            ]:
+                if req_resp.headers.get(str_header) is not None:
+                    dict_meta[str_key] = req_resp.headers[str_header]
+            _ = self.dump_meta(file_url, dict_meta)
+            try:
+                return self.open_body(file_url)
+            except OSError:
+                req_resp = (session if session is not None else requests).get(
+                    file_url, verify=bl_verify, timeout=timeout
+                )
+        #   error statuses are never cached nor served - the stale body, when there is one,
+        #       otherwise an exception
+        if req_resp.status_code != 200:
+            if dict_meta is not None:
+                try:
+                    return self.open_body(file_url)
+                except OSError:
+                    pass
+            raise Exception(
+                'HTTP status {} requesting {}, please revisit'.format(
+                    req_resp.status_code, file_url
+                )
+            )
+        # storing the new body, then its validators
+        path_body, _ = self.paths(file_url)
+        if self.atomic_write(path_body, req_resp.content) == False:
+            return BytesIO(req_resp.content)
+        if (
+            self.dump_meta(
+                file_url,
+                {
+                    'url': file_url,
+                    'etag': req_resp.headers.get('ETag'),
+                    'last_modified': req_resp.headers.get('Last-Modified'),
+                    'time_validated': time.time(),
+                },
+            )
+            == False
+        ):
+            return BytesIO(req_resp.content)
+        #   a body larger than the size cap is evicted at once, and served from memory
+        _ = self.evict()
+        try:
+            return self.open_body(file_url)
+        except OSError:
+            return BytesIO(req_resp.content)
+
+    def clear(self) -> int:
+        """
+        DOCSTRING: REMOVE ALL THE HTTP CACHE FILES
+        INPUTS: -
+        OUTPUTS: INTEGER - NUMBER OF FILES REMOVED
+        """
+        list_files = glob(os.path.join(escape(self.path_dir), 'http_v*'))
+        int_removed = 0
+        for path_file in list_files:
+            try:
+                os.remove(path_file)
+                int_removed += 1
+            except OSError:
+                continue
+        return int_removed
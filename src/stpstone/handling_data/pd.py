@@ -1,8 +1,10 @@
 ### DEAL WITH PANDAS ISSUES ###
 
 import os
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from stpstone.cals.handling_dates import DatesBR
@@ -17,6 +19,17 @@ class DealingPd(DealingExcel):
     DOCSTRING: COMMON FUNCTIONS TO DEAL WITH DATA IMPORT TO PANDAS DATAFRAMES OR TIMESERIES
     """
 
+    # strptime formats of DatesBR().str_date_to_datetime's codes - two-digit years are prefixed
+    #   with the century beforehand, as DatesBR does
+    DICT_FMT_DT = {
+        'DD/MM/YYYY': '%d/%m/%Y',
+        'YYYY-MM-DD': '%Y-%m-%d',
+        'YYMMDD': '%Y%m%d',
+        'DDMMYY': '%d%m%Y',
+        'DDMMYYYY': '%d%m%Y',
+        'DD/MM/YY': '%d/%m/%Y',
+    }
+
     def append_df_to_Excel(
         self,
         filename,
@@ -228,6 +241,57 @@ class DealingPd(DealingExcel):
             dict_[col_] = df_[col_].astype(str).str.len().max()
         return dict_
 
+    def str_dates_to_datetime(
+        self,
+        ser_: pd.Series,
+        str_fmt_dt: str = 'YYYY-MM-DD',
+        bl_dt64: bool = False,
+    ) -> pd.Series:
+        """
+        DOCSTRING: STRING DATES TO DATES, AS DATESBR().STR_DATE_TO_DATETIME - EACH DISTINCT
+            STRING IS PARSED ONCE, THROUGH DATETIME.STRPTIME (PD.TO_DATETIME FOR DATETIME64,
+            WITHIN ITS NANOSECOND BOUNDS) WITH AN EXPLICIT FORMAT, AND TAKEN BACK BY ITS CODES
+        INPUTS: SERIES, DATE FORMAT CODE ('YYYY-MM-DD' AS DEFAULT) AND WHETHER TO RETURN
+            DATETIME64 INSTEAD OF DATETIME.DATE OBJECTS (FALSE AS DEFAULT)
+        OUTPUTS: SERIES
+        """
+        if str_fmt_dt not in self.DICT_FMT_DT:
+            raise Exception('format não é válido, favor revisite o parâmetro')
+        # distinct strings
+        array_codes, array_uniques = pd.factorize(ser_)
+        ser_uniques = pd.Series(array_uniques, dtype=object).astype(str)
+        # two-digit years within the 2000s, or the current century for DD/MM/YY
+        if str_fmt_dt == 'YYMMDD':
+            ser_uniques = '20' + ser_uniques
+        elif str_fmt_dt == 'DDMMYY':
+            ser_uniques = ser_uniques.str[:4] + '20' + ser_uniques.str[-2:]
+        elif str_fmt_dt == 'DD/MM/YY':
+            ser_uniques = (
+                ser_uniques.str[:6]
+                + str(DatesBR().year_number(DatesBR().curr_date))[:2]
+                + ser_uniques.str[-2:]
+            )
+        # taking the parsed uniques back to the rows, missing values as missing dates
+        if bl_dt64 == True:
+            ser_dt = pd.to_datetime(
+                ser_uniques, format=self.DICT_FMT_DT[str_fmt_dt]
+            )
+            array_dt = np.append(ser_dt.to_numpy(), np.datetime64('NaT', 'ns'))
+        #   date objects through strptime, free of the nanosecond bounds of datetime64 - fill
+        #       values as 9999-12-31 are kept
+        else:
+            array_dt = np.array(
+                [
+                    datetime.strptime(
+                        str_dt, self.DICT_FMT_DT[str_fmt_dt]
+                    ).date()
+                    for str_dt in ser_uniques
+                ]
+                + [None],
+                dtype=object,
+            )
+        return pd.Series(array_dt[array_codes], index=ser_.index)
+
     def change_dtypes(
         self,
         df_: pd.DataFrame,
@@ -235,11 +299,14 @@ class DealingPd(DealingExcel):
         list_cols_dt: List[str],
         str_fmt_dt: str = 'YYYY-MM-DD',
         errors: str = 'raise',
+        bl_dt64: bool = False,
     ) -> pd.DataFrame:
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: CAST COLUMNS' DTYPES AND PARSE DATE COLUMNS
+        INPUTS: DATAFRAME, DTYPES PER COLUMN, DATE COLUMNS, DATE FORMAT CODE, ERRORS OF THE
+            CAST ('RAISE' AS DEFAULT) AND WHETHER DATES ARE DATETIME64 (FALSE AS DEFAULT,
+            DATETIME.DATE)
+        OUTPUTS: DATAFRAME
         """
         if any(
             [col_ not in list(dict_dtypes.keys()) for col_ in list_cols_dt]
@@ -248,19 +315,23 @@ class DealingPd(DealingExcel):
                 dict_dtypes[col_] = str
         df_ = df_.astype(dict_dtypes, errors=errors)
         for col_ in list_cols_dt:
-            df_[col_] = [
-                DatesBR().str_date_to_datetime(d, str_fmt_dt)
-                for d in df_[col_]
-            ]
+            df_[col_] = self.str_dates_to_datetime(
+                df_[col_], str_fmt_dt, bl_dt64=bl_dt64
+            )
         return df_
 
     def strip_all_obj_dtypes(
-        self, df_: pd.DataFrame, list_cols_dt: List[str]
+        self,
+        df_: pd.DataFrame,
+        list_cols_dt: List[str],
+        float_max_ratio_categ: Optional[float] = None,
     ) -> pd.DataFrame:
         """
-        DOCSTRING:
-        INPUTS:
-        OUTPUTS:
+        DOCSTRING: STRIP STRINGS OF OBJECT COLUMNS, ONCE PER DISTINCT VALUE UNLESS THE VALUES
+            ARE MOSTLY DISTINCT; NON-STRING VALUES ARE KEPT AS THEY ARE
+        INPUTS: DATAFRAME, DATE COLUMNS (NOT STRIPPED) AND MAXIMUM RATIO OF DISTINCT VALUES TO
+            ROWS OF THE COLUMNS CONVERTED TO CATEGORICAL (NONE AS DEFAULT, NO CONVERSION)
+        OUTPUTS: DATAFRAME
         """
         list_cols = [
             col_
@@ -268,7 +339,35 @@ class DealingPd(DealingExcel):
             if col_ not in list_cols_dt
         ]
         for col_ in list_cols:
-            df_[col_] = [x.strip() for x in df_[col_]]
+            #   mostly distinct values, sampled at a stride - stripping each row is cheaper than
+            #       hashing them, and there would be no categorical
+            ser_sample = df_[col_].iloc[:: max(len(df_) // 10000, 1)]
+            if ser_sample.nunique(dropna=False) > 0.5 * len(ser_sample) and (
+                float_max_ratio_categ is None or float_max_ratio_categ < 0.5
+            ):
+                ser_stripped = df_[col_].str.strip()
+                df_[col_] = ser_stripped.where(ser_stripped.notna(), df_[col_])
+                continue
+            #   distinct values stripped once
+            array_codes, array_uniques = pd.factorize(df_[col_])
+            ser_uniques = pd.Series(array_uniques, dtype=object)
+            ser_stripped = ser_uniques.str.strip()
+            ser_stripped = ser_stripped.where(
+                ser_stripped.notna(), ser_uniques
+            )
+            #   low-cardinality columns as categorical - stripping may merge distinct values
+            if float_max_ratio_categ is not None and len(
+                ser_stripped
+            ) <= float_max_ratio_categ * len(df_):
+                array_codes_stripped, array_categ = pd.factorize(ser_stripped)
+                df_[col_] = pd.Categorical.from_codes(
+                    np.append(array_codes_stripped, -1)[array_codes],
+                    categories=array_categ,
+                )
+            else:
+                df_[col_] = np.append(
+                    ser_stripped.to_numpy(dtype=object), None
+                )[array_codes]
         return df_
 
     def fillna_data(
@@ -299,18 +398,25 @@ class DealingPd(DealingExcel):
         str_dt_fillna: str = '2100-12-31',
         str_data_fillna: str = '-1',
         str_fmt_dt: str = 'YYYY-MM-DD',
+        bl_dt64: bool = False,
+        float_max_ratio_categ: Optional[float] = None,
     ):
         """
         DOCSTRING: PIPELINE DATAFRAME STARTUP
         INPUTS: DATAFRAME, DICT DTYPES, LIST OF DATE TYPE COLUMNS, STR DT FILLNA, STR DATA FILLNA,
-            STR DATE FORMAT INPUT
+            STR DATE FORMAT INPUT, DATES AS DATETIME64 (FALSE AS DEFAULT) AND MAXIMUM RATIO OF
+            DISTINCT VALUES OF CATEGORICAL STRING COLUMNS (NONE AS DEFAULT)
         OUTPUTS:
         """
         df_ = self.fillna_data(
             df_, list_cols_dt, str_dt_fillna, str_data_fillna
         )
-        df_ = self.change_dtypes(df_, dict_dtypes, list_cols_dt, str_fmt_dt)
-        df_ = self.strip_all_obj_dtypes(df_, list_cols_dt)
+        df_ = self.change_dtypes(
+            df_, dict_dtypes, list_cols_dt, str_fmt_dt, bl_dt64=bl_dt64
+        )
+        df_ = self.strip_all_obj_dtypes(
+            df_, list_cols_dt, float_max_ratio_categ=float_max_ratio_categ
+        )
         return df_
 
     def cols_remove_dupl(self, df_):
@@ -320,3 +426,87 @@ class DealingPd(DealingExcel):
         OUTPUTS: DATAFRAME
         """
         return df_.loc[:, ~df_.columns.duplicated()]
+
+
+if __name__ == '__main__':
+    from time import time
+
+    # synthetic 5M rows query result - two date columns, a low-cardinality padded ticker, a
+    #   high-cardinality padded name and numeric columns
+    int_rows = 5_000_000
+    rng = np.random.default_rng(7)
+    array_dts = (
+        pd.date_range('2015-01-01', periods=2500)
+        .strftime('%Y-%m-%d')
+        .to_numpy()
+    )
+    df_query = pd.DataFrame(
+        {
+            'DT_REF': array_dts[rng.integers(0, 2500, int_rows)],
+            'DT_VENC': array_dts[rng.integers(0, 2500, int_rows)],
+            'TICKER': np.array(
+                [' PETR4 ', 'VALE3 ', ' ITUB4', 'BBDC4'] * 250, dtype=object
+            )[rng.integers(0, 1000, int_rows)],
+            'NOME': (
+                pd.Series(rng.integers(0, int_rows, int_rows)).astype(str)
+                + ' '
+            ).to_numpy(dtype=object),
+            'QTD': rng.integers(0, 1000, int_rows),
+            'PRECO': rng.normal(size=int_rows),
+        }
+    )
+    dict_dtypes = {
+        'DT_REF': str,
+        'DT_VENC': str,
+        'TICKER': str,
+        'NOME': str,
+        'QTD': int,
+        'PRECO': float,
+    }
+    list_cols_dt = ['DT_REF', 'DT_VENC']
+    # former per-cell path - a DatesBR instance and a strptime-like parse per date, a strip per
+    #   string
+    float_t0 = time()
+    df_legacy = DealingPd().fillna_data(df_query.copy(), list_cols_dt)
+    df_legacy = df_legacy.astype(dict_dtypes)
+    for col_ in list_cols_dt:
+        df_legacy[col_] = [
+            DatesBR().str_date_to_datetime(d, 'YYYY-MM-DD')
+            for d in df_legacy[col_]
+        ]
+    for col_ in ['TICKER', 'NOME']:
+        df_legacy[col_] = [x.strip() for x in df_legacy[col_]]
+    print('PER-CELL: {:.1f} s'.format(time() - float_t0))
+    # vectorized pipeline
+    float_t0 = time()
+    df_vect = DealingPd().pipeline_df_startup(
+        df_query.copy(),
+        dict(dict_dtypes),
+        list_cols_dt,
+    )
+    print('VECTORIZED: {:.1f} s'.format(time() - float_t0))
+    print(
+        'EQUAL: {}'.format(
+            all(
+                (
+                    df_legacy[col_].astype(str) == df_vect[col_].astype(str)
+                ).all()
+                for col_ in df_legacy.columns
+            )
+        )
+    )
+    float_t0 = time()
+    df_vect = DealingPd().pipeline_df_startup(
+        df_query.copy(),
+        dict(dict_dtypes),
+        list_cols_dt,
+        bl_dt64=True,
+        float_max_ratio_categ=0.01,
+    )
+    print(
+        'VECTORIZED, DATETIME64 AND CATEGORICAL: {:.1f} s, {:.0f} MB VS {:.0f} MB'.format(
+            time() - float_t0,
+            df_vect.memory_usage(deep=True).sum() / 1e6,
+            df_legacy.memory_usage(deep=True).sum() / 1e6,
+        )
+    )
@@ -1,8 +1,11 @@
 ### HANDLING XML FILES ###
 
 import xml.etree.ElementTree as et
+from io import BytesIO
 
+import numpy as np
 from bs4 import BeautifulSoup
+from lxml import etree
 
 
 class XMLFiles:
@@ -66,3 +69,85 @@ class XMLFiles:
         OUTPUTS: STRING
         """
         return soup_xml.get_text()
+
+    def xml_iterparse_records(self, xml_source, dict_record_tags):
+        """
+        DOCSTRING: STREAMING XML PARSER THROUGH LXML'S ITERPARSE - YIELDS EACH RECORD OF INTEREST
+            WITH THE TEXT AND THE ATTRIBUTES OF THE FIRST DESCENDANT OF EACH FIELD TAG (AS SOUP'S
+            FIND), CLEARING THE PARSED ELEMENTS AS IT GOES, SO THE MEMORY IS BOUNDED BY A RECORD
+            RATHER THAN BY THE FILE; TAGS ARE MATCHED BY THEIR LOCAL NAMES, REGARDLESS OF
+            NAMESPACES, AND ABSENT FIELDS ARE LEFT OUT
+        INPUTS: XML SOURCE (COMPLETE PATH, FILE-LIKE OBJECT OR BYTES) AND DICTIONARY OF RECORD
+            TAGS TO LISTS OF FIELD TAGS
+        OUTPUTS: GENERATOR OF TUPLES (RECORD TAG, DICTIONARY OF TEXTS, DICTIONARY OF ATTRIBUTES)
+        """
+        # bytes in memory are read as a file
+        if isinstance(xml_source, (bytes, bytearray)):
+            xml_source = BytesIO(xml_source)
+        # parsing events only for the records of interest, within any namespace
+        for _, element in etree.iterparse(
+            xml_source,
+            events=('end',),
+            tag=['{*}' + str_tag for str_tag in dict_record_tags],
+        ):
+            str_record = element.tag.rpartition('}')[2]
+            set_fields = set(dict_record_tags[str_record])
+            dict_texts, dict_attrs = dict(), dict()
+            #   first descendant of each field, in document order
+            for node in element.iterdescendants():
+                if isinstance(node.tag, str) == False:
+                    continue
+                str_tag = node.tag.rpartition('}')[2]
+                if str_tag in set_fields and str_tag not in dict_texts:
+                    dict_texts[str_tag] = ''.join(node.itertext())
+                    dict_attrs[str_tag] = dict(node.attrib)
+            #   fields ordered as requested
+            yield (
+                str_record,
+                {
+                    str_tag: dict_texts[str_tag]
+                    for str_tag in dict_record_tags[str_record]
+                    if str_tag in dict_texts
+                },
+                {
+                    str_tag: dict_attrs[str_tag]
+                    for str_tag in dict_record_tags[str_record]
+                    if str_tag in dict_attrs
+                },
+            )
+            #   records nested within other records are released along with the outermost one
+            if any(
+                isinstance(node.tag, str)
+                and node.tag.rpartition('}')[2] in dict_record_tags
+                for node in element.iterancestors()
+            ):
+                continue
+            #   releasing the record and everything parsed before it
+            element.clear(keep_tail=True)
+            for node in [element] + list(element.iterancestors()):
+                while node.getprevious() is not None:
+                    del node.getparent()[0]
+
+    def records_to_columns(self, iter_records, value_missing=np.nan):
+        """
+        DOCSTRING: GATHER AN ITERABLE OF RECORDS (DICTIONARIES) INTO COLUMNS, ONE LIST PER KEY IN
+            ORDER OF FIRST APPEARANCE, FILLING THE KEYS ABSENT FROM A RECORD WITH THE MISSING
+            VALUE - THE RECORDS ARE CONSUMED ONE AT A TIME
+        INPUTS: ITERABLE OF DICTIONARIES AND MISSING VALUE (NAN AS DEFAULT)
+        OUTPUTS: DICTIONARY OF LISTS
+        """
+        # setting variables
+        dict_cols = dict()
+        int_rows = 0
+        # appending each record's values, padding the new and the absent columns
+        for dict_record in iter_records:
+            for key, value in dict_record.items():
+                if key not in dict_cols:
+                    dict_cols[key] = [value_missing] * int_rows
+                dict_cols[key].append(value)
+            int_rows += 1
+            for list_col in dict_cols.values():
+                if len(list_col) < int_rows:
+                    list_col.append(value_missing)
+        # returning columns
+        return dict_cols
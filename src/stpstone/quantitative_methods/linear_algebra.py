@@ -14,7 +14,7 @@ class LinearAlgebra:
         OUTPUTS: CHOLESKY MATRIX DECOMPOSITION, FOR LOWER OR UPPER TRIANGLE
         """
         return np.linalg.cholesky(
-            np.array(array_data), lower=bool_lower_triangle
+            np.array(array_data), upper=not bool_lower_triangle
         )
 
     def eigenvalue_eigenvector(self, array_data):
@@ -6,14 +6,13 @@ import matplotlib.pylab as plt
 import numpy as np
 import seaborn as sns
 from numpy import dot, log, multiply, ones, pi, shape, sqrt
-from scipy.special import gamma, gammaln
+from scipy.special import gamma, gammaln, ndtr, ndtri
 from scipy.stats import (
     bernoulli,
     binom,
     chi2,
     f,
     geom,
-    norm,
     poisson,
     sem,
     t,
@@ -227,7 +226,21 @@ class NormalDistribution:
 
     def cumnulative_phi(self, z):
         """
-        DOCSTRING: DENSITY FUNCTION WITH MEAN 0.0 AND STANDARD DEVIATION 1.0 AT THE GIVEN Z VALUE
+        DOCSTRING: CUMULATIVE DENSITY FUNCTION WITH MEAN 0.0 AND STANDARD DEVIATION 1.0 AT THE
+            GIVEN Z VALUE, VECTORIZED THROUGH NDTR (CODY'S RATIONAL APPROXIMATION OF ERF/ERFC),
+            WHICH KEEPS DOUBLE PRECISION ACROSS THE WHOLE REAL LINE
+        INPUTS: Z (FLOAT OR ARRAY-LIKE)
+        OUTPUTS: PHI (FLOAT, OR ARRAY FOR ARRAY INPUTS)
+        """
+        phi = ndtr(z)
+        if np.ndim(phi) == 0:
+            return float(phi)
+        return phi
+
+    def cumnulative_phi_taylor(self, z):
+        """
+        DOCSTRING: DENSITY FUNCTION WITH MEAN 0.0 AND STANDARD DEVIATION 1.0 AT THE GIVEN Z VALUE,
+            THROUGH A TAYLOR SERIES - SCALAR ONLY, KEPT AS A REFERENCE FOR CUMNULATIVE_PHI
         INPUTS: Z
         OUTPUTS: PHI
         """
@@ -246,10 +259,9 @@ class NormalDistribution:
 
     def cdf(self, x, mu=0.0, sigma=1.0):
         """
-        DOCSTRING: STANDARD GAUSSIAN CDF WITH MEAN MI AND STDDEV SIGMA, USING TAYLOR
-            APPROXIMATION - CUMULATIVE DISTRIBUTION FUNCTION - AREA BELOW GAUSSIAN CURVE -
-            NORMAL DISTRIBUTION FORMULA
-        INPUTS: X, MU(STANDARD 0.0) AND SIGMA (STANDARD 1.0)
+        DOCSTRING: STANDARD GAUSSIAN CDF WITH MEAN MI AND STDDEV SIGMA - CUMULATIVE DISTRIBUTION
+            FUNCTION - AREA BELOW GAUSSIAN CURVE - NORMAL DISTRIBUTION FORMULA
+        INPUTS: X (FLOAT OR ARRAY-LIKE), MU(STANDARD 0.0) AND SIGMA (STANDARD 1.0)
         OUTPUTS: CUMULATIVE DENSITY FUNCTION OF A GAUSSIAN DISTRIBUTION
         """
         return self.cumnulative_phi((x - mu) / sigma)
@@ -258,10 +270,48 @@ class NormalDistribution:
         """
         DOCSTRING: INVERSE OF THE NORMAL CULMULATIVE DISTRIBUTION FOR A SUPPLIED VALUE OF X, OR
             A PROBABILITY, WITH A GIVEN DISTRIBUTION MEAND AND STANDARD DEVIATION
-        INPUTS: PROBABILITY, MEAN AND STANDARD DEVIATION
+        INPUTS: PROBABILITY (FLOAT OR ARRAY-LIKE), MEAN AND STANDARD DEVIATION
         OUTPUTS: INV.NORM, OR Z-SCORE
         """
-        return norm.ppf(p, mu, sigma)
+        z = mu + sigma * ndtri(p)
+        if np.ndim(z) == 0:
+            return float(z)
+        return z
+
+    def bivariate_cdf(self, a, b, rho, int_nodes=20):
+        """
+        REFERENCES: DREZNER, Z.; WESOLOWSKY, G. O. - ON THE COMPUTATION OF THE BIVARIATE NORMAL
+            INTEGRAL (1990), THE COMPLETE GUIDE TO OPTION PRICING FORMULAS - ESPEN GAARDER HAUG
+        DOCSTRING: STANDARD BIVARIATE NORMAL CDF M(A, B, RHO), VECTORIZED - GAUSS-LEGENDRE
+            QUADRATURE OVER THE ANGLE OF PLACKETT'S IDENTITY, M(A, B, RHO) = N(A) * N(B) +
+            1 / (2 * PI) * INTEGRAL FROM 0 TO ARCSIN(RHO) OF EXP(-(A ** 2 + B ** 2 - 2 * A * B *
+            SIN(THETA)) / (2 * COS(THETA) ** 2)) D(THETA) - DOUBLE PRECISION FOR |RHO| UP TO
+            ABOUT 0.9, LOSING ACCURACY AS |RHO| APPROACHES 1
+        INPUTS: A, B, RHO (FLOATS OR ARRAYS BROADCASTING TOGETHER) AND NUMBER OF QUADRATURE NODES
+        OUTPUTS: FLOAT, OR ARRAY FOR ARRAY INPUTS
+        """
+        a, b, rho = np.broadcast_arrays(
+            *[np.asarray(x, dtype=float) for x in [a, b, rho]]
+        )
+        # gauss-legendre nodes and weights mapped from [-1, 1] to [0, arcsin(rho)]
+        array_x, array_w = np.polynomial.legendre.leggauss(int_nodes)
+        theta_max = np.arcsin(rho)[..., None]
+        theta = theta_max * (array_x + 1.0) / 2.0
+        cos_theta_2 = np.cos(theta) ** 2
+        integrand = np.exp(
+            -(
+                a[..., None] ** 2
+                + b[..., None] ** 2
+                - 2.0 * a[..., None] * b[..., None] * np.sin(theta)
+            )
+            / (2.0 * cos_theta_2)
+        )
+        m = ndtr(a) * ndtr(b) + (integrand @ array_w) * theta_max[..., 0] / (
+            4.0 * np.pi
+        )
+        if np.ndim(m) == 0:
+            return float(m)
+        return m
 
     def confidence_interval_normal(self, data, confidence=0.95):
         """
@@ -582,3 +632,37 @@ class HansenSkewStudent(object):
         LL = -LL
 
         return LL.sum()
+
+
+if __name__ == '__main__':
+    import timeit
+
+    # micro-benchmark - vectorized cdf against the former taylor series loop
+    cls_normal = NormalDistribution()
+    array_z = np.linspace(-10.0, 10.0, 100_000)
+    float_time_taylor = timeit.timeit(
+        lambda: [cls_normal.cumnulative_phi_taylor(z) for z in array_z],
+        number=1,
+    )
+    float_time_vectorized = (
+        timeit.timeit(lambda: cls_normal.cdf(array_z), number=10) / 10
+    )
+    print(
+        'Taylor loop: {:.2f} ms | vectorized: {:.2f} ms | speedup: {:.0f}x'.format(
+            float_time_taylor * 1000,
+            float_time_vectorized * 1000,
+            float_time_taylor / float_time_vectorized,
+        )
+    )
+    print(
+        'Max absolute difference: {:.2e}'.format(
+            np.max(
+                np.abs(
+                    cls_normal.cdf(array_z)
+                    - np.array(
+                        [cls_normal.cumnulative_phi_taylor(z) for z in array_z]
+                    )
+                )
+            )
+        )
+    )
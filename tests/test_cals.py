@@ -0,0 +1,374 @@
+### CALENDARS UNIT TESTS ###
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from workalendar.core import Calendar
+
+from stpstone.cals.br_bzdays import BrazilBankCalendar
+from stpstone.cals.handling_dates import DatesBR
+from stpstone.cals.holidays_cache import HolidaysCache
+from stpstone.cals.usa_bzdays import WorkCalendar
+
+
+class TestBrazilBankCalendarIndex(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - TEMPORARY HOLIDAYS CACHE DIRECTORY, RANDOM DATES
+            AND DELTAS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        TestWorkCalendarIndex.setUp(self)
+        rng = np.random.default_rng(7)
+        self.cal = BrazilBankCalendar()
+        self.list_dates = [
+            date(2000, 1, 1) + timedelta(days=int(x))
+            for x in rng.integers(0, 365 * 30, 300)
+        ]
+        self.list_deltas = [int(x) for x in rng.integers(-300, 300, 300)]
+
+    def tearDown(self):
+        """
+        DOCSTRING: RESTORE THE HOLIDAYS CACHE DIRECTORY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        TestWorkCalendarIndex.tearDown(self)
+
+    def test_matches_workalendar(self):
+        """
+        DOCSTRING: INDEX LOOKUPS MUST MATCH WORKALENDAR'S DAY-BY-DAY ALGORITHMS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        for date_, int_delta in zip(self.list_dates, self.list_deltas):
+            date_other = date_ + timedelta(days=int_delta)
+            self.assertEqual(
+                self.cal.is_working_day(date_),
+                Calendar.is_working_day(self.cal, date_),
+            )
+            self.assertEqual(
+                self.cal.add_working_days(date_, int_delta),
+                Calendar.add_working_days(self.cal, date_, int_delta),
+            )
+            self.assertEqual(
+                self.cal.get_working_days_delta(
+                    date_, date_other, include_start=True
+                ),
+                Calendar.get_working_days_delta(
+                    self.cal, date_, date_other, include_start=True
+                ),
+            )
+
+    def test_following_and_last_working_day(self):
+        """
+        DOCSTRING: CHRISTMAS 2024 IS A WEDNESDAY, NEW YEAR 2023 IS A SUNDAY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertEqual(
+            self.cal.find_following_working_day(date(2024, 12, 25)),
+            date(2024, 12, 26),
+        )
+        self.assertEqual(
+            self.cal.find_last_working_day(date(2023, 1, 2)),
+            date(2022, 12, 30),
+        )
+
+    def test_out_of_index_fallback(self):
+        """
+        DOCSTRING: DATES OUT OF THE INDEX YEARS FALL BACK TO WORKALENDAR'S RULES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertEqual(
+            self.cal.add_working_days(date(2100, 12, 20), 20),
+            Calendar.add_working_days(self.cal, date(2100, 12, 20), 20),
+        )
+        self.assertEqual(
+            self.cal.get_working_days_delta(
+                date(1980, 1, 1), date(1991, 1, 1)
+            ),
+            Calendar.get_working_days_delta(
+                self.cal, date(1980, 1, 1), date(1991, 1, 1)
+            ),
+        )
+
+    def test_list_working_days(self):
+        """
+        DOCSTRING: FOLLOWING WORKING DAYS OF EACH CALENDAR DAY BETWEEN THE DATES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertEqual(
+            DatesBR().list_working_days(
+                date(2024, 12, 20), date(2024, 12, 28)
+            ),
+            [
+                date(2024, 12, 20),
+                date(2024, 12, 23),
+                date(2024, 12, 24),
+                date(2024, 12, 26),
+                date(2024, 12, 27),
+                date(2024, 12, 30),
+            ],
+        )
+
+
+class TestDatesBRVectorized(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM PAIRS OF DATES AND DELTAS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        TestBrazilBankCalendarIndex.setUp(self)
+        self.ser_start = pd.Series(self.list_dates)
+        self.ser_end = pd.Series(
+            [
+                date_ + timedelta(days=int_delta * 5)
+                for date_, int_delta in zip(self.list_dates, self.list_deltas)
+            ]
+        )
+
+    def tearDown(self):
+        """
+        DOCSTRING: RESTORE THE HOLIDAYS CACHE DIRECTORY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        TestBrazilBankCalendarIndex.tearDown(self)
+
+    def test_working_days_delta_matches_scalar(self):
+        """
+        DOCSTRING: ARRAY DELTAS MUST MATCH THE SCALAR DELTAS, PAIR BY PAIR
+        INPUTS: -
+        OUTPUTS: -
+        """
+        ser_du = DatesBR().working_days_delta(self.ser_start, self.ser_end)
+        self.assertIsInstance(ser_du, pd.Series)
+        self.assertEqual(
+            ser_du.tolist(),
+            [
+                DatesBR().get_working_days_delta(d1, d2)
+                for d1, d2 in zip(self.ser_start, self.ser_end)
+            ],
+        )
+        array_du = DatesBR().working_days_delta(
+            self.ser_start.values.astype('datetime64[D]'),
+            list(self.ser_end),
+            include_start=True,
+        )
+        self.assertEqual(
+            array_du.tolist(),
+            [
+                DatesBR().get_working_days_delta(d1, d2, include_start=True)
+                for d1, d2 in zip(self.ser_start, self.ser_end)
+            ],
+        )
+
+    def test_add_and_is_working_day_match_scalar(self):
+        """
+        DOCSTRING: ARRAY SHIFTS AND FLAGS MUST MATCH THE SCALAR ONES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        ser_dates = DatesBR().add_working_days(
+            self.ser_start, np.array(self.list_deltas)
+        )
+        self.assertEqual(
+            [d.date() for d in ser_dates],
+            [
+                DatesBR().add_working_days(d, n)
+                for d, n in zip(self.ser_start, self.list_deltas)
+            ],
+        )
+        self.assertEqual(
+            DatesBR().is_working_day(self.ser_start).tolist(),
+            [DatesBR().is_working_day(d) for d in self.ser_start],
+        )
+
+    def test_anbima_adjustment(self):
+        """
+        DOCSTRING: THE LAST WEEKDAY OF 2024 AND THE ASH WEDNESDAY OF 2025 ARE ADDED
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertEqual(
+            DatesBR().working_days_delta(
+                date(2024, 12, 1), date(2025, 12, 31), bl_anbima=True
+            )
+            - DatesBR().get_working_days_delta(
+                date(2024, 12, 1), date(2025, 12, 31)
+            ),
+            2,
+        )
+
+
+class TestHolidaysCache(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - TEMPORARY CACHE DIRECTORY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.dir_tmp = tempfile.TemporaryDirectory()
+        self.cls_cache = HolidaysCache(path_dir=self.dir_tmp.name)
+
+    def tearDown(self):
+        """
+        DOCSTRING: REMOVE THE TEMPORARY CACHE DIRECTORY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.cls_cache.clear()
+        self.dir_tmp.cleanup()
+
+    def test_round_trip(self):
+        """
+        DOCSTRING: CACHED HOLIDAYS ARE PERSISTED, MEMORY-MAPPED AND EQUAL TO WORKALENDAR'S
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_holidays = self.cls_cache.holidays_ordinals(
+            BrazilBankCalendar(), 2000, 2030
+        )
+        self.assertEqual(len(os.listdir(self.dir_tmp.name)), 1)
+        self.cls_cache._dict_holidays.clear()
+        array_loaded = self.cls_cache.holidays_ordinals(
+            BrazilBankCalendar(), 2000, 2030
+        )
+        self.assertIsInstance(array_loaded, np.memmap)
+        self.assertEqual(
+            array_loaded.tolist(),
+            sorted(
+                d.toordinal()
+                for int_year in range(2000, 2031)
+                for d in BrazilBankCalendar().holidays_set(int_year)
+            ),
+        )
+        self.assertEqual(array_loaded.tolist(), array_holidays.tolist())
+
+    def test_rules_invalidate(self):
+        """
+        DOCSTRING: CALENDAR CLASSES WITH DIFFERENT RULES HAVE DIFFERENT CACHE FILES
+        INPUTS: -
+        OUTPUTS: -
+        """
+
+        class BrazilBankCalendarXmasEvng(BrazilBankCalendar):
+            include_xmas_evng = True
+
+        self.assertNotEqual(
+            self.cls_cache.fingerprint(BrazilBankCalendar(), 2000, 2030),
+            self.cls_cache.fingerprint(
+                BrazilBankCalendarXmasEvng(), 2000, 2030
+            ),
+        )
+        self.assertIn(
+            date(2024, 12, 24).toordinal(),
+            self.cls_cache.holidays_ordinals(
+                BrazilBankCalendarXmasEvng(), 2000, 2030
+            ).tolist(),
+        )
+
+
+class TestWorkCalendarIndex(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - HOLIDAYS CACHE IN A TEMPORARY DIRECTORY, SO
+            RUNS NEITHER WRITE TO NOR READ FROM THE USER'S CACHE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.str_cache_dir = os.environ.get('STPSTONE_CACHE_DIR')
+        self.dir_tmp = tempfile.TemporaryDirectory()
+        os.environ['STPSTONE_CACHE_DIR'] = self.dir_tmp.name
+
+    def tearDown(self):
+        """
+        DOCSTRING: RESTORE THE HOLIDAYS CACHE DIRECTORY AND REMOVE THE TEMPORARY ONE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        if self.str_cache_dir == None:
+            del os.environ['STPSTONE_CACHE_DIR']
+        else:
+            os.environ['STPSTONE_CACHE_DIR'] = self.str_cache_dir
+        HolidaysCache(path_dir=self.dir_tmp.name).clear()
+        self.dir_tmp.cleanup()
+
+    def test_matches_day_by_day(self):
+        """
+        DOCSTRING: INDEX LOOKUPS AND BATCHES MUST MATCH THE DAY-BY-DAY STEPPING OVER THE
+            FEDERAL HOLIDAYS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        cls_calendar = WorkCalendar()
+        rng = np.random.default_rng(11)
+        list_dt_bgn = [
+            date(2000, 1, 1) + timedelta(days=int(x))
+            for x in rng.integers(0, 365 * 30, 100)
+        ]
+        list_num_days = [int(x) for x in rng.integers(-5, 300, 100)]
+        list_dt_end = [
+            dt_ + timedelta(days=int(x))
+            for dt_, x in zip(list_dt_bgn, rng.integers(-10, 800, 100))
+        ]
+        list_add, list_diff = list(), list()
+        for dt_bgn, int_num_days, dt_end in zip(
+            list_dt_bgn, list_num_days, list_dt_end
+        ):
+            current_date, int_added = dt_bgn, 0
+            while int_added < int_num_days:
+                current_date += timedelta(days=1)
+                if current_date.weekday() < 5 and not (
+                    cls_calendar.calendar.is_holiday(current_date)
+                ):
+                    int_added += 1
+            list_add.append(current_date)
+            list_diff.append(
+                sum(
+                    1
+                    for x in range((dt_end - dt_bgn).days + 1)
+                    if (dt_bgn + timedelta(days=x)).weekday() < 5
+                    and not cls_calendar.calendar.is_holiday(
+                        dt_bgn + timedelta(days=x)
+                    )
+                )
+            )
+        self.assertEqual(
+            [
+                cls_calendar.add_working_days(dt_, n)
+                for dt_, n in zip(list_dt_bgn, list_num_days)
+            ],
+            list_add,
+        )
+        self.assertEqual(
+            [
+                cls_calendar.diff_working_days(dt_bgn, dt_end)
+                for dt_bgn, dt_end in zip(list_dt_bgn, list_dt_end)
+            ],
+            list_diff,
+        )
+        self.assertEqual(
+            cls_calendar.add_working_days_batch(
+                list_dt_bgn, list_num_days
+            ).tolist(),
+            list_add,
+        )
+        self.assertEqual(
+            cls_calendar.diff_working_days_batch(
+                list_dt_bgn, list_dt_end
+            ).tolist(),
+            list_diff,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+### HTTP CACHE UNIT TESTS ###
+import mmap
+import os
+import tempfile
+import time
+import unittest
+from io import BytesIO
+from zipfile import ZipFile
+
+from stpstone.handling_data.folders import DirFilesManagement
+from stpstone.handling_data.http_cache import HttpCache
+
+
+class LocalResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else dict()
+
+
+class LocalSession:
+    """
+    DOCSTRING: SERVER OF ZIP ARCHIVES BY URL, HONOURING IF-NONE-MATCH, AND LOG OF THE REQUESTS
+    INPUTS: -
+    OUTPUTS: -
+    """
+
+    def __init__(self):
+        self.dict_files = dict()
+        self.list_requests = list()
+        self.int_status_error = None
+
+    def publish(self, file_url, str_content, str_etag):
+        bytes_zip = BytesIO()
+        with ZipFile(bytes_zip, 'w') as zipfile:
+            zipfile.writestr('PR241220.xml', str_content)
+        self.dict_files[file_url] = (bytes_zip.getvalue(), str_etag)
+
+    def get(self, file_url, verify=True, timeout=None, headers=None):
+        headers = headers if headers is not None else dict()
+        self.list_requests.append((file_url, dict(headers)))
+        if self.int_status_error is not None:
+            return LocalResponse(self.int_status_error, b'<html>error</html>')
+        if file_url not in self.dict_files:
+            return LocalResponse(404)
+        bytes_zip, str_etag = self.dict_files[file_url]
+        if headers.get('If-None-Match') == str_etag:
+            return LocalResponse(304, headers={'ETag': str_etag})
+        return LocalResponse(200, bytes_zip, {'ETag': str_etag})
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - TEMPORARY CACHE DIRECTORY AND LOCAL SERVER
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.dir_tmp = tempfile.TemporaryDirectory()
+        self.cls_cache = HttpCache(path_dir=self.dir_tmp.name)
+        self.session = LocalSession()
+        self.url = 'https://www.b3.com.br/pesquisapregao/download?filelist=PR241220.zip'
+        self.session.publish(self.url, '<BizFile/>', '"v1"')
+
+    def tearDown(self):
+        """
+        DOCSTRING: REMOVE THE TEMPORARY CACHE DIRECTORY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.cls_cache.clear()
+        self.dir_tmp.cleanup()
+
+    def read_zip(self):
+        return (
+            DirFilesManagement()
+            .get_zip_from_web_in_memory(
+                self.url,
+                session=self.session,
+                bl_cache=True,
+                http_cache=self.cls_cache,
+            )
+            .read()
+        )
+
+    def test_fresh_hit_skips_network(self):
+        """
+        DOCSTRING: WITHIN THE TIME TO LIVE THE ARCHIVE IS SERVED MEMORY-MAPPED, WITHOUT REQUESTS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertEqual(self.read_zip(), b'<BizFile/>')
+        self.assertEqual(self.read_zip(), b'<BizFile/>')
+        self.assertEqual(len(self.session.list_requests), 1)
+        self.assertIsInstance(
+            self.cls_cache.get(self.url, session=self.session), mmap.mmap
+        )
+
+    def test_conditional_revalidation(self):
+        """
+        DOCSTRING: A STALE ENTRY SENDS ITS ETAG - 304 KEEPS THE BODY, 200 REPLACES IT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.cls_cache.int_ttl_seconds = 0
+        self.assertEqual(self.read_zip(), b'<BizFile/>')
+        self.assertEqual(self.read_zip(), b'<BizFile/>')
+        self.assertEqual(
+            self.session.list_requests[-1][1], {'If-None-Match': '"v1"'}
+        )
+        self.session.publish(self.url, '<BizFile v="2"/>', '"v2"')
+        self.assertEqual(self.read_zip(), b'<BizFile v="2"/>')
+        self.assertEqual(self.cls_cache.load_meta(self.url)['etag'], '"v2"')
+
+    def test_lru_eviction(self):
+        """
+        DOCSTRING: ABOVE THE SIZE CAP THE LEAST RECENTLY USED ENTRIES ARE REMOVED; ERRORS ARE
+            NOT CACHED
+        INPUTS: -
+        OUTPUTS: -
+        """
+        list_urls = [self.url + '&n={}'.format(i) for i in range(3)]
+        for i, file_url in enumerate(list_urls):
+            self.session.publish(file_url, 'x' * 100, str(i))
+        int_size = len(self.session.dict_files[list_urls[0]][0])
+        self.cls_cache.int_max_bytes = 2 * int_size
+        _ = self.cls_cache.get(list_urls[0], session=self.session)
+        _ = self.cls_cache.get(list_urls[1], session=self.session)
+        path_body, _ = self.cls_cache.paths(list_urls[1])
+        os.utime(path_body, (time.time() - 60, time.time() - 60))
+        _ = self.cls_cache.get(list_urls[0], session=self.session)
+        _ = self.cls_cache.get(list_urls[2], session=self.session)
+        self.assertIsNotNone(self.cls_cache.load_meta(list_urls[0]))
+        self.assertIsNone(self.cls_cache.load_meta(list_urls[1]))
+        self.assertIsNotNone(self.cls_cache.load_meta(list_urls[2]))
+        with self.assertRaises(Exception):
+            self.cls_cache.get(self.url + '&n=404', session=self.session)
+        self.assertIsNone(self.cls_cache.load_meta(self.url + '&n=404'))
+
+    def test_stale_on_error(self):
+        """
+        DOCSTRING: AN ERROR STATUS ON REVALIDATION SERVES THE STALE BODY, NOT THE ERROR PAGE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.cls_cache.int_ttl_seconds = 0
+        self.assertEqual(self.read_zip(), b'<BizFile/>')
+        self.session.int_status_error = 503
+        self.assertEqual(self.read_zip(), b'<BizFile/>')
+        self.assertEqual(len(self.session.list_requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
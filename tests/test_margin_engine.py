@@ -0,0 +1,193 @@
+### LOCAL MARGIN ENGINE UNIT TESTS ###
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stpstone.finance.b3.margin_engine import MarginEngineB3
+
+
+class TestMarginEngineB3(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM SCENARIOS OF TWO CURVE FPRS (BASIS POINTS,
+            EXPONENTIAL AND LINEAR) WITH THEIR OWN VERTICES AND A SPOT FPR (PERCENTUAL), AND
+            RANDOM PORTFOLIOS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(29)
+        list_ser = list()
+        for int_scenario in range(1, 41):
+            for int_vertex in [21, 63, 252, 756]:
+                list_ser.append((2962, int_scenario, int_vertex, 2, 0))
+            for int_vertex in [30, 180, 360]:
+                list_ser.append((2945, int_scenario, int_vertex, 2, 1))
+            list_ser.append((2906, int_scenario, np.nan, 1, 2))
+        self.df_scenarios = pd.DataFrame(
+            list_ser,
+            columns=[
+                'ID_FPR',
+                'ID_CENARIO',
+                'DIAS_CORRIDOS_VERTICE',
+                'FORMATO_VARIACAO',
+                'CRITERIO_CAPITALIZACAO',
+            ],
+        )
+        self.df_scenarios['VALOR_PHI_1'] = np.where(
+            self.df_scenarios['FORMATO_VARIACAO'] == 2,
+            rng.normal(0.0, 80.0, len(self.df_scenarios)),
+            rng.normal(0.0, 0.05, len(self.df_scenarios)),
+        )
+        int_n = 120
+        self.df_positions = pd.DataFrame(
+            {
+                'ID_PORTFOLIO': rng.integers(0, 25, int_n),
+                'ID_FPR_SPOT': np.where(rng.random(int_n) < 0.4, 2906, np.nan),
+                'ID_FPR_CURVA': np.where(
+                    rng.random(int_n) < 0.7,
+                    np.where(rng.random(int_n) < 0.5, 2962, 2945),
+                    np.nan,
+                ),
+                'DIAS_CORRIDOS': rng.integers(1, 1000, int_n),
+                'VALOR': rng.normal(0.0, 1e6, int_n),
+                'TAXA': rng.uniform(0.05, 0.15, int_n),
+            }
+        )
+        self.cls_engine = MarginEngineB3(self.df_scenarios)
+
+    def test_matches_position_by_position_revaluation(self):
+        """
+        DOCSTRING: CHUNKED, VECTORIZED P&L MUST MATCH THE REVALUATION OF EACH POSITION UNDER
+            EACH SCENARIO, WITH SHOCKS INTERPOLATED ALONG THE FPR'S OWN VERTICES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_portfolios, array_pnl = self.cls_engine.pnl_scenarios(
+            self.df_positions, int_chunk_positions=37
+        )
+        array_expected = np.zeros(array_pnl.shape)
+        for _, row in self.df_positions.iterrows():
+            int_p = int(
+                np.flatnonzero(array_portfolios == row['ID_PORTFOLIO'])[0]
+            )
+            for int_s, int_scenario in enumerate(
+                self.cls_engine.array_scenarios
+            ):
+                df_s = self.df_scenarios[
+                    self.df_scenarios['ID_CENARIO'] == int_scenario
+                ]
+                float_factor = 1.0
+                if np.isnan(row['ID_FPR_SPOT']) == False:
+                    float_factor *= (
+                        1.0
+                        + df_s[df_s['ID_FPR'] == row['ID_FPR_SPOT']][
+                            'VALOR_PHI_1'
+                        ].iloc[0]
+                    )
+                if np.isnan(row['ID_FPR_CURVA']) == False:
+                    df_c = df_s[df_s['ID_FPR'] == row['ID_FPR_CURVA']]
+                    float_rate_shock = (
+                        row['TAXA']
+                        + np.interp(
+                            row['DIAS_CORRIDOS'],
+                            df_c['DIAS_CORRIDOS_VERTICE'],
+                            df_c['VALOR_PHI_1'],
+                        )
+                        / 1e4
+                    )
+                    float_years = row['DIAS_CORRIDOS'] / 365.0
+                    if row['ID_FPR_CURVA'] == 2945:
+                        float_factor *= (1.0 + row['TAXA'] * float_years) / (
+                            1.0 + float_rate_shock * float_years
+                        )
+                    else:
+                        float_factor *= (
+                            (1.0 + row['TAXA']) / (1.0 + float_rate_shock)
+                        ) ** float_years
+                array_expected[int_p, int_s] += row['VALOR'] * (
+                    float_factor - 1.0
+                )
+        self.assertTrue(np.allclose(array_pnl, array_expected))
+        df_margins = self.cls_engine.worst_case_losses(self.df_positions)
+        self.assertTrue(
+            np.allclose(df_margins['PIOR_PERDA'], -array_expected.min(axis=1))
+        )
+        self.assertTrue(
+            np.array_equal(
+                df_margins['ID_CENARIO_PIOR'],
+                self.cls_engine.array_scenarios[array_expected.argmin(axis=1)],
+            )
+        )
+        self.assertTrue((df_margins['MARGEM'] >= 0.0).all())
+
+    def test_unknown_fpr(self):
+        """
+        DOCSTRING: POSITIONS ON FPRS ABSENT FROM THE SCENARIOS ARE REJECTED
+        INPUTS: -
+        OUTPUTS: -
+        """
+        df_positions = self.df_positions.copy()
+        df_positions.loc[0, 'ID_FPR_SPOT'] = 1234
+        with self.assertRaises(Exception):
+            self.cls_engine.exposures(df_positions)
+
+    def test_holding_periods(self):
+        """
+        DOCSTRING: SHOCKS OF OTHER HOLDING PERIODS ARE EITHER SELECTED OUT OR REJECTED AS
+            DUPLICATED KEYS, REGARDLESS OF THE ORDER OF THE ROWS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        df_other = self.df_scenarios.copy()
+        df_other['VALOR_PHI_1'] *= 3.0
+        df_scenarios = pd.concat(
+            [
+                df_other.assign(DIAS_HOLDING_PERIOD=10),
+                self.df_scenarios.assign(DIAS_HOLDING_PERIOD=2),
+            ],
+            ignore_index=True,
+        )
+        with self.assertRaises(Exception):
+            MarginEngineB3(df_scenarios)
+        for df_ in [df_scenarios, df_scenarios.iloc[::-1]]:
+            self.assertTrue(
+                np.allclose(
+                    MarginEngineB3(df_, int_holding_period=2).array_cube,
+                    self.cls_engine.array_cube,
+                )
+            )
+        with self.assertRaises(Exception):
+            MarginEngineB3(self.df_scenarios, int_scenario_type=1)
+
+    def test_fpr_without_shocks(self):
+        """
+        DOCSTRING: A FPR MISSING PHI AT EVERY VERTEX IS LEFT UNSHOCKED AND LOGGED, THE OTHER
+            FPRS ARE UNCHANGED
+        INPUTS: -
+        OUTPUTS: -
+        """
+        df_scenarios = self.df_scenarios.copy()
+        df_scenarios.loc[
+            df_scenarios['ID_FPR'] == 2945, 'VALOR_PHI_1'
+        ] = np.nan
+        with self.assertLogs('test_margin_engine', level='WARNING'):
+            cls_engine = MarginEngineB3(
+                df_scenarios, logger=logging.getLogger('test_margin_engine')
+            )
+        self.assertEqual(cls_engine.array_fprs_no_shocks.tolist(), [2945])
+        array_bl_f = cls_engine.array_fprs == 2945
+        self.assertTrue((cls_engine.array_cube[array_bl_f] == 0.0).all())
+        self.assertTrue(
+            np.allclose(
+                cls_engine.array_cube[~array_bl_f],
+                self.cls_engine.array_cube[~array_bl_f],
+            )
+        )
+        self.assertEqual(len(self.cls_engine.array_fprs_no_shocks), 0)
+        _ = cls_engine.worst_case_losses(self.df_positions)
+
+
+if __name__ == '__main__':
+    unittest.main()
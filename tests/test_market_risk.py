@@ -0,0 +1,473 @@
+### MARKET RISK MANAGEMENT UNIT TESTS ###
+import platform
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+if platform.system() == 'Windows':
+    from stpstone.finance.financial_risk.market_risk import (
+        EWMACovariance,
+        HistoricalVaR,
+        MarketRiskManagement,
+        MarkowitzEff,
+    )
+
+
+class TestDrawdown(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM PRICES, DATES X ASSETS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(5)
+        self.array_returns = rng.normal(0.0003, 0.015, (400, 6))
+        self.array_prices = 100.0 * np.cumprod(
+            1.0 + self.array_returns, axis=0
+        )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_max_drawdown_brute_force(self):
+        """
+        DOCSTRING: SINGLE-PASS MAXIMUM DRAWDOWN MUST MATCH THE WORST DECREASE AMONG ALL PAIRS
+            OF PRICES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_mdd = MarketRiskManagement().max_drawdown(
+            list_original_prices=self.array_prices
+        )
+        for j in range(self.array_prices.shape[1]):
+            array_p = self.array_prices[:, j]
+            float_mdd = np.max(
+                1.0 - array_p[None, :] / array_p[:, None],
+                where=np.triu(np.ones((len(array_p),) * 2, dtype=bool), 1),
+                initial=0.0,
+            )
+            self.assertAlmostEqual(array_mdd[j], float_mdd, places=12)
+        self.assertAlmostEqual(
+            MarketRiskManagement().max_drawdown(
+                list_returns=self.array_returns[:, 0]
+            ),
+            MarketRiskManagement().max_drawdown(
+                list_original_prices=np.concatenate(
+                    [[100.0], self.array_prices[:, 0]]
+                )
+            ),
+            places=12,
+        )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_duration_recovery(self):
+        """
+        DOCSTRING: PEAK, TROUGH AND RECOVERY OF A KNOWN PATH
+        INPUTS: -
+        OUTPUTS: -
+        """
+        dict_dd = MarketRiskManagement().drawdown_duration_recovery(
+            list_original_prices=[100.0, 110.0, 99.0, 88.0, 105.0, 111.0, 90.0]
+        )
+        self.assertAlmostEqual(dict_dd['max_drawdown'], 0.2)
+        self.assertEqual(dict_dd['peak'], 1)
+        self.assertEqual(dict_dd['trough'], 3)
+        self.assertEqual(dict_dd['recovery'], 5)
+        self.assertEqual(dict_dd['duration'], 2)
+        self.assertEqual(dict_dd['recovery_time'], 2)
+        self.assertEqual(dict_dd['max_underwater_period'], 3)
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_rolling_max_drawdown(self):
+        """
+        DOCSTRING: ROLLING MAXIMUM DRAWDOWN MUST MATCH THE MAXIMUM DRAWDOWN OF EACH WINDOW
+        INPUTS: -
+        OUTPUTS: -
+        """
+        int_window = 60
+        array_rolling_mdd = MarketRiskManagement().rolling_max_drawdown(
+            int_window, list_original_prices=self.array_prices
+        )
+        self.assertTrue(np.isnan(array_rolling_mdd[: int_window - 1]).all())
+        for t in [int_window - 1, 150, 399]:
+            self.assertTrue(
+                np.allclose(
+                    array_rolling_mdd[t],
+                    MarketRiskManagement().max_drawdown(
+                        list_original_prices=self.array_prices[
+                            t - int_window + 1 : t + 1
+                        ]
+                    ),
+                )
+            )
+
+
+class TestEWMACovariance(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM PRICES, DATES X ASSETS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(9)
+        self.array_prices = 100.0 * np.exp(
+            np.cumsum(rng.normal(0.0, 0.01, (500, 4)), axis=0)
+        )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_fit_matches_recursion_and_ewma(self):
+        """
+        DOCSTRING: WEIGHTED PRODUCT, RECURSIVE UPDATES AND THE SINGLE-SERIES EWMA MUST AGREE -
+            OVER 458 OBSERVATIONS, EWMA'S LAMBDA IS 0.99
+        INPUTS: -
+        OUTPUTS: -
+        """
+        cls_ewma = EWMACovariance(float_lambda=0.99)
+        array_returns = cls_ewma.log_returns(self.array_prices)
+        array_cov = cls_ewma.fit(array_returns)
+        cls_ewma_rec = EWMACovariance(float_lambda=0.99)
+        for array_r in array_returns:
+            cls_ewma_rec.update(array_r)
+        self.assertTrue(np.allclose(array_cov, cls_ewma_rec.cov))
+        self.assertTrue(
+            np.allclose(
+                np.diag(array_cov),
+                MarketRiskManagement().ewma(self.array_prices)[
+                    'variance_ewma_daily'
+                ],
+            )
+        )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_update_without_commit(self):
+        """
+        DOCSTRING: INTRADAY REFRESHES WITHOUT COMMITTING KEEP THE STATE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        cls_ewma = EWMACovariance()
+        array_returns = cls_ewma.log_returns(self.array_prices)
+        array_cov = cls_ewma.fit(array_returns[:-1]).copy()
+        array_preview = cls_ewma.update(array_returns[-1], bl_commit=False)
+        self.assertTrue(np.allclose(cls_ewma.cov, array_cov))
+        self.assertTrue(
+            np.allclose(array_preview, EWMACovariance().fit(array_returns))
+        )
+
+
+class TestHistoricalVaR(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - FAT-TAILED SCENARIOS AND POSITIONS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(13)
+        self.array_scenarios = rng.standard_t(4, (1000, 50)) * 0.01
+        self.array_positions = rng.normal(0.0, 1e5, (50, 3))
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_var_es_match_sorted_losses(self):
+        """
+        DOCSTRING: VAR AND ES OF EVERY LEVEL AND PORTFOLIO MUST MATCH THE FULLY SORTED LOSSES -
+            10 SCENARIOS IN THE 99% TAIL OF 1000
+        INPUTS: -
+        OUTPUTS: -
+        """
+        dict_var_es = HistoricalVaR(
+            self.array_positions, self.array_scenarios
+        ).var_es()
+        array_losses = -np.sort(
+            self.array_scenarios @ self.array_positions, axis=0
+        )
+        for float_level, int_k in zip([0.95, 0.975, 0.99], [50, 25, 10]):
+            self.assertTrue(
+                np.allclose(
+                    dict_var_es['var'].loc[float_level],
+                    array_losses[int_k - 1],
+                )
+            )
+            self.assertTrue(
+                np.allclose(
+                    dict_var_es['es'].loc[float_level],
+                    array_losses[:int_k].mean(axis=0),
+                )
+            )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_components_and_filtered_mode(self):
+        """
+        DOCSTRING: COMPONENTS ADD UP TO VAR AND ES; FILTERED SCENARIOS KEEP THE SHAPE AND
+            RESCALE THE RETURNS TO THE CURRENT EWMA VOLATILITY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        for bl_filtered in [False, True]:
+            cls_hs = HistoricalVaR(
+                self.array_positions[:, 0],
+                self.array_scenarios,
+                bl_filtered=bl_filtered,
+            )
+            dict_var_es = cls_hs.var_es()
+            df_components = cls_hs.components(0.99)
+            self.assertAlmostEqual(
+                df_components['component_var'].sum(),
+                dict_var_es['var'].loc[0.99],
+                places=6,
+            )
+            self.assertAlmostEqual(
+                df_components['component_es'].sum(),
+                dict_var_es['es'].loc[0.99],
+                places=6,
+            )
+        array_vol = np.sqrt(
+            EWMACovariance().variance_series(self.array_scenarios)
+        )
+        self.assertTrue(
+            np.allclose(
+                cls_hs.array_scenarios,
+                self.array_scenarios * array_vol[-1] / array_vol[:-1],
+            )
+        )
+
+
+class TestMarkowitzEffRandomPortfolios(unittest.TestCase):
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - MARKET DATA OF RANDOM PRICES, 8 TICKERS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(17)
+        list_ser = list()
+        for j in range(8):
+            array_p = 20.0 * np.cumprod(
+                1.0 + rng.normal(0.0005 * (j + 1), 0.01 + 0.002 * j, 300)
+            )
+            for t in range(300):
+                list_ser.append(
+                    {
+                        'ticker': 'TCK{}'.format(j),
+                        'dt_date': pd.Timestamp('2020-01-01')
+                        + pd.Timedelta(days=t),
+                        'close': array_p[t],
+                        'daily_return': np.nan
+                        if t == 0
+                        else array_p[t] / array_p[t - 1] - 1.0,
+                    }
+                )
+        np.random.seed(17)
+        self.cls_markowitz = MarkowitzEff(
+            pd.DataFrame(list_ser),
+            5000,
+            1e6,
+            0.0,
+            bl_constraints=False,
+            n_attempts_opt_prf=100,
+            bl_show_plot=False,
+            bl_debug_mode=False,
+        )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_batch_matches_single_portfolio_formulas(self):
+        """
+        DOCSTRING: BATCHED RETURNS, RISKS AND SHARPES MUST MATCH THE FORMULAS OF A SINGLE
+            PORTFOLIO, WITH WEIGHTS KEPT AS A FLOAT MATRIX
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_weights = self.cls_markowitz.array_weights
+        array_returns = self.cls_markowitz.array_returns
+        self.assertEqual(array_weights.shape, (5000, 8))
+        self.assertTrue(np.allclose(array_weights.sum(axis=1), 1.0))
+        for i in [0, 1234, 4999]:
+            self.assertAlmostEqual(
+                self.cls_markowitz.array_mus[i],
+                array_weights[i] @ array_returns.mean(axis=1) * 252,
+            )
+            self.assertAlmostEqual(
+                self.cls_markowitz.array_sigmas[i],
+                self.cls_markowitz.sigma_portfolio(
+                    array_weights[i], array_returns
+                )
+                * np.sqrt(252),
+            )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_constrained_batch(self):
+        """
+        DOCSTRING: CONSTRAINED WEIGHTS ARE ZERO OR ABOVE THE MINIMUM, OVER AT LEAST TWO ASSETS;
+            WITHOUT FEASIBLE PAIRS, PORTFOLIOS HOLD A SINGLE ASSET
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_min_w = np.linspace(0.05, 0.4, 8)
+        array_weights = self.cls_markowitz.random_weights_batch(
+            2000, 8, bl_constraints=True, array_min_w=array_min_w
+        )
+        self.assertTrue(np.allclose(array_weights.sum(axis=1), 1.0))
+        self.assertTrue(
+            ((array_weights >= array_min_w) | (array_weights == 0.0)).all()
+        )
+        array_two_assets = (array_weights > 0.0).sum(axis=1) >= 2
+        self.assertTrue(
+            (array_two_assets | (array_weights.max(axis=1) == 1.0)).all()
+        )
+        self.assertGreater(array_two_assets.mean(), 0.9)
+        self.assertEqual(
+            self.cls_markowitz.dict_sampler_stats['accepted']
+            + self.cls_markowitz.dict_sampler_stats['fallbacks'],
+            2000,
+        )
+        array_weights = self.cls_markowitz.random_weights_batch(
+            10, 8, bl_constraints=True, array_min_w=np.full(8, 0.6)
+        )
+        self.assertTrue(((array_weights == 1.0).sum(axis=1) == 1).all())
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_lots_and_acceptance_stats(self):
+        """
+        DOCSTRING: LOT WEIGHTS ARE MULTIPLES OF THE MINIMUMS SUMMING TO 1.0 WITHIN TOLERANCE;
+            WITHOUT ZEROS, EVERY ASSET HOLDS ITS MINIMUM
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_min_w = np.random.default_rng(3).uniform(5.0, 80.0, 40) * 1e-4
+        array_weights = self.cls_markowitz.random_weights_batch(
+            1000,
+            40,
+            bl_constraints=True,
+            bl_opt_possb_comb=True,
+            array_min_w=array_min_w,
+        )
+        dict_stats = self.cls_markowitz.dict_sampler_stats
+        self.assertEqual(dict_stats['fallbacks'], 0)
+        self.assertEqual(dict_stats['accepted'], 1000)
+        self.assertAlmostEqual(
+            dict_stats['acceptance_rate'], 1000 / dict_stats['candidates']
+        )
+        self.assertTrue(
+            np.allclose(
+                array_weights / array_min_w,
+                np.round(array_weights / array_min_w),
+            )
+        )
+        self.assertTrue(
+            (np.abs(array_weights.sum(axis=1) - 1.0) <= 1e-4 + 1e-12).all()
+        )
+        array_weights = self.cls_markowitz.random_weights_batch(
+            1000,
+            8,
+            bl_constraints=True,
+            array_min_w=np.full(8, 0.1),
+            bl_allow_zero=False,
+        )
+        self.assertTrue((array_weights >= 0.1 - 1e-12).all())
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_frontier_warm_start_and_adaptive(self):
+        """
+        DOCSTRING: WARM-STARTED FRONTIER MUST MATCH THE COLD ONE WITHIN THE SOLVER TOLERANCE,
+            AND ADAPTIVE POINTS MUST LIE ON IT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_returns = self.cls_markowitz.array_returns
+        (
+            _,
+            list_mus_cold,
+            list_sigmas_cold,
+        ) = self.cls_markowitz.optimal_portfolios(
+            array_returns, 300, bl_warm_start=False
+        )
+        (
+            _,
+            list_mus_warm,
+            list_sigmas_warm,
+        ) = self.cls_markowitz.optimal_portfolios(array_returns, 300)
+        self.assertTrue(
+            np.allclose(list_sigmas_warm, list_sigmas_cold, rtol=1e-2)
+        )
+        self.assertTrue(np.allclose(list_mus_warm, list_mus_cold, rtol=1e-2))
+        (
+            _,
+            list_mus_adapt,
+            list_sigmas_adapt,
+        ) = self.cls_markowitz.optimal_portfolios(
+            array_returns, 60, bl_adaptive=True
+        )
+        self.assertLessEqual(len(list_mus_adapt), 60)
+        array_order = np.argsort(list_mus_cold)
+        self.assertTrue(
+            np.allclose(
+                list_sigmas_adapt,
+                np.interp(
+                    list_mus_adapt,
+                    np.array(list_mus_cold)[array_order],
+                    np.array(list_sigmas_cold)[array_order],
+                ),
+                rtol=1e-2,
+            )
+        )
+
+    @unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+    def test_eff_frontier_sorted_lookup(self):
+        """
+        DOCSTRING: SPARSE-TABLE RANGES MUST MATCH NP.ARGMAX AND THE FRONTIER PORTFOLIOS MUST BE
+            THE HIGHEST RETURNS WITHIN EACH NP.ISCLOSE BAND, WIDENED BY THE PACE PER POINT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(23)
+        array_values = rng.normal(size=777)
+        array_table = self.cls_markowitz.sparse_table_argmax(array_values)
+        array_lo = rng.integers(0, 777, 500)
+        array_hi = np.minimum(array_lo + rng.integers(1, 300, 500), 777)
+        self.assertEqual(
+            self.cls_markowitz.range_argmax(
+                array_values, array_table, array_lo, array_hi
+            ).tolist(),
+            [
+                int_lo + int(np.argmax(array_values[int_lo:int_hi]))
+                for int_lo, int_hi in zip(array_lo, array_hi)
+            ],
+        )
+        array_weights = rng.dirichlet(np.ones(4), 20000)
+        array_mus = rng.normal(0.1, 0.05, 20000)
+        array_sigmas = np.abs(rng.normal(0.2, 0.05, 20000))
+        array_risks = np.concatenate([np.linspace(0.05, 0.4, 50), [0.0, 2.0]])
+        df_eff, _ = self.cls_markowitz.eff_frontier(
+            array_risks,
+            array_risks,
+            array_weights,
+            array_mus,
+            array_sigmas,
+            0.0,
+        )
+        list_expected = list()
+        for float_risk in array_risks:
+            float_atol = 1e-2
+            while True:
+                array_idx = np.where(
+                    np.isclose(array_sigmas, float_risk, atol=float_atol)
+                )[0]
+                if len(array_idx) > 0:
+                    break
+                float_atol *= 5
+            list_expected.append(
+                array_weights[array_idx[np.argmax(array_mus[array_idx])]]
+            )
+        self.assertTrue(
+            np.allclose(
+                df_eff[['weight_{}'.format(i) for i in range(4)]].to_numpy(),
+                np.array(list_expected),
+            )
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
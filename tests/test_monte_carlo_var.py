@@ -0,0 +1,88 @@
+### MONTE CARLO VALUE-AT-RISK UNIT TESTS ###
+import unittest
+
+import numpy as np
+from scipy.special import ndtri
+
+from stpstone.finance.financial_risk.monte_carlo_var import MonteCarloVaR
+
+
+class TestMonteCarloVaR(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM COVARIANCE MATRIX AND POSITIONS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        rng = np.random.default_rng(21)
+        array_a = rng.normal(0.0, 0.01, (15, 15))
+        self.array_cov = array_a @ array_a.T + np.diag(np.full(15, 1e-4))
+        self.array_positions = rng.normal(0.0, 1e5, 15)
+        self.float_sigma = np.sqrt(
+            self.array_positions @ self.array_cov @ self.array_positions
+        )
+
+    def test_reproducible_across_chunks_and_workers(self):
+        """
+        DOCSTRING: THE SAME SEED YIELDS THE SAME P&L, WHATEVER THE CHUNK SIZE AND THE NUMBER
+            OF WORKERS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        for dict_kwargs in [
+            {'bl_antithetic': True},
+            {'bl_sobol': True},
+            {'str_distribution': 'skew_t'},
+        ]:
+            array_pnl = MonteCarloVaR(
+                self.array_positions,
+                self.array_cov,
+                int_seed=5,
+                int_chunk_size=1000,
+                **dict_kwargs
+            ).simulate(int_n_paths=9001)
+            array_pnl_other = MonteCarloVaR(
+                self.array_positions,
+                self.array_cov,
+                int_seed=5,
+                int_chunk_size=2999,
+                **dict_kwargs
+            ).simulate(int_n_paths=9001, int_workers=2)
+            self.assertTrue(np.allclose(array_pnl, array_pnl_other))
+
+    def test_converges_to_parametric_var(self):
+        """
+        DOCSTRING: NORMAL SHOCKS WITH SOBOL AND ANTITHETIC VARIATES CONVERGE TO THE PARAMETRIC
+            VAR AND ES; ANTITHETIC PAIRS CANCEL OUT THE MEAN
+        INPUTS: -
+        OUTPUTS: -
+        """
+        cls_mc = MonteCarloVaR(
+            self.array_positions,
+            self.array_cov,
+            list_confidence_levels=[0.95, 0.99],
+            int_seed=5,
+            bl_antithetic=True,
+            bl_sobol=True,
+        )
+        array_pnl = cls_mc.simulate(int_n_paths=200000)
+        self.assertAlmostEqual(array_pnl.mean() / self.float_sigma, 0.0)
+        dict_var_es = cls_mc.var_es()
+        for float_level in [0.95, 0.99]:
+            float_z = ndtri(float_level)
+            self.assertAlmostEqual(
+                dict_var_es['var'].loc[float_level] / self.float_sigma,
+                float_z,
+                places=1,
+            )
+            self.assertAlmostEqual(
+                dict_var_es['es'].loc[float_level] / self.float_sigma,
+                np.exp(-(float_z**2) / 2.0)
+                / np.sqrt(2.0 * np.pi)
+                / (1.0 - float_level),
+                places=1,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
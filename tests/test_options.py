@@ -0,0 +1,394 @@
+### OPTIONS PRICING UNIT TESTS ###
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from stpstone.finance.derivatives.options.american import PricingModels
+from stpstone.finance.derivatives.options.european import EuropeanOptions
+
+
+class TestBlackScholesMertonVectorized(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM OPTION CHAIN
+        INPUTS: -
+        OUTPUTS: -
+        """
+        int_n = 500
+        rng = np.random.default_rng(123)
+        self.array_s = rng.uniform(10.0, 100.0, int_n)
+        self.array_k = self.array_s * rng.uniform(0.5, 1.5, int_n)
+        self.array_r = rng.uniform(0.0, 0.15, int_n)
+        self.array_t = rng.uniform(0.01, 3.0, int_n)
+        self.array_sigma = rng.uniform(0.05, 1.0, int_n)
+        self.array_q = np.zeros(int_n)
+        self.array_b = self.array_r - rng.uniform(0.0, 0.05, int_n)
+        self.array_opt_type = rng.choice(['call', 'put'], int_n)
+
+    def test_general_opt_price_matches_scalar(self):
+        """
+        DOCSTRING: VECTORIZED PRICES MUST MATCH THE SCALAR PATH, CONTRACT BY CONTRACT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_prices = EuropeanOptions().general_opt_price(
+            self.array_s,
+            self.array_k,
+            self.array_r,
+            self.array_t,
+            self.array_sigma,
+            self.array_q,
+            self.array_b,
+            self.array_opt_type,
+        )
+        array_scalar_prices = np.array(
+            [
+                EuropeanOptions().general_opt_price(*tup_)
+                for tup_ in zip(
+                    self.array_s,
+                    self.array_k,
+                    self.array_r,
+                    self.array_t,
+                    self.array_sigma,
+                    self.array_q,
+                    self.array_b,
+                    self.array_opt_type,
+                )
+            ]
+        )
+        self.assertTrue(
+            np.allclose(array_prices, array_scalar_prices, rtol=0, atol=1e-12)
+        )
+
+    def test_general_opt_price_broadcasts_series(self):
+        """
+        DOCSTRING: PANDAS SERIES AND SCALARS BROADCAST TOGETHER
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_prices = EuropeanOptions().general_opt_price(
+            pd.Series(self.array_s),
+            100.0,
+            0.1,
+            1.0,
+            0.3,
+            0.0,
+            0.1,
+            'put',
+        )
+        self.assertEqual(array_prices.shape, self.array_s.shape)
+        self.assertAlmostEqual(
+            array_prices[0],
+            EuropeanOptions().general_opt_price(
+                self.array_s[0], 100.0, 0.1, 1.0, 0.3, 0.0, 0.1, 'put'
+            ),
+            places=12,
+        )
+
+    def test_general_opt_price_object_dtype(self):
+        """
+        DOCSTRING: NUMBERS HELD IN OBJECT-DTYPE SERIES ARE PARAMETERS, NOT OPTION STYLES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_prices = EuropeanOptions().general_opt_price(
+            pd.Series(self.array_s, dtype=object),
+            self.array_k.astype(object),
+            self.array_r,
+            self.array_t,
+            self.array_sigma,
+            self.array_q,
+            self.array_b,
+            pd.Series(self.array_opt_type, dtype=object),
+        )
+        self.assertTrue(
+            np.allclose(
+                array_prices,
+                EuropeanOptions().general_opt_price(
+                    self.array_s,
+                    self.array_k,
+                    self.array_r,
+                    self.array_t,
+                    self.array_sigma,
+                    self.array_q,
+                    self.array_b,
+                    self.array_opt_type,
+                ),
+                rtol=0,
+                atol=1e-12,
+            )
+        )
+        self.assertTrue(
+            EuropeanOptions().bl_str_array(
+                np.array(['call', 'put'], dtype=object)
+            )
+        )
+        self.assertFalse(
+            EuropeanOptions().bl_str_array(np.array([1.0, None], dtype=object))
+        )
+
+
+class TestGreeksTable(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM OPTION CHAIN
+        INPUTS: -
+        OUTPUTS: -
+        """
+        TestBlackScholesMertonVectorized.setUp(self)
+
+    def test_greeks_table_matches_scalar(self):
+        """
+        DOCSTRING: GREEKS SURFACE MUST MATCH THE SCALAR GREEKS, CONTRACT BY CONTRACT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        df_chain = pd.DataFrame(
+            {
+                's': self.array_s,
+                'k': self.array_k,
+                'r': self.array_r,
+                't': self.array_t,
+                'sigma': self.array_sigma,
+                'q': self.array_q,
+                'b': self.array_b,
+                'opt_type': self.array_opt_type,
+            }
+        )
+        list_greeks_opt_type = ['delta', 'theta', 'rho', 'vanna', 'charm']
+        list_greeks = ['gamma', 'vega', 'zomma', 'speed', 'vomma']
+        df_greeks = EuropeanOptions().greeks_table(
+            df_chain, which=list_greeks_opt_type + list_greeks
+        )
+        self.assertEqual(
+            list(df_greeks.columns), list_greeks_opt_type + list_greeks
+        )
+        for tup_ in df_chain.head(50).itertuples():
+            for greek_ in list_greeks_opt_type:
+                self.assertAlmostEqual(
+                    df_greeks.loc[tup_.Index, greek_],
+                    getattr(EuropeanOptions(), greek_)(*tup_[1:]),
+                    places=10,
+                )
+            for greek_ in list_greeks:
+                self.assertAlmostEqual(
+                    df_greeks.loc[tup_.Index, greek_],
+                    getattr(EuropeanOptions(), greek_)(*tup_[1:-1]),
+                    places=10,
+                )
+
+    def test_greeks_table_unknown_greek(self):
+        """
+        DOCSTRING: UNKNOWN GREEKS RAISE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        with self.assertRaises(Exception):
+            EuropeanOptions().greeks_table(
+                {
+                    's': [100.0],
+                    'k': [100.0],
+                    'r': [0.1],
+                    't': [1.0],
+                    'sigma': [0.3],
+                    'q': [0.0],
+                    'b': [0.1],
+                    'opt_type': ['call'],
+                },
+                which=['delta', 'not_a_greek'],
+            )
+
+
+class TestImpliedVolatilityBatch(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - RANDOM OPTION CHAIN
+        INPUTS: -
+        OUTPUTS: -
+        """
+        TestBlackScholesMertonVectorized.setUp(self)
+
+    def test_round_trip(self):
+        """
+        DOCSTRING: IMPLIED VOLATILITIES OF BSM PRICES MUST RECOVER THE ORIGINAL VOLATILITIES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_prices = EuropeanOptions().general_opt_price(
+            self.array_s,
+            self.array_k,
+            self.array_r,
+            self.array_t,
+            self.array_sigma,
+            self.array_q,
+            self.array_b,
+            self.array_opt_type,
+        )
+        (
+            array_imp_vol,
+            array_status,
+        ) = EuropeanOptions().implied_volatility_batch(
+            self.array_s,
+            self.array_k,
+            self.array_r,
+            self.array_t,
+            self.array_q,
+            self.array_b,
+            array_prices,
+            self.array_opt_type,
+        )
+        mask_conv = array_status == EuropeanOptions().INT_IV_CONVERGED
+        self.assertGreater(mask_conv.mean(), 0.95)
+        self.assertTrue(
+            np.allclose(
+                array_imp_vol[mask_conv],
+                self.array_sigma[mask_conv],
+                rtol=0,
+                atol=1e-6,
+            )
+        )
+
+    def test_status_codes(self):
+        """
+        DOCSTRING: NO-ARBITRAGE VIOLATIONS AND PRICES WITHOUT TIME VALUE ARE FLAGGED
+        INPUTS: -
+        OUTPUTS: -
+        """
+        (
+            array_imp_vol,
+            array_status,
+        ) = EuropeanOptions().implied_volatility_batch(
+            100.0, 90.0, 0.1, 1.0, 0.0, 0.1, [5.0, 0.0, 25.0], 'call'
+        )
+        self.assertEqual(
+            array_status.tolist(),
+            [
+                EuropeanOptions().INT_IV_ARBITRAGE,
+                EuropeanOptions().INT_IV_ARBITRAGE,
+                EuropeanOptions().INT_IV_CONVERGED,
+            ],
+        )
+        self.assertTrue(np.isnan(array_imp_vol[:2]).all())
+        (
+            array_imp_vol,
+            array_status,
+        ) = EuropeanOptions().implied_volatility_batch(
+            100.0, 200.0, 0.1, 1.0, 0.0, 0.1, 0.0, 'call'
+        )
+        self.assertEqual(array_status, EuropeanOptions().INT_IV_ZERO_VEGA)
+
+
+class TestBinomialLattice(unittest.TestCase):
+    def test_batch_matches_scalar(self):
+        """
+        DOCSTRING: BATCHED LATTICE MUST MATCH CONTRACT-BY-CONTRACT PRICING, FOR EVERY
+            PARAMETRIZATION AND EXERCISE STYLE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_s = np.array([80.0, 95.0, 100.0, 105.0, 120.0])
+        array_opt_type = np.array(['call', 'put', 'call', 'put', 'put'])
+        for str_method in [
+            'crr_method',
+            'jr_method',
+            'eqp_method',
+            'trg_method',
+        ]:
+            for bl_american in [False, True]:
+                array_prices = getattr(EuropeanOptions(), str_method)(
+                    array_s,
+                    100.0,
+                    0.08,
+                    0.75,
+                    200,
+                    0.3,
+                    array_opt_type,
+                    bl_american=bl_american,
+                )
+                for i, float_s in enumerate(array_s):
+                    self.assertAlmostEqual(
+                        array_prices[i],
+                        getattr(EuropeanOptions(), str_method)(
+                            float_s,
+                            100.0,
+                            0.08,
+                            0.75,
+                            200,
+                            0.3,
+                            array_opt_type[i],
+                            bl_american=bl_american,
+                        ),
+                        places=10,
+                    )
+
+    def test_convergence_to_bsm(self):
+        """
+        DOCSTRING: EUROPEAN LATTICE PRICES CONVERGE TO THE CLOSED-FORM BSM PRICES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        for opt_type in ['call', 'put']:
+            self.assertAlmostEqual(
+                EuropeanOptions().crr_method(
+                    100.0, 100.0, 0.05, 1.0, 2000, 0.2, opt_type
+                ),
+                EuropeanOptions().general_opt_price(
+                    100.0, 100.0, 0.05, 1.0, 0.2, 0.0, 0.05, opt_type
+                ),
+                places=2,
+            )
+
+
+class TestAmericanApproximations(unittest.TestCase):
+    def test_barone_adesi_whaley_reference(self):
+        """
+        DOCSTRING: BAW PRICES AGAINST REFERENCE VALUES (QUANTLIB'S BAW ENGINE)
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_prices = PricingModels().barone_adesi_whaley(
+            np.array([100.0, 110.0]),
+            100.0,
+            0.1,
+            182.0 / 365.0,
+            0.25,
+            0.05,
+            np.array(['put', 'put']),
+        )
+        self.assertAlmostEqual(array_prices[0], 5.93442, places=4)
+        self.assertAlmostEqual(
+            array_prices[1],
+            PricingModels().barone_adesi_whaley(
+                110.0, 100.0, 0.1, 182.0 / 365.0, 0.25, 0.05, 'put'
+            ),
+            places=12,
+        )
+
+    def test_bounds_against_binomial(self):
+        """
+        DOCSTRING: AMERICAN APPROXIMATIONS LIE ABOVE THE EUROPEAN PRICE AND CLOSE TO THE
+            BINOMIAL TREE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        array_s = np.array([80.0, 100.0, 120.0])
+        float_u = np.exp(0.3 * np.sqrt(1.0 / 1000))
+        array_binomial = PricingModels().binomial(
+            array_s, 100.0, 0.1, 1.0, 1000, float_u, 1.0 / float_u, 'put'
+        )
+        array_european = EuropeanOptions().general_opt_price(
+            array_s, 100.0, 0.1, 1.0, 0.3, 0.0, 0.1, 'put'
+        )
+        for str_model in ['barone_adesi_whaley', 'bjerksund_stensland']:
+            array_prices = getattr(PricingModels(), str_model)(
+                array_s, 100.0, 0.1, 1.0, 0.3, 0.1, 'put'
+            )
+            self.assertTrue((array_prices >= array_european).all())
+            self.assertTrue(
+                np.allclose(array_prices, array_binomial, rtol=0, atol=0.15)
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+### DEALING PANDAS UNIT TESTS ###
+import platform
+import sys
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+if platform.system() == 'Windows':
+    from stpstone.handling_data.pd import DealingPd
+
+
+@unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+class TestStrDatesToDatetime(unittest.TestCase):
+    def test_ddmmyyyy(self):
+        """
+        DOCSTRING: DDMMYYYY PARSED AS DAY, MONTH AND YEAR; MISSING VALUES AS NONE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        ser_dt = DealingPd().str_dates_to_datetime(
+            pd.Series(
+                ['20122024', '02012025', None, '20122024'], dtype=object
+            ),
+            'DDMMYYYY',
+        )
+        self.assertEqual(
+            ser_dt.tolist(),
+            [date(2024, 12, 20), date(2025, 1, 2), None, date(2024, 12, 20)],
+        )
+
+    def test_two_digit_years(self):
+        """
+        DOCSTRING: TWO-DIGIT YEARS WITHIN THE 2000S
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertEqual(
+            DealingPd()
+            .str_dates_to_datetime(
+                pd.Series(['241220'], dtype=object), 'YYMMDD'
+            )
+            .tolist(),
+            [date(2024, 12, 20)],
+        )
+        self.assertEqual(
+            DealingPd()
+            .str_dates_to_datetime(
+                pd.Series(['201224'], dtype=object), 'DDMMYY'
+            )
+            .tolist(),
+            [date(2024, 12, 20)],
+        )
+        with self.assertRaises(Exception):
+            DealingPd().str_dates_to_datetime(
+                pd.Series(['2024-12-20'], dtype=object), 'YYYY/DD/MM'
+            )
+
+    def test_out_of_bounds(self):
+        """
+        DOCSTRING: DATES BEYOND THE NANOSECOND BOUNDS OF DATETIME64, AS THE 9999-12-31 FILL
+            VALUE, ARE KEPT AS DATE OBJECTS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        ser_dt = DealingPd().str_dates_to_datetime(
+            pd.Series(['9999-12-31', '2024-12-20', '1600-01-01'], dtype=object)
+        )
+        self.assertEqual(
+            ser_dt.tolist(),
+            [date(9999, 12, 31), date(2024, 12, 20), date(1600, 1, 1)],
+        )
+        df_ = DealingPd().pipeline_df_startup(
+            pd.DataFrame(
+                {
+                    'DT_VENC': pd.Series(['2024-12-20', None], dtype=object),
+                    'QTD': [1, 2],
+                }
+            ),
+            {'DT_VENC': str, 'QTD': int},
+            ['DT_VENC'],
+            str_dt_fillna='9999-12-31',
+        )
+        self.assertEqual(
+            df_['DT_VENC'].tolist(), [date(2024, 12, 20), date(9999, 12, 31)]
+        )
+
+    def test_dt64(self):
+        """
+        DOCSTRING: DATETIME64 ON REQUEST, MISSING VALUES AS NAT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        ser_dt = DealingPd().str_dates_to_datetime(
+            pd.Series(['20/12/2024', None], dtype=object),
+            'DD/MM/YYYY',
+            bl_dt64=True,
+        )
+        self.assertTrue(np.issubdtype(ser_dt.dtype, np.datetime64))
+        self.assertEqual(ser_dt.iloc[0], pd.Timestamp('2024-12-20'))
+        self.assertTrue(pd.isna(ser_dt.iloc[1]))
+
+
+@unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+class TestStripAllObjDtypes(unittest.TestCase):
+    def test_strip_distinct_values(self):
+        """
+        DOCSTRING: MOSTLY DISTINCT VALUES STRIPPED ROW BY ROW; NON-STRING VALUES AND DATE
+            COLUMNS KEPT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        list_names = [' NAME{} '.format(i) for i in range(100)]
+        df_ = DealingPd().strip_all_obj_dtypes(
+            pd.DataFrame(
+                {
+                    'NOME': pd.Series(list_names + [7, np.nan], dtype=object),
+                    'DT_REF': pd.Series([' 2024-12-20 '] * 102, dtype=object),
+                }
+            ),
+            ['DT_REF'],
+        )
+        self.assertEqual(
+            df_['NOME'].tolist()[:100],
+            ['NAME{}'.format(i) for i in range(100)],
+        )
+        self.assertEqual(df_['NOME'].iloc[100], 7)
+        self.assertTrue(pd.isna(df_['NOME'].iloc[101]))
+        self.assertEqual(df_['DT_REF'].iloc[0], ' 2024-12-20 ')
+
+    def test_strip_low_cardinality(self):
+        """
+        DOCSTRING: REPEATED VALUES STRIPPED ONCE EACH, KEPT AS OBJECTS UNLESS A RATIO OF
+            DISTINCT VALUES IS GIVEN
+        INPUTS: -
+        OUTPUTS: -
+        """
+        ser_ = pd.Series(
+            [' PETR4 ', 'PETR4', 'VALE3 ', None] * 100, dtype=object
+        )
+        df_ = DealingPd().strip_all_obj_dtypes(
+            pd.DataFrame({'TICKER': ser_.copy()}), list()
+        )
+        self.assertNotIsInstance(df_['TICKER'].dtype, pd.CategoricalDtype)
+        self.assertEqual(
+            df_['TICKER'].tolist()[:3], ['PETR4', 'PETR4', 'VALE3']
+        )
+        self.assertTrue(pd.isna(df_['TICKER'].iloc[3]))
+        df_ = DealingPd().strip_all_obj_dtypes(
+            pd.DataFrame({'TICKER': ser_.copy()}),
+            list(),
+            float_max_ratio_categ=0.1,
+        )
+        self.assertIsInstance(df_['TICKER'].dtype, pd.CategoricalDtype)
+        self.assertEqual(
+            sorted(df_['TICKER'].cat.categories.tolist()), ['PETR4', 'VALE3']
+        )
+        self.assertEqual(
+            df_['TICKER'].tolist()[:3], ['PETR4', 'PETR4', 'VALE3']
+        )
+        self.assertTrue(pd.isna(df_['TICKER'].iloc[3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
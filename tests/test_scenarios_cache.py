@@ -0,0 +1,149 @@
+### B3 RISK SCENARIOS CACHE UNIT TESTS ###
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from stpstone.finance.b3.scenarios_cache import ScenariosCacheB3
+
+
+class TestScenariosCacheB3(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - TEMPORARY CACHE DIRECTORY AND TWO RANDOM SCENARIOS
+            FILES, IN B3'S FORMAT (HEADER, SEMICOLONS, DECIMAL COMMAS, MISSING VERTICES)
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.dir_tmp = tempfile.TemporaryDirectory()
+        self.cls_cache = ScenariosCacheB3(path_dir=self.dir_tmp.name)
+        self.list_cols = [
+            'TIPO',
+            'ID_FPR',
+            'ID_CENARIO',
+            'INT_TIPO_CENARIO',
+            'DIAS_HOLDING_PERIOD',
+            'DIAS_CORRIDOS_VERTICE',
+            'DIAS_SAQUE_VERTICE',
+            'VALOR_PHI_1',
+            'VALOR_PHI_2',
+        ]
+        rng = np.random.default_rng(31)
+        self.list_bytes = list()
+        for int_fpr in [2962, 2945]:
+            list_lines = ['HEADER']
+            for int_scenario in rng.permutation(np.arange(1, 61)):
+                for int_vertex in [21, 63, 252]:
+                    list_lines.append(
+                        ';'.join(
+                            [
+                                '1',
+                                str(int_fpr),
+                                str(int_scenario),
+                                str(int_scenario % 3 + 1),
+                                '2',
+                                '' if int_vertex == 63 else str(int_vertex),
+                                str(int_vertex),
+                                '{:.6f}'.format(rng.normal()).replace(
+                                    '.', ','
+                                ),
+                                '{:.6f}'.format(rng.normal()).replace(
+                                    '.', ','
+                                ),
+                            ]
+                        )
+                    )
+            self.list_bytes.append(('\n'.join(list_lines) + '\n').encode())
+
+    def tearDown(self):
+        """
+        DOCSTRING: REMOVE THE TEMPORARY CACHE DIRECTORY
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.cls_cache.clear()
+        self.dir_tmp.cleanup()
+
+    def list_files(self):
+        """
+        DOCSTRING: OPENED FILES, NAMED AS B3'S
+        INPUTS: -
+        OUTPUTS: LIST
+        """
+        list_files = list()
+        for int_fpr, bytes_ in zip([2962, 2945], self.list_bytes):
+            file_ = BytesIO(bytes_)
+            file_.name = 'CenariosTipoCurva_{}.txt'.format(int_fpr)
+            list_files.append(file_)
+        return list_files
+
+    def test_round_trip_matches_legacy_parsing(self):
+        """
+        DOCSTRING: CACHED COLUMNS ARE TYPED, MEMORY-MAPPED ON LOAD AND EQUAL TO THE FORMER
+            READ_CSV, FILLNA AND ASTYPE PIPELINE; SCENARIO RANGES AND FILES ARE FILTERED
+        INPUTS: -
+        OUTPUTS: -
+        """
+        df_legacy = pd.concat(
+            [
+                pd.read_csv(
+                    file_,
+                    sep=';',
+                    skiprows=1,
+                    header=None,
+                    names=self.list_cols,
+                    decimal=',',
+                ).fillna(-1)
+                for file_ in self.list_files()
+            ],
+            ignore_index=True,
+        )
+        dict_parsed = self.cls_cache.parse(
+            self.list_files(), self.list_cols, self.list_cols[7:]
+        )
+        path_cache = self.cls_cache.path_cache('tipo_curva', '241220')
+        self.assertTrue(self.cls_cache.dump(path_cache, dict_parsed))
+        dict_loaded = self.cls_cache.load(path_cache)
+        self.assertIsInstance(dict_loaded['columns']['ID_CENARIO'], np.memmap)
+        self.assertEqual(dict_loaded['columns']['ID_FPR'].dtype, np.int32)
+        self.assertEqual(
+            dict_loaded['columns']['VALOR_PHI_1'].dtype, np.float64
+        )
+        df_cache = self.cls_cache.frame(
+            dict_loaded, int_scenario_inf=10, int_scenario_sup=40
+        )
+        df_expected = (
+            df_legacy[df_legacy['ID_CENARIO'].isin(range(10, 40))]
+            .sort_values('ID_CENARIO', kind='stable')
+            .reset_index(drop=True)
+        )
+        self.assertEqual(list(df_cache.columns), self.list_cols)
+        self.assertTrue(
+            np.array_equal(
+                df_cache.to_numpy(dtype=float),
+                df_expected.to_numpy(dtype=float),
+            )
+        )
+        df_filtered = self.cls_cache.frame(
+            dict_loaded, list_files_substr=['2945']
+        )
+        self.assertEqual(set(df_filtered['ID_FPR']), {2945})
+        self.assertEqual(len(df_filtered), 180)
+
+    def test_missing_cache(self):
+        """
+        DOCSTRING: A DATE WITHOUT CACHE LOADS AS NONE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        self.assertIsNone(
+            self.cls_cache.load(
+                self.cls_cache.path_cache('tipo_spot', '241220')
+            )
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+### SEARCH BY TRADING - B3 BACKFILL UNIT TESTS ###
+import platform
+import sys
+import time
+import unittest
+from datetime import date, timedelta
+from io import BytesIO
+
+from stpstone.cals.handling_dates import DatesBR
+
+if platform.system() == 'Windows':
+    from stpstone.finance.b3.search_by_trading import TradingFilesB3
+
+    class LocalTradingFilesB3(TradingFilesB3):
+        def price_report(self, bl_debug=False):
+            """
+            DOCSTRING: WORKING DAYS BEFORE OF THE PARSED DATE, FAILING ON THE 10TH OF THE MONTH
+            INPUTS: DEBUG FLAG
+            OUTPUTS: INTEGER
+            """
+            if (
+                DatesBR()
+                .sub_working_days(DatesBR().curr_date, self.int_wd_bef)
+                .day
+                == 10
+            ):
+                raise Exception('corrupted zip')
+            return self.int_wd_bef
+
+
+class LocalHttpCache:
+    """
+    DOCSTRING: DISK CACHE STAND-IN - LOG OF THE FETCHED URLS (SHARED BY THE FETCHING THREADS)
+        AND A DELAY PER DOWNLOAD
+    INPUTS: -
+    OUTPUTS: -
+    """
+
+    list_urls = list()
+    float_sleep = 0.0
+
+    def get(self, file_url, bl_verify=True, timeout=None, session=None):
+        LocalHttpCache.list_urls.append(file_url)
+        time.sleep(LocalHttpCache.float_sleep)
+        return BytesIO(b'')
+
+
+@unittest.skipUnless(sys.platform.startswith('win'), 'requires Windows')
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - PAST RANGE OF TRADE DATES AND EMPTY FETCH LOG
+        INPUTS: -
+        OUTPUTS: -
+        """
+        LocalHttpCache.list_urls = list()
+        LocalHttpCache.float_sleep = 0.0
+        self.cls_trading = LocalTradingFilesB3(http_cache=LocalHttpCache())
+        self.date_inf = date(2024, 12, 2)
+        self.date_sup = date(2024, 12, 20)
+        self.list_dates = DatesBR().list_working_days(
+            self.date_inf, self.date_sup
+        )
+
+    def test_backfill_wd_bef(self):
+        """
+        DOCSTRING: WORKING DAYS BEFORE MAP BACK TO EACH TRADE DATE; DATES FROM THE CURRENT ONE
+            ON ARE LEFT OUT
+        INPUTS: -
+        OUTPUTS: -
+        """
+        list_dates_wd_bef = self.cls_trading.backfill_wd_bef(
+            self.date_inf, self.date_sup
+        )
+        self.assertEqual(
+            [date_ for date_, _ in list_dates_wd_bef], self.list_dates
+        )
+        for date_, int_wd_bef in list_dates_wd_bef:
+            self.assertEqual(
+                DatesBR().sub_working_days(DatesBR().curr_date, int_wd_bef),
+                date_,
+            )
+        date_curr = DatesBR().curr_date
+        list_dates_wd_bef = self.cls_trading.backfill_wd_bef(
+            date_curr - timedelta(days=10), date_curr + timedelta(days=10)
+        )
+        self.assertTrue(
+            all(date_ < date_curr for date_, _ in list_dates_wd_bef)
+        )
+        self.assertTrue(
+            all(int_wd_bef >= 1 for _, int_wd_bef in list_dates_wd_bef)
+        )
+
+    def test_backfill_urls(self):
+        """
+        DOCSTRING: URLS CARRY THE TRADE DATE, ONE PER DATED ZIP, FOLLOWED BY THE FALLBACK
+            DATES' ONES; UNKNOWN METHODS RAISE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        for date_, int_wd_bef in self.cls_trading.backfill_wd_bef(
+            self.date_inf, self.date_sup
+        ):
+            list_urls = self.cls_trading.backfill_urls(
+                'price_report', int_wd_bef
+            )
+            self.assertEqual(len(list_urls), 1)
+            self.assertIn(date_.strftime('%y%m%d'), list_urls[0][0])
+            self.assertEqual(
+                len(self.cls_trading.backfill_urls('options_b3', int_wd_bef)),
+                2,
+            )
+            list_urls = self.cls_trading.backfill_urls(
+                'cenarios_risco_tipo_spot', int_wd_bef
+            )
+            self.assertEqual(len(list_urls), 2)
+            self.assertIn(date_.strftime('%y%m%d'), list_urls[0][0])
+            self.assertIn(
+                DatesBR().sub_working_days(date_, 1).strftime('%y%m%d'),
+                list_urls[1][0],
+            )
+        with self.assertRaises(Exception):
+            self.cls_trading.backfill_urls('not_a_method', 1)
+
+    def test_backfill_scheduling(self):
+        """
+        DOCSTRING: EVERY DATE IS YIELDED ONCE, WITH ITS OWN OUTPUT OR EXCEPTION, AND DOWNLOADS
+            NEVER RUN AHEAD OF THE YIELDED DATES BY MORE THAN THE WINDOW
+        INPUTS: -
+        OUTPUTS: -
+        """
+        LocalHttpCache.float_sleep = 0.01
+        int_dates_ahead = 3
+        dict_outputs = dict()
+        for i, (date_, output_, exc_) in enumerate(
+            self.cls_trading.backfill(
+                'price_report',
+                self.date_inf,
+                self.date_sup,
+                int_workers_fetch=4,
+                int_workers_parse=2,
+                int_dates_ahead=int_dates_ahead,
+            )
+        ):
+            self.assertLessEqual(
+                len(LocalHttpCache.list_urls), i + int_dates_ahead
+            )
+            self.assertNotIn(date_, dict_outputs)
+            dict_outputs[date_] = (output_, exc_)
+        self.assertEqual(sorted(dict_outputs.keys()), self.list_dates)
+        self.assertEqual(len(LocalHttpCache.list_urls), len(self.list_dates))
+        for date_, (output_, exc_) in dict_outputs.items():
+            if date_.day == 10:
+                self.assertIsNone(output_)
+                self.assertIsInstance(exc_, Exception)
+            else:
+                self.assertIsNone(exc_)
+                self.assertEqual(
+                    DatesBR().sub_working_days(DatesBR().curr_date, output_),
+                    date_,
+                )
+
+    def test_backfill_early_close(self):
+        """
+        DOCSTRING: CLOSING THE GENERATOR RETURNS AT ONCE AND CANCELS THE QUEUED DOWNLOADS
+        INPUTS: -
+        OUTPUTS: -
+        """
+        LocalHttpCache.float_sleep = 0.2
+        gen_backfill = self.cls_trading.backfill(
+            'price_report',
+            self.date_inf,
+            self.date_sup,
+            int_workers_fetch=1,
+            int_workers_parse=1,
+        )
+        _ = next(gen_backfill)
+        float_start = time.time()
+        gen_backfill.close()
+        self.assertLess(time.time() - float_start, 0.2)
+        time.sleep(0.5)
+        self.assertLess(len(LocalHttpCache.list_urls), len(self.list_dates))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+### XML FILES UNIT TESTS ###
+import unittest
+from io import BytesIO
+
+import pandas as pd
+
+from stpstone.handling_data.xml import XMLFiles
+
+
+class TestXMLIterparseRecords(unittest.TestCase):
+    def setUp(self):
+        """
+        DOCSTRING: SETUP FOR THE TEST CLASS - NAMESPACED PRICE REPORT-LIKE XML, WITH OPTIONAL
+            FIELDS AND CURRENCY ATTRIBUTES
+        INPUTS: -
+        OUTPUTS: -
+        """
+        list_parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<BizFile xmlns="urn:bvmf.052.01.xsd">'
+        ]
+        for i in range(300):
+            list_parts.append(
+                '<BizGrp><AppHdr><Fr><Id>BVMF</Id></Fr></AppHdr><Document><PricRpt>'
+                '<TradDt><Dt>2024-01-02</Dt></TradDt>'
+                '<SctyId><TckrSymb>TCK{0}</TckrSymb></SctyId>'
+                '<FinInstrmId><OthrId><Id>{0}</Id></OthrId></FinInstrmId>'
+                '<FinInstrmAttrbts>{1}<NtlFinVol{2}>{3}</NtlFinVol>'
+                '<LastPric>{0}</LastPric></FinInstrmAttrbts>'
+                '</PricRpt></Document></BizGrp>'.format(
+                    i,
+                    '' if i % 5 else '<OpnIntrst>{}</OpnIntrst>'.format(i),
+                    ' Ccy="BRL"' if i % 3 else '',
+                    i * 1.5,
+                )
+            )
+        list_parts.append('</BizFile>')
+        self.bytes_xml = ''.join(list_parts).encode()
+        self.dict_tags = {
+            'PricRpt': [
+                'Dt',
+                'TckrSymb',
+                'Id',
+                'OpnIntrst',
+                'NtlFinVol',
+                'LastPric',
+                'Missing',
+            ]
+        }
+
+    def test_matches_soup(self):
+        """
+        DOCSTRING: STREAMED RECORDS AND COLUMNS MUST MATCH SOUP'S FIND OVER THE WHOLE TREE
+        INPUTS: -
+        OUTPUTS: -
+        """
+        list_soup = list()
+        for soup_content in (
+            XMLFiles().xml_memory_parser(self.bytes_xml).find_all('PricRpt')
+        ):
+            dict_ = dict()
+            for tag in self.dict_tags['PricRpt']:
+                tag_ = soup_content.find(tag)
+                if tag_ is None:
+                    continue
+                dict_[tag] = tag_.get_text()
+                if 'Ccy' in tag_.attrs:
+                    dict_['Currency'] = tag_.attrs['Ccy']
+            list_soup.append(dict_)
+        list_stream = list()
+        for (
+            str_record,
+            dict_texts,
+            dict_attrs,
+        ) in XMLFiles().xml_iterparse_records(
+            BytesIO(self.bytes_xml), self.dict_tags
+        ):
+            self.assertEqual(str_record, 'PricRpt')
+            dict_ = dict()
+            for tag, str_text in dict_texts.items():
+                dict_[tag] = str_text
+                if 'Ccy' in dict_attrs[tag]:
+                    dict_['Currency'] = dict_attrs[tag]['Ccy']
+            list_stream.append(dict_)
+        self.assertEqual(list_stream, list_soup)
+        self.assertTrue(
+            pd.DataFrame(
+                XMLFiles().records_to_columns(iter(list_stream))
+            ).equals(pd.DataFrame(list_soup))
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()